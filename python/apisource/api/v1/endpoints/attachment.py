@@ -0,0 +1,52 @@
+import string
+from urllib.parse import quote
+
+from fastapi.responses import StreamingResponse
+
+from service.audio_extractor_service import ClosingStream, media_type_for
+
+# Content-Dispositionのfilenameパラメータにそのまま含められる文字（引用符、バックスラッシュ、区切り文字を含まない）
+FALLBACK_FILENAME_CHARACTERS = frozenset(string.ascii_letters + string.digits + " !#$&'()+,-.=@[]^_`{}~")
+
+def content_disposition(file_name: str) -> str:
+    """
+    ダウンロードさせるファイルのContent-Dispositionヘッダーの値を組み立てます。
+
+    ファイル名はクライアントが送信した任意の文字列を含むため、そのままヘッダーに含めず、
+    安全なASCII文字以外を_に置き換えた引用符付きのfilenameと、
+    UTF-8でパーセントエンコードしたfilename*（RFC 6266）の両方を指定します。
+
+    Args:
+        file_name (str): ダウンロードさせるファイル名。
+
+    Returns:
+        str: Content-Dispositionヘッダーの値。
+    """
+    fallback = "".join(c if c in FALLBACK_FILENAME_CHARACTERS else "_" for c in file_name)
+    return f"attachment; filename=\"{fallback}\"; filename*=UTF-8''{quote(file_name, safe='')}"
+
+class AttachmentResponse(StreamingResponse):
+    """
+    音声抽出の結果をダウンロードさせるストリーミングレスポンス。
+
+    ボディのストリームは送信を終えた時点だけでなく、送信の途中で中断された場合や送信が始まらなかった場合にも閉じるため、
+    ストリームが保持する作業ディレクトリと受信したファイルは常に削除されます。
+    """
+
+    def __init__(self, content: ClosingStream, file_name: str):
+        """
+        AttachmentResponseを初期化します。
+
+        Args:
+            content (ClosingStream): データのチャンクを返すストリーム。
+            file_name (str): ダウンロードさせるファイル名。メディアタイプの決定にも使用します。
+        """
+        super().__init__(content, media_type=media_type_for(file_name), headers={
+            "Content-Disposition": content_disposition(file_name)
+        })
+
+    async def __call__(self, scope, receive, send):
+        try:
+            await super().__call__(scope, receive, send)
+        finally:
+            await self.body_iterator.aclose()
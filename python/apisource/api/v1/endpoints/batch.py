@@ -0,0 +1,120 @@
+import asyncio
+from collections.abc import AsyncIterator
+
+from fastapi import APIRouter, Depends, Query, Request
+from fastapi.exceptions import RequestValidationError
+
+from api.v1.endpoints.attachment import AttachmentResponse
+from api.v1.endpoints.extraction_options import get_extraction_options
+from domain.interfaces.audio_extractor_interface import NoAudioStreamException, UnsupportedContainerException
+from domain.interfaces.upload_session_store_interface import (
+    UploadChecksumMismatchException, UploadIncompleteException, UploadOffsetMismatchException,
+    UploadSessionNotFoundException
+)
+from domain.models.batch_source import BatchSource
+from domain.models.extraction_options import ExtractionOptions
+from infrastructure.framework.di import (
+    get_audio_extractor_service, get_batch_slots, get_max_upload_size, get_upload_session_service
+)
+from infrastructure.framework.multipart_stream import MultipartStreamReader
+from service.audio_extractor_service import AudioExtractorService
+from service.upload_session_service import UploadSessionService
+
+router = APIRouter()
+
+# 複数のファイルを同じフィールド名で送信するmultipart/form-dataのリクエスト定義
+BATCH_REQUEST_BODY = {
+    "requestBody": {
+        "required": False,
+        "content": {
+            "multipart/form-data": {
+                "schema": {
+                    "type": "object",
+                    "properties": {"files": {"type": "array", "items": {"type": "string", "format": "binary"}}},
+                }
+            }
+        },
+    }
+}
+
+# 参照したアップロードのセッションを使用できない場合に、そのファイルのみを失敗として記録する例外
+UPLOAD_REFERENCE_ERRORS = (
+    UploadSessionNotFoundException, UploadIncompleteException, UploadOffsetMismatchException,
+    UploadChecksumMismatchException,
+)
+
+# 先頭部分の判定で拒否したファイルを、残りのデータを書き込まずに失敗として記録する例外
+SCREENING_ERRORS = (UnsupportedContainerException, NoAudioStreamException)
+
+@router.post("/extract_audio/batch", openapi_extra=BATCH_REQUEST_BODY)
+async def extract_audio_batch(
+    request: Request,
+    upload_id: list[str] = Query(
+        [],
+        description="受信が完了した再開可能なアップロードのセッションID。複数指定でき、filesと併用できます。",
+    ),
+    options: ExtractionOptions = Depends(get_extraction_options),
+    service: AudioExtractorService = Depends(get_audio_extractor_service),
+    upload_service: UploadSessionService = Depends(get_upload_session_service),
+    slots: asyncio.Semaphore = Depends(get_batch_slots),
+    max_upload_size: int = Depends(get_max_upload_size)
+):
+    """
+    複数のビデオファイルから音声を抽出し、ファイルごとのディレクトリに分けた1つのアーカイブとして返します。
+
+    ファイルはmultipart/form-dataのfilesフィールドで送信するか、再開可能なアップロードのセッションIDで参照します。
+    動画形式でないファイルや抽出に失敗したファイルがあっても全体は失敗させず、
+    ファイルごとの結果をアーカイブ末尾のmanifest.jsonに記録します。
+
+    Args:
+        request (Request): multipart/form-data形式でfilesフィールドを含むリクエスト。
+        upload_id (list[str]): 再開可能なアップロードのセッションID。
+        options (ExtractionOptions): クエリパラメータで指定された、全ファイル共通の音声抽出のオプション。
+        service (AudioExtractorService): 音声を抽出するためのサービス。
+        upload_service (UploadSessionService): 再開可能なアップロードのサービス。
+        slots (asyncio.Semaphore): 同時に抽出するファイル数を制限するセマフォ。
+        max_upload_size (int): リクエストボディ全体で受信を許可する最大バイト数。
+
+    Returns:
+        AttachmentResponse: 抽出された音声アーカイブを含むレスポンス。
+
+    Raises:
+        RequestValidationError: ファイルが1つも指定されていない場合。
+    """
+    is_multipart = request.headers.get("Content-Type", "").startswith("multipart/form-data")
+    if not is_multipart and not upload_id:
+        raise RequestValidationError([{
+            "type": "missing",
+            "loc": ("body", "files"),
+            "msg": "Field required",
+            "input": None,
+        }])
+
+    async def sources() -> AsyncIterator[BatchSource]:
+        if is_multipart:
+            reader = MultipartStreamReader(request, max_upload_size)
+            while (part := await reader.next_file()) is not None:
+                if part.field_name != "files":
+                    continue
+                if not part.content_type.startswith("video/"):
+                    yield BatchSource(part.filename, error="InvalidFileTypeException")
+                    continue
+                try:
+                    chunks = await service.screen(part.filename, part)
+                except SCREENING_ERRORS as e:
+                    # 読み残したデータは次のファイルを読み込む際に読み捨てられる
+                    yield BatchSource(part.filename, error=type(e).__name__)
+                    continue
+                video_path, content_hash = await service.ingest(part.filename, chunks)
+                yield BatchSource(part.filename, video_path, content_hash)
+        for session_id in upload_id:
+            try:
+                file_name = upload_service.get(session_id).file_name
+                video_path, content_hash = await upload_service.complete(session_id)
+            except UPLOAD_REFERENCE_ERRORS as e:
+                yield BatchSource(session_id, error=type(e).__name__)
+                continue
+            yield BatchSource(file_name, video_path, content_hash)
+
+    archive_stream, archive_name = await service.extract_batch(sources(), options, slots)
+    return AttachmentResponse(archive_stream, archive_name)
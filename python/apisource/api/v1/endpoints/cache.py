@@ -0,0 +1,23 @@
+from fastapi import APIRouter, Depends
+
+from domain.interfaces.result_cache_interface import CacheStats, IResultCache
+from infrastructure.framework.di import get_result_cache
+
+router = APIRouter()
+
+@router.get("/cache/stats")
+async def cache_stats(
+    result_cache: IResultCache | None = Depends(get_result_cache)
+) -> CacheStats:
+    """
+    抽出結果キャッシュのヒット数、ミス数、使用量などの統計情報を返します。
+
+    Args:
+        result_cache (IResultCache | None): 抽出結果キャッシュ。
+
+    Returns:
+        CacheStats: キャッシュの統計情報。キャッシュが無効な場合はすべて0を返します。
+    """
+    if result_cache is None:
+        return CacheStats(hits=0, misses=0, evictions=0, entries=0, size_bytes=0, max_bytes=0)
+    return result_cache.stats()
@@ -1,33 +1,65 @@
-from fastapi import APIRouter, UploadFile, File, Depends
-from fastapi.responses import StreamingResponse
-import io
+from fastapi import APIRouter, Request, Depends, Query
 
+from api.v1.endpoints.attachment import AttachmentResponse
+from api.v1.endpoints.extraction_options import get_extraction_options
 from api.v1.endpoints.validation_exceptions import InvalidFileTypeException
-from infrastructure.framework.di import get_audio_extractor_service
+from domain.models.extraction_options import ExtractionOptions
+from infrastructure.framework.di import get_audio_extractor_service, get_max_upload_size
+from infrastructure.framework.multipart_stream import MultipartStreamReader, UPLOAD_REQUEST_BODY
 from service.audio_extractor_service import AudioExtractorService
 
 router = APIRouter()
 
-@router.post("/extract_audio")
+@router.post("/extract_audio", openapi_extra=UPLOAD_REQUEST_BODY)
 async def extract_audio(
-    file: UploadFile = File(...),
-    service: AudioExtractorService = Depends(get_audio_extractor_service)
+    request: Request,
+    options: ExtractionOptions = Depends(get_extraction_options),
+    service: AudioExtractorService = Depends(get_audio_extractor_service),
+    max_upload_size: int = Depends(get_max_upload_size)
 ):
     """
     アップロードされたファイルから音声を抽出し、ダウンロード可能なアーカイブとして返します。
 
+    アップロードされたファイルはメモリに展開せず、受信したチャンクを順に一時ファイルへ書き込みます。
+    アーカイブは抽出が完了したトラックから順に生成しながら送信します。
+
     Args:
-        file (UploadFile): 抽出対象の音声を含むアップロードファイル。
+        request (Request): multipart/form-data形式でfileフィールドを含むリクエスト。
+        options (ExtractionOptions): クエリパラメータで指定された音声抽出のオプション。
         service (AudioExtractorService): 音声を抽出するためのサービス。
+        max_upload_size (int): アップロードを許可する最大バイト数。
 
     Returns:
-        StreamingResponse: 抽出された音声アーカイブを含むレスポンス。
+        AttachmentResponse: 抽出された音声アーカイブを含むレスポンス。
     """
+    file = await MultipartStreamReader(request, max_upload_size).get_file("file")
     if not file.content_type.startswith("video/"):
         raise InvalidFileTypeException()
 
-    file_content = await file.read()
-    archive_content, archive_name = await service.extract(file.filename, file_content)
-    return StreamingResponse(io.BytesIO(archive_content), media_type="application/zip", headers={
-        "Content-Disposition": f"attachment; filename={archive_name}"
-    })
+    archive_stream, archive_name = await service.extract(file.filename, file, options)
+    return AttachmentResponse(archive_stream, archive_name)
+
+@router.post("/extract_audio/reference")
+async def extract_referenced_audio(
+    source: str = Query(
+        ...,
+        description="マウントされたストレージ上の絶対パス、またはHTTP(S)のURL。サーバーで許可された場所のみ指定できます。",
+    ),
+    options: ExtractionOptions = Depends(get_extraction_options),
+    service: AudioExtractorService = Depends(get_audio_extractor_service)
+):
+    """
+    アップロードせずに参照で指定されたファイルから音声を抽出し、ダウンロード可能なアーカイブとして返します。
+
+    参照先のファイルは一時ファイルへコピーせず、ffmpegが直接読み込みます。
+
+    Args:
+        source (str): マウントされたストレージ上の絶対パス、またはHTTP(S)のURL。
+        options (ExtractionOptions): クエリパラメータで指定された音声抽出のオプション。
+        service (AudioExtractorService): 音声を抽出するためのサービス。
+
+    Returns:
+        AttachmentResponse: 抽出された音声アーカイブを含むレスポンス。
+    """
+    archive_stream, archive_name = await service.extract_reference(source, options)
+    return AttachmentResponse(archive_stream, archive_name)
@@ -0,0 +1,73 @@
+from fastapi import Query
+from fastapi.exceptions import RequestValidationError
+
+from domain.models.extraction_options import ArchiveFormat, ExtractionOptions, OutputFormat
+
+def get_extraction_options(
+    output_format: OutputFormat = Query(
+        OutputFormat.AAC,
+        description="抽出した音声の出力形式。autoの場合はトラックごとに元のコーデックを格納できる形式を選択します。",
+    ),
+    passthrough: bool = Query(
+        True,
+        description="元のコーデックが出力形式に格納できる場合に、再エンコードせずストリームコピーするかどうか。",
+    ),
+    archive_format: ArchiveFormat = Query(
+        ArchiveFormat.ZIP,
+        description="抽出した音声をまとめて返す形式。zipは無圧縮、zip_deflatedはDeflate圧縮、tarは無圧縮のtarです。"
+                    "autoの場合は音声トラックが1つだけであればアーカイブせずにそのまま返します。",
+    ),
+    track: list[int] = Query(
+        [],
+        description="抽出する音声トラックのストリームのインデックス。複数指定できます。",
+    ),
+    language: list[str] = Query(
+        [],
+        description="抽出する音声トラックの言語タグ（jpn、engなど）。複数指定できます。"
+                    "trackとlanguageのいずれも指定しない場合はすべての音声トラックを抽出します。",
+    ),
+    start: float | None = Query(None, ge=0, description="抽出する範囲の開始位置（秒）。"),
+    end: float | None = Query(None, gt=0, description="抽出する範囲の終了位置（秒）。"),
+    analyze: bool = Query(
+        False,
+        description="トラックごとの波形のピークとEBU R128のラウドネスを解析し、アーカイブのanalysis.jsonに記録するかどうか。"
+                    "指定した場合は音声トラックが1つだけでもアーカイブにまとめます。",
+    ),
+) -> ExtractionOptions:
+    """
+    クエリパラメータから音声抽出のオプションを組み立てます。
+
+    Args:
+        output_format (OutputFormat): 抽出した音声の出力形式。
+        passthrough (bool): 元のコーデックを再エンコードせずストリームコピーするかどうか。
+        archive_format (ArchiveFormat): 抽出した音声をまとめて返す形式。
+        track (list[int]): 抽出する音声トラックのストリームのインデックス。
+        language (list[str]): 抽出する音声トラックの言語タグ。
+        start (float | None): 抽出する範囲の開始位置（秒）。
+        end (float | None): 抽出する範囲の終了位置（秒）。
+        analyze (bool): 波形とラウドネスを解析するかどうか。
+
+    Returns:
+        ExtractionOptions: 音声抽出のオプション。
+
+    Raises:
+        RequestValidationError: 終了位置が開始位置以前の場合。
+    """
+    if start is not None and end is not None and end <= start:
+        raise RequestValidationError([{
+            "type": "greater_than",
+            "loc": ("query", "end"),
+            "msg": "end must be greater than start",
+            "input": end,
+            "ctx": {"gt": start},
+        }])
+    return ExtractionOptions(
+        output_format=output_format,
+        passthrough=passthrough,
+        archive_format=archive_format,
+        tracks=tuple(track),
+        languages=tuple(language),
+        start=start,
+        end=end,
+        analyze=analyze,
+    )
@@ -0,0 +1,121 @@
+import json
+from collections.abc import AsyncIterator
+
+from fastapi import APIRouter, Request, Depends
+from fastapi.responses import FileResponse, StreamingResponse
+
+from api.v1.endpoints.attachment import content_disposition
+from api.v1.endpoints.extraction_options import get_extraction_options
+from api.v1.endpoints.validation_exceptions import InvalidFileTypeException
+from domain.models.extraction_options import ExtractionOptions
+from domain.models.job import Job
+from infrastructure.framework.di import get_audio_extractor_service, get_extraction_job_service, get_max_upload_size
+from infrastructure.framework.multipart_stream import MultipartStreamReader, UPLOAD_REQUEST_BODY
+from service.audio_extractor_service import AudioExtractorService, media_type_for
+from service.extraction_job_service import ExtractionJobService
+
+router = APIRouter()
+
+# ジョブの進捗を確認して通知する間隔（秒）
+PROGRESS_INTERVAL_SECONDS = 1.0
+
+@router.post("/jobs", status_code=202, openapi_extra=UPLOAD_REQUEST_BODY)
+async def submit_job(
+    request: Request,
+    options: ExtractionOptions = Depends(get_extraction_options),
+    service: AudioExtractorService = Depends(get_audio_extractor_service),
+    job_service: ExtractionJobService = Depends(get_extraction_job_service),
+    max_upload_size: int = Depends(get_max_upload_size)
+) -> Job:
+    """
+    アップロードされたファイルの音声抽出ジョブを投入し、ジョブの情報を返します。
+
+    音声抽出はバックグラウンドで実行されるため、変換の完了を待たずにレスポンスを返します。
+    ジョブの状態はGET /jobs/{job_id}で確認し、完了後にGET /jobs/{job_id}/resultで結果を取得します。
+    変換中の進捗はGET /jobs/{job_id}/eventsで受け取れます。
+
+    Args:
+        request (Request): multipart/form-data形式でfileフィールドを含むリクエスト。
+        options (ExtractionOptions): クエリパラメータで指定された音声抽出のオプション。
+        service (AudioExtractorService): 音声を抽出するためのサービス。
+        job_service (ExtractionJobService): ジョブを管理するためのサービス。
+        max_upload_size (int): アップロードを許可する最大バイト数。
+
+    Returns:
+        Job: 投入されたジョブ。
+    """
+    file = await MultipartStreamReader(request, max_upload_size).get_file("file")
+    if not file.content_type.startswith("video/"):
+        raise InvalidFileTypeException()
+
+    # 音声を抽出できないことが先頭部分から分かるファイルは、ジョブを投入せずに拒否する
+    chunks = await service.screen(file.filename, file)
+    return await job_service.submit(service, file.filename, chunks, options)
+
+@router.get("/jobs/{job_id}")
+async def get_job(
+    job_id: str,
+    job_service: ExtractionJobService = Depends(get_extraction_job_service)
+) -> Job:
+    """
+    ジョブの状態を返します。
+
+    Args:
+        job_id (str): ジョブID。
+        job_service (ExtractionJobService): ジョブを管理するためのサービス。
+
+    Returns:
+        Job: ジョブ。
+    """
+    return job_service.get(job_id)
+
+@router.get("/jobs/{job_id}/events")
+async def stream_job_events(
+    job_id: str,
+    job_service: ExtractionJobService = Depends(get_extraction_job_service)
+):
+    """
+    ジョブの状態と音声トラックごとの進捗を、Server-Sent Eventsで終了まで通知します。
+
+    statusイベントはジョブの状態が変化するたびに、progressイベントは変換中に進捗が変化するたびに送信されます。
+    progressイベントには、トラックごとの変換済みの長さ、抽出する範囲の長さ、変換速度、推定残り時間が含まれます。
+    ページを再読み込みした場合も、同じジョブIDで接続し直せば進捗の続きを受け取れます。
+
+    Args:
+        job_id (str): ジョブID。
+        job_service (ExtractionJobService): ジョブを管理するためのサービス。
+
+    Returns:
+        StreamingResponse: text/event-stream形式のレスポンス。
+    """
+    # ジョブが存在しない場合は、ストリームを開始する前に404を返す
+    job_service.get(job_id)
+
+    async def event_stream() -> AsyncIterator[str]:
+        async for event, data in job_service.watch(job_id, PROGRESS_INTERVAL_SECONDS):
+            yield f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n"
+
+    return StreamingResponse(event_stream(), media_type="text/event-stream", headers={
+        "Cache-Control": "no-cache",
+        "X-Accel-Buffering": "no",
+    })
+
+@router.get("/jobs/{job_id}/result")
+async def get_job_result(
+    job_id: str,
+    job_service: ExtractionJobService = Depends(get_extraction_job_service)
+):
+    """
+    完了したジョブの音声アーカイブを返します。
+
+    Args:
+        job_id (str): ジョブID。
+        job_service (ExtractionJobService): ジョブを管理するためのサービス。
+
+    Returns:
+        FileResponse: 抽出された音声アーカイブを含むレスポンス。
+    """
+    job, result_path = job_service.get_result(job_id)
+    return FileResponse(result_path, media_type=media_type_for(job.archive_name), headers={
+        "Content-Disposition": content_disposition(job.archive_name)
+    })
@@ -0,0 +1,23 @@
+from fastapi import APIRouter, Depends
+from fastapi.responses import PlainTextResponse
+
+from infrastructure.framework.di import get_metrics_registry
+from infrastructure.metrics import MetricsRegistry
+
+router = APIRouter()
+
+@router.get("/metrics", response_class=PlainTextResponse)
+async def metrics(
+    registry: MetricsRegistry = Depends(get_metrics_registry)
+) -> PlainTextResponse:
+    """
+    リクエストのレイテンシ、転送量、ffmpegの実行状況とリソース使用量、一時領域の使用量を
+    Prometheusのテキスト形式で返します。
+
+    Args:
+        registry (MetricsRegistry): メトリクスの登録先。
+
+    Returns:
+        PlainTextResponse: Prometheusのテキスト形式のメトリクス。
+    """
+    return PlainTextResponse(registry.render(), media_type="text/plain; version=0.0.4; charset=utf-8")
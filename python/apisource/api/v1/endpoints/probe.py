@@ -0,0 +1,35 @@
+from fastapi import APIRouter, Request, Depends
+
+from api.v1.endpoints.validation_exceptions import InvalidFileTypeException
+from domain.models.media_info import MediaInfo
+from infrastructure.framework.di import get_audio_extractor_service, get_max_upload_size
+from infrastructure.framework.multipart_stream import MultipartStreamReader, UPLOAD_REQUEST_BODY
+from service.audio_extractor_service import AudioExtractorService
+
+router = APIRouter()
+
+@router.post("/probe", openapi_extra=UPLOAD_REQUEST_BODY)
+async def probe(
+    request: Request,
+    service: AudioExtractorService = Depends(get_audio_extractor_service),
+    max_upload_size: int = Depends(get_max_upload_size)
+) -> MediaInfo:
+    """
+    アップロードされたファイルを解析し、音声トラックのメタデータを返します。
+
+    音声の抽出は行わないため、抽出前にトラックの構成を確認する用途に使用できます。
+    解析結果はファイル内容のハッシュ値をキーとしてキャッシュされ、同じファイルの抽出時にも再利用されます。
+
+    Args:
+        request (Request): multipart/form-data形式でfileフィールドを含むリクエスト。
+        service (AudioExtractorService): メディアを解析するためのサービス。
+        max_upload_size (int): アップロードを許可する最大バイト数。
+
+    Returns:
+        MediaInfo: コンテナと音声トラックのメタデータ。
+    """
+    file = await MultipartStreamReader(request, max_upload_size).get_file("file")
+    if not file.content_type.startswith("video/"):
+        raise InvalidFileTypeException()
+
+    return await service.probe(file.filename, file)
@@ -0,0 +1,184 @@
+from pathlib import Path
+
+from fastapi import APIRouter, Depends, Header, Query, Request, Response
+
+from api.v1.endpoints.attachment import AttachmentResponse
+from api.v1.endpoints.extraction_options import get_extraction_options
+from api.v1.endpoints.validation_exceptions import InvalidFileTypeException
+from domain.models.extraction_options import ExtractionOptions
+from domain.models.job import Job
+from domain.models.upload_session import UploadSession
+from infrastructure.framework.di import (
+    get_audio_extractor_service, get_extraction_job_service, get_upload_session_service
+)
+from service.audio_extractor_service import AudioExtractorService
+from service.extraction_job_service import ExtractionJobService
+from service.upload_session_service import UploadSessionService
+
+router = APIRouter()
+
+# チャンクの送信はmultipart/form-dataではなく、リクエストボディにバイトデータをそのまま含める
+CHUNK_REQUEST_BODY = {
+    "requestBody": {
+        "required": True,
+        "content": {"application/offset+octet-stream": {"schema": {"type": "string", "format": "binary"}}},
+    }
+}
+
+@router.post("/uploads", status_code=201)
+async def create_upload(
+    response: Response,
+    file_name: str = Query(..., description="アップロードするファイル名。"),
+    content_type: str = Query(..., description="アップロードするファイルのメディアタイプ。"),
+    sha256: str | None = Query(None, description="ファイル全体のSHA-256ハッシュ値（16進数）。指定した場合は受信完了時に照合します。"),
+    upload_length: int = Header(..., ge=0, description="ファイル全体のバイト数。"),
+    upload_service: UploadSessionService = Depends(get_upload_session_service)
+) -> UploadSession:
+    """
+    再開可能なアップロードのセッションを作成します。
+
+    ファイルデータはPATCH /uploads/{session_id}で分割して送信し、受信が完了したら
+    POST /uploads/{session_id}/extractまたはPOST /uploads/{session_id}/jobsで音声抽出を要求します。
+
+    Args:
+        response (Response): セッションのURLを返すためのレスポンス。
+        file_name (str): アップロードするファイル名。
+        content_type (str): アップロードするファイルのメディアタイプ。
+        sha256 (str | None): ファイル全体のSHA-256ハッシュ値。
+        upload_length (int): ファイル全体のバイト数（Upload-Lengthヘッダー）。
+        upload_service (UploadSessionService): 再開可能なアップロードのサービス。
+
+    Returns:
+        UploadSession: 作成されたセッション。
+    """
+    if not content_type.startswith("video/"):
+        raise InvalidFileTypeException()
+
+    session = upload_service.create(file_name, content_type, upload_length, sha256)
+    response.headers["Location"] = f"/api/v1/uploads/{session.id}"
+    return session
+
+@router.get("/uploads/{session_id}")
+async def get_upload(
+    session_id: str,
+    response: Response,
+    upload_service: UploadSessionService = Depends(get_upload_session_service)
+) -> UploadSession:
+    """
+    セッションの状態を返します。
+
+    送信が途切れた場合は、返されたoffset（Upload-Offsetヘッダー）の位置から送信を再開します。
+
+    Args:
+        session_id (str): セッションID。
+        response (Response): 受信済みのバイト数を返すためのレスポンス。
+        upload_service (UploadSessionService): 再開可能なアップロードのサービス。
+
+    Returns:
+        UploadSession: セッション。
+    """
+    session = upload_service.get(session_id)
+    response.headers["Upload-Offset"] = str(session.offset)
+    response.headers["Cache-Control"] = "no-store"
+    return session
+
+@router.patch("/uploads/{session_id}", openapi_extra=CHUNK_REQUEST_BODY)
+async def append_upload(
+    session_id: str,
+    request: Request,
+    response: Response,
+    upload_offset: int = Header(..., ge=0, description="チャンクの先頭のファイル内の位置。受信済みのバイト数と一致する必要があります。"),
+    upload_checksum: str | None = Header(None, description="チャンクのハッシュ値（\"sha256 <Base64>\"形式）。"),
+    service: AudioExtractorService = Depends(get_audio_extractor_service),
+    upload_service: UploadSessionService = Depends(get_upload_session_service)
+) -> UploadSession:
+    """
+    リクエストボディのチャンクをセッションのファイルへ追記します。
+
+    ファイルの先頭を含むチャンクは、/extract_audioと同様にコンテナ形式と音声トラックの有無を先頭部分から判定し、
+    音声を抽出できないファイルはチャンクを書き込む前に拒否します。
+
+    Args:
+        session_id (str): セッションID。
+        request (Request): チャンクのバイトデータをボディに含むリクエスト。
+        response (Response): 受信済みのバイト数を返すためのレスポンス。
+        upload_offset (int): チャンクの先頭のファイル内の位置（Upload-Offsetヘッダー）。
+        upload_checksum (str | None): チャンクのハッシュ値（Upload-Checksumヘッダー）。
+        service (AudioExtractorService): 先頭部分を判定するためのサービス。
+        upload_service (UploadSessionService): 再開可能なアップロードのサービス。
+
+    Returns:
+        UploadSession: 更新されたセッション。
+    """
+    chunks = request.stream()
+    session = upload_service.get(session_id)
+    if upload_offset == session.offset == 0:
+        chunks = await service.screen(session.file_name, chunks)
+    session = await upload_service.append(session_id, upload_offset, chunks, upload_checksum)
+    response.headers["Upload-Offset"] = str(session.offset)
+    return session
+
+@router.delete("/uploads/{session_id}", status_code=204)
+async def delete_upload(
+    session_id: str,
+    upload_service: UploadSessionService = Depends(get_upload_session_service)
+):
+    """
+    セッションを中止し、受信済みのファイルデータを削除します。
+
+    Args:
+        session_id (str): セッションID。
+        upload_service (UploadSessionService): 再開可能なアップロードのサービス。
+    """
+    upload_service.delete(session_id)
+
+@router.post("/uploads/{session_id}/extract")
+async def extract_uploaded_audio(
+    session_id: str,
+    options: ExtractionOptions = Depends(get_extraction_options),
+    service: AudioExtractorService = Depends(get_audio_extractor_service),
+    upload_service: UploadSessionService = Depends(get_upload_session_service)
+):
+    """
+    受信が完了したファイルから音声を抽出し、ダウンロード可能なアーカイブとして返します。
+
+    Args:
+        session_id (str): セッションID。
+        options (ExtractionOptions): クエリパラメータで指定された音声抽出のオプション。
+        service (AudioExtractorService): 音声を抽出するためのサービス。
+        upload_service (UploadSessionService): 再開可能なアップロードのサービス。
+
+    Returns:
+        AttachmentResponse: 抽出された音声アーカイブを含むレスポンス。
+    """
+    file_name = upload_service.get(session_id).file_name
+    video_path, content_hash = await upload_service.complete(session_id)
+    archive_stream, archive_name = await service.extract_ingested(
+        video_path, content_hash, options, base_name=Path(file_name).name
+    )
+    return AttachmentResponse(archive_stream, archive_name)
+
+@router.post("/uploads/{session_id}/jobs", status_code=202)
+async def submit_uploaded_job(
+    session_id: str,
+    options: ExtractionOptions = Depends(get_extraction_options),
+    service: AudioExtractorService = Depends(get_audio_extractor_service),
+    upload_service: UploadSessionService = Depends(get_upload_session_service),
+    job_service: ExtractionJobService = Depends(get_extraction_job_service)
+) -> Job:
+    """
+    受信が完了したファイルの音声抽出ジョブを投入し、ジョブの情報を返します。
+
+    Args:
+        session_id (str): セッションID。
+        options (ExtractionOptions): クエリパラメータで指定された音声抽出のオプション。
+        service (AudioExtractorService): 音声を抽出するためのサービス。
+        upload_service (UploadSessionService): 再開可能なアップロードのサービス。
+        job_service (ExtractionJobService): ジョブを管理するためのサービス。
+
+    Returns:
+        Job: 投入されたジョブ。
+    """
+    file_name = upload_service.get(session_id).file_name
+    video_path, content_hash = await upload_service.complete(session_id)
+    return job_service.submit_ingested(service, file_name, video_path, content_hash, options)
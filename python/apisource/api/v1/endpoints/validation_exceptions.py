@@ -2,4 +2,10 @@ class InvalidFileTypeException(Exception):
     """
     動画形式でないファイルがアップロードされた場合に使用される例外クラス。
     """
-    pass
\ No newline at end of file
+    pass
+
+class FileTooLargeException(Exception):
+    """
+    アップロードされたファイルが許可された最大サイズを超えた場合に使用される例外クラス。
+    """
+    pass
@@ -0,0 +1,101 @@
+"""
+アーカイブ形式ごとのベンチマーク。
+
+AACなどの圧縮済み音声と同じく圧縮の効かないランダムなデータをトラックとして用意し、
+Deflate圧縮のZIP（従来の既定）、無圧縮のZIP、無圧縮のtar、アーカイブしない単一トラックの送出について、
+アーカイブの生成に要するCPU時間、所要時間、出力サイズを比較します。
+ffmpegを使用しないため、どの環境でも実行できます。
+
+実行例（apisourceディレクトリで実行）:
+    PYTHONPATH=. python benchmarks/bench_archivers.py --tracks 1 4 --track-size-mb 8 --repeat 3
+"""
+
+import argparse
+import asyncio
+import os
+import tempfile
+import time
+import zipfile
+from collections.abc import AsyncIterator
+from pathlib import Path
+
+from infrastructure.tar_archiver import TarArchiver
+from infrastructure.zip_archiver import ZipArchiver
+
+# ファイルを読み出す際のチャンクサイズ
+STREAM_CHUNK_SIZE = 1024 * 1024
+
+async def async_iter(items):
+    """
+    リストの要素を順に返す非同期イテレータを生成します。
+    """
+    for item in items:
+        yield item
+
+async def single_file_stream(files: list[Path]) -> AsyncIterator[bytes]:
+    """
+    アーカイブせずに先頭のファイルをそのまま送出するストリーム（autoで音声トラックが1つの場合）。
+    """
+    with open(files[0], 'rb') as src:
+        while chunk := await asyncio.to_thread(src.read, STREAM_CHUNK_SIZE):
+            yield chunk
+
+async def drain(stream: AsyncIterator[bytes]) -> int:
+    """
+    ストリームを最後まで読み出し、合計バイト数を返します。
+    """
+    total = 0
+    async for chunk in stream:
+        total += len(chunk)
+    return total
+
+def measure(open_stream, repeat: int) -> tuple[float, float, int]:
+    """
+    ストリームの生成を繰り返し実行し、CPU時間と所要時間の最小値、出力サイズを返します。
+
+    ファイルの読み込みは別スレッドで行われるため、CPU時間はプロセス全体の値で計測します。
+    """
+    best_cpu = best_wall = float("inf")
+    size = 0
+    for _ in range(repeat):
+        cpu_started_at = time.process_time()
+        wall_started_at = time.perf_counter()
+        size = asyncio.run(drain(open_stream()))
+        best_wall = min(best_wall, time.perf_counter() - wall_started_at)
+        best_cpu = min(best_cpu, time.process_time() - cpu_started_at)
+    return best_cpu, best_wall, size
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--tracks", type=int, nargs="+", default=[1, 4], help="音声トラック数")
+    parser.add_argument("--track-size-mb", type=float, default=8, help="1トラックあたりのサイズ（MiB）")
+    parser.add_argument("--repeat", type=int, default=3, help="計測の繰り返し回数（最小値を採用）")
+    args = parser.parse_args()
+
+    strategies = {
+        "zip_deflated": lambda files: ZipArchiver(zipfile.ZIP_DEFLATED).stream_archive(async_iter(files)),
+        "zip": lambda files: ZipArchiver().stream_archive(async_iter(files)),
+        "tar": lambda files: TarArchiver().stream_archive(async_iter(files)),
+        "single_track": single_file_stream,
+    }
+
+    print(f"{'tracks':>6} {'format':>14} {'cpu(s)':>8} {'wall(s)':>8} {'size(MiB)':>10} {'cpu vs deflate':>15}")
+    with tempfile.TemporaryDirectory() as work_dir:
+        for track_count in args.tracks:
+            files = []
+            for index in range(track_count):
+                path = Path(work_dir) / f"{track_count}_audio_track_{index}.aac"
+                path.write_bytes(os.urandom(int(args.track_size_mb * 1024 * 1024)))
+                files.append(path)
+
+            baseline = None
+            for name, strategy in strategies.items():
+                if name == "single_track" and track_count != 1:
+                    continue
+                cpu, wall, size = measure(lambda: strategy(files), args.repeat)
+                baseline = baseline or cpu
+                ratio = cpu / baseline if baseline else 0.0
+                print(f"{track_count:>6} {name:>14} {cpu:>8.3f} {wall:>8.3f} {size / 1024 ** 2:>10.2f} {ratio:>14.2f}x")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+"""
+音声抽出モードのベンチマーク。
+
+合成動画の音声トラック数を変えながら、1回のffmpeg実行で全トラックを抽出するモード（single_pass）と
+トラックごとにffmpegを起動するモード（per_track）の処理時間とffmpegのCPU時間を比較します。
+
+実行例（apisourceディレクトリで実行）:
+    PYTHONPATH=. python benchmarks/bench_extraction_modes.py --track-counts 1 2 4 8 --duration 120
+"""
+
+import argparse
+import asyncio
+import resource
+import shutil
+import statistics
+import tempfile
+import time
+from pathlib import Path
+
+from benchmarks.synthetic_media import generate_video
+from infrastructure.ffmpeg_audio_extractor import FFmpegAudioExtractor, EXTRACTION_MODES
+
+def run_once(extractor: FFmpegAudioExtractor, video_path: Path, work_dir: Path) -> tuple[float, float]:
+    """
+    音声抽出を1回実行し、経過時間と子プロセスのCPU時間を計測します。
+
+    Args:
+        extractor (FFmpegAudioExtractor): 計測対象の音声抽出器。
+        video_path (Path): 入力動画のパス。
+        work_dir (Path): 抽出した音声の保存先ディレクトリ。
+
+    Returns:
+        tuple[float, float]: 経過時間（秒）とffmpegが消費したCPU時間（秒）。
+    """
+    output_dir = work_dir / "out"
+    output_dir.mkdir()
+    try:
+        before = resource.getrusage(resource.RUSAGE_CHILDREN)
+        start = time.perf_counter()
+        asyncio.run(extractor.extract_all_audio(str(video_path), output_dir))
+        elapsed = time.perf_counter() - start
+        after = resource.getrusage(resource.RUSAGE_CHILDREN)
+        cpu = (after.ru_utime - before.ru_utime) + (after.ru_stime - before.ru_stime)
+        return elapsed, cpu
+    finally:
+        shutil.rmtree(output_dir)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--track-counts", type=int, nargs="+", default=[1, 2, 4, 8], help="計測する音声トラック数")
+    parser.add_argument("--duration", type=float, default=60, help="合成動画の長さ（秒）")
+    parser.add_argument("--repeat", type=int, default=3, help="各条件の繰り返し回数")
+    args = parser.parse_args()
+
+    print(f"{'tracks':>6} {'mode':>12} {'wall(s)':>9} {'cpu(s)':>9} {'speedup':>8}")
+    with tempfile.TemporaryDirectory() as tmp:
+        work_dir = Path(tmp)
+        for track_count in args.track_counts:
+            video_path = generate_video(
+                work_dir / f"input_{track_count}.mkv", duration=args.duration, audio_tracks=track_count
+            )
+            results = {}
+            for mode in EXTRACTION_MODES:
+                extractor = FFmpegAudioExtractor(mode)
+                samples = [run_once(extractor, video_path, work_dir) for _ in range(args.repeat)]
+                results[mode] = (
+                    statistics.median(sample[0] for sample in samples),
+                    statistics.median(sample[1] for sample in samples),
+                )
+            baseline = results["per_track"][0]
+            for mode, (wall, cpu) in results.items():
+                print(f"{track_count:>6} {mode:>12} {wall:>9.2f} {cpu:>9.2f} {baseline / wall:>7.2f}x")
+            video_path.unlink()
+
+if __name__ == "__main__":
+    main()
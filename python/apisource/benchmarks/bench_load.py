@@ -0,0 +1,335 @@
+"""
+エンドツーエンドの負荷ベンチマーク。
+
+合成動画の長さ・解像度・音声トラック数を変えながら、実際のFastAPIアプリケーションをuvicornで起動し、
+指定した同時接続数で/api/v1/extract_audioへリクエストを送信して、スループット、レイテンシのパーセンタイル、
+サーバーとffmpegの子プロセスの最大常駐メモリを計測します。
+
+結果はJSONファイルに出力され、--compareで以前の結果と比較できます。
+メモリの計測には/procを使用するため、Linuxでのみ取得できます。
+
+実行例（apisourceディレクトリで実行）:
+    PYTHONPATH=. python benchmarks/bench_load.py --durations 30 120 --resolutions 640x360 1920x1080 \\
+        --track-counts 1 4 --concurrency 1 4 --requests 8 --output results.json
+    PYTHONPATH=. python benchmarks/bench_load.py --output after.json --compare results.json
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import platform
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+
+import httpx
+
+from benchmarks.synthetic_media import generate_video
+
+# uvicornを起動するディレクトリ（apisource）
+APP_DIR = Path(__file__).resolve().parent.parent
+# 常駐メモリを取得する間隔（秒）
+RSS_SAMPLE_INTERVAL = 0.05
+# 比較時に表示する指標と、値が大きいほど良いかどうか
+COMPARED_METRICS = {
+    "throughput_rps": True,
+    "latency_p50": False,
+    "latency_p95": False,
+    "latency_p99": False,
+    "server_peak_rss_bytes": False,
+    "ffmpeg_peak_rss_bytes": False,
+}
+
+def _read_rss(pid: int) -> int:
+    """
+    プロセスの現在の常駐メモリ（バイト）を/procから取得します。プロセスが存在しない場合は0を返します。
+    """
+    try:
+        with open(f"/proc/{pid}/status") as status:
+            for line in status:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1]) * 1024
+    except (FileNotFoundError, ProcessLookupError, PermissionError):
+        pass
+    return 0
+
+def _child_pids(pid: int) -> list[int]:
+    """
+    指定されたプロセスの子孫プロセスのPIDを/procから取得します。
+    """
+    parents: dict[int, int] = {}
+    for entry in os.scandir("/proc"):
+        if not entry.name.isdigit():
+            continue
+        try:
+            with open(f"/proc/{entry.name}/stat") as stat:
+                # プロセス名に空白が含まれる場合に備え、末尾の")"以降を分割する
+                fields = stat.read().rsplit(")", 1)[1].split()
+            parents[int(entry.name)] = int(fields[1])
+        except (FileNotFoundError, ProcessLookupError, PermissionError, IndexError):
+            continue
+    descendants, frontier = [], [pid]
+    while frontier:
+        parent = frontier.pop()
+        children = [child for child, ppid in parents.items() if ppid == parent]
+        descendants += children
+        frontier += children
+    return descendants
+
+class RssSampler:
+    """
+    サーバーとその子プロセス（ffmpeg）の常駐メモリを定期的に取得し、最大値を記録するクラス。
+
+    子プロセスは短時間で終了するため、取得間隔より短い間に到達した最大値は記録されない場合があります。
+    """
+
+    def __init__(self, pid: int):
+        self.pid = pid
+        self.server_peak = 0
+        self.children_peak = 0
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    def __enter__(self) -> "RssSampler":
+        self._thread = threading.Thread(target=self.__run, daemon=True)
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self._stop.set()
+        self._thread.join()
+
+    def __run(self):
+        if not Path("/proc").is_dir():
+            return
+        while not self._stop.wait(RSS_SAMPLE_INTERVAL):
+            self.server_peak = max(self.server_peak, _read_rss(self.pid))
+            # 同時に実行されている子プロセスの合計を、ffmpegの使用量とする
+            children = sum(_read_rss(child) for child in _child_pids(self.pid))
+            self.children_peak = max(self.children_peak, children)
+
+def _free_port() -> int:
+    """
+    空いているTCPポートを取得します。
+    """
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+def start_server(port: int, env_overrides: dict[str, str], work_dir: Path) -> subprocess.Popen:
+    """
+    uvicornでアプリケーションを起動し、リクエストを受け付けられるようになるまで待機します。
+
+    結果キャッシュが有効だと同じ動画への2回目以降のリクエストでffmpegが実行されないため、既定では無効にします。
+
+    Args:
+        port (int): 待ち受けるポート番号。
+        env_overrides (dict[str, str]): サーバーに設定する環境変数。
+        work_dir (Path): キャッシュやジョブの保存先として使用する作業ディレクトリ。
+
+    Returns:
+        subprocess.Popen: サーバーのプロセス。
+    """
+    env = {
+        **os.environ,
+        "RESULT_CACHE_MAX_BYTES": "0",
+        "RESULT_CACHE_DIR": str(work_dir / "cache"),
+        "JOB_DIR": str(work_dir / "jobs"),
+        **env_overrides,
+    }
+    server = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "main:app", "--port", str(port), "--log-level", "warning"],
+        cwd=APP_DIR, env=env,
+    )
+    deadline = time.monotonic() + 30
+    while time.monotonic() < deadline:
+        if server.poll() is not None:
+            raise RuntimeError(f"server exited with code {server.returncode}")
+        try:
+            httpx.get(f"http://127.0.0.1:{port}/metrics", timeout=1).raise_for_status()
+            return server
+        except httpx.HTTPError:
+            time.sleep(0.2)
+    server.terminate()
+    raise RuntimeError("server did not start within 30 seconds")
+
+def percentile(values: list[float], fraction: float) -> float:
+    """
+    線形補間でパーセンタイルを求めます。
+
+    Args:
+        values (list[float]): 値のリスト。
+        fraction (float): 0から1の範囲のパーセンタイル。
+
+    Returns:
+        float: パーセンタイルの値。値が空の場合は0。
+    """
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    position = (len(ordered) - 1) * fraction
+    lower = int(position)
+    upper = min(lower + 1, len(ordered) - 1)
+    return ordered[lower] + (ordered[upper] - ordered[lower]) * (position - lower)
+
+async def drive_load(url: str, video_path: Path, requests: int, concurrency: int) -> tuple[list[float], int, float]:
+    """
+    指定した同時接続数で動画をアップロードし、各リクエストのレイテンシを計測します。
+
+    Args:
+        url (str): リクエスト先のURL。
+        video_path (Path): アップロードする動画のパス。
+        requests (int): 送信するリクエスト数。
+        concurrency (int): 同時接続数。
+
+    Returns:
+        tuple[list[float], int, float]: 成功したリクエストのレイテンシ（秒）のリスト、失敗したリクエスト数、全体の経過時間（秒）。
+    """
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies: list[float] = []
+    errors = 0
+
+    async def send(client: httpx.AsyncClient):
+        nonlocal errors
+        async with semaphore:
+            start = time.perf_counter()
+            with open(video_path, "rb") as video:
+                try:
+                    async with client.stream(
+                        "POST", url, files={"file": (video_path.name, video, "video/x-matroska")}
+                    ) as response:
+                        async for _ in response.aiter_bytes():
+                            pass
+                except httpx.HTTPError:
+                    errors += 1
+                    return
+            if response.status_code == 200:
+                latencies.append(time.perf_counter() - start)
+            else:
+                errors += 1
+
+    limits = httpx.Limits(max_connections=concurrency)
+    async with httpx.AsyncClient(timeout=None, limits=limits) as client:
+        start = time.perf_counter()
+        await asyncio.gather(*(send(client) for _ in range(requests)))
+        elapsed = time.perf_counter() - start
+    return latencies, errors, elapsed
+
+def run_scenario(
+    server: subprocess.Popen, base_url: str, video_path: Path, requests: int, concurrency: int, query: str
+) -> dict:
+    """
+    1つの条件で負荷をかけ、計測結果を返します。
+
+    Returns:
+        dict: スループット、レイテンシのパーセンタイル、最大常駐メモリなどの計測結果。
+    """
+    url = f"{base_url}/api/v1/extract_audio" + (f"?{query}" if query else "")
+    with RssSampler(server.pid) as sampler:
+        latencies, errors, elapsed = asyncio.run(drive_load(url, video_path, requests, concurrency))
+    input_bytes = video_path.stat().st_size * len(latencies)
+    return {
+        "requests": requests,
+        "errors": errors,
+        "elapsed_seconds": elapsed,
+        "throughput_rps": len(latencies) / elapsed if elapsed else 0.0,
+        "input_mbps": input_bytes / elapsed / 1024 ** 2 if elapsed else 0.0,
+        "latency_mean": statistics.fmean(latencies) if latencies else 0.0,
+        "latency_p50": percentile(latencies, 0.50),
+        "latency_p95": percentile(latencies, 0.95),
+        "latency_p99": percentile(latencies, 0.99),
+        "server_peak_rss_bytes": sampler.server_peak,
+        "ffmpeg_peak_rss_bytes": sampler.children_peak,
+    }
+
+def compare(results: dict, baseline_path: Path):
+    """
+    以前の計測結果と比較し、条件ごとの変化率を表示します。
+
+    Args:
+        results (dict): 今回の計測結果。
+        baseline_path (Path): 比較対象の計測結果のJSONファイル。
+    """
+    baseline = {scenario["name"]: scenario for scenario in json.loads(baseline_path.read_text())["scenarios"]}
+    print(f"\ncomparison with {baseline_path}")
+    print(f"{'scenario':>32} {'metric':>22} {'baseline':>12} {'current':>12} {'change':>8}")
+    for scenario in results["scenarios"]:
+        previous = baseline.get(scenario["name"])
+        if previous is None:
+            continue
+        for metric, higher_is_better in COMPARED_METRICS.items():
+            before, after = previous.get(metric, 0), scenario.get(metric, 0)
+            change = (after - before) / before * 100 if before else 0.0
+            regressed = change < -5 if higher_is_better else change > 5
+            marker = " !" if regressed else ""
+            print(f"{scenario['name']:>32} {metric:>22} {before:>12.4g} {after:>12.4g} {change:>+7.1f}%{marker}")
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--durations", type=float, nargs="+", default=[30], help="合成動画の長さ（秒）")
+    parser.add_argument("--resolutions", nargs="+", default=["640x360"], help="合成動画の解像度（幅x高さ）")
+    parser.add_argument("--track-counts", type=int, nargs="+", default=[2], help="合成動画の音声トラック数")
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 4], help="同時接続数")
+    parser.add_argument("--requests", type=int, default=8, help="各条件で送信するリクエスト数")
+    parser.add_argument("--query", default="", help="リクエストに付与するクエリ文字列（例: output_format=mp3）")
+    parser.add_argument("--env", nargs="*", default=[], metavar="KEY=VALUE", help="サーバーに設定する環境変数")
+    parser.add_argument("--output", type=Path, default=Path("bench_load_results.json"), help="計測結果の出力先")
+    parser.add_argument("--compare", type=Path, help="比較対象とする以前の計測結果")
+    args = parser.parse_args()
+
+    env_overrides = dict(item.split("=", 1) for item in args.env)
+    port = _free_port()
+    results = {
+        "generated_at": datetime.now(timezone.utc).isoformat(),
+        "environment": {"python": platform.python_version(), "platform": platform.platform(), "cpus": os.cpu_count()},
+        "config": {"requests": args.requests, "query": args.query, "env": env_overrides},
+        "scenarios": [],
+    }
+
+    print(f"{'scenario':>32} {'rps':>8} {'p50(s)':>8} {'p95(s)':>8} {'p99(s)':>8} {'srv MiB':>8} {'ff MiB':>8} {'err':>4}")
+    with tempfile.TemporaryDirectory() as tmp:
+        work_dir = Path(tmp)
+        server = start_server(port, env_overrides, work_dir)
+        try:
+            for duration in args.durations:
+                for resolution in args.resolutions:
+                    width, height = (int(value) for value in resolution.split("x"))
+                    for track_count in args.track_counts:
+                        video_path = generate_video(
+                            work_dir / "input.mkv", duration=duration, width=width, height=height,
+                            audio_tracks=track_count,
+                        )
+                        for concurrency in args.concurrency:
+                            name = f"{duration:g}s-{resolution}-{track_count}tr-c{concurrency}"
+                            measured = run_scenario(
+                                server, f"http://127.0.0.1:{port}", video_path, args.requests, concurrency, args.query
+                            )
+                            results["scenarios"].append({
+                                "name": name, "duration": duration, "width": width, "height": height,
+                                "audio_tracks": track_count, "concurrency": concurrency, **measured,
+                            })
+                            print(
+                                f"{name:>32} {measured['throughput_rps']:>8.2f} {measured['latency_p50']:>8.2f} "
+                                f"{measured['latency_p95']:>8.2f} {measured['latency_p99']:>8.2f} "
+                                f"{measured['server_peak_rss_bytes'] / 1024 ** 2:>8.1f} "
+                                f"{measured['ffmpeg_peak_rss_bytes'] / 1024 ** 2:>8.1f} {measured['errors']:>4}"
+                            )
+                        video_path.unlink()
+        finally:
+            server.terminate()
+            server.wait()
+
+    args.output.write_text(json.dumps(results, indent=2))
+    print(f"\nresults written to {args.output}")
+    if args.compare:
+        compare(results, args.compare)
+
+if __name__ == "__main__":
+    main()
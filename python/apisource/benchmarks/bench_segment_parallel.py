@@ -0,0 +1,105 @@
+"""
+区間並列変換のベンチマーク。
+
+実際の動画と同程度のビットレートの映像と音声トラックを1つ持つ長い合成動画を、使用するコア数（ffmpegの同時実行数）を
+変えながら再エンコードして抽出し、区間に分割しない場合に対する処理時間の短縮率とffmpegのCPU時間を比較します。
+各ffmpegのスレッド数は1に固定するため、同時実行数がそのまま使用するコア数になります。
+区間は入力側でシークしてから変換するため、映像のデータ量が小さいと区間の手前を読み飛ばす効果が計測に表れません。
+
+実行例（apisourceディレクトリで実行）:
+    PYTHONPATH=. python benchmarks/bench_segment_parallel.py --core-counts 1 2 4 8 --duration 1200
+"""
+
+import argparse
+import asyncio
+import resource
+import shutil
+import statistics
+import tempfile
+import time
+from pathlib import Path
+
+from benchmarks.synthetic_media import generate_video
+from domain.models.extraction_options import ExtractionOptions, OutputFormat
+from infrastructure.ffmpeg_audio_extractor import FFmpegAudioExtractor
+from infrastructure.ffmpeg_scheduler import FFmpegJobScheduler
+
+# 元のコーデック（AAC）から再エンコードが必要な出力形式を指定する
+OPTIONS = ExtractionOptions(output_format=OutputFormat.MP3)
+
+def run_once(extractor: FFmpegAudioExtractor, video_path: Path, work_dir: Path) -> tuple[float, float]:
+    """
+    音声抽出を1回実行し、経過時間と子プロセスのCPU時間を計測します。
+
+    Args:
+        extractor (FFmpegAudioExtractor): 計測対象の音声抽出器。
+        video_path (Path): 入力動画のパス。
+        work_dir (Path): 抽出した音声の保存先ディレクトリ。
+
+    Returns:
+        tuple[float, float]: 経過時間（秒）とffmpegが消費したCPU時間（秒）。
+    """
+    output_dir = work_dir / "out"
+    output_dir.mkdir()
+    try:
+        before = resource.getrusage(resource.RUSAGE_CHILDREN)
+        start = time.perf_counter()
+        asyncio.run(extractor.extract_all_audio(str(video_path), output_dir, OPTIONS))
+        elapsed = time.perf_counter() - start
+        after = resource.getrusage(resource.RUSAGE_CHILDREN)
+        cpu = (after.ru_utime - before.ru_utime) + (after.ru_stime - before.ru_stime)
+        return elapsed, cpu
+    finally:
+        shutil.rmtree(output_dir)
+
+def measure(extractor: FFmpegAudioExtractor, video_path: Path, work_dir: Path, repeat: int) -> tuple[float, float]:
+    """
+    音声抽出を繰り返し実行し、経過時間とCPU時間の中央値を求めます。
+
+    Args:
+        extractor (FFmpegAudioExtractor): 計測対象の音声抽出器。
+        video_path (Path): 入力動画のパス。
+        work_dir (Path): 抽出した音声の保存先ディレクトリ。
+        repeat (int): 繰り返し回数。
+
+    Returns:
+        tuple[float, float]: 経過時間（秒）とCPU時間（秒）の中央値。
+    """
+    samples = [run_once(extractor, video_path, work_dir) for _ in range(repeat)]
+    return (
+        statistics.median(sample[0] for sample in samples),
+        statistics.median(sample[1] for sample in samples),
+    )
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--core-counts", type=int, nargs="+", default=[1, 2, 4, 8], help="計測する使用コア数")
+    parser.add_argument("--duration", type=float, default=1200, help="合成動画の長さ（秒）")
+    parser.add_argument("--width", type=int, default=1920, help="合成動画の映像の幅")
+    parser.add_argument("--height", type=int, default=1080, help="合成動画の映像の高さ")
+    parser.add_argument("--video-bitrate", default="8M", help="合成動画の映像のビットレート")
+    parser.add_argument("--repeat", type=int, default=3, help="各条件の繰り返し回数")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        work_dir = Path(tmp)
+        video_path = generate_video(
+            work_dir / "input.mkv", duration=args.duration, width=args.width, height=args.height, audio_tracks=1,
+            video_bitrate=args.video_bitrate,
+        )
+        # 区間に分割しない場合の処理時間を基準とする
+        baseline, baseline_cpu = measure(
+            FFmpegAudioExtractor(scheduler=FFmpegJobScheduler(max_concurrent_jobs=1, threads_per_job=1)),
+            video_path, work_dir, args.repeat
+        )
+
+        print(f"{'cores':>5} {'segments':>8} {'wall(s)':>9} {'cpu(s)':>9} {'speedup':>8}")
+        print(f"{1:>5} {'-':>8} {baseline:>9.2f} {baseline_cpu:>9.2f} {1:>7.2f}x")
+        for core_count in args.core_counts:
+            scheduler = FFmpegJobScheduler(max_concurrent_jobs=core_count, threads_per_job=1)
+            extractor = FFmpegAudioExtractor(scheduler=scheduler, segment_min_duration=1)
+            wall, cpu = measure(extractor, video_path, work_dir, args.repeat)
+            print(f"{core_count:>5} {extractor.max_segments:>8} {wall:>9.2f} {cpu:>9.2f} {baseline / wall:>7.2f}x")
+
+if __name__ == "__main__":
+    main()
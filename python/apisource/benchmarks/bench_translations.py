@@ -0,0 +1,57 @@
+"""
+翻訳ミドルウェアのベンチマーク。
+
+リクエストごとにTranslations.loadで.moファイルを読み込む従来の方式と、
+起動時に読み込んだカタログをTranslationRegistryから参照する方式について、1リクエストあたりのオーバーヘッドを比較します。
+エラーレスポンスのように翻訳が必要な場合と、正常系のように翻訳を使用しない場合をそれぞれ計測します。
+
+実行例（apisourceディレクトリで実行）:
+    PYTHONPATH=. python benchmarks/bench_translations.py --iterations 20000
+"""
+
+import argparse
+import timeit
+
+from babel.support import Translations
+
+from infrastructure.framework.middlewares import DEFAULT_LANGUAGE, LOCALE_DIR
+from infrastructure.framework.translations import TranslationRegistry
+
+# 計測に使用するAccept-Languageヘッダーの値
+HEADERS = ["ja,en-US;q=0.9", "en-US,en;q=0.9", "fr-FR,fr;q=0.9,ja;q=0.5"]
+MESSAGE_ID = "error.unexpected"
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--iterations", type=int, default=20000, help="各方式の繰り返し回数")
+    parser.add_argument("--repeat", type=int, default=5, help="計測の繰り返し回数（最小値を採用）")
+    args = parser.parse_args()
+
+    registry = TranslationRegistry(LOCALE_DIR, DEFAULT_LANGUAGE)
+    headers = HEADERS * (args.iterations // len(HEADERS))
+
+    def load_per_request(translate: bool):
+        for header in headers:
+            translations = Translations.load(LOCALE_DIR, [header])
+            if translate:
+                translations.gettext(MESSAGE_ID)
+
+    def registry_lookup(translate: bool):
+        for header in headers:
+            translations = registry.for_header(header)
+            if translate:
+                translations.gettext(MESSAGE_ID)
+
+    print(f"{'case':>10} {'method':>18} {'per request(us)':>16} {'speedup':>8}")
+    for translate in (False, True):
+        case = "error" if translate else "success"
+        results = {}
+        for name, func in (("load_per_request", load_per_request), ("registry", registry_lookup)):
+            best = min(timeit.repeat(lambda: func(translate), number=1, repeat=args.repeat))
+            results[name] = best / len(headers) * 1e6
+        baseline = results["load_per_request"]
+        for name, per_request in results.items():
+            print(f"{case:>10} {name:>18} {per_request:>16.2f} {baseline / per_request:>7.1f}x")
+
+if __name__ == "__main__":
+    main()
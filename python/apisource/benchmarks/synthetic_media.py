@@ -0,0 +1,62 @@
+"""
+ベンチマーク用の合成動画を生成するモジュール。
+
+ffmpegのlavfi入力を使用して、テストパターンの映像と正弦波の音声トラックを持つ動画をローカルで生成します。
+"""
+
+from pathlib import Path
+
+import ffmpeg
+
+# 音声トラックに付与する言語タグ（トラック数がこれを超える場合は繰り返して使用）
+TRACK_LANGUAGES = ["jpn", "eng", "fra", "deu", "spa", "ita", "kor", "zho"]
+
+def generate_video(
+    output_path: Path,
+    duration: float = 60,
+    width: int = 640,
+    height: int = 360,
+    audio_tracks: int = 2,
+    video_bitrate: str | None = None,
+) -> Path:
+    """
+    テストパターンの映像と複数の音声トラックを持つ合成動画を生成します。
+
+    Args:
+        output_path (Path): 生成する動画の保存先パス。拡張子でコンテナ形式が決まります。
+        duration (float): 動画の長さ（秒）。
+        width (int): 映像の幅。
+        height (int): 映像の高さ。
+        audio_tracks (int): 音声トラックの数。
+        video_bitrate (str | None): 映像のビットレート（例: "8M"）。指定した場合は固定ビットレートで符号化し、
+            テストパターンでも実際の動画と同程度のデータ量にします。Noneの場合はエンコーダーの既定の品質とします。
+
+    Returns:
+        Path: 生成した動画のパス。
+    """
+    video = ffmpeg.input(f"testsrc2=size={width}x{height}:rate=30:duration={duration}", f="lavfi")
+    audios = [
+        ffmpeg.input(f"sine=frequency={220 + index * 110}:sample_rate=48000:duration={duration}", f="lavfi")
+        for index in range(audio_tracks)
+    ]
+    video_args = {}
+    if video_bitrate is not None:
+        # 単純なテストパターンは圧縮されて小さくなるため、フィラーデータで指定したビットレートを埋める
+        video_args = {
+            "video_bitrate": video_bitrate, "minrate": video_bitrate, "maxrate": video_bitrate,
+            "bufsize": video_bitrate, "x264-params": "nal-hrd=cbr",
+        }
+    metadata = {
+        f"metadata:s:a:{index}": f"language={TRACK_LANGUAGES[index % len(TRACK_LANGUAGES)]}"
+        for index in range(audio_tracks)
+    }
+    (
+        ffmpeg.output(
+            video, *audios, str(output_path),
+            vcodec="libx264", preset="ultrafast", acodec="aac", audio_bitrate="128k",
+            **video_args, **metadata
+        )
+        .overwrite_output()
+        .run(quiet=True)
+    )
+    return output_path
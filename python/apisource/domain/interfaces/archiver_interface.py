@@ -1,4 +1,5 @@
 from abc import ABC, abstractmethod
+from collections.abc import AsyncIterable, AsyncIterator
 from pathlib import Path
 
 class IArchiver(ABC):
@@ -8,16 +9,27 @@ class IArchiver(ABC):
     ファイルをアーカイブ形式に変換するためのメソッドを定義します。
     """
 
+    @property
     @abstractmethod
-    def create_archive(self, files: list[Path], archive_path: str) -> bytes:
+    def file_extension(self) -> str:
         """
-        ファイルをアーカイブにまとめます。
+        アーカイブファイルの拡張子（例: ".zip"）。
+        """
+        pass
+
+    @abstractmethod
+    def stream_archive(self, files: AsyncIterable[Path], root: Path | None = None) -> AsyncIterator[bytes]:
+        """
+        ファイルを受け取った順にアーカイブへ追加し、生成されたアーカイブをチャンク単位で返します。
+
+        アーカイブ全体をディスクやメモリに保持せずに、最初のファイルが揃った時点から出力を開始します。
 
         Args:
-            files (list[Path]): アーカイブするファイルのリスト。
-            archive_path (str): アーカイブファイルの保存先パス。
+            files (AsyncIterable[Path]): アーカイブするファイルを順に返す非同期イテラブル。
+            root (Path | None): エントリ名の基準となるディレクトリ。指定した場合はこのディレクトリからの相対パスを、
+                Noneの場合はファイル名をエントリ名とします。
 
         Returns:
-            bytes: アーカイブされたデータのバイト列。
+            AsyncIterator[bytes]: アーカイブデータのチャンクを返す非同期イテレータ。
         """
         pass
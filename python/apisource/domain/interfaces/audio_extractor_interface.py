@@ -1,7 +1,11 @@
 from abc import ABC, abstractmethod
+from collections.abc import AsyncIterable, AsyncIterator
 from pathlib import Path
 from typing import List
 
+from domain.models.extraction_options import ExtractionOptions
+from domain.models.media_info import MediaInfo
+
 class IAudioExtractor(ABC):
     """
     音声抽出器のインターフェース。
@@ -10,22 +14,153 @@ class IAudioExtractor(ABC):
     """
 
     @abstractmethod
-    async def extract_all_audio(self, video_path: str, output_dir: Path) -> List[Path]:
+    async def extract_all_audio(
+        self,
+        video_path: str,
+        output_dir: Path,
+        options: ExtractionOptions | None = None,
+        media_info: MediaInfo | None = None,
+    ) -> List[Path]:
         """
-        ビデオファイルからすべての音声トラックを抽出し、指定されたディレクトリに保存します。
+        ビデオファイルからオプションで選択された音声トラックを抽出し、指定されたディレクトリに保存します。
+
+        オプションで抽出する範囲が指定された場合は、その範囲のみを抽出します。
 
         Args:
             video_path (str): 音声を抽出するビデオファイルのパス。
             output_dir (Path): 抽出した音声を保存するディレクトリ。
+            options (ExtractionOptions | None): 音声抽出のオプション（出力形式、抽出する音声トラックと範囲など）。
+                Noneの場合は既定値を使用します。
+            media_info (MediaInfo | None): 解析済みのメタデータ。Noneの場合はビデオファイルを解析します。
 
         Returns:
             List[Path]: 抽出された音声ファイルのパスのリスト。
         """
         pass
 
+    @abstractmethod
+    def iter_extract_audio(
+        self,
+        video_path: str,
+        output_dir: Path,
+        options: ExtractionOptions | None = None,
+        media_info: MediaInfo | None = None,
+    ) -> AsyncIterator[Path]:
+        """
+        ビデオファイルからオプションで選択された音声トラックを抽出し、抽出が完了した順に音声ファイルのパスを返します。
+
+        オプションで抽出する範囲が指定された場合は、その範囲のみを抽出します。
+        オプションで解析が指定された場合は、音声ファイルを返す前に、その解析結果（TrackAnalysis）を
+        analysis_path_forが返すパスにJSON形式で書き出します。
+
+        Args:
+            video_path (str): 音声を抽出するビデオファイルのパス。
+            output_dir (Path): 抽出した音声を保存するディレクトリ。
+            options (ExtractionOptions | None): 音声抽出のオプション（出力形式、抽出する音声トラックと範囲など）。
+                Noneの場合は既定値を使用します。
+            media_info (MediaInfo | None): 解析済みのメタデータ。Noneの場合はビデオファイルを解析します。
+
+        Returns:
+            AsyncIterator[Path]: 抽出された音声ファイルのパスを返す非同期イテレータ。
+        """
+        pass
+
+    @abstractmethod
+    def is_streamable(self, head: bytes) -> bool:
+        """
+        ファイルの先頭部分から、ファイル全体を受信する前に読み込みを開始できる形式かどうかを判定します。
+
+        Args:
+            head (bytes): ファイルの先頭部分のバイトデータ。
+
+        Returns:
+            bool: 先頭から順に読み込むだけで音声を抽出できる形式の場合はTrue。
+        """
+        pass
+
+    @abstractmethod
+    def is_supported_container(self, head: bytes) -> bool:
+        """
+        ファイルの先頭部分から、音声を抽出できるコンテナ形式かどうかを判定します。
+
+        Args:
+            head (bytes): ファイルの先頭部分のバイトデータ。
+
+        Returns:
+            bool: 対応するコンテナ形式の場合はTrue。
+        """
+        pass
+
+    @abstractmethod
+    def iter_extract_audio_from_stream(
+        self,
+        chunks: AsyncIterable[bytes],
+        output_dir: Path,
+        options: ExtractionOptions | None,
+        media_info: MediaInfo,
+    ) -> AsyncIterator[Path]:
+        """
+        受信中のビデオファイルのデータを順に読み込みながらオプションで選択された音声トラックを抽出し、音声ファイルのパスを返します。
+
+        オプションで解析が指定された場合の解析結果の書き出しは、iter_extract_audioと同じです。
+
+        Args:
+            chunks (AsyncIterable[bytes]): ビデオファイルのバイトデータを順に返す非同期イテラブル。
+            output_dir (Path): 抽出した音声を保存するディレクトリ。
+            options (ExtractionOptions | None): 音声抽出のオプション（出力形式、抽出する音声トラックと範囲など）。
+                Noneの場合は既定値を使用します。
+            media_info (MediaInfo): ファイルの先頭部分から解析したメタデータ。
+
+        Returns:
+            AsyncIterator[Path]: 抽出された音声ファイルのパスを返す非同期イテレータ。
+        """
+        pass
+
 class AudioExtractionFailedException(Exception):
     """
     オーディオ抽出処理が失敗した場合に発生する例外。
 
     この例外は、オーディオファイルの解析や変換中にエラーが発生した場合に発生します。
     """
+
+class UnsupportedContainerException(Exception):
+    """
+    アップロードされたファイルが音声を抽出できるコンテナ形式でない場合に発生する例外。
+
+    この例外は、受信したファイルの先頭部分のマジックナンバーから判定した時点で発生します。
+    """
+
+class NoAudioStreamException(Exception):
+    """
+    アップロードされたファイルに音声トラックが含まれていない場合に発生する例外。
+
+    この例外は、受信したファイルの先頭部分の解析で音声トラックがないと判明した時点で発生します。
+    """
+
+class NoMatchingAudioTrackException(Exception):
+    """
+    抽出する音声トラックの指定（トラック番号や言語）に一致する音声トラックがない場合に発生する例外。
+
+    この例外は、ファイルの解析結果から抽出対象のトラックを選択した時点で、ffmpegを実行する前に発生します。
+    """
+
+class ExtractionDeadlineExceededException(Exception):
+    """
+    音声抽出が制限時間内に終わらなかった場合に発生する例外。
+
+    この例外が発生した時点で、実行中のffmpegは終了させられています。
+    """
+
+class ExtractorBusyException(Exception):
+    """
+    音声抽出の処理能力を超える依頼を受けた場合に発生する例外。
+
+    この例外は、実行待ちの変換処理が上限に達しており、新たな依頼を受け付けられない場合に発生します。
+
+    Attributes:
+        retry_after (int): 再試行までに待機すべき秒数。
+    """
+
+    def __init__(self, retry_after: int):
+        super().__init__(f"Extractor is busy, retry after {retry_after} seconds")
+        self.retry_after = retry_after
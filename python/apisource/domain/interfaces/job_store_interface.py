@@ -0,0 +1,92 @@
+from abc import ABC, abstractmethod
+from pathlib import Path
+
+from domain.models.job import Job
+
+class IJobStore(ABC):
+    """
+    音声抽出ジョブの保存先のインターフェース。
+
+    ジョブの状態と、完了したジョブの結果アーカイブを保存・取得するためのメソッドを定義します。
+    """
+
+    @abstractmethod
+    def save(self, job: Job):
+        """
+        ジョブを保存します。同じIDのジョブが存在する場合は上書きします。
+
+        Args:
+            job (Job): 保存するジョブ。
+        """
+        pass
+
+    @abstractmethod
+    def get(self, job_id: str) -> Job | None:
+        """
+        ジョブを取得します。
+
+        Args:
+            job_id (str): ジョブID。
+
+        Returns:
+            Job | None: ジョブ。存在しない場合はNone。
+        """
+        pass
+
+    @abstractmethod
+    def list_expired(self, now: float) -> list[Job]:
+        """
+        有効期限を過ぎたジョブを取得します。
+
+        Args:
+            now (float): 現在時刻（UNIX時間）。
+
+        Returns:
+            list[Job]: 有効期限を過ぎたジョブのリスト。
+        """
+        pass
+
+    @abstractmethod
+    def list_unfinished(self) -> list[Job]:
+        """
+        終了していない（待機中または実行中の）ジョブを取得します。
+
+        Returns:
+            list[Job]: 終了していないジョブのリスト。
+        """
+        pass
+
+    @abstractmethod
+    def delete(self, job_id: str):
+        """
+        ジョブとその結果アーカイブを削除します。
+
+        Args:
+            job_id (str): ジョブID。
+        """
+        pass
+
+    @abstractmethod
+    def result_path(self, job_id: str) -> Path:
+        """
+        ジョブの結果アーカイブの保存先パスを取得します。
+
+        Args:
+            job_id (str): ジョブID。
+
+        Returns:
+            Path: 結果アーカイブの保存先パス。
+        """
+        pass
+
+class JobNotFoundException(Exception):
+    """
+    指定されたジョブが存在しない場合に発生する例外。
+
+    この例外は、ジョブIDが誤っている場合や、ジョブの有効期限が切れて削除された場合に発生します。
+    """
+
+class JobNotFinishedException(Exception):
+    """
+    終了していないジョブの結果を取得しようとした場合に発生する例外。
+    """
@@ -0,0 +1,34 @@
+from abc import ABC, abstractmethod
+
+from domain.models.media_info import MediaInfo
+
+class IMediaProber(ABC):
+    """
+    メディア解析器のインターフェース。
+
+    メディアファイルのコンテナと音声ストリームのメタデータを取得するためのメソッドを定義します。
+    """
+
+    @abstractmethod
+    async def probe(self, video_path: str, content_hash: str | None = None) -> MediaInfo:
+        """
+        メディアファイルを解析し、メタデータを取得します。
+
+        Args:
+            video_path (str): 解析するメディアファイルのパス。
+            content_hash (str | None): ファイル内容のハッシュ値。指定された場合は解析結果のキャッシュキーとして使用します。
+
+        Returns:
+            MediaInfo: メディアファイルのメタデータ。
+
+        Raises:
+            MediaProbeFailedException: 解析に失敗した場合。
+        """
+        pass
+
+class MediaProbeFailedException(Exception):
+    """
+    メディアファイルの解析が失敗した場合に発生する例外。
+
+    この例外は、ファイルがメディアとして読み取れない場合や、解析処理の実行に失敗した場合に発生します。
+    """
@@ -0,0 +1,91 @@
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from pathlib import Path
+
+@dataclass(frozen=True)
+class CacheStats:
+    """
+    結果キャッシュの統計情報。
+
+    Attributes:
+        hits (int): キャッシュにヒットした回数。
+        misses (int): キャッシュにヒットしなかった回数。
+        evictions (int): 容量制限により削除されたエントリ数。
+        entries (int): 現在のエントリ数。
+        size_bytes (int): 現在のエントリの合計バイト数。
+        max_bytes (int): キャッシュの容量上限（バイト）。
+    """
+    hits: int
+    misses: int
+    evictions: int
+    entries: int
+    size_bytes: int
+    max_bytes: int
+
+class IResultCache(ABC):
+    """
+    抽出結果キャッシュのインターフェース。
+
+    入力ファイルの内容と抽出オプションから導出したキーで、生成済みのアーカイブを保存・取得するためのメソッドを定義します。
+    """
+
+    @abstractmethod
+    def get(self, key: str) -> Path | None:
+        """
+        キーに対応するキャッシュ済みアーカイブのパスを取得します。
+
+        Args:
+            key (str): キャッシュキー。
+
+        Returns:
+            Path | None: キャッシュ済みアーカイブのパス。存在しない場合はNone。
+        """
+        pass
+
+    @abstractmethod
+    def reserve(self, key: str) -> Path:
+        """
+        キャッシュへ保存するアーカイブの書き込み先となる一時ファイルのパスを払い出します。
+
+        書き込みが完了したらcommitを、中断した場合はdiscardを呼び出す必要があります。
+
+        Args:
+            key (str): キャッシュキー。
+
+        Returns:
+            Path: 一時ファイルのパス。
+        """
+        pass
+
+    @abstractmethod
+    def commit(self, key: str, temp_path: Path, suffix: str = ""):
+        """
+        書き込みが完了した一時ファイルをキャッシュへ登録します。
+
+        Args:
+            key (str): キャッシュキー。
+            temp_path (Path): reserveで払い出された一時ファイルのパス。
+            suffix (str): エントリのファイル名に付ける、"_"または"."で始まる接尾辞（"_audio.zip"など）。
+                getが返すパスのファイル名は、キーにこの接尾辞を付けたものになります。
+        """
+        pass
+
+    @abstractmethod
+    def discard(self, temp_path: Path):
+        """
+        書き込みを中断した一時ファイルを削除します。
+
+        Args:
+            temp_path (Path): reserveで払い出された一時ファイルのパス。
+        """
+        pass
+
+    @abstractmethod
+    def stats(self) -> CacheStats:
+        """
+        キャッシュの統計情報を取得します。
+
+        Returns:
+            CacheStats: キャッシュの統計情報。
+        """
+        pass
@@ -0,0 +1,153 @@
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from pathlib import Path
+
+@dataclass(frozen=True)
+class ScratchStats:
+    """
+    一時作業領域の使用状況。
+
+    Attributes:
+        workspaces (int): 使用中の作業ディレクトリの数。
+        used_bytes (int): 作業ディレクトリに書き込まれたバイト数の合計。
+        max_bytes (int): 使用できるバイト数の上限（0の場合は制限なし）。
+    """
+    workspaces: int
+    used_bytes: int
+    max_bytes: int
+
+class IScratchSpace(ABC):
+    """
+    一時作業領域のインターフェース。
+
+    受信したファイルや抽出した音声を書き込むリクエストごとの作業ディレクトリを払い出し、
+    書き込まれたバイト数を全リクエスト共通の容量上限で管理するためのメソッドを定義します。
+    """
+
+    @abstractmethod
+    def check_capacity(self):
+        """
+        新たなリクエストを受け付けられる空き容量があるかどうかを確認します。
+
+        Raises:
+            ScratchSpaceExhaustedException: 使用量が容量上限に達している場合。
+        """
+        pass
+
+    @abstractmethod
+    def create_workspace(self) -> Path:
+        """
+        作業ディレクトリを作成します。
+
+        作業ディレクトリは使い終わったらdiscardで削除する必要があります。
+        削除されずに残った作業ディレクトリは、purge_orphansで削除されます。
+
+        Returns:
+            Path: 作成した作業ディレクトリのパス。
+        """
+        pass
+
+    @abstractmethod
+    def charge(self, path: Path, size: int):
+        """
+        作業ディレクトリに書き込むバイト数を使用量に計上します。
+
+        Args:
+            path (Path): 作業ディレクトリ、またはその中のファイルのパス。
+            size (int): 書き込むバイト数。
+
+        Raises:
+            ScratchSpaceExhaustedException: 計上すると容量上限を超える場合。
+        """
+        pass
+
+    @abstractmethod
+    def release(self, path: Path, size: int):
+        """
+        作業ディレクトリから削除したファイルのバイト数を、使用量から差し引きます。
+
+        作業ディレクトリ自体を削除する場合は、discardが使用量を解放するため呼び出す必要はありません。
+
+        Args:
+            path (Path): 作業ディレクトリ、またはその中のファイルのパス。
+            size (int): 削除したバイト数。
+        """
+        pass
+
+    @abstractmethod
+    def adopt(self, path: Path) -> Path:
+        """
+        前回のプロセスが作成した作業ディレクトリを、このプロセスが使用中の作業ディレクトリとして引き継ぎます。
+
+        プロセスの再起動をまたいで保持するデータ（再開可能なアップロードの受信済みのデータなど）が
+        purge_orphansで削除されないよう、起動時に呼び出します。引き継いだ作業ディレクトリのファイルは使用量に計上されます。
+
+        Args:
+            path (Path): 作業ディレクトリ、またはその中のファイルのパス。
+
+        Returns:
+            Path: 引き継いだ後の、指定されたパスに対応するパス。
+
+        Raises:
+            FileNotFoundError: 作業ディレクトリが既に削除されている場合。
+            ValueError: 作業領域外のパスが指定された場合。
+        """
+        pass
+
+    @abstractmethod
+    def discard(self, path: Path):
+        """
+        作業ディレクトリを削除し、その使用量を解放します。
+
+        作業ディレクトリ内のファイルのパスが指定された場合は、そのファイルを含む作業ディレクトリ全体を削除します。
+        作業領域外のパスが指定された場合は、そのファイルのみを削除します。
+
+        Args:
+            path (Path): 作業ディレクトリ、またはその中のファイルのパス。
+        """
+        pass
+
+    @abstractmethod
+    def purge_orphans(self) -> int:
+        """
+        異常終了したプロセスなどが削除せずに残した作業ディレクトリを削除します。
+
+        Returns:
+            int: 削除した作業ディレクトリの数。
+        """
+        pass
+
+    @abstractmethod
+    async def run_janitor(self, interval_seconds: float):
+        """
+        purge_orphansを一定の間隔で繰り返し実行します。タスクがキャンセルされるまで終了しません。
+
+        Args:
+            interval_seconds (float): 実行の間隔（秒）。
+        """
+        pass
+
+    @abstractmethod
+    def stats(self) -> ScratchStats:
+        """
+        一時作業領域の使用状況を取得します。
+
+        Returns:
+            ScratchStats: 使用状況。
+        """
+        pass
+
+class ScratchSpaceExhaustedException(Exception):
+    """
+    一時作業領域の容量上限に達した場合に発生する例外。
+
+    この例外は、使用量が容量上限に達しているために新たなリクエストを受け付けられない場合や、
+    受信中のファイルが空き容量を超えた場合に発生します。
+
+    Attributes:
+        retry_after (int): 再試行までに待機すべき秒数。
+    """
+
+    def __init__(self, retry_after: int):
+        super().__init__(f"Scratch space is exhausted, retry after {retry_after} seconds")
+        self.retry_after = retry_after
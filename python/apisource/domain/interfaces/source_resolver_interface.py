@@ -0,0 +1,39 @@
+from abc import ABC, abstractmethod
+
+from domain.models.source_reference import SourceReference
+
+class ISourceResolver(ABC):
+    """
+    参照で指定されたビデオファイルの解決器のインターフェース。
+
+    クライアントが指定したパスやURLを検証し、ffmpegが直接読み込める入力に変換するためのメソッドを定義します。
+    """
+
+    @abstractmethod
+    async def resolve(self, reference: str) -> SourceReference:
+        """
+        参照を検証し、ffmpegに渡す入力を決定します。
+
+        Args:
+            reference (str): マウントされたストレージ上のパス、またはHTTP(S)のURL。
+
+        Returns:
+            SourceReference: 解決されたビデオファイル。
+
+        Raises:
+            SourceNotAllowedException: 許可されていない場所が指定された場合。
+            SourceNotFoundException: 指定されたファイルが存在しない場合。
+        """
+        pass
+
+class SourceNotAllowedException(Exception):
+    """
+    許可されていない場所のファイルが参照された場合に発生する例外。
+
+    この例外は、許可されたマウントのルート外のパスや、許可されていないオリジンのURLが指定された場合に発生します。
+    """
+
+class SourceNotFoundException(Exception):
+    """
+    参照されたファイルが存在しないか、取得できない場合に発生する例外。
+    """
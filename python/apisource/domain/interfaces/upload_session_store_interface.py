@@ -0,0 +1,117 @@
+from abc import ABC, abstractmethod
+from pathlib import Path
+
+from domain.models.upload_session import UploadSession
+
+class IUploadSessionStore(ABC):
+    """
+    再開可能なアップロードのセッションの保存先のインターフェース。
+
+    セッションの状態と、受信済みのファイルデータの保存先パスを保存・取得するためのメソッドを定義します。
+    ファイルデータ自体は一時作業領域に保存され、その削除はUploadSessionServiceが行います。
+    """
+
+    @abstractmethod
+    def save(self, session: UploadSession):
+        """
+        セッションを保存します。同じIDのセッションが存在する場合は上書きします。
+
+        Args:
+            session (UploadSession): 保存するセッション。
+        """
+        pass
+
+    @abstractmethod
+    def get(self, session_id: str) -> UploadSession | None:
+        """
+        セッションを取得します。
+
+        Args:
+            session_id (str): セッションID。
+
+        Returns:
+            UploadSession | None: セッション。存在しない場合はNone。
+        """
+        pass
+
+    @abstractmethod
+    def list_all(self) -> list[UploadSession]:
+        """
+        すべてのセッションを取得します。
+
+        Returns:
+            list[UploadSession]: セッションのリスト。
+        """
+        pass
+
+    @abstractmethod
+    def list_expired(self, now: float) -> list[UploadSession]:
+        """
+        有効期限を過ぎたセッションを取得します。
+
+        Args:
+            now (float): 現在時刻（UNIX時間）。
+
+        Returns:
+            list[UploadSession]: 有効期限を過ぎたセッションのリスト。
+        """
+        pass
+
+    @abstractmethod
+    def delete(self, session_id: str):
+        """
+        セッションを削除します。受信済みのファイルデータは削除しません。
+
+        Args:
+            session_id (str): セッションID。
+        """
+        pass
+
+    @abstractmethod
+    def data_path(self, session_id: str) -> Path | None:
+        """
+        セッションの受信済みのファイルデータの保存先パスを取得します。
+
+        Args:
+            session_id (str): セッションID。
+
+        Returns:
+            Path | None: ファイルデータの保存先パス。セッションが存在しないか、保存先が記録されていない場合はNone。
+        """
+        pass
+
+    @abstractmethod
+    def set_data_path(self, session_id: str, data_path: Path):
+        """
+        セッションの受信済みのファイルデータの保存先パスを記録します。
+
+        Args:
+            session_id (str): セッションID。
+            data_path (Path): ファイルデータの保存先パス。
+        """
+        pass
+
+class UploadSessionNotFoundException(Exception):
+    """
+    指定されたアップロードのセッションが存在しない場合に発生する例外。
+
+    この例外は、セッションIDが誤っている場合や、放置されたセッションが有効期限切れで削除された場合に発生します。
+    """
+
+class UploadOffsetMismatchException(Exception):
+    """
+    チャンクの送信位置が受信済みのバイト数と一致しない場合に発生する例外。
+
+    同じセッションへ別のリクエストが書き込み中の場合にも発生します。
+    クライアントはセッションの状態を取得し、受信済みのバイト数から送信をやり直す必要があります。
+    """
+
+class UploadIncompleteException(Exception):
+    """
+    ファイル全体の受信が完了していないセッションで音声抽出を要求した場合に発生する例外。
+    """
+
+class UploadChecksumMismatchException(Exception):
+    """
+    受信したデータのハッシュ値が、クライアントが指定したハッシュ値と一致しない場合に発生する例外。
+    """
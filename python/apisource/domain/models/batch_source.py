@@ -0,0 +1,20 @@
+from dataclasses import dataclass
+
+@dataclass(frozen=True)
+class BatchSource:
+    """
+    一括抽出の対象となる1ファイル。
+
+    受信に成功した場合はvideo_pathとcontent_hashを、失敗した場合はerrorを持ちます。
+    受信に失敗したファイルも、一括抽出の結果にエラーとして記録されます。
+
+    Attributes:
+        file_name (str): ファイル名。
+        video_path (str | None): 受信済みのビデオファイルのパス。
+        content_hash (str | None): ファイル内容のハッシュ値。
+        error (str | None): 受信に失敗した理由。
+    """
+    file_name: str
+    video_path: str | None = None
+    content_hash: str | None = None
+    error: str | None = None
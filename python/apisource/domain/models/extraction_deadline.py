@@ -0,0 +1,37 @@
+from dataclasses import dataclass
+
+from domain.models.extraction_options import ExtractionOptions
+from domain.models.media_info import MediaInfo
+
+@dataclass(frozen=True)
+class ExtractionDeadline:
+    """
+    音声抽出の制限時間の設定。
+
+    制限時間は、base_seconds + seconds_per_media_second × 抽出する範囲の長さ（秒）で求めます。
+    実行枠の待ち時間を含め、制限時間内に抽出が終わらない場合はffmpegを終了させます。
+
+    Attributes:
+        base_seconds (float): 抽出する範囲の長さによらない制限時間（秒）。
+        seconds_per_media_second (float): 抽出する範囲の長さ1秒あたりに加算する制限時間（秒）。
+    """
+    base_seconds: float = 0
+    seconds_per_media_second: float = 0
+
+    def seconds_for(self, media_info: MediaInfo, options: ExtractionOptions) -> float | None:
+        """
+        解析したメディアの長さと抽出する範囲から制限時間を求めます。
+
+        Args:
+            media_info (MediaInfo): 解析したメディアファイルのメタデータ。
+            options (ExtractionOptions): 音声抽出のオプション。
+
+        Returns:
+            float | None: 制限時間（秒）。制限時間が設定されていない場合、またはメディアの長さが不明な場合はNone。
+        """
+        if not self.base_seconds and not self.seconds_per_media_second:
+            return None
+        length = options.clip_duration(media_info.duration)
+        if length is None:
+            return None
+        return self.base_seconds + self.seconds_per_media_second * length
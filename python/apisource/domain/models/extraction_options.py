@@ -0,0 +1,94 @@
+from dataclasses import dataclass
+from enum import Enum
+
+from domain.models.media_info import AudioStreamInfo
+
+class OutputFormat(str, Enum):
+    """
+    抽出した音声の出力形式。
+
+    AUTOの場合は、各トラックのコーデックをそのまま格納できる形式をトラックごとに選択します。
+    """
+    AUTO = "auto"
+    AAC = "aac"
+    M4A = "m4a"
+    MP3 = "mp3"
+    OGG = "ogg"
+    OPUS = "opus"
+    FLAC = "flac"
+    MKA = "mka"
+
+class ArchiveFormat(str, Enum):
+    """
+    抽出した音声をまとめて返す際の形式。
+
+    AUTOの場合は、音声トラックが1つだけであればアーカイブせずに音声ファイルをそのまま返し、
+    複数ある場合は無圧縮のZIPにまとめます。
+    """
+    AUTO = "auto"
+    ZIP = "zip"
+    ZIP_DEFLATED = "zip_deflated"
+    TAR = "tar"
+
+@dataclass(frozen=True)
+class ExtractionOptions:
+    """
+    音声抽出のオプション。
+
+    Attributes:
+        output_format (OutputFormat): 抽出した音声の出力形式。
+        passthrough (bool): 元のコーデックが出力形式に格納できる場合に、再エンコードせずストリームコピーするかどうか。
+        archive_format (ArchiveFormat): 抽出した音声をまとめて返す際の形式。
+        tracks (tuple[int, ...]): 抽出する音声トラックのストリームのインデックス。
+        languages (tuple[str, ...]): 抽出する音声トラックの言語タグ。
+            tracksとlanguagesのいずれにも指定がない場合はすべての音声トラックを抽出し、
+            指定がある場合はいずれかに一致する音声トラックのみを抽出します。
+        start (float | None): 抽出する範囲の開始位置（秒）。Noneの場合は先頭から抽出します。
+        end (float | None): 抽出する範囲の終了位置（秒）。Noneの場合は末尾まで抽出します。
+        analyze (bool): 抽出と同じffmpegの実行で、トラックごとの波形のピークとEBU R128のラウドネスを解析するかどうか。
+    """
+    output_format: OutputFormat = OutputFormat.AAC
+    passthrough: bool = True
+    archive_format: ArchiveFormat = ArchiveFormat.ZIP
+    tracks: tuple[int, ...] = ()
+    languages: tuple[str, ...] = ()
+    start: float | None = None
+    end: float | None = None
+    analyze: bool = False
+
+    def clip_duration(self, duration: float | None) -> float | None:
+        """
+        メディアの長さを、抽出する範囲の長さに切り詰めます。
+
+        Args:
+            duration (float | None): メディアの長さ（秒）。
+
+        Returns:
+            float | None: 抽出する範囲の長さ（秒）。メディアの長さが不明な場合はNone。
+        """
+        if duration is None:
+            return None
+        end = duration if self.end is None else min(self.end, duration)
+        return max(0.0, end - (self.start or 0))
+
+    def select_tracks(self, audio_streams: list[AudioStreamInfo]) -> list[AudioStreamInfo]:
+        """
+        抽出対象の音声トラックを選択します。
+
+        言語タグは大文字と小文字を区別せず、"jpn"のような主言語のみの指定は"jpn-JP"などの地域付きのタグにも一致します。
+
+        Args:
+            audio_streams (list[AudioStreamInfo]): ファイルに含まれる音声トラック。
+
+        Returns:
+            list[AudioStreamInfo]: 抽出対象の音声トラック。
+        """
+        if not self.tracks and not self.languages:
+            return list(audio_streams)
+        languages = {language.lower() for language in self.languages}
+
+        def matches_language(stream: AudioStreamInfo) -> bool:
+            language = (stream.language or "").lower()
+            return bool(language) and (language in languages or language.split("-")[0] in languages)
+
+        return [stream for stream in audio_streams if stream.index in self.tracks or matches_language(stream)]
@@ -0,0 +1,131 @@
+import dataclasses
+import threading
+from contextvars import ContextVar
+from dataclasses import dataclass
+
+@dataclass(frozen=True)
+class TrackProgress:
+    """
+    1つの音声トラックの抽出の進捗。
+
+    Attributes:
+        track_index (int): 入力ファイル内のストリームのインデックス。
+        duration (float | None): 抽出する範囲の長さ（秒）。不明な場合はNone。
+        processed_seconds (float): 変換済みの長さ（秒）。
+        speed (float | None): 変換速度（再生速度に対する倍率）。計測前はNone。
+        finished (bool): 抽出が終了したかどうか。
+    """
+    track_index: int
+    duration: float | None = None
+    processed_seconds: float = 0.0
+    speed: float | None = None
+    finished: bool = False
+
+    @property
+    def eta_seconds(self) -> float | None:
+        """
+        抽出が終わるまでの推定残り時間（秒）。長さまたは変換速度が不明な場合はNone。
+        """
+        if self.finished:
+            return 0.0
+        if self.duration is None or not self.speed:
+            return None
+        return max(0.0, self.duration - self.processed_seconds) / self.speed
+
+class ExtractionProgress:
+    """
+    1回の音声抽出のトラックごとの進捗。
+
+    ffmpegの出力を読み込むスレッドから更新され、イベントループから参照されるため、ロックで保護します。
+    更新のたびにversionが増えるため、参照側は変化があった場合のみ進捗を通知できます。
+    """
+
+    def __init__(self):
+        """
+        ExtractionProgressを初期化します。
+        """
+        self._tracks: dict[int, TrackProgress] = {}
+        self._version = 0
+        self._lock = threading.Lock()
+
+    def start_tracks(self, durations: dict[int, float | None]):
+        """
+        抽出を開始する音声トラックを登録します。
+
+        Args:
+            durations (dict[int, float | None]): 音声トラックのインデックスと、抽出する範囲の長さ（秒）の対応。
+        """
+        with self._lock:
+            for track_index, duration in durations.items():
+                self._tracks[track_index] = TrackProgress(track_index, duration)
+            self._version += 1
+
+    def update(self, track_indices: list[int], processed_seconds: float | None, speed: float | None):
+        """
+        音声トラックの変換済みの長さと変換速度を更新します。
+
+        Args:
+            track_indices (list[int]): 同じffmpegで変換している音声トラックのインデックス。
+            processed_seconds (float | None): 変換済みの長さ（秒）。不明な場合は更新しません。
+            speed (float | None): 変換速度。不明な場合は更新しません。
+        """
+        with self._lock:
+            for track_index in track_indices:
+                track = self._tracks.get(track_index, TrackProgress(track_index))
+                if processed_seconds is not None:
+                    limit = track.duration if track.duration is not None else processed_seconds
+                    track = dataclasses.replace(track, processed_seconds=min(processed_seconds, limit))
+                if speed is not None:
+                    track = dataclasses.replace(track, speed=speed)
+                self._tracks[track_index] = track
+            self._version += 1
+
+    def finish(self, track_indices: list[int]):
+        """
+        音声トラックの抽出が終了したことを記録します。
+
+        Args:
+            track_indices (list[int]): 抽出が終了した音声トラックのインデックス。
+        """
+        with self._lock:
+            for track_index in track_indices:
+                track = self._tracks.get(track_index, TrackProgress(track_index))
+                processed_seconds = track.duration if track.duration is not None else track.processed_seconds
+                self._tracks[track_index] = dataclasses.replace(
+                    track, processed_seconds=processed_seconds, finished=True
+                )
+            self._version += 1
+
+    def snapshot(self) -> tuple[int, list[TrackProgress]]:
+        """
+        現在の進捗を取得します。
+
+        Returns:
+            tuple[int, list[TrackProgress]]: 進捗の版数と、インデックス順のトラックごとの進捗。
+        """
+        with self._lock:
+            return self._version, sorted(self._tracks.values(), key=lambda track: track.track_index)
+
+_current_progress: ContextVar[ExtractionProgress | None] = ContextVar("extraction_progress", default=None)
+
+def start_extraction_progress() -> ExtractionProgress:
+    """
+    現在のコンテキスト（ジョブ）の進捗の記録を開始します。
+
+    このコンテキストから起動されたタスクやスレッドでの音声抽出の進捗も、同じExtractionProgressに記録されます。
+
+    Returns:
+        ExtractionProgress: 記録先のExtractionProgress。
+    """
+    progress = ExtractionProgress()
+    _current_progress.set(progress)
+    return progress
+
+def current_extraction_progress() -> ExtractionProgress | None:
+    """
+    現在のコンテキストの進捗の記録先を取得します。
+
+    Returns:
+        ExtractionProgress | None: 記録先のExtractionProgress。記録が開始されていない場合はNone。
+    """
+    return _current_progress.get()
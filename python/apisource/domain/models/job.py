@@ -0,0 +1,35 @@
+from dataclasses import dataclass
+from enum import Enum
+
+class JobStatus(str, Enum):
+    """
+    音声抽出ジョブの状態。
+    """
+    QUEUED = "queued"
+    RUNNING = "running"
+    SUCCEEDED = "succeeded"
+    FAILED = "failed"
+
+@dataclass(frozen=True)
+class Job:
+    """
+    音声抽出ジョブ。
+
+    Attributes:
+        id (str): ジョブID。
+        status (JobStatus): ジョブの状態。
+        file_name (str): アップロードされたファイル名。
+        created_at (float): ジョブの作成時刻（UNIX時間）。
+        updated_at (float): ジョブの最終更新時刻（UNIX時間）。
+        expires_at (float | None): 結果の有効期限（UNIX時間）。ジョブが終了するまではNone。
+        archive_name (str | None): 結果アーカイブのファイル名。ジョブが成功するまではNone。
+        error (str | None): ジョブが失敗した理由。
+    """
+    id: str
+    status: JobStatus
+    file_name: str
+    created_at: float
+    updated_at: float
+    expires_at: float | None = None
+    archive_name: str | None = None
+    error: str | None = None
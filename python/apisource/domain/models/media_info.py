@@ -0,0 +1,37 @@
+from dataclasses import dataclass, field
+
+@dataclass(frozen=True)
+class AudioStreamInfo:
+    """
+    音声ストリームのメタデータ。
+
+    Attributes:
+        index (int): 入力ファイル内のストリームのインデックス。
+        codec_name (str): コーデック名。
+        channels (int | None): チャンネル数。
+        sample_rate (int | None): サンプリング周波数（Hz）。
+        duration (float | None): ストリームの長さ（秒）。
+        language (str | None): 言語タグ。
+        bit_rate (int | None): ビットレート（bps）。
+    """
+    index: int
+    codec_name: str
+    channels: int | None = None
+    sample_rate: int | None = None
+    duration: float | None = None
+    language: str | None = None
+    bit_rate: int | None = None
+
+@dataclass(frozen=True)
+class MediaInfo:
+    """
+    メディアファイルのメタデータ。
+
+    Attributes:
+        format_name (str): コンテナ形式名。
+        duration (float | None): メディアの長さ（秒）。
+        audio_streams (list[AudioStreamInfo]): 音声ストリームのメタデータのリスト。
+    """
+    format_name: str
+    duration: float | None = None
+    audio_streams: list[AudioStreamInfo] = field(default_factory=list)
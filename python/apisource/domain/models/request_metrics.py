@@ -0,0 +1,73 @@
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+
+@dataclass
+class RequestMetrics:
+    """
+    1リクエストの処理の内訳。
+
+    アクセスログに出力するため、処理の各段階で所要時間や入出力のサイズを記録します。
+
+    Attributes:
+        stages (dict[str, float]): 処理段階ごとの所要時間（秒）。同じ段階が複数回記録された場合は合計します。
+        input_bytes (int): 受信したファイルのバイト数。
+        track_count (int | None): 音声トラック数。解析を行っていない場合はNone。
+        response_bytes (int): 送信したレスポンスボディのバイト数。
+    """
+    stages: dict[str, float] = field(default_factory=dict)
+    input_bytes: int = 0
+    track_count: int | None = None
+    response_bytes: int = 0
+
+    def add_stage(self, name: str, seconds: float):
+        """
+        処理段階の所要時間を記録します。
+
+        Args:
+            name (str): 処理段階の名前。
+            seconds (float): 所要時間（秒）。
+        """
+        self.stages[name] = self.stages.get(name, 0.0) + seconds
+
+_current_metrics: ContextVar[RequestMetrics | None] = ContextVar("request_metrics", default=None)
+
+def start_request_metrics() -> RequestMetrics:
+    """
+    現在のコンテキスト（リクエスト）の記録を開始します。
+
+    このコンテキストから起動されたタスクやスレッドでの記録も、同じRequestMetricsに集計されます。
+
+    Returns:
+        RequestMetrics: 記録先のRequestMetrics。
+    """
+    metrics = RequestMetrics()
+    _current_metrics.set(metrics)
+    return metrics
+
+def current_request_metrics() -> RequestMetrics:
+    """
+    現在のコンテキストの記録先を取得します。
+
+    記録が開始されていない場合（リクエスト外での実行など）は、破棄される記録先を返します。
+
+    Returns:
+        RequestMetrics: 記録先のRequestMetrics。
+    """
+    return _current_metrics.get() or RequestMetrics()
+
+@contextmanager
+def measure_stage(name: str):
+    """
+    ブロックの実行時間を処理段階の所要時間として記録します。
+
+    Args:
+        name (str): 処理段階の名前。
+    """
+    metrics = current_request_metrics()
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        metrics.add_stage(name, time.perf_counter() - start)
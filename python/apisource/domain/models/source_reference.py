@@ -0,0 +1,16 @@
+from dataclasses import dataclass
+
+@dataclass(frozen=True)
+class SourceReference:
+    """
+    アップロードせずに参照するビデオファイル。
+
+    Attributes:
+        location (str): ffmpegとffprobeに入力として渡すパスまたはURL。
+        name (str): レスポンスのファイル名に使用するファイル名。
+        fingerprint (str | None): ファイルの内容が変わると変化する識別子（パス、サイズ、更新時刻、ETagなど）。
+            結果キャッシュのキーに使用します。内容の同一性を判定できない場合はNone。
+    """
+    location: str
+    name: str
+    fingerprint: str | None = None
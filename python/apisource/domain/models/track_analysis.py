@@ -0,0 +1,35 @@
+from dataclasses import dataclass, field
+from pathlib import Path
+
+@dataclass(frozen=True)
+class TrackAnalysis:
+    """
+    抽出した音声トラックの波形とラウドネスの解析結果。
+
+    Attributes:
+        track_index (int): 入力ファイル内のストリームのインデックス。
+        integrated_loudness (float | None): EBU R128の統合ラウドネス（LUFS）。
+        loudness_range (float | None): EBU R128のラウドネスレンジ（LU）。
+        true_peak (float | None): 全チャンネルのトゥルーピークの最大値（dBTP）。無音の場合はNone。
+        peaks_per_second (int): peaksの1秒あたりの要素数。
+        peaks (list[float]): 一定時間ごとの全チャンネルの最大振幅。1.0がフルスケールです。
+    """
+    track_index: int
+    integrated_loudness: float | None = None
+    loudness_range: float | None = None
+    true_peak: float | None = None
+    peaks_per_second: int = 0
+    peaks: list[float] = field(default_factory=list)
+
+def analysis_path_for(audio_file: Path) -> Path:
+    """
+    音声ファイルの解析結果を保存するJSONファイルのパスを返します。
+
+    Args:
+        audio_file (Path): 抽出した音声ファイルのパス。
+
+    Returns:
+        Path: 音声ファイルと同じディレクトリにある、解析結果のJSONファイルのパス。
+    """
+    audio_file = Path(audio_file)
+    return audio_file.with_name(f"{audio_file.stem}.analysis.json")
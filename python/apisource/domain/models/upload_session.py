@@ -0,0 +1,27 @@
+from dataclasses import dataclass
+
+@dataclass(frozen=True)
+class UploadSession:
+    """
+    再開可能なアップロードのセッション。
+
+    Attributes:
+        id (str): セッションID。
+        file_name (str): アップロードするファイル名。
+        content_type (str): アップロードするファイルのメディアタイプ。
+        length (int): ファイル全体のバイト数。
+        offset (int): 受信済みのバイト数。次のチャンクはこの位置から送信します。
+        created_at (float): セッションの作成時刻（UNIX時間）。
+        updated_at (float): 最後にチャンクを受信した時刻（UNIX時間）。
+        expires_at (float): セッションの有効期限（UNIX時間）。チャンクを受信するたびに延長されます。
+        checksum (str | None): ファイル全体のSHA-256ハッシュ値（16進数）。指定された場合は受信完了時に照合します。
+    """
+    id: str
+    file_name: str
+    content_type: str
+    length: int
+    offset: int
+    created_at: float
+    updated_at: float
+    expires_at: float
+    checksum: str | None = None
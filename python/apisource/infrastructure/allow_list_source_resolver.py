@@ -0,0 +1,346 @@
+import asyncio
+import base64
+import hashlib
+import hmac
+import http.server
+import secrets
+import shutil
+import threading
+import urllib.error
+import urllib.request
+from pathlib import Path, PurePosixPath
+from urllib.parse import quote, unquote, urlsplit
+
+from domain.interfaces.source_resolver_interface import (
+    ISourceResolver, SourceNotAllowedException, SourceNotFoundException
+)
+from domain.models.source_reference import SourceReference
+
+# URLの存在確認（HEADリクエスト）のタイムアウト秒数
+HEAD_TIMEOUT_SECONDS = 10
+
+# ffmpegとffprobeのリクエストを参照先へ中継する際の、接続と読み込みのタイムアウト秒数
+RELAY_TIMEOUT_SECONDS = 30
+
+# 参照先のレスポンスをffmpegへ中継する際のチャンクサイズ
+RELAY_CHUNK_SIZE = 64 * 1024
+
+# 参照先のレスポンスからffmpegへ中継するヘッダー（Rangeリクエストによるシークに必要なもの）
+RELAY_HEADERS = ("Content-Type", "Content-Length", "Content-Range", "Accept-Ranges", "ETag", "Last-Modified")
+
+def _download_name(path: str) -> str:
+    """
+    URLのパスから、レスポンスのファイル名に使用するファイル名を求めます。
+
+    パーセントエンコードを戻した後で末尾の要素を取り出すため、"%2F"で区切られた部分はファイル名に含めません。
+    制御文字は取り除きます。ヘッダーに含める際のエンコードはレスポンス側で行います。
+
+    Args:
+        path (str): URLのパス。
+
+    Returns:
+        str: ファイル名。パスにファイル名が含まれない場合は空文字列。
+    """
+    return "".join(c for c in PurePosixPath(unquote(path)).name if c.isprintable())
+
+class _AllowListRedirectHandler(urllib.request.HTTPRedirectHandler):
+    """
+    リダイレクト先のURLが許可されている場合のみリダイレクトに従うハンドラー。
+    """
+
+    def __init__(self, reference: str, is_allowed):
+        """
+        _AllowListRedirectHandlerを初期化します。
+
+        Args:
+            reference (str): 解決中の参照。
+            is_allowed: URLを受け取り、参照が許可されているかどうかを返す関数。
+        """
+        self.reference = reference
+        self.is_allowed = is_allowed
+
+    def redirect_request(self, req, fp, code, msg, headers, newurl):
+        """
+        リダイレクト先のURLを検証し、許可されている場合のみリダイレクト先へのリクエストを返します。
+
+        Raises:
+            SourceNotAllowedException: リダイレクト先のURLが許可されていない場合。
+        """
+        if not self.is_allowed(newurl):
+            fp.close()
+            raise SourceNotAllowedException(self.reference)
+        redirected = super().redirect_request(req, fp, code, msg, headers, newurl)
+        if redirected is not None:
+            # 既定ではリダイレクト先へGETで送信されるため、HEADのまま送信する
+            redirected.method = req.get_method()
+        return redirected
+
+class _RelayRequestHandler(http.server.BaseHTTPRequestHandler):
+    """
+    ffmpegとffprobeからのGETとHEADのリクエストを、パスに埋め込まれた参照先のURLへ中継するハンドラー。
+    """
+
+    def do_GET(self):
+        self.__forward()
+
+    def do_HEAD(self):
+        self.__forward()
+
+    def __forward(self):
+        """
+        署名を検証したうえで参照先へ同じメソッドとRangeヘッダーでリクエストし、レスポンスを返します。
+
+        参照先のリダイレクトは許可リストを適用して従い、許可されていない場所へのリダイレクトは403を返します。
+        """
+        url = self.server.target_for(self.path)
+        if url is None:
+            self.send_error(404)
+            return
+        request = urllib.request.Request(url, method=self.command)
+        if "Range" in self.headers:
+            request.add_header("Range", self.headers["Range"])
+        try:
+            response = self.server.open_url(request, RELAY_TIMEOUT_SECONDS)
+        except SourceNotAllowedException:
+            self.send_error(403)
+            return
+        except urllib.error.HTTPError as e:
+            e.close()
+            self.send_error(e.code)
+            return
+        except (urllib.error.URLError, OSError):
+            self.send_error(502)
+            return
+
+        with response:
+            self.send_response(response.status)
+            for name in RELAY_HEADERS:
+                if name in response.headers:
+                    self.send_header(name, response.headers[name])
+            self.end_headers()
+            if self.command == "GET":
+                try:
+                    shutil.copyfileobj(response, self.wfile, RELAY_CHUNK_SIZE)
+                except (BrokenPipeError, ConnectionResetError):
+                    # ffmpegはシークする際に読み込み中の接続を閉じる
+                    pass
+
+    def log_message(self, format, *args):
+        pass
+
+class _AllowListRelay(http.server.ThreadingHTTPServer):
+    """
+    ffmpegとffprobeのHTTPリクエストを、許可リストを適用して参照先へ中継するループバックのHTTPサーバー。
+
+    ffmpegは参照先が返すリダイレクトに無条件に従うため、参照先のURLを直接渡さずにこのサーバーのURLを渡します。
+    参照先のURLは署名付きでパスに埋め込むため、サーバーは参照ごとの状態を持たず、署名が一致しないリクエストは拒否します。
+    """
+
+    def __init__(self, open_url):
+        """
+        _AllowListRelayを初期化し、バックグラウンドのスレッドでリクエストの受け付けを開始します。
+
+        Args:
+            open_url: urllib.request.Requestとタイムアウト秒数を受け取り、許可リストを適用してレスポンスを返す関数。
+        """
+        super().__init__(("127.0.0.1", 0), _RelayRequestHandler)
+        self.open_url = open_url
+        self.secret = secrets.token_bytes(32)
+        self.thread = threading.Thread(target=self.serve_forever, name="source-relay", daemon=True)
+        self.thread.start()
+
+    def url_for(self, url: str, name: str) -> str:
+        """
+        参照先のURLを中継するこのサーバーのURLを返します。
+
+        Args:
+            url (str): 許可リストで検証済みの参照先のURL。
+            name (str): パスの末尾に付けるファイル名。ffmpegが形式を推定する手がかりとして使用します。
+
+        Returns:
+            str: ffmpegとffprobeに渡すURL。
+        """
+        token = base64.urlsafe_b64encode(url.encode()).decode()
+        return f"http://127.0.0.1:{self.server_port}/{self.__sign(token)}/{token}/{quote(name)}"
+
+    def target_for(self, path: str) -> str | None:
+        """
+        リクエストのパスから参照先のURLを取り出します。
+
+        Args:
+            path (str): リクエストのパス。
+
+        Returns:
+            str | None: 参照先のURL。署名が一致しない場合はNone。
+        """
+        parts = path.split("/")
+        if len(parts) < 3 or not hmac.compare_digest(parts[1], self.__sign(parts[2])):
+            return None
+        return base64.urlsafe_b64decode(parts[2]).decode()
+
+    def close(self):
+        """
+        リクエストの受け付けを停止し、待ち受けのソケットを閉じます。
+        """
+        self.shutdown()
+        self.server_close()
+        self.thread.join()
+
+    def __sign(self, token: str) -> str:
+        """
+        パスに埋め込んだ参照先のURLの署名を求めます。
+        """
+        return hmac.new(self.secret, token.encode(), hashlib.sha256).hexdigest()
+
+class AllowListSourceResolver(ISourceResolver):
+    """
+    許可リストに基づいて参照を解決するクラス。
+
+    許可されたマウントのルート配下のファイルと、許可されたプレフィックスで始まるHTTP(S)のURLのみを受け付けます。
+    ファイルはコピーせずにそのパスを、URLはループバックの中継サーバーを経由するURLをffmpegへ渡すため、
+    ffmpegが必要な範囲だけを読み込みます（HTTPの場合はRangeリクエストでシークします）。
+    中継サーバーは最初にURLを解決した時点で起動し、ffmpegのリクエストとそのリダイレクトにも許可リストを適用します。
+    """
+
+    def __init__(self, mount_roots: list[Path], url_prefixes: list[str]):
+        """
+        AllowListSourceResolverを初期化します。
+
+        Args:
+            mount_roots (list[Path]): 参照を許可するマウントのルートディレクトリ。
+            url_prefixes (list[str]): 参照を許可するURLのプレフィックス（例: "http://media.internal/videos/"）。
+        """
+        self.mount_roots = [Path(root).resolve() for root in mount_roots]
+        self.url_prefixes = [urlsplit(prefix) for prefix in url_prefixes]
+        self._relay: _AllowListRelay | None = None
+
+    def close(self):
+        """
+        中継サーバーを起動している場合は停止します。
+        """
+        if self._relay is not None:
+            self._relay.close()
+            self._relay = None
+
+    async def resolve(self, reference: str) -> SourceReference:
+        """
+        参照を検証し、ffmpegに渡す入力を決定します。
+
+        Args:
+            reference (str): マウントされたストレージ上の絶対パス、またはHTTP(S)のURL。
+
+        Returns:
+            SourceReference: 解決されたビデオファイル。
+
+        Raises:
+            SourceNotAllowedException: 許可されていない場所が指定された場合。
+            SourceNotFoundException: 指定されたファイルが存在しない場合。
+        """
+        if urlsplit(reference).scheme.lower() in ("http", "https"):
+            return await self.__resolve_url(reference)
+        return await asyncio.to_thread(self.__resolve_path, reference)
+
+    def __resolve_path(self, reference: str) -> SourceReference:
+        """
+        マウントのルート配下のファイルを解決します。
+
+        シンボリックリンクや".."を解決した後のパスで判定するため、ルート外のファイルは参照できません。
+        """
+        path = Path(reference)
+        if not path.is_absolute():
+            raise SourceNotAllowedException(reference)
+        try:
+            resolved = path.resolve(strict=True)
+        except (FileNotFoundError, RuntimeError) as e:
+            raise SourceNotFoundException(reference) from e
+        if not any(resolved.is_relative_to(root) for root in self.mount_roots):
+            raise SourceNotAllowedException(reference)
+        if not resolved.is_file():
+            raise SourceNotFoundException(reference)
+
+        stat = resolved.stat()
+        fingerprint = hashlib.sha256(f"file:{resolved}:{stat.st_size}:{stat.st_mtime_ns}".encode()).hexdigest()
+        return SourceReference(str(resolved), resolved.name, fingerprint)
+
+    async def __resolve_url(self, reference: str) -> SourceReference:
+        """
+        許可されたプレフィックスで始まるURLを解決します。
+
+        HEADリクエストで存在を確認し、ETag、Last-Modified、Content-Lengthから内容の識別子を求めます。
+        ETagもLast-Modifiedも返されない場合は内容の同一性を判定できないため、識別子をNoneとします。
+        リダイレクトされた場合は、リダイレクト先も許可されている場合のみ最終的なURLを参照先とします。
+        ffmpegには参照先を中継サーバー経由で読み込むURLを渡すため、GETのみ異なる場所へリダイレクトされても従いません。
+        """
+        url = urlsplit(reference)
+        if not self.__is_allowed_url(reference):
+            raise SourceNotAllowedException(reference)
+
+        location, headers = await asyncio.to_thread(self.__head, reference)
+        validators = [headers.get("ETag"), headers.get("Last-Modified")]
+        fingerprint = None
+        if any(validators):
+            key = ":".join([location, *(value or "" for value in validators), headers.get("Content-Length") or ""])
+            fingerprint = hashlib.sha256(f"url:{key}".encode()).hexdigest()
+        name = _download_name(url.path) or url.hostname or "source"
+        if self._relay is None:
+            self._relay = _AllowListRelay(self.__open)
+        return SourceReference(self._relay.url_for(location, name), name, fingerprint)
+
+    def __is_allowed_url(self, reference: str) -> bool:
+        """
+        URLが許可されたプレフィックスのいずれかの配下かどうかを判定します。
+        """
+        url = urlsplit(reference)
+        return any(self.__matches_prefix(url, prefix) for prefix in self.url_prefixes)
+
+    def __matches_prefix(self, url, prefix) -> bool:
+        """
+        URLのスキーム、ホスト、ポートが一致し、パスがプレフィックスのパス配下かどうかを判定します。
+
+        文字列の前方一致ではなく構成要素ごとに比較するため、"http://host.evil"や"/videos../"のような参照は一致しません。
+        """
+        if url.scheme.lower() != prefix.scheme.lower() or url.netloc.lower() != prefix.netloc.lower():
+            return False
+        if url.username or url.password or ".." in PurePosixPath(unquote(url.path)).parts:
+            return False
+        prefix_path = prefix.path if prefix.path.endswith("/") else prefix.path + "/"
+        return (url.path + "/").startswith(prefix_path)
+
+    def __head(self, reference: str) -> tuple[str, dict[str, str]]:
+        """
+        HEADリクエストを送信し、リダイレクト後の最終的なURLとレスポンスヘッダーを返します。
+
+        リダイレクトは、リダイレクト先のURLも許可されている場合のみ従います。
+
+        Raises:
+            SourceNotAllowedException: 許可されていないURLへリダイレクトされた場合。
+            SourceNotFoundException: レスポンスがエラーの場合、または接続できない場合。
+        """
+        request = urllib.request.Request(reference, method="HEAD")
+        try:
+            with self.__open(request, HEAD_TIMEOUT_SECONDS) as response:
+                return response.geturl(), dict(response.headers.items())
+        except urllib.error.HTTPError as e:
+            # エラーのレスポンスも接続を保持しているため閉じる
+            e.close()
+            raise SourceNotFoundException(reference) from e
+        except (urllib.error.URLError, OSError) as e:
+            raise SourceNotFoundException(reference) from e
+
+    def __open(self, request: urllib.request.Request, timeout: float):
+        """
+        リダイレクト先のURLも許可されている場合のみリダイレクトに従って、リクエストを送信します。
+
+        Args:
+            request (urllib.request.Request): 送信するリクエスト。
+            timeout (float): 接続と読み込みのタイムアウト秒数。
+
+        Returns:
+            http.client.HTTPResponse: レスポンス。
+
+        Raises:
+            SourceNotAllowedException: 許可されていないURLへリダイレクトされた場合。
+            urllib.error.URLError: レスポンスがエラーの場合、または接続できない場合。
+        """
+        opener = urllib.request.build_opener(_AllowListRedirectHandler(request.full_url, self.__is_allowed_url))
+        return opener.open(request, timeout=timeout)
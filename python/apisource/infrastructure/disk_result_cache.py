@@ -0,0 +1,158 @@
+import os
+import re
+import shutil
+import uuid
+from collections import OrderedDict
+from pathlib import Path
+
+from domain.interfaces.result_cache_interface import CacheStats, IResultCache
+
+class DiskResultCache(IResultCache):
+    """
+    ディスク上に抽出結果を保存するキャッシュ。
+
+    エントリの合計サイズが容量上限を超えた場合は、最後に参照された時刻が最も古いエントリから削除します（LRU）。
+    参照時刻はファイルの更新時刻にも反映するため、プロセスを再起動してもLRUの順序が引き継がれます。
+
+    IResultCacheインターフェースを実装します。
+    """
+
+    def __init__(self, root_dir: Path, max_bytes: int):
+        """
+        DiskResultCacheを初期化します。
+
+        既存のエントリを読み込み、書き込み途中で残った一時ファイルを削除します。
+
+        Args:
+            root_dir (Path): キャッシュを保存するディレクトリ。
+            max_bytes (int): キャッシュの容量上限（バイト）。
+        """
+        self.root_dir = Path(root_dir)
+        self.max_bytes = max_bytes
+        self._entries_dir = self.root_dir / "entries"
+        self._tmp_dir = self.root_dir / "tmp"
+        shutil.rmtree(self._tmp_dir, ignore_errors=True)
+        self._entries_dir.mkdir(parents=True, exist_ok=True)
+        self._tmp_dir.mkdir(parents=True, exist_ok=True)
+
+        # キャッシュキーごとのエントリのファイル名とサイズ
+        self._entries: OrderedDict[str, tuple[str, int]] = OrderedDict()
+        self._size_bytes = 0
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+        for entry in sorted(self._entries_dir.iterdir(), key=lambda path: path.stat().st_mtime):
+            size = entry.stat().st_size
+            # ファイル名はキャッシュキーに"_"または"."で始まる接尾辞を付けたもの
+            self._entries[re.split(r"[._]", entry.name, maxsplit=1)[0]] = (entry.name, size)
+            self._size_bytes += size
+        self.__evict()
+
+    def __entry_path(self, key: str) -> Path | None:
+        entry = self._entries.get(key)
+        return self._entries_dir / entry[0] if entry is not None else None
+
+    def get(self, key: str) -> Path | None:
+        """
+        キーに対応するキャッシュ済みアーカイブのパスを取得し、参照時刻を更新します。
+
+        Args:
+            key (str): キャッシュキー。
+
+        Returns:
+            Path | None: キャッシュ済みアーカイブのパス。存在しない場合はNone。
+        """
+        path = self.__entry_path(key)
+        if path is None or not path.exists():
+            self.__forget(key)
+            self._misses += 1
+            return None
+        self._entries.move_to_end(key)
+        os.utime(path)
+        self._hits += 1
+        return path
+
+    def reserve(self, key: str) -> Path:
+        """
+        キャッシュへ保存するアーカイブの書き込み先となる一時ファイルのパスを払い出します。
+
+        Args:
+            key (str): キャッシュキー。
+
+        Returns:
+            Path: 一時ファイルのパス。
+        """
+        return self._tmp_dir / f"{key}.{uuid.uuid4().hex}"
+
+    def commit(self, key: str, temp_path: Path, suffix: str = ""):
+        """
+        書き込みが完了した一時ファイルをキャッシュへ登録し、容量上限を超えた分のエントリを削除します。
+
+        容量上限より大きいアーカイブは登録せずに破棄します。
+
+        Args:
+            key (str): キャッシュキー。
+            temp_path (Path): reserveで払い出された一時ファイルのパス。
+            suffix (str): エントリのファイル名に付ける、"_"または"."で始まる接尾辞。
+        """
+        size = temp_path.stat().st_size
+        if size > self.max_bytes:
+            self.discard(temp_path)
+            return
+        self.__remove(key)
+        file_name = key + suffix
+        os.replace(temp_path, self._entries_dir / file_name)
+        self._entries[key] = (file_name, size)
+        self._size_bytes += size
+        self.__evict()
+
+    def discard(self, temp_path: Path):
+        """
+        書き込みを中断した一時ファイルを削除します。
+
+        Args:
+            temp_path (Path): reserveで払い出された一時ファイルのパス。
+        """
+        temp_path.unlink(missing_ok=True)
+
+    def stats(self) -> CacheStats:
+        """
+        キャッシュの統計情報を取得します。
+
+        Returns:
+            CacheStats: キャッシュの統計情報。
+        """
+        return CacheStats(
+            hits=self._hits,
+            misses=self._misses,
+            evictions=self._evictions,
+            entries=len(self._entries),
+            size_bytes=self._size_bytes,
+            max_bytes=self.max_bytes,
+        )
+
+    def __forget(self, key: str):
+        """
+        エントリを管理情報から取り除きます。
+        """
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self._size_bytes -= entry[1]
+
+    def __remove(self, key: str):
+        """
+        エントリを管理情報とディスクの両方から削除します。
+        """
+        path = self.__entry_path(key)
+        self.__forget(key)
+        if path is not None:
+            path.unlink(missing_ok=True)
+
+    def __evict(self):
+        """
+        容量上限を下回るまで、参照時刻の古いエントリから削除します。
+        """
+        while self._size_bytes > self.max_bytes and self._entries:
+            key = next(iter(self._entries))
+            self.__remove(key)
+            self._evictions += 1
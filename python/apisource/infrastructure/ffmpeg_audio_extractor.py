@@ -1,9 +1,391 @@
 import ffmpeg
+from collections.abc import AsyncIterable, AsyncIterator
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import List
+from contextlib import asynccontextmanager
+from typing import List, NamedTuple
 import asyncio
+import dataclasses
+import json
+import math
+import os
+import shutil
+import signal
+import sys
+import threading
+import time
 
-from domain.interfaces.audio_extractor_interface import IAudioExtractor, AudioExtractionFailedException
+from domain.interfaces.audio_extractor_interface import (
+    IAudioExtractor, AudioExtractionFailedException, ExtractorBusyException, NoAudioStreamException,
+    NoMatchingAudioTrackException
+)
+from domain.interfaces.media_prober_interface import IMediaProber
+from domain.interfaces.scratch_space_interface import IScratchSpace, ScratchSpaceExhaustedException
+from domain.models.extraction_options import ExtractionOptions, OutputFormat
+from domain.models.media_info import AudioStreamInfo, MediaInfo
+from domain.models.extraction_progress import ExtractionProgress, current_extraction_progress
+from domain.models.request_metrics import current_request_metrics
+from domain.models.track_analysis import TrackAnalysis, analysis_path_for
+from infrastructure.ffmpeg_scheduler import FFmpegJobScheduler
+from infrastructure.ffmpeg_segment_planner import (
+    Segment, SegmentAnchor, SegmentCodec, concat_list, drop_packets_filter, parse_anchor, plan_track_segments,
+    segment_input_args, snap_expression
+)
+from infrastructure.ffprobe_media_prober import FFprobeMediaProber
+from infrastructure.metrics import FFMPEG_CPU_SECONDS, FFMPEG_EXITS, FFMPEG_PEAK_RSS_BYTES
+
+# 全トラックを1回のffmpeg実行でまとめて抽出するモード
+SINGLE_PASS_MODE = "single_pass"
+# トラックごとにffmpegを起動して抽出するモード
+PER_TRACK_MODE = "per_track"
+EXTRACTION_MODES = (SINGLE_PASS_MODE, PER_TRACK_MODE)
+
+# ffmpegごとに専用で起動する入出力用のスレッド数（標準出力と標準エラー出力の読み捨て、標準入力への書き込み）
+FFMPEG_IO_THREADS = 3
+
+class _FormatProfile(NamedTuple):
+    """
+    出力形式ごとの設定。
+
+    Attributes:
+        extension (str): 出力ファイルの拡張子。
+        copy_codecs (frozenset[str] | None): ストリームコピーで格納できるコーデック。Noneの場合はすべてのコーデック。
+        encoder_args (dict): 再エンコードする場合のffmpegの出力引数。
+    """
+    extension: str
+    copy_codecs: frozenset[str] | None
+    encoder_args: dict
+
+FORMAT_PROFILES = {
+    OutputFormat.AAC: _FormatProfile(".aac", frozenset({"aac"}), {"acodec": "aac", "audio_bitrate": "192k"}),
+    OutputFormat.M4A: _FormatProfile(".m4a", frozenset({"aac", "alac"}), {"acodec": "aac", "audio_bitrate": "192k"}),
+    OutputFormat.MP3: _FormatProfile(".mp3", frozenset({"mp3"}), {"acodec": "libmp3lame", "audio_bitrate": "192k"}),
+    OutputFormat.OGG: _FormatProfile(".ogg", frozenset({"opus", "vorbis", "flac"}), {"acodec": "libopus", "audio_bitrate": "128k"}),
+    OutputFormat.OPUS: _FormatProfile(".opus", frozenset({"opus"}), {"acodec": "libopus", "audio_bitrate": "128k"}),
+    OutputFormat.FLAC: _FormatProfile(".flac", frozenset({"flac"}), {"acodec": "flac"}),
+    OutputFormat.MKA: _FormatProfile(".mka", None, {"acodec": "aac", "audio_bitrate": "192k"}),
+}
+
+# OutputFormat.AUTOの場合に、元のコーデックをそのまま格納する出力形式
+AUTO_FORMATS = {
+    "aac": OutputFormat.AAC,
+    "alac": OutputFormat.M4A,
+    "mp3": OutputFormat.MP3,
+    "opus": OutputFormat.OGG,
+    "vorbis": OutputFormat.OGG,
+    "flac": OutputFormat.FLAC,
+}
+
+# MPEG-TSのパケット長と同期バイト
+TS_PACKET_SIZE = 188
+TS_SYNC_BYTE = 0x47
+# Matroska/WebMのEBMLヘッダーのマジックナンバー
+EBML_MAGIC = b"\x1a\x45\xdf\xa3"
+# M2TS（BDAV）のパケット長。4バイトのタイムコードに続いてMPEG-TSのパケットが格納される
+M2TS_PACKET_SIZE = 192
+# MP4/MOV/3GPのファイル先頭に置かれるトップレベルのボックスの種類
+MP4_LEADING_BOXES = frozenset({b"ftyp", b"moov", b"mdat", b"free", b"skip", b"wide", b"pnot"})
+# 先頭のバイト列で判別できるコンテナ形式のマジックナンバー
+CONTAINER_MAGICS = (
+    EBML_MAGIC,                                             # Matroska/WebM
+    b"FLV\x01",                                             # FLV
+    b"OggS",                                                # Ogg
+    b"\x00\x00\x01\xba",                                     # MPEG-PS（VOB、MPG）
+    bytes.fromhex("3026b2758e66cf11a6d900aa0062ce6c"),      # ASF（WMV）
+)
+
+def _has_sync_bytes(head: bytes, offset: int, packet_size: int) -> bool:
+    """
+    先頭部分の範囲で、一定間隔のパケットの先頭がすべてMPEG-TSの同期バイトかどうかを判定します。
+
+    Args:
+        head (bytes): ファイルの先頭部分のバイトデータ。
+        offset (int): 最初のパケットの同期バイトの位置。
+        packet_size (int): パケット長。
+
+    Returns:
+        bool: 最初のパケットを含め、先頭部分に含まれる最大4パケットの同期バイトが一致した場合はTrue。
+    """
+    if head[offset:offset + 1] != bytes([TS_SYNC_BYTE]):
+        return False
+    return all(
+        head[position] == TS_SYNC_BYTE
+        for position in range(offset + packet_size, min(len(head), offset + packet_size * 4), packet_size)
+    )
+
+# 波形とラウドネスの解析に使用するサンプリング周波数（ebur128フィルターの入力と同じ）
+ANALYSIS_SAMPLE_RATE = 48000
+# 波形のピークの1秒あたりの要素数
+ANALYSIS_PEAKS_PER_SECOND = 10
+# ametadataフィルターが書き出す解析結果のキー
+PEAK_LEVEL_KEY = "lavfi.astats.Overall.Peak_level"
+INTEGRATED_LOUDNESS_KEY = "lavfi.r128.I"
+LOUDNESS_RANGE_KEY = "lavfi.r128.LRA"
+TRUE_PEAK_KEY_PREFIX = "lavfi.r128.true_peaks_ch"
+
+def _mp4_moov_precedes_mdat(head: bytes) -> bool:
+    """
+    MP4/MOVのトップレベルのボックスを先頭から辿り、moovボックスがmdatボックスより前にあるかどうかを判定します。
+
+    フラグメント化MP4やfaststart済みのMP4はmoovが先頭側にあるため、シークせずに読み込めます。
+
+    Args:
+        head (bytes): ファイルの先頭部分のバイトデータ。
+
+    Returns:
+        bool: 先頭部分の範囲でmdatより前にmoovが見つかった場合はTrue。
+    """
+    if head[4:8] != b"ftyp":
+        return False
+    offset = 0
+    while offset + 8 <= len(head):
+        size = int.from_bytes(head[offset:offset + 4], "big")
+        box_type = head[offset + 4:offset + 8]
+        if box_type == b"moov":
+            return True
+        if box_type == b"mdat":
+            return False
+        if size == 1:
+            if offset + 16 > len(head):
+                return False
+            size = int.from_bytes(head[offset + 8:offset + 16], "big")
+        if size < 8:
+            # size == 0はファイル末尾までのボックスを表すため、以降にmoovは存在しない
+            return False
+        offset += size
+    return False
+
+def _select_tracks(video_path: str, options: ExtractionOptions, media_info: MediaInfo) -> list[AudioStreamInfo]:
+    """
+    オプションで指定された抽出対象の音声トラックを選択します。
+
+    Args:
+        video_path (str): ビデオファイルのパス。例外のメッセージに使用します。
+        options (ExtractionOptions): 音声抽出のオプション。
+        media_info (MediaInfo): ビデオファイルのメタデータ。
+
+    Returns:
+        list[AudioStreamInfo]: 抽出対象の音声トラック。
+
+    Raises:
+        NoAudioStreamException: ファイルに音声トラックが含まれていない場合。
+        NoMatchingAudioTrackException: 指定されたトラック番号や言語に一致する音声トラックがない場合。
+    """
+    if not media_info.audio_streams:
+        raise NoAudioStreamException(video_path)
+    tracks = options.select_tracks(media_info.audio_streams)
+    if not tracks:
+        raise NoMatchingAudioTrackException(video_path)
+    return tracks
+
+def _input_args(options: ExtractionOptions) -> dict:
+    """
+    抽出する範囲をffmpegの入力引数に変換します。
+
+    -ssと-tを入力側に指定するため、ffmpegは開始位置までキーフレーム単位でシークし、
+    範囲外のデータをデコードせずに読み飛ばします。
+
+    Args:
+        options (ExtractionOptions): 音声抽出のオプション。
+
+    Returns:
+        dict: ffmpegの入力引数。
+    """
+    input_args = {}
+    if options.start:
+        input_args["ss"] = options.start
+    if options.end is not None:
+        input_args["t"] = options.end - (options.start or 0)
+    return input_args
+
+def _metadata_path_for(output_path: Path) -> Path:
+    """
+    音声ファイルの解析中にametadataフィルターがフレームごとのメタデータを書き出すファイルのパスを返します。
+
+    Args:
+        output_path (Path): 抽出した音声の保存先のパス。
+
+    Returns:
+        Path: メタデータを書き出すファイルのパス。
+    """
+    return output_path.with_name(f"{output_path.stem}.analysis.txt")
+
+def _analysis_output(stream, output_path: Path, thread_args: dict):
+    """
+    音声ストリームの波形とラウドネスを解析し、フレームごとのメタデータをファイルに書き出す出力を組み立てます。
+
+    抽出用の出力と同じffmpegに追加するため、入力の読み込みとデマックス（再エンコードする場合はデコードも）は
+    抽出と共有されます。一定の長さのフレームに分割してからebur128とastatsを適用し、フレームごとの最大振幅と、
+    その時点までのラウドネスを書き出します。
+
+    Args:
+        stream: 解析する音声ストリーム。
+        output_path (Path): 抽出した音声の保存先のパス。
+        thread_args (dict): スレッド数の引数。
+
+    Returns:
+        ffmpeg-pythonの出力ストリーム。
+    """
+    return (
+        stream
+        .filter("aresample", ANALYSIS_SAMPLE_RATE)
+        .filter("asetnsamples", n=ANALYSIS_SAMPLE_RATE // ANALYSIS_PEAKS_PER_SECOND, p=0)
+        .filter("ebur128", metadata=1, peak="true")
+        .filter("astats", metadata=1, reset=1, measure_perchannel="none", measure_overall="Peak_level")
+        .filter("ametadata", mode="print", file=str(_metadata_path_for(output_path)))
+        .output("-", f="null", **thread_args)
+    )
+
+def _finite_or_none(value: float) -> float | None:
+    """
+    有限の値の場合は小数第2位に丸めて返し、無限大や非数の場合はNoneを返します。
+    """
+    return round(value, 2) if math.isfinite(value) else None
+
+def _parse_analysis(metadata_path: Path, track_index: int) -> TrackAnalysis:
+    """
+    ametadataフィルターが書き出したフレームごとのメタデータから、トラックの解析結果を求めます。
+
+    波形のピークはフレームごとの最大振幅（dBFS）をフルスケールに対する比に変換します。
+    ラウドネスとトゥルーピークはebur128フィルターが累積した値のため、キーごとに最後に出力された値を使用します。
+    最後のフレームにはebur128フィルターの値が含まれない場合があるため、フレームをまたいで値を保持します。
+
+    Args:
+        metadata_path (Path): メタデータのファイルのパス。
+        track_index (int): 音声トラックのインデックス。
+
+    Returns:
+        TrackAnalysis: 解析結果。
+    """
+    peaks = []
+    loudness: dict[str, str] = {}
+    with open(metadata_path, encoding="utf-8") as metadata_file:
+        for line in metadata_file:
+            if line.startswith("frame:"):
+                continue
+            key, separator, value = line.strip().partition("=")
+            if not separator:
+                continue
+            if key == PEAK_LEVEL_KEY:
+                level = float(value)
+                peaks.append(round(10 ** (level / 20), 4) if math.isfinite(level) else 0.0)
+            else:
+                loudness[key] = value
+
+    true_peaks = [float(value) for key, value in loudness.items() if key.startswith(TRUE_PEAK_KEY_PREFIX)]
+    true_peak = max(true_peaks, default=0.0)
+    return TrackAnalysis(
+        track_index=track_index,
+        integrated_loudness=_finite_or_none(float(loudness.get(INTEGRATED_LOUDNESS_KEY, "nan"))),
+        loudness_range=_finite_or_none(float(loudness.get(LOUDNESS_RANGE_KEY, "nan"))),
+        true_peak=_finite_or_none(20 * math.log10(true_peak)) if true_peak > 0 else None,
+        peaks_per_second=ANALYSIS_PEAKS_PER_SECOND,
+        peaks=peaks,
+    )
+
+def _write_analysis(output_path: Path, track_index: int):
+    """
+    解析中に書き出されたメタデータを解析結果のJSONファイルに変換し、メタデータのファイルを削除します。
+
+    Args:
+        output_path (Path): 抽出した音声の保存先のパス。
+        track_index (int): 音声トラックのインデックス。
+    """
+    metadata_path = _metadata_path_for(output_path)
+    try:
+        analysis = _parse_analysis(metadata_path, track_index)
+    finally:
+        metadata_path.unlink(missing_ok=True)
+    analysis_path_for(output_path).write_text(json.dumps(dataclasses.asdict(analysis)), encoding="utf-8")
+
+def _parse_speed(value: str | None) -> float | None:
+    """
+    ffmpegの進捗のspeed（"1.5x"など）を倍率に変換します。計測前（"N/A"）などで変換できない場合はNoneを返します。
+    """
+    try:
+        return float((value or "").rstrip("x"))
+    except ValueError:
+        return None
+
+def _read_progress(stdout, on_progress):
+    """
+    ffmpegが-progressで標準出力に書き出す進捗を読み込み、報告ごとに変換済みの長さと変換速度を通知します。
+
+    標準出力を読み捨てるスレッドで実行するため、イベントループをブロックしません。
+    報告は"key=value"形式の行の並びで、"progress=continue"または"progress=end"の行で区切られます。
+
+    Args:
+        stdout: ffmpegの標準出力。
+        on_progress: 変換済みの長さ（秒、不明な場合はNone）と変換速度（不明な場合はNone）を受け取る関数。
+    """
+    report: dict[str, str] = {}
+    for line in iter(stdout.readline, b""):
+        key, separator, value = line.decode("ascii", errors="replace").strip().partition("=")
+        if not separator:
+            continue
+        if key != "progress":
+            report[key] = value
+            continue
+        # out_time_msも実際にはマイクロ秒単位（古いffmpegはout_time_usを出力しない）
+        out_time_us = report.get("out_time_us", report.get("out_time_ms", ""))
+        processed_seconds = int(out_time_us) / 1_000_000 if out_time_us.lstrip("-").isdigit() else None
+        on_progress(processed_seconds, _parse_speed(report.get("speed")))
+        report = {}
+
+def _reap(process):
+    """
+    ffmpegのプロセスの終了を待ち、プロセスのリソース使用量を取得します。
+
+    os.wait4でプロセスを回収するため、並行して実行されている他のffmpegの使用量が混ざりません。
+    os.wait4が使用できない環境では終了のみを待ちます。
+
+    Args:
+        process: ffmpegのプロセス。
+
+    Returns:
+        resource.struct_rusage | None: プロセスのリソース使用量。取得できない場合はNone。
+    """
+    if not hasattr(os, "wait4"):
+        process.wait()
+        return None
+    _, status, rusage = os.wait4(process.pid, 0)
+    process.returncode = os.waitstatus_to_exitcode(status)
+    return rusage
+
+def _terminate(process):
+    """
+    実行中のffmpegのプロセスを強制終了します。既に回収済みの場合は何もしません。
+
+    プロセスの回収はos.wait4を呼び出しているスレッドに任せるため、回収を試みるPopen.killは
+    os.wait4が使用できない環境でのみ使用します。
+
+    Args:
+        process: ffmpegのプロセス。
+    """
+    if process.returncode is not None:
+        return
+    try:
+        if hasattr(os, "wait4"):
+            os.kill(process.pid, signal.SIGKILL)
+        else:
+            process.kill()
+    except ProcessLookupError:
+        pass
+
+def _record_process_metrics(returncode: int, rusage):
+    """
+    終了したffmpegのCPU時間、最大常駐メモリ、終了結果をメトリクスに記録します。
+
+    Args:
+        returncode (int): 終了コード。
+        rusage (resource.struct_rusage | None): プロセスのリソース使用量。
+    """
+    FFMPEG_EXITS.inc(outcome="success" if returncode == 0 else "failure")
+    if rusage is None:
+        return
+    FFMPEG_CPU_SECONDS.observe(rusage.ru_utime + rusage.ru_stime)
+    # ru_maxrssはLinuxではKiB単位、macOSではバイト単位
+    FFMPEG_PEAK_RSS_BYTES.observe(rusage.ru_maxrss * (1 if sys.platform == "darwin" else 1024))
 
 class FFmpegAudioExtractor(IAudioExtractor):
     """
@@ -12,20 +394,340 @@ class FFmpegAudioExtractor(IAudioExtractor):
     IAudioExtractorインターフェースを実装します。
     """
 
-    def __get_audio_tracks(self, video_path: str):
+    def __init__(
+        self,
+        mode: str = SINGLE_PASS_MODE,
+        prober: IMediaProber | None = None,
+        scheduler: FFmpegJobScheduler | None = None,
+        segment_min_duration: float = 0,
+        max_segments: int | None = None,
+        scratch_space: IScratchSpace | None = None,
+    ):
+        """
+        FFmpegAudioExtractorを初期化します。
+
+        Args:
+            mode (str): 抽出モード。SINGLE_PASS_MODEの場合は1回のffmpeg実行で全トラックを抽出し、
+                PER_TRACK_MODEの場合はトラックごとにffmpegを起動します。
+            prober (IMediaProber | None): 音声トラックの取得に使用するメディア解析器。
+                Noneの場合はFFprobeMediaProberを使用します。
+            scheduler (FFmpegJobScheduler | None): ffmpegの同時実行数を制御するスケジューラー。
+                Noneの場合は同時実行数を制限しません。
+            segment_min_duration (float): 1つの音声トラックのみをSEGMENT_CODECSのエンコーダーと出力形式で再エンコードする
+                場合に、区間に分割して並列に変換する抽出範囲の最短の長さ（秒）。0の場合は分割しません。
+            max_segments (int | None): 区間並列変換で分割する区間の最大数。
+                Noneの場合はスケジューラーの同時実行数（スケジューラーがない場合はCPUコア数）。
+            scratch_space (IScratchSpace | None): 出力先の作業ディレクトリが属する一時作業領域。
+                抽出した音声と区間並列変換の中間ファイルのバイト数を使用量に計上します。Noneの場合は計上しません。
+
+        Raises:
+            ValueError: 未知の抽出モードが指定された場合。
+        """
+        if mode not in EXTRACTION_MODES:
+            raise ValueError(f"Unknown extraction mode: {mode}")
+        self.mode = mode
+        self.prober = prober or FFprobeMediaProber()
+        self.scheduler = scheduler
+        self.segment_min_duration = segment_min_duration
+        if max_segments is None:
+            max_segments = scheduler.max_concurrent_jobs if scheduler is not None else os.cpu_count() or 1
+        self.max_segments = max_segments
+        self.scratch_space = scratch_space
+
+    def __charge(self, path: Path) -> int:
+        """
+        ffmpegが書き出したファイルのバイト数を、一時作業領域の使用量に計上します。
+
+        Args:
+            path (Path): 書き出されたファイルのパス。
+
+        Returns:
+            int: 計上したバイト数。
+
+        Raises:
+            ScratchSpaceExhaustedException: 計上すると容量上限を超える場合。
+        """
+        if self.scratch_space is None:
+            return 0
+        size = path.stat().st_size
+        self.scratch_space.charge(path, size)
+        return size
+
+    def __plan_output(self, track: AudioStreamInfo, output_dir: Path, options: ExtractionOptions) -> tuple[Path, dict]:
+        """
+        音声トラックの出力先とffmpegの出力引数を決定します。
+
+        元のコーデックが出力形式に格納できる場合はストリームコピーし、そうでない場合のみ再エンコードします。
+
+        Args:
+            track (AudioStreamInfo): 音声トラックのメタデータ。
+            output_dir (Path): 抽出した音声を保存するディレクトリ。
+            options (ExtractionOptions): 音声抽出のオプション。
+
+        Returns:
+            tuple[Path, dict]: 出力先のパスとffmpegの出力引数。
+        """
+        codec_name = track.codec_name
+        output_format = options.output_format
+        if output_format == OutputFormat.AUTO:
+            output_format = AUTO_FORMATS.get(codec_name, OutputFormat.MKA)
+        profile = FORMAT_PROFILES[output_format]
+
+        output_path = output_dir / f"audio_track_{track.index}{profile.extension}"
+        can_copy = profile.copy_codecs is None or codec_name in profile.copy_codecs
+        if options.passthrough and can_copy:
+            return output_path, {"acodec": "copy"}
+        return output_path, profile.encoder_args
+
+    def __start_progress(self, media_info: MediaInfo, options: ExtractionOptions):
+        """
+        進捗の記録が開始されている場合に、抽出する音声トラックとその長さを登録します。
+
+        トラックの長さが解析できなかった場合は、メディア全体の長さを使用します。
+
+        Args:
+            media_info (MediaInfo): ビデオファイルのメタデータ。
+            options (ExtractionOptions): 音声抽出のオプション。
+        """
+        progress = current_extraction_progress()
+        if progress is None:
+            return
+        progress.start_tracks({
+            track.index: options.clip_duration(track.duration if track.duration is not None else media_info.duration)
+            for track in options.select_tracks(media_info.audio_streams)
+        })
+
+    @asynccontextmanager
+    async def __slot(self, owner: object, admitted: bool):
+        """
+        スケジューラーからffmpegの実行枠を確保します。
+
+        Args:
+            owner (object): ジョブの依頼元を識別するキー。
+            admitted (bool): 受け付け済みのジョブかどうか。
+
+        Returns:
+            AsyncIterator[dict]: ffmpegの出力に追加するスレッド数の引数。
+        """
+        if self.scheduler is None:
+            yield {}
+            return
+        async with self.scheduler.slot(owner, admitted) as threads:
+            yield {"threads": threads}
+
+    async def __run(
+        self,
+        build_stream_spec,
+        owner: object,
+        admitted: bool = False,
+        input_chunks: AsyncIterable[bytes] | None = None,
+        track_indices: list[int] | None = None,
+        on_progress=None,
+    ) -> float:
         """
-        ビデオファイルから利用可能な音声トラックを取得します。
+        スケジューラーから実行枠を確保してffmpegを実行し、終了するまで待機します。
+
+        実行枠の確保を待った時間は、処理段階queueの所要時間として記録します。
+        進捗の記録が開始されている場合は、ffmpegの-progressの報告を変換中の音声トラックの進捗として記録します。
 
         Args:
-            video_path (str): 音声トラックを取得するビデオファイルのパス。
+            build_stream_spec: スレッド数の引数を受け取り、実行するffmpeg-pythonの出力ストリームを返す関数。
+            owner (object): ジョブの依頼元を識別するキー。
+            admitted (bool): 受け付け済みのジョブかどうか。
+            input_chunks (AsyncIterable[bytes] | None): ffmpegの標準入力へ渡すデータ。Noneの場合は標準入力を使用しません。
+            track_indices (list[int] | None): このffmpegで変換する音声トラックのインデックス。
+            on_progress: ffmpegの進捗の報告を受け取る関数。指定した場合はtrack_indicesの進捗の代わりに報告を渡します。
 
         Returns:
-            list: 利用可能な音声トラックのインデックスリスト。
+            float: ffmpegの実行にかかった時間（秒）。
+
+        Raises:
+            AudioExtractionFailedException: ffmpegが異常終了した場合。
+            ExtractorBusyException: 実行待ちのジョブが上限に達している場合。
         """
-        probe = ffmpeg.probe(video_path, v='error', select_streams='a', show_entries='stream=index')
-        return [stream['index'] for stream in probe['streams']]
+        queued_at = time.perf_counter()
+        async with self.__slot(owner, admitted) as thread_args:
+            started_at = time.perf_counter()
+            current_request_metrics().add_stage("queue", started_at - queued_at)
+            stream_spec = build_stream_spec(thread_args)
+            progress = current_extraction_progress()
+            if on_progress is None and progress is not None and track_indices:
+                on_progress = self.__progress_reporter(progress, track_indices)
+            if on_progress is not None:
+                stream_spec = stream_spec.global_args("-progress", "pipe:1", "-nostats")
+            # パイプの入出力はffmpegの実行中ずっとスレッドを占有するため、共有の既定のスレッドプールは使用しない
+            # （同時に実行するffmpegが増えると、プールのスレッドが尽きて書き込みが進まなくなる）
+            io_threads = ThreadPoolExecutor(FFMPEG_IO_THREADS, thread_name_prefix="ffmpeg-io")
+            try:
+                if input_chunks is None:
+                    process = stream_spec.run_async(quiet=True)
+                    rusage = await self.__wait(process, io_threads, on_progress)
+                else:
+                    process = stream_spec.run_async(pipe_stdin=True, quiet=True)
+                    rusage = await self.__feed(process, input_chunks, io_threads, on_progress)
+            finally:
+                # プロセスは回収済みのため、残ったスレッドもパイプが閉じられて間もなく終了する
+                io_threads.shutdown(wait=False)
+            elapsed = time.perf_counter() - started_at
+        _record_process_metrics(process.returncode, rusage)
+        if process.returncode != 0:
+            raise AudioExtractionFailedException(f"ffmpeg exited with code {process.returncode}")
+        if progress is not None and track_indices:
+            progress.finish(track_indices)
+        return elapsed
 
-    async def __extract_audio(self, video_path: str, output_path: Path, track_index: int):
+    def __progress_reporter(self, progress: ExtractionProgress, track_indices: list[int]):
+        """
+        ffmpegの進捗の報告を、変換中の音声トラックの進捗として記録する関数を返します。
+
+        Args:
+            progress (ExtractionProgress): 進捗の記録先。
+            track_indices (list[int]): このffmpegで変換する音声トラックのインデックス。
+
+        Returns:
+            変換済みの長さと変換速度を受け取る関数。
+        """
+        def report(processed_seconds: float | None, speed: float | None):
+            progress.update(track_indices, processed_seconds, speed)
+        return report
+
+    def __segment_progress_reporters(self, progress: ExtractionProgress, track_index: int, count: int) -> list:
+        """
+        区間ごとのffmpegの進捗の報告を合算し、音声トラック全体の進捗として記録する関数を返します。
+
+        変換済みの長さは全区間の合計、変換速度は並列に変換している区間の速度の合計とします。
+
+        Args:
+            progress (ExtractionProgress): 進捗の記録先。
+            track_index (int): 変換する音声トラックのインデックス。
+            count (int): 区間の数。
+
+        Returns:
+            list: 区間ごとに、変換済みの長さと変換速度を受け取る関数のリスト。
+        """
+        processed = [0.0] * count
+        speeds: list[float | None] = [None] * count
+        # 各区間の報告は、それぞれのffmpegの出力を読み込むスレッドから届く
+        lock = threading.Lock()
+
+        def reporter(segment: int):
+            def report(processed_seconds: float | None, speed: float | None):
+                with lock:
+                    if processed_seconds is not None:
+                        processed[segment] = processed_seconds
+                    if speed is not None:
+                        speeds[segment] = speed
+                    total_seconds = sum(processed)
+                    total_speed = sum(speed for speed in speeds if speed) or None
+                progress.update([track_index], total_seconds, total_speed)
+            return report
+        return [reporter(segment) for segment in range(count)]
+
+    async def __wait(self, process, io_threads: ThreadPoolExecutor, on_progress=None):
+        """
+        ffmpegの標準出力と標準エラー出力を読み捨てながら、ffmpegが終了するまで待機します。
+
+        待機中にキャンセルされた場合（クライアントの切断や制限時間の超過など）は、結果が使われない変換を続けさせないよう
+        ffmpegを強制終了させ、プロセスを回収してからキャンセルを伝播させます。
+
+        Args:
+            process: ffmpegのプロセス。
+            io_threads (ThreadPoolExecutor): このffmpegの入出力専用のスレッドプール。
+            on_progress: 標準出力に書き出された進捗の報告を受け取る関数。Noneの場合は標準出力を読み捨てます。
+
+        Returns:
+            resource.struct_rusage | None: プロセスのリソース使用量。
+        """
+        # 読み終えたパイプはプロセスの回収を待たずに閉じる
+        def drain_stdout():
+            try:
+                if on_progress is None:
+                    process.stdout.read()
+                else:
+                    _read_progress(process.stdout, on_progress)
+            finally:
+                process.stdout.close()
+
+        def drain_stderr():
+            try:
+                process.stderr.read()
+            finally:
+                process.stderr.close()
+
+        async def drain_and_reap():
+            loop = asyncio.get_running_loop()
+            await asyncio.gather(
+                loop.run_in_executor(io_threads, drain_stdout),
+                loop.run_in_executor(io_threads, drain_stderr),
+            )
+            return await loop.run_in_executor(io_threads, _reap, process)
+
+        reaped = asyncio.ensure_future(drain_and_reap())
+        try:
+            return await asyncio.shield(reaped)
+        except asyncio.CancelledError:
+            _terminate(process)
+            # 出力ファイルの削除が書き込み中のffmpegと競合しないよう、プロセスの回収を待つ
+            await asyncio.wait({reaped})
+            raise
+
+    async def __feed(
+        self, process, input_chunks: AsyncIterable[bytes], io_threads: ThreadPoolExecutor, on_progress=None
+    ):
+        """
+        受信したデータを順にffmpegの標準入力へ書き込み、ffmpegが終了するまで待機します。
+
+        標準出力と標準エラー出力は書き込みと並行して読み捨て、パイプが詰まってffmpegが停止しないようにします。
+        ffmpegが途中で終了した場合は、残りのデータを書き込まずに終了を待ちます。
+
+        Args:
+            process: 標準入力をパイプで接続して起動したffmpegのプロセス。
+            input_chunks (AsyncIterable[bytes]): ffmpegの標準入力へ渡すデータ。
+            io_threads (ThreadPoolExecutor): このffmpegの入出力専用のスレッドプール。
+            on_progress: 標準出力に書き出された進捗の報告を受け取る関数。
+
+        Returns:
+            resource.struct_rusage | None: プロセスのリソース使用量。
+        """
+        loop = asyncio.get_running_loop()
+        wait = asyncio.ensure_future(self.__wait(process, io_threads, on_progress))
+        try:
+            async for chunk in input_chunks:
+                try:
+                    await loop.run_in_executor(io_threads, process.stdin.write, chunk)
+                except BrokenPipeError:
+                    break
+        except BaseException:
+            # 入力が途中で途切れた場合は、不完全なデータで変換を続けないよう終了させる
+            _terminate(process)
+            self.__close_stdin(process)
+            await wait
+            raise
+        self.__close_stdin(process)
+        return await wait
+
+    def __close_stdin(self, process):
+        """
+        ffmpegの標準入力を閉じ、入力の終端を通知します。
+
+        Args:
+            process: 標準入力をパイプで接続して起動したffmpegのプロセス。
+        """
+        try:
+            process.stdin.close()
+        except BrokenPipeError:
+            pass
+
+    async def __extract_audio(
+        self,
+        video_path: str,
+        output_path: Path,
+        track_index: int,
+        output_args: dict,
+        owner: object,
+        input_args: dict,
+        analyze: bool = False,
+    ) -> Path:
         """
         指定された音声トラックを抽出して保存します。
 
@@ -33,21 +735,292 @@ class FFmpegAudioExtractor(IAudioExtractor):
             video_path (str): 音声を抽出するビデオファイルのパス。
             output_path (Path): 抽出した音声を保存するパス。
             track_index (int): 抽出する音声トラックのインデックス。
+            output_args (dict): ffmpegの出力引数。
+            owner (object): ジョブの依頼元を識別するキー。
+            input_args (dict): ffmpegの入力引数（抽出する範囲）。
+            analyze (bool): 同じffmpegの実行で波形とラウドネスを解析するかどうか。
+
+        Returns:
+            Path: 抽出した音声ファイルのパス。
+
+        Raises:
+            AudioExtractionFailedException: ffmpegが異常終了した場合。
+        """
+        def build_stream_spec(thread_args: dict):
+            input_stream = ffmpeg.input(video_path, **input_args)
+            output = input_stream.output(str(output_path), map=f"0:{track_index}", **output_args, **thread_args)
+            if not analyze:
+                return output
+            return ffmpeg.merge_outputs(
+                output, _analysis_output(input_stream[str(track_index)], output_path, thread_args)
+            )
+
+        elapsed = await self.__run(build_stream_spec, owner, admitted=True, track_indices=[track_index])
+        current_request_metrics().add_stage(f"transcode[{track_index}]", elapsed)
+        if analyze:
+            await asyncio.to_thread(_write_analysis, output_path, track_index)
+        return output_path
+
+    async def __extract_audio_single_pass(
+        self,
+        video_path: str,
+        outputs: dict[int, tuple[Path, dict]],
+        owner: object,
+        input_args: dict,
+        input_chunks: AsyncIterable[bytes] | None = None,
+        analyze: bool = False,
+    ) -> List[Path]:
+        """
+        指定されたすべての音声トラックを1回のffmpeg実行で抽出して保存します。
+
+        入力の読み込みとデマックスは1回だけ行われ、各トラックは-mapで個別の出力ファイルに振り分けられます。
+
+        Args:
+            video_path (str): 音声を抽出するビデオファイルのパス。標準入力から読み込む場合は"pipe:0"。
+            outputs (dict[int, tuple[Path, dict]]): 音声トラックのインデックスと、保存先パスおよびffmpegの出力引数の対応。
+            owner (object): ジョブの依頼元を識別するキー。
+            input_args (dict): ffmpegの入力引数（抽出する範囲）。
+            input_chunks (AsyncIterable[bytes] | None): ffmpegの標準入力へ渡すデータ。
+            analyze (bool): 同じffmpegの実行で各トラックの波形とラウドネスを解析するかどうか。
+
+        Returns:
+            List[Path]: 抽出した音声ファイルのパスのリスト。
+
+        Raises:
+            AudioExtractionFailedException: ffmpegが異常終了した場合。
+            ExtractorBusyException: 実行待ちのジョブが上限に達している場合。
+        """
+        def build_stream_spec(thread_args: dict):
+            input_stream = ffmpeg.input(video_path, **input_args)
+            streams = []
+            for track_index, (output_path, output_args) in outputs.items():
+                streams.append(input_stream[str(track_index)].output(str(output_path), **output_args, **thread_args))
+                if analyze:
+                    streams.append(_analysis_output(input_stream[str(track_index)], output_path, thread_args))
+            return ffmpeg.merge_outputs(*streams)
+
+        elapsed = await self.__run(build_stream_spec, owner, input_chunks=input_chunks, track_indices=list(outputs))
+        # 全トラックが同じffmpegで同時に変換されるため、各トラックの所要時間は実行時間全体とする
+        metrics = current_request_metrics()
+        for track_index in outputs:
+            metrics.add_stage(f"transcode[{track_index}]", elapsed)
+        if analyze:
+            for track_index, (output_path, _) in outputs.items():
+                await asyncio.to_thread(_write_analysis, output_path, track_index)
+        return [output_path for output_path, _ in outputs.values()]
+
+    def __plan_segments(
+        self, media_info: MediaInfo, outputs: dict[int, tuple[Path, dict]], options: ExtractionOptions
+    ) -> tuple[SegmentCodec, list[Segment]] | None:
+        """
+        区間並列変換を行う場合に、抽出する範囲を分割する区間を決定します。
+
+        SEGMENT_SOURCE_CODECSの1つの音声トラックのみをSEGMENT_CODECSのエンコーダーと出力形式で再エンコードし、
+        抽出する範囲の長さがsegment_min_duration以上の場合に分割します。ストリームコピーは入出力が律速となり並列化の効果がなく、
+        解析のラウドネスは範囲全体で累積する必要があるため、これらの場合は分割しません。
+
+        Args:
+            media_info (MediaInfo): ビデオファイルのメタデータ。
+            outputs (dict[int, tuple[Path, dict]]): 音声トラックのインデックスと、保存先パスおよびffmpegの出力引数の対応。
+            options (ExtractionOptions): 音声抽出のオプション。
+
+        Returns:
+            tuple[SegmentCodec, list[Segment]] | None: 区間の変換に使用するエンコーダーの設定と、区間ごとの変換方法。
+                分割しない場合はNone。
+        """
+        if not self.segment_min_duration or len(outputs) != 1 or options.analyze:
+            return None
+        track_index, (output_path, output_args) = next(iter(outputs.items()))
+        track = next(track for track in media_info.audio_streams if track.index == track_index)
+        return plan_track_segments(
+            track, output_path, output_args, options, media_info.duration, self.segment_min_duration, self.max_segments
+        )
+
+    async def __find_anchor(self, video_path: str, anchor_path: Path, track_index: int, owner: object) -> SegmentAnchor:
+        """
+        音声トラックの先頭の2フレームをデコードし、区間並列変換の基準を求めます。
+
+        Args:
+            video_path (str): 音声を抽出するビデオファイルのパス。
+            anchor_path (Path): デコードしたフレームをframecrc形式で書き出すパス。
+            track_index (int): 抽出する音声トラックのインデックス。
+            owner (object): ジョブの依頼元を識別するキー。
+
+        Returns:
+            SegmentAnchor: 区間並列変換の基準。
+
+        Raises:
+            AudioExtractionFailedException: ffmpegが異常終了した場合。
+        """
+        def build_stream_spec(thread_args: dict):
+            return (
+                ffmpeg.input(video_path)[str(track_index)]
+                .output(str(anchor_path), f="framecrc", **{"frames:a": 2}, **thread_args)
+                .global_args("-copyts")
+            )
+
+        await self.__run(build_stream_spec, owner, admitted=True)
+        return parse_anchor(anchor_path)
+
+    async def __extract_segment(
+        self,
+        video_path: str,
+        segment_path: Path,
+        track_index: int,
+        output_args: dict,
+        owner: object,
+        segment: Segment,
+        anchor: SegmentAnchor,
+        on_progress=None,
+    ) -> float:
+        """
+        音声トラックの1つの区間を変換して保存します。
+
+        区間の開始位置のSEGMENT_SEEK_MARGIN_SECONDS秒手前まで入力側でシークし、それより前のデータは読み込みません。
+        -copytsで入力のタイムスタンプを保ったまま、デコードした音声のタイムスタンプをフレームの位置に揃え、
+        区間の範囲のサンプルをatrimフィルターで切り出してから変換します。
+        連結しないパケットはnoiseビットストリームフィルターで破棄します。
+
+        Args:
+            video_path (str): 音声を抽出するビデオファイルのパス。
+            segment_path (Path): 変換した区間を保存するパス。
+            track_index (int): 抽出する音声トラックのインデックス。
+            output_args (dict): ffmpegの出力引数。
+            owner (object): ジョブの依頼元を識別するキー。
+            segment (Segment): 区間の変換方法。
+            anchor (SegmentAnchor): 区間の位置を入力のタイムスタンプに変換する基準。
+            on_progress: ffmpegの進捗の報告を受け取る関数。
+
+        Returns:
+            float: ffmpegの実行にかかった時間（秒）。
+
+        Raises:
+            AudioExtractionFailedException: ffmpegが異常終了した場合。
+        """
+        input_args, trim_args = segment_input_args(segment, anchor)
+
+        def build_stream_spec(thread_args: dict):
+            stream = (
+                ffmpeg.input(video_path, **input_args)[str(track_index)]
+                .filter("asetpts", snap_expression(anchor))
+                .filter("atrim", **trim_args)
+                # 進捗の変換済みの長さが区間の先頭から数えられるよう、タイムスタンプを0から始める
+                .filter("asetpts", "PTS-STARTPTS")
+            )
+            return stream.output(
+                str(segment_path), **output_args, **{"bsf:a": drop_packets_filter(segment)}, **thread_args
+            ).global_args("-copyts")
+
+        return await self.__run(build_stream_spec, owner, admitted=True, on_progress=on_progress)
+
+    async def __extract_audio_segmented(
+        self,
+        video_path: str,
+        output_path: Path,
+        track_index: int,
+        output_args: dict,
+        owner: object,
+        codec: SegmentCodec,
+        segments: list[Segment],
+    ) -> Path:
+        """
+        音声トラックを区間ごとに並列に変換し、ストリームコピーで1つのファイルに連結して保存します。
+
+        先頭のフレームのタイムスタンプを求めてから、各区間を出力と同じエンコーダーで中間のエレメンタリーストリームに変換し、
+        ffmpegのconcatデマクサーで再エンコードせずに連結します。区間のffmpegはスケジューラーの実行枠を1つずつ使用するため、
+        空いているCPUコアの数だけ同時に変換されます。
+
+        Args:
+            video_path (str): 音声を抽出するビデオファイルのパス。
+            output_path (Path): 抽出した音声を保存するパス。
+            track_index (int): 抽出する音声トラックのインデックス。
+            output_args (dict): ffmpegの出力引数。
+            owner (object): ジョブの依頼元を識別するキー。
+            codec (SegmentCodec): 区間の変換に使用するエンコーダーの設定。
+            segments (list[Segment]): 区間ごとの変換方法。
+
+        Returns:
+            Path: 抽出した音声ファイルのパス。
+
+        Raises:
+            AudioExtractionFailedException: ffmpegが異常終了した場合。
+            ExtractorBusyException: 実行待ちのジョブが上限に達している場合。
+            ScratchSpaceExhaustedException: 変換した区間が一時作業領域の容量上限を超えた場合。
         """
-        process = (
-            ffmpeg.input(video_path)
-            .output(str(output_path), acodec='aac', audio_bitrate='192k', map=f"0:{track_index}")
-            .run_async(quiet=True)
+        # 区間のジョブは、一部だけが実行されることのないようまとめて受け付ける
+        if self.scheduler is not None:
+            self.scheduler.check_capacity(len(segments))
+        progress = current_extraction_progress()
+        reporters = (
+            self.__segment_progress_reporters(progress, track_index, len(segments))
+            if progress is not None else [None] * len(segments)
         )
-        await asyncio.to_thread(process.wait)
+        segment_dir = output_path.with_name(f"{output_path.stem}.segments")
+        segment_dir.mkdir()
+        segment_paths = [
+            segment_dir / f"segment_{index:04d}{codec.segment_extension}" for index in range(len(segments))
+        ]
+        segment_args = {**output_args, **codec.encoder_args}
+        # 変換済みの区間は連結して削除するまで作業ディレクトリを占めるため、完了した時点で使用量に計上する
+        charged = 0
+
+        async def extract_segment(segment_path: Path, segment: Segment, anchor: SegmentAnchor, reporter) -> float:
+            nonlocal charged
+            elapsed = await self.__extract_segment(
+                video_path, segment_path, track_index, segment_args, owner, segment, anchor, reporter
+            )
+            charged += self.__charge(segment_path)
+            return elapsed
+
+        try:
+            anchor = await self.__find_anchor(video_path, segment_dir / "anchor.framecrc", track_index, owner)
+            tasks = [
+                asyncio.ensure_future(extract_segment(segment_path, segment, anchor, reporter))
+                for segment_path, segment, reporter in zip(segment_paths, segments, reporters)
+            ]
+            try:
+                elapsed = await asyncio.gather(*tasks)
+            finally:
+                # 失敗またはキャンセルされた場合は残りの区間のffmpegを終了させ、作業ディレクトリの削除前に回収を待つ
+                for task in tasks:
+                    task.cancel()
+                await asyncio.gather(*tasks, return_exceptions=True)
+            # 区間は並列に変換されるため、トラックの所要時間は最も遅い区間の実行時間とする
+            metrics = current_request_metrics()
+            metrics.add_stage(f"transcode[{track_index}]", max(elapsed))
+
+            list_path = segment_dir / "segments.txt"
+            list_path.write_text(
+                concat_list([segment_path.name for segment_path in segment_paths], segments), encoding="utf-8"
+            )
 
-    async def extract_all_audio(self, video_path: str, output_dir: Path) -> List[Path]:
+            def build_stream_spec(thread_args: dict):
+                return ffmpeg.input(str(list_path), f="concat").output(str(output_path), acodec="copy", **thread_args)
+
+            metrics.add_stage(f"concat[{track_index}]", await self.__run(build_stream_spec, owner, admitted=True))
+        finally:
+            shutil.rmtree(segment_dir, ignore_errors=True)
+            if self.scratch_space is not None:
+                self.scratch_space.release(segment_dir, charged)
+        if progress is not None:
+            progress.finish([track_index])
+        return output_path
+
+    async def extract_all_audio(
+        self,
+        video_path: str,
+        output_dir: Path,
+        options: ExtractionOptions | None = None,
+        media_info: MediaInfo | None = None,
+    ) -> List[Path]:
         """
-        ビデオファイルからすべての音声トラックを抽出し、指定されたディレクトリに保存します。
+        ビデオファイルからオプションで選択された音声トラックを抽出し、指定されたディレクトリに保存します。
 
         Args:
             video_path (str): 音声を抽出するビデオファイルのパス。
             output_dir (Path): 抽出した音声を保存するディレクトリ。
+            options (ExtractionOptions | None): 音声抽出のオプション。Noneの場合は既定値を使用します。
+            media_info (MediaInfo | None): 解析済みのメタデータ。Noneの場合はビデオファイルを解析します。
 
         Returns:
             List[Path]: 抽出された音声ファイルのパスのリスト。
@@ -55,18 +1028,196 @@ class FFmpegAudioExtractor(IAudioExtractor):
         Raises:
             AudioExtractionFailedException: 音声抽出に失敗した場合。
         """
+        audio_files = [audio_file async for audio_file in self.iter_extract_audio(video_path, output_dir, options, media_info)]
+        return sorted(audio_files, key=lambda audio_file: audio_file.name)
+
+    async def iter_extract_audio(
+        self,
+        video_path: str,
+        output_dir: Path,
+        options: ExtractionOptions | None = None,
+        media_info: MediaInfo | None = None,
+    ) -> AsyncIterator[Path]:
+        """
+        ビデオファイルからオプションで選択された音声トラックを抽出し、抽出が完了した順に音声ファイルのパスを返します。
+
+        元のコーデックが出力形式に格納できるトラックはストリームコピーし、それ以外のトラックのみ再エンコードします。
+        抽出する範囲が指定された場合は、入力側のシークにより範囲外のデータを読み飛ばします。
+        再エンコードする1つのトラックの範囲が長い場合は、区間に分割して並列に変換してから連結します。
+
+        Args:
+            video_path (str): 音声を抽出するビデオファイルのパス。
+            output_dir (Path): 抽出した音声を保存するディレクトリ。
+            options (ExtractionOptions | None): 音声抽出のオプション。Noneの場合は既定値を使用します。
+            media_info (MediaInfo | None): 解析済みのメタデータ。Noneの場合はビデオファイルを解析します。
+
+        Returns:
+            AsyncIterator[Path]: 抽出された音声ファイルのパスを返す非同期イテレータ。
+
+        Raises:
+            AudioExtractionFailedException: 音声抽出に失敗した場合。
+            ExtractorBusyException: 実行待ちのジョブが上限に達している場合。
+            NoAudioStreamException: ファイルに音声トラックが含まれていない場合。
+            NoMatchingAudioTrackException: 指定されたトラック番号や言語に一致する音声トラックがない場合。
+            ScratchSpaceExhaustedException: 抽出した音声が一時作業領域の容量上限を超えた場合。
+        """
+        options = options or ExtractionOptions()
+        if media_info is None:
+            try:
+                media_info = await self.prober.probe(video_path)
+            except Exception as e:
+                raise AudioExtractionFailedException() from e
+
+        outputs = {
+            track.index: self.__plan_output(track, output_dir, options)
+            for track in _select_tracks(video_path, options, media_info)
+        }
+        self.__start_progress(media_info, options)
+
+        # スケジューラーが依頼元ごとに公平にジョブを割り当てるための識別キー
+        owner = object()
+        input_args = _input_args(options)
+
+        segment_plan = self.__plan_segments(media_info, outputs, options)
+        if segment_plan is not None:
+            (track_index, (output_path, output_args)), = outputs.items()
+            codec, segments = segment_plan
+            try:
+                audio_file = await self.__extract_audio_segmented(
+                    video_path, output_path, track_index, output_args, owner, codec, segments
+                )
+            except (ExtractorBusyException, ScratchSpaceExhaustedException):
+                raise
+            except Exception as e:
+                raise AudioExtractionFailedException() from e
+            self.__charge(audio_file)
+            yield audio_file
+            return
+
+        if self.mode == SINGLE_PASS_MODE:
+            try:
+                audio_files = await self.__extract_audio_single_pass(
+                    video_path, outputs, owner, input_args, analyze=options.analyze
+                )
+            except ExtractorBusyException:
+                raise
+            except Exception as e:
+                raise AudioExtractionFailedException() from e
+            for audio_file in audio_files:
+                self.__charge(audio_file)
+                yield audio_file
+            return
+
+        # トラックごとのジョブは、一部だけが実行されることのないようまとめて受け付ける
+        if self.scheduler is not None:
+            self.scheduler.check_capacity(len(outputs))
+        tasks = [
+            asyncio.ensure_future(
+                self.__extract_audio(
+                    video_path, output_path, track_index, output_args, owner, input_args, options.analyze
+                )
+            )
+            for track_index, (output_path, output_args) in outputs.items()
+        ]
         try:
-            track_indices = self.__get_audio_tracks(video_path)
-            audio_files = []
-            tasks = []
+            for next_done in asyncio.as_completed(tasks):
+                try:
+                    audio_file = await next_done
+                except Exception as e:
+                    raise AudioExtractionFailedException() from e
+                self.__charge(audio_file)
+                yield audio_file
+        finally:
+            # 残りのトラックのffmpegを終了させ、呼び出し側が出力先を削除する前に回収を待つ
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+    def is_streamable(self, head: bytes) -> bool:
+        """
+        ファイルの先頭部分から、ファイル全体を受信する前に読み込みを開始できる形式かどうかを判定します。
+
+        MPEG-TS、Matroska/WebM、およびmoovボックスがmdatボックスより前にあるMP4（フラグメント化MP4など）を
+        ストリーミング可能と判定します。moovボックスが末尾にあるMP4など、シークが必要な形式はFalseを返します。
 
-            for track_index in track_indices:
-                output_path = output_dir / f"audio_track_{track_index}.aac"
-                tasks.append(self.__extract_audio(video_path, output_path, track_index))
-                audio_files.append(output_path)
+        Args:
+            head (bytes): ファイルの先頭部分のバイトデータ。
 
-            await asyncio.gather(*tasks)
+        Returns:
+            bool: 先頭から順に読み込むだけで音声を抽出できる形式の場合はTrue。
+        """
+        if head[:1] == bytes([TS_SYNC_BYTE]):
+            return _has_sync_bytes(head, 0, TS_PACKET_SIZE)
+        if head.startswith(EBML_MAGIC):
+            return True
+        return _mp4_moov_precedes_mdat(head)
 
-            return audio_files
-        except Exception as e:
+    def is_supported_container(self, head: bytes) -> bool:
+        """
+        ファイルの先頭部分のマジックナンバーから、音声を抽出できるコンテナ形式かどうかを判定します。
+
+        MP4/MOV/3GP、Matroska/WebM、MPEG-TS/M2TS、MPEG-PS、AVI、FLV、ASF、Oggを対応する形式と判定します。
+        内容が音声を含むかどうかは判定しません。
+
+        Args:
+            head (bytes): ファイルの先頭部分のバイトデータ。
+
+        Returns:
+            bool: 対応するコンテナ形式の場合はTrue。
+        """
+        if head[4:8] in MP4_LEADING_BOXES:
+            return True
+        if head[:4] == b"RIFF" and head[8:12] == b"AVI ":
+            return True
+        if _has_sync_bytes(head, 0, TS_PACKET_SIZE) or _has_sync_bytes(head, 4, M2TS_PACKET_SIZE):
+            return True
+        return head.startswith(CONTAINER_MAGICS)
+
+    async def iter_extract_audio_from_stream(
+        self,
+        chunks: AsyncIterable[bytes],
+        output_dir: Path,
+        options: ExtractionOptions | None,
+        media_info: MediaInfo,
+    ) -> AsyncIterator[Path]:
+        """
+        受信中のビデオファイルのデータをffmpegの標準入力へ渡しながらオプションで選択された音声トラックを抽出し、
+        音声ファイルのパスを返します。
+
+        入力は1回しか読み込めないため、抽出モードにかかわらず1回のffmpeg実行で全トラックを抽出します。
+        標準入力はシークできないため、抽出する範囲の開始位置までのデータはデコードせずに読み捨てられます。
+        ffmpegの実行枠は入力の受信が終わるまで確保されたままになります。
+
+        Args:
+            chunks (AsyncIterable[bytes]): ビデオファイルのバイトデータを順に返す非同期イテラブル。
+            output_dir (Path): 抽出した音声を保存するディレクトリ。
+            options (ExtractionOptions | None): 音声抽出のオプション。Noneの場合は既定値を使用します。
+            media_info (MediaInfo): ファイルの先頭部分から解析したメタデータ。
+
+        Returns:
+            AsyncIterator[Path]: 抽出された音声ファイルのパスを返す非同期イテレータ。
+
+        Raises:
+            AudioExtractionFailedException: 音声抽出に失敗した場合。
+            ExtractorBusyException: 実行待ちのジョブが上限に達している場合。
+            NoAudioStreamException: ファイルに音声トラックが含まれていない場合。
+            NoMatchingAudioTrackException: 指定されたトラック番号や言語に一致する音声トラックがない場合。
+            ScratchSpaceExhaustedException: 抽出した音声が一時作業領域の容量上限を超えた場合。
+        """
+        options = options or ExtractionOptions()
+        outputs = {
+            track.index: self.__plan_output(track, output_dir, options)
+            for track in _select_tracks("pipe:0", options, media_info)
+        }
+        self.__start_progress(media_info, options)
+
+        try:
+            audio_files = await self.__extract_audio_single_pass(
+                "pipe:0", outputs, object(), _input_args(options), chunks, options.analyze
+            )
+        except OSError as e:
+            # 受信側の例外（アップロードサイズの超過など）は呼び出し側で処理できるようそのまま伝播させる
             raise AudioExtractionFailedException() from e
+        for audio_file in audio_files:
+            self.__charge(audio_file)
+            yield audio_file
@@ -0,0 +1,140 @@
+import asyncio
+import os
+from collections import OrderedDict, deque
+from collections.abc import AsyncIterator, Hashable
+from contextlib import asynccontextmanager
+
+from domain.interfaces.audio_extractor_interface import ExtractorBusyException
+
+class FFmpegJobScheduler:
+    """
+    プロセス全体でffmpegの同時実行数を制御するスケジューラー。
+
+    同時に実行するffmpegのジョブ数をCPUコア数に応じて制限し、超過したジョブは待機させます。
+    待機中のジョブは依頼元（リクエスト）ごとのキューに入れられ、依頼元を順番に巡回して実行されるため、
+    トラック数の多いリクエストが他のリクエストを待たせ続けることはありません。
+    待機中のジョブが上限に達した場合は、新たなジョブを受け付けずにExtractorBusyExceptionを送出します。
+    """
+
+    def __init__(
+        self,
+        max_concurrent_jobs: int | None = None,
+        threads_per_job: int | None = None,
+        max_queued_jobs: int = 64,
+        retry_after: int = 5,
+    ):
+        """
+        FFmpegJobSchedulerを初期化します。
+
+        Args:
+            max_concurrent_jobs (int | None): 同時に実行するジョブの最大数。Noneの場合はCPUコア数。
+            threads_per_job (int | None): 各ジョブのffmpegに割り当てるスレッド数。
+                Noneの場合はCPUコア数を同時実行数で割った値。
+            max_queued_jobs (int): 待機できるジョブの最大数。
+            retry_after (int): 受け付けを拒否した際にクライアントへ提示する再試行までの秒数。
+        """
+        cores = os.cpu_count() or 1
+        self.max_concurrent_jobs = max(1, max_concurrent_jobs or cores)
+        self.threads_per_job = max(1, threads_per_job or cores // self.max_concurrent_jobs)
+        self.max_queued_jobs = max_queued_jobs
+        self.retry_after = retry_after
+        self.running_jobs = 0
+        self._waiters: OrderedDict[Hashable, deque[asyncio.Future]] = OrderedDict()
+
+    @property
+    def queued_jobs(self) -> int:
+        """
+        実行待ちのジョブ数を返します。
+        """
+        return sum(len(waiters) for waiters in self._waiters.values())
+
+    def check_capacity(self, jobs: int):
+        """
+        指定された数のジョブを受け付けられるかどうかを確認します。
+
+        Args:
+            jobs (int): 受け付けるジョブの数。
+
+        Raises:
+            ExtractorBusyException: 待機できるジョブの上限を超える場合。
+        """
+        available = max(0, self.max_concurrent_jobs - self.running_jobs) if not self._waiters else 0
+        if self.queued_jobs + max(0, jobs - available) > self.max_queued_jobs:
+            raise ExtractorBusyException(self.retry_after)
+
+    async def acquire(self, owner: Hashable, admitted: bool = False):
+        """
+        ジョブの実行枠を確保します。空きがない場合は順番が回ってくるまで待機します。
+
+        Args:
+            owner (Hashable): ジョブの依頼元を識別するキー。同じキーのジョブは依頼順に実行されます。
+            admitted (bool): check_capacityで受け付け済みのジョブかどうか。Trueの場合は待機数の上限を確認しません。
+
+        Raises:
+            ExtractorBusyException: 待機できるジョブの上限に達している場合。
+        """
+        if self.running_jobs < self.max_concurrent_jobs and not self._waiters:
+            self.running_jobs += 1
+            return
+        if not admitted and self.queued_jobs >= self.max_queued_jobs:
+            raise ExtractorBusyException(self.retry_after)
+
+        future = asyncio.get_running_loop().create_future()
+        self._waiters.setdefault(owner, deque()).append(future)
+        try:
+            await future
+        except asyncio.CancelledError:
+            if future.done() and not future.cancelled():
+                # 実行枠が割り当てられた直後にキャンセルされた場合は枠を返却する
+                self.release()
+            else:
+                self.__remove_waiter(owner, future)
+            raise
+
+    def release(self):
+        """
+        ジョブの実行枠を返却し、待機中のジョブがあれば依頼元を巡回して次のジョブに枠を割り当てます。
+        """
+        self.running_jobs -= 1
+        while self._waiters and self.running_jobs < self.max_concurrent_jobs:
+            owner, waiters = next(iter(self._waiters.items()))
+            future = waiters.popleft()
+            # 次の割り当てでは別の依頼元が優先されるよう、この依頼元を末尾に回す
+            del self._waiters[owner]
+            if waiters:
+                self._waiters[owner] = waiters
+            if not future.done():
+                self.running_jobs += 1
+                future.set_result(None)
+
+    def __remove_waiter(self, owner: Hashable, future: asyncio.Future):
+        """
+        待機中のジョブをキューから取り除きます。
+        """
+        waiters = self._waiters.get(owner)
+        if waiters is None:
+            return
+        try:
+            waiters.remove(future)
+        except ValueError:
+            pass
+        if not waiters:
+            del self._waiters[owner]
+
+    @asynccontextmanager
+    async def slot(self, owner: Hashable, admitted: bool = False) -> AsyncIterator[int]:
+        """
+        ジョブの実行枠を確保し、ブロックを抜けたときに返却するコンテキストマネージャー。
+
+        Args:
+            owner (Hashable): ジョブの依頼元を識別するキー。
+            admitted (bool): check_capacityで受け付け済みのジョブかどうか。
+
+        Returns:
+            AsyncIterator[int]: ジョブのffmpegに割り当てるスレッド数。
+        """
+        await self.acquire(owner, admitted)
+        try:
+            yield self.threads_per_job
+        finally:
+            self.release()
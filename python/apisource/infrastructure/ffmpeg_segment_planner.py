@@ -0,0 +1,273 @@
+"""
+区間並列変換の区間の分割と、区間ごとのffmpegの引数の計算。
+
+長い1つの音声トラックを区間に分割して並列に変換し、連結した音声のサンプル数が分割せずに変換した場合と
+一致するよう、区間の境界、シーク位置、切り出す範囲、破棄するパケットを求めます。
+ffmpegを実行せずに計算できる部分のみを含み、実行はFFmpegAudioExtractorが行います。
+"""
+
+import math
+from pathlib import Path
+from typing import NamedTuple
+
+from domain.models.extraction_options import ExtractionOptions
+from domain.models.media_info import AudioStreamInfo
+
+# 区間並列変換で1つの区間に割り当てる最短の長さ（秒）。これより短い区間には分割しない
+MIN_SEGMENT_SECONDS = 60
+# 区間並列変換で、境界のフレームもエンコーダーが前後の音声を参照して変換できるよう、区間の前後に重ねて変換するフレーム数
+SEGMENT_OVERLAP_FRAMES = 4
+# 区間並列変換で、区間の開始位置からこの長さ（秒）だけ手前に入力側でシークする。
+# キーフレーム単位のシークの誤差と、デコーダーが前のフレームを参照して復号を始める分を吸収する
+SEGMENT_SEEK_MARGIN_SECONDS = 1
+# 区間並列変換できる元のコーデック。デコードしたフレームのサンプル数が一定のため、
+# シークした位置のタイムスタンプをフレームの位置に揃えてサンプル単位で区間を切り出せる
+SEGMENT_SOURCE_CODECS = frozenset({"aac", "ac3", "eac3", "dts", "mp2", "mp3"})
+
+class SegmentCodec(NamedTuple):
+    """
+    区間並列変換で、区間ごとに変換したパケットを連結できるエンコーダーの設定。
+
+    Attributes:
+        frame_size (int): 1パケットのサンプル数。
+        delay_packets (int): エンコーダーの遅延（プライミング）のため、入力の先頭より前の無音を含む先頭のパケット数。
+        sample_rates (frozenset[int]): 再サンプリングせずに、frame_sizeのパケットで変換できるサンプリング周波数。
+        segment_extension (str): 区間を保存する中間ファイルの拡張子。タイムスタンプを持たないエレメンタリーストリームとする。
+        encoder_args (dict): 区間の変換に追加するffmpegの出力引数。
+    """
+    frame_size: int
+    delay_packets: int
+    sample_rates: frozenset[int]
+    segment_extension: str
+    encoder_args: dict
+
+AAC_SEGMENT_CODEC = SegmentCodec(
+    1024, 1,
+    frozenset({7350, 8000, 11025, 12000, 16000, 22050, 24000, 32000, 44100, 48000, 64000, 88200, 96000}),
+    ".aac", {},
+)
+# 区間ごとに変換したパケットを連結しても、分割しない場合と同じサンプル数になるエンコーダーと出力ファイルの拡張子の組み合わせ。
+# M4Aは連結するとエンコーダーの遅延を示す編集リストが失われ、FLACは連結したタイムスタンプが単調増加にならず、
+# Opusは48kHzへの再サンプリングとプリスキップを伴うため、区間に分割しない
+SEGMENT_CODECS = {
+    ("aac", ".aac"): AAC_SEGMENT_CODEC,
+    ("aac", ".mka"): AAC_SEGMENT_CODEC,
+    # MPEG-1 Layer IIIのサンプリング周波数のみ1152サンプルのフレームとなる。
+    # ビットリザーバーを使用すると、区間の先頭のフレームが破棄した直前のフレームのデータを参照するため無効にする
+    ("libmp3lame", ".mp3"): SegmentCodec(1152, 1, frozenset({32000, 44100, 48000}), ".mp3", {"reservoir": 0}),
+}
+
+class Segment(NamedTuple):
+    """
+    区間並列変換の1つの区間の変換方法。
+
+    Attributes:
+        start_sample (int): 音声トラックの先頭のサンプルから数えた、変換を始めるサンプルの位置。
+        end_sample (int | None): 変換を終えるサンプルの位置。Noneの場合は終端まで変換する。
+        skip_packets (int): 変換した音声の先頭から破棄するパケット数。
+        packets (int | None): 破棄したパケットに続けて残すパケット数。Noneの場合は終端まで残す。
+        duration (float | None): 連結した音声で区間が占める長さ（秒）。Noneの場合は終端まで。
+    """
+    start_sample: int
+    end_sample: int | None
+    skip_packets: int
+    packets: int | None
+    duration: float | None
+
+class SegmentAnchor(NamedTuple):
+    """
+    区間並列変換で、区間の位置を入力のタイムスタンプに変換する基準。
+
+    Attributes:
+        sample_rate (int): デコードした音声のサンプリング周波数（Hz）。タイムスタンプの単位は1/sample_rate秒。
+        first_pts (int): 音声トラックの先頭のサンプルのタイムスタンプ。
+        frame_size (int): 元のコーデックの1フレームのサンプル数。
+    """
+    sample_rate: int
+    first_pts: int
+    frame_size: int
+
+def plan_track_segments(
+    track: AudioStreamInfo,
+    output_path: Path,
+    output_args: dict,
+    options: ExtractionOptions,
+    media_duration: float | None,
+    min_duration: float,
+    max_segments: int,
+) -> tuple[SegmentCodec, list[Segment]] | None:
+    """
+    1つの音声トラックを区間並列変換する場合に、抽出する範囲を分割する区間を決定します。
+
+    SEGMENT_SOURCE_CODECSのトラックをSEGMENT_CODECSのエンコーダーと出力形式で再エンコードし、
+    抽出する範囲の長さがmin_duration以上で、MIN_SEGMENT_SECONDS秒以上の区間に2つ以上分割できる場合に分割します。
+
+    Args:
+        track (AudioStreamInfo): 抽出する音声トラック。
+        output_path (Path): 抽出した音声を保存するパス。拡張子で出力形式を判定します。
+        output_args (dict): ffmpegの出力引数。
+        options (ExtractionOptions): 音声抽出のオプション。
+        media_duration (float | None): トラックの長さが不明な場合に使用する、メディア全体の長さ（秒）。
+        min_duration (float): 区間に分割する抽出する範囲の最短の長さ（秒）。
+        max_segments (int): 分割する区間の最大数。
+
+    Returns:
+        tuple[SegmentCodec, list[Segment]] | None: 区間の変換に使用するエンコーダーの設定と、区間ごとの変換方法。
+            分割しない場合はNone。
+    """
+    codec = SEGMENT_CODECS.get((output_args.get("acodec"), output_path.suffix))
+    if codec is None:
+        return None
+    if track.codec_name not in SEGMENT_SOURCE_CODECS or track.sample_rate not in codec.sample_rates:
+        return None
+    duration = options.clip_duration(track.duration if track.duration is not None else media_duration)
+    if duration is None or duration < min_duration:
+        return None
+    count = min(max_segments, int(duration // MIN_SEGMENT_SECONDS))
+    if count < 2:
+        return None
+    range_start = round((options.start or 0) * track.sample_rate)
+    range_end = round(options.end * track.sample_rate) if options.end is not None else None
+    return codec, plan_segments(range_start, range_end, duration, count, codec, track.sample_rate)
+
+def plan_segments(
+    range_start: int, range_end: int | None, duration: float, count: int, codec: SegmentCodec, sample_rate: int
+) -> list[Segment]:
+    """
+    抽出する範囲を区間並列変換の区間に分割し、区間ごとの変換方法を決定します。
+
+    区間の長さはエンコーダーのフレーム長の整数倍に揃え、端数は最後の区間に含めます。各区間は前後に
+    SEGMENT_OVERLAP_FRAMESフレームずつ隣の区間と重ねて変換し、重ねた部分とエンコーダーの遅延による先頭のパケットを
+    破棄します。残したパケットは分割せずに変換した場合の同じ位置のパケットと同じ範囲の音声を表すため、
+    連結した音声のサンプル数は分割しない場合と一致します。
+
+    Args:
+        range_start (int): 音声トラックの先頭のサンプルから数えた、抽出する範囲の開始位置。
+        range_end (int | None): 抽出する範囲の終了位置。Noneの場合は終端まで。
+        duration (float): 抽出する範囲の長さ（秒）。
+        count (int): 区間の数。
+        codec (SegmentCodec): 区間の変換に使用するエンコーダーの設定。
+        sample_rate (int): 音声トラックのサンプリング周波数（Hz）。
+
+    Returns:
+        list[Segment]: 区間ごとの変換方法。
+    """
+    frame_seconds = codec.frame_size / sample_rate
+    frames = math.ceil(duration / count / frame_seconds)
+    segments = []
+    for index in range(count):
+        first_frame = index * frames
+        start_sample = range_start + ((first_frame - SEGMENT_OVERLAP_FRAMES) * codec.frame_size if index else 0)
+        skip_packets = SEGMENT_OVERLAP_FRAMES + codec.delay_packets if index else 0
+        if index == count - 1:
+            segments.append(Segment(start_sample, range_end, skip_packets, None, None))
+            break
+        # 次の区間と重ねる部分まで変換する。範囲の終了位置が指定されている場合はそれを超えない
+        end_sample = range_start + (first_frame + frames + SEGMENT_OVERLAP_FRAMES) * codec.frame_size
+        if range_end is not None:
+            end_sample = min(end_sample, range_end)
+        # 最初の区間は、エンコーダーの遅延による先頭のパケットも含めて残す
+        packets = frames + (0 if index else codec.delay_packets)
+        segments.append(Segment(start_sample, end_sample, skip_packets, packets, packets * frame_seconds))
+    return segments
+
+def parse_anchor(anchor_path: Path) -> SegmentAnchor:
+    """
+    音声トラックの先頭の2フレームをframecrc形式で書き出したファイルから、区間並列変換の基準を読み込みます。
+
+    先頭のフレームは元のコーデックのフレームの途中から始まる場合があるため、フレームの位置は2番目のフレームから求め、
+    先頭のサンプルのタイムスタンプもその位置に揃えます。
+
+    Args:
+        anchor_path (Path): framecrc形式のファイルのパス。
+
+    Returns:
+        SegmentAnchor: 区間並列変換の基準。
+    """
+    sample_rate = None
+    frames = []
+    for line in anchor_path.read_text(encoding="utf-8").splitlines():
+        if line.startswith("#sample_rate"):
+            sample_rate = int(line.split(":")[1])
+        elif line and not line.startswith("#"):
+            # stream_index, dts, pts, duration, size, hash
+            frames.append([int(field) for field in line.split(",")[1:4]])
+    (_, first_pts, _), (_, grid_pts, frame_size) = frames[:2]
+    first_pts = grid_pts + round((first_pts - grid_pts) / frame_size) * frame_size
+    return SegmentAnchor(sample_rate, first_pts, frame_size)
+
+def snap_expression(anchor: SegmentAnchor) -> str:
+    """
+    シークした位置からデコードした音声のタイムスタンプを、元のコーデックのフレームの位置に揃えるasetptsの式を返します。
+
+    Matroskaなどのタイムスタンプはミリ秒単位に丸められており、シークした位置の先頭のフレームの
+    タイムスタンプはサンプル単位では数十サンプルずれるため、最も近いフレームの位置に揃え、
+    以降のサンプルはそこから連続して数えます。
+
+    Args:
+        anchor (SegmentAnchor): 区間並列変換の基準。
+
+    Returns:
+        str: asetptsフィルターの式。
+    """
+    origin = anchor.first_pts % anchor.frame_size
+    return f"{origin}+round((STARTPTS-{origin})/{anchor.frame_size})*{anchor.frame_size}+N"
+
+def segment_input_args(segment: Segment, anchor: SegmentAnchor) -> tuple[dict, dict]:
+    """
+    区間を変換するffmpegの入力引数と、区間の範囲のサンプルを切り出すatrimフィルターの引数を返します。
+
+    区間の開始位置のSEGMENT_SEEK_MARGIN_SECONDS秒手前まで入力側でシークし、それより前のデータは読み込みません。
+    シーク位置は区間の手前のため、atrimで切り出すまでデコードした音声を正確な位置に揃える必要はありません。
+
+    Args:
+        segment (Segment): 区間の変換方法。
+        anchor (SegmentAnchor): 区間の位置を入力のタイムスタンプに変換する基準。
+
+    Returns:
+        tuple[dict, dict]: ffmpegの入力引数と、atrimフィルターの引数（入力のタイムスタンプ単位）。
+    """
+    start_pts = anchor.first_pts + segment.start_sample
+    trim_args = {"start_pts": start_pts}
+    if segment.end_sample is not None:
+        trim_args["end_pts"] = anchor.first_pts + segment.end_sample
+    seek_seconds = round(start_pts / anchor.sample_rate - SEGMENT_SEEK_MARGIN_SECONDS, 6)
+    input_args = {"ss": seek_seconds, "noaccurate_seek": None} if seek_seconds > 0 else {}
+    return input_args, trim_args
+
+def drop_packets_filter(segment: Segment) -> str:
+    """
+    変換した区間のうち、連結しないパケットを破棄するビットストリームフィルターを返します。
+
+    Args:
+        segment (Segment): 区間の変換方法。
+
+    Returns:
+        str: ffmpegの-bsfに指定するnoiseフィルター。nは区間の先頭からのパケットの番号。
+    """
+    conditions = []
+    if segment.skip_packets:
+        conditions.append(f"lt(n\\,{segment.skip_packets})")
+    if segment.packets is not None:
+        conditions.append(f"gte(n\\,{segment.skip_packets + segment.packets})")
+    return f"noise=drop={'+'.join(conditions)}"
+
+def concat_list(segment_names: list[str], segments: list[Segment]) -> str:
+    """
+    変換した区間を連結するconcatデマクサーの入力リストを返します。
+
+    エレメンタリーストリームの長さはビットレートから推定されるため、連結する位置は残したパケットの長さで指定します。
+    inpointを0とし、MP3のLAMEヘッダーが示すエンコーダーの遅延で区間の開始時刻がずれないようにします。
+
+    Args:
+        segment_names (list[str]): 区間を保存したファイル名。入力リストと同じディレクトリにあるものとします。
+        segments (list[Segment]): 区間ごとの変換方法。
+
+    Returns:
+        str: concatデマクサーの入力リストの内容。
+    """
+    return "".join(
+        f"file '{segment_name}'\ninpoint 0\n"
+        + (f"duration {segment.duration:.6f}\n" if segment.duration is not None else "")
+        for segment_name, segment in zip(segment_names, segments)
+    )
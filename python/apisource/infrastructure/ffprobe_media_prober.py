@@ -0,0 +1,146 @@
+import asyncio
+import json
+from collections import OrderedDict
+
+from domain.interfaces.media_prober_interface import IMediaProber, MediaProbeFailedException
+from domain.models.media_info import AudioStreamInfo, MediaInfo
+
+def _to_int(value) -> int | None:
+    """
+    ffprobeの出力値を整数に変換します。変換できない場合はNoneを返します。
+    """
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return None
+
+def _to_float(value) -> float | None:
+    """
+    ffprobeの出力値を浮動小数点数に変換します。変換できない場合はNoneを返します。
+    """
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+class FFprobeMediaProber(IMediaProber):
+    """
+    ffprobeを使用してメディアファイルを解析するクラス。
+
+    ffprobeは非同期のサブプロセスとして実行するため、解析中もイベントループは塞がれません。
+    解析結果はファイル内容のハッシュ値をキーとしてLRU方式でキャッシュします。
+
+    IMediaProberインターフェースを実装します。
+    """
+
+    def __init__(self, cache_size: int = 256):
+        """
+        FFprobeMediaProberを初期化します。
+
+        Args:
+            cache_size (int): キャッシュする解析結果の最大件数。0の場合はキャッシュしません。
+        """
+        self.cache_size = cache_size
+        self._cache: OrderedDict[str, MediaInfo] = OrderedDict()
+
+    async def probe(self, video_path: str, content_hash: str | None = None) -> MediaInfo:
+        """
+        メディアファイルを解析し、メタデータを取得します。
+
+        Args:
+            video_path (str): 解析するメディアファイルのパス。
+            content_hash (str | None): ファイル内容のハッシュ値。指定された場合は解析結果のキャッシュキーとして使用します。
+
+        Returns:
+            MediaInfo: メディアファイルのメタデータ。
+
+        Raises:
+            MediaProbeFailedException: 解析に失敗した場合。
+        """
+        if content_hash is not None and content_hash in self._cache:
+            self._cache.move_to_end(content_hash)
+            return self._cache[content_hash]
+
+        media_info = self.__parse(await self.__run_ffprobe(video_path))
+
+        if content_hash is not None and self.cache_size > 0:
+            self._cache[content_hash] = media_info
+            while len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+        return media_info
+
+    async def __run_ffprobe(self, video_path: str) -> dict:
+        """
+        ffprobeを実行し、JSON形式の出力を返します。
+
+        Args:
+            video_path (str): 解析するメディアファイルのパス。
+
+        Returns:
+            dict: ffprobeの出力。
+
+        Raises:
+            MediaProbeFailedException: ffprobeの実行に失敗した場合。
+            asyncio.CancelledError: 実行中にキャンセルされた場合。ffprobeは強制終了して回収済みです。
+        """
+        try:
+            process = await asyncio.create_subprocess_exec(
+                "ffprobe", "-v", "error", "-of", "json",
+                "-show_format", "-show_streams", "-select_streams", "a",
+                video_path,
+                stdout=asyncio.subprocess.PIPE,
+                stderr=asyncio.subprocess.PIPE,
+            )
+        except OSError as e:
+            raise MediaProbeFailedException(str(e)) from e
+        try:
+            stdout, stderr = await process.communicate()
+        except asyncio.CancelledError:
+            # キャンセルされた場合（クライアントの切断や制限時間の超過など）は、ffprobeを終了させて回収してから伝播させる
+            if process.returncode is None:
+                try:
+                    process.kill()
+                except ProcessLookupError:
+                    pass
+            await asyncio.shield(process.wait())
+            raise
+        except OSError as e:
+            raise MediaProbeFailedException(str(e)) from e
+
+        if process.returncode != 0:
+            raise MediaProbeFailedException(stderr.decode(errors="replace").strip())
+        try:
+            return json.loads(stdout)
+        except ValueError as e:
+            raise MediaProbeFailedException("Invalid ffprobe output") from e
+
+    def __parse(self, probe: dict) -> MediaInfo:
+        """
+        ffprobeの出力をMediaInfoに変換します。
+
+        Args:
+            probe (dict): ffprobeの出力。
+
+        Returns:
+            MediaInfo: メディアファイルのメタデータ。
+        """
+        media_format = probe.get("format", {})
+        duration = _to_float(media_format.get("duration"))
+        audio_streams = [
+            AudioStreamInfo(
+                index=stream["index"],
+                codec_name=stream.get("codec_name", ""),
+                channels=_to_int(stream.get("channels")),
+                sample_rate=_to_int(stream.get("sample_rate")),
+                duration=_to_float(stream.get("duration")) or duration,
+                language=stream.get("tags", {}).get("language"),
+                bit_rate=_to_int(stream.get("bit_rate")),
+            )
+            for stream in probe.get("streams", [])
+            if stream.get("codec_type", "audio") == "audio"
+        ]
+        return MediaInfo(
+            format_name=media_format.get("format_name", ""),
+            duration=duration,
+            audio_streams=audio_streams,
+        )
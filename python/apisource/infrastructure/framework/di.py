@@ -1,12 +1,39 @@
+import asyncio
+import atexit
+import copy
+import json
 import logging
 import os
-from logging.handlers import RotatingFileHandler
+import queue
+import shutil
+import zipfile
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
 from fastapi import Depends
 from domain.interfaces.archiver_interface import IArchiver
 from domain.interfaces.audio_extractor_interface import IAudioExtractor
+from domain.interfaces.media_prober_interface import IMediaProber
+from domain.interfaces.job_store_interface import IJobStore
+from domain.interfaces.result_cache_interface import IResultCache
+from domain.interfaces.scratch_space_interface import IScratchSpace
+from domain.interfaces.source_resolver_interface import ISourceResolver
+from domain.interfaces.upload_session_store_interface import IUploadSessionStore
+from domain.models.extraction_deadline import ExtractionDeadline
+from domain.models.extraction_options import ArchiveFormat
+from infrastructure.allow_list_source_resolver import AllowListSourceResolver
+from infrastructure.disk_result_cache import DiskResultCache
 from infrastructure.ffmpeg_audio_extractor import FFmpegAudioExtractor
+from infrastructure.ffmpeg_scheduler import FFmpegJobScheduler
+from infrastructure.ffprobe_media_prober import FFprobeMediaProber
+from infrastructure.local_scratch_space import LocalScratchSpace
+from infrastructure.framework import settings
+from infrastructure.metrics import Gauge, MetricsRegistry, registry as metrics_registry
+from infrastructure.sqlite_job_store import SqliteJobStore
+from infrastructure.sqlite_upload_session_store import SqliteUploadSessionStore
+from infrastructure.tar_archiver import TarArchiver
 from infrastructure.zip_archiver import ZipArchiver
 from service.audio_extractor_service import AudioExtractorService
+from service.extraction_job_service import ExtractionJobService
+from service.upload_session_service import UploadSessionService
 from datetime import datetime
 from pathlib import Path
 
@@ -36,14 +63,74 @@ class IndentedFormatter(logging.Formatter):
         indented_message = "\n  ".join(original_message.splitlines())
         return indented_message
 
+class JsonLinesFormatter(logging.Formatter):
+    """
+    ログレコードを1行のJSONとしてフォーマットするカスタムフォーマッター。
+
+    ログ出力時にextra={"fields": {...}}で渡された項目は、JSONのトップレベルに展開されます。
+
+    Attributes:
+        tz (datetime.tzinfo): タイムゾーン情報。
+    """
+    def __init__(self):
+        super().__init__()
+        self.tz = datetime.now().astimezone().tzinfo
+
+    def format(self, record):
+        entry = {
+            "time": datetime.fromtimestamp(record.created, self.tz).isoformat(),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        entry.update(getattr(record, "fields", {}))
+        if record.exc_info:
+            entry["exception"] = self.formatException(record.exc_info)
+        return json.dumps(entry, ensure_ascii=False, default=str)
+
+class DeferredFormattingQueueHandler(QueueHandler):
+    """
+    ログレコードの整形をQueueListenerのスレッドに任せるQueueHandler。
+
+    標準のQueueHandlerはキューへ積む前に例外のトレースバックを含むメッセージ全体を整形しますが、
+    このクラスはメッセージ引数の埋め込みのみを行い、トレースバックの整形は出力先のフォーマッターに任せます。
+    """
+    def prepare(self, record):
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        return record
+
+def _create_logger(name: str, level: int, file_name: str) -> logging.Logger:
+    """
+    ファイルへの書き込みをバックグラウンドスレッドで行うロガーを作成します。
+
+    ロガーはレコードをキューへ積むだけで、フォーマットとファイルへの書き込み（ローテーションを含む）は
+    QueueListenerのスレッドで行われるため、イベントループがファイルI/Oで停止しません。
+
+    Args:
+        name (str): ロガー名。
+        level (int): ログレベル。
+        file_name (str): ログディレクトリ内の出力先ファイル名。
+
+    Returns:
+        logging.Logger: ロガーのインスタンス。
+    """
+    file_handler = RotatingFileHandler(os.path.join(LOG_DIR, file_name), maxBytes=10**6, backupCount=5)
+    file_handler.setFormatter(JsonLinesFormatter() if settings.LOG_FORMAT == "json" else IndentedFormatter())
+    log_queue = queue.SimpleQueue()
+    listener = QueueListener(log_queue, file_handler)
+    listener.start()
+    # プロセス終了時にキューに残ったレコードを書き出す
+    atexit.register(listener.stop)
+
+    logger = logging.getLogger(name)
+    logger.setLevel(level)
+    logger.addHandler(DeferredFormattingQueueHandler(log_queue))
+    return logger
+
 # アクセスロガーの設定
-access_logger = logging.getLogger("access")
-access_logger.setLevel(logging.INFO)
-access_log_file = os.path.join(LOG_DIR, "access.log")
-access_file_handler = RotatingFileHandler(access_log_file, maxBytes=10**6, backupCount=5)
-access_formatter = IndentedFormatter()
-access_file_handler.setFormatter(access_formatter)
-access_logger.addHandler(access_file_handler)
+access_logger = _create_logger("access", logging.INFO, "access.log")
 def get_access_logger() -> logging.Logger:
     """
     アクセスロガーのインスタンスを提供します。
@@ -54,13 +141,7 @@ def get_access_logger() -> logging.Logger:
     return access_logger
 
 # エラーロガーの設定
-error_logger = logging.getLogger("error")
-error_logger.setLevel(logging.ERROR)
-error_log_file = os.path.join(LOG_DIR, "error.log")
-error_file_handler = RotatingFileHandler(error_log_file, maxBytes=10**6, backupCount=5)
-error_formatter = IndentedFormatter()
-error_file_handler.setFormatter(error_formatter)
-error_logger.addHandler(error_file_handler)
+error_logger = _create_logger("error", logging.ERROR, "error.log")
 def get_error_logger() -> logging.Logger:
     """
     エラーロガーのインスタンスを提供します。
@@ -70,27 +151,171 @@ def get_error_logger() -> logging.Logger:
     """
     return error_logger
 
-def get_audio_extractor() -> IAudioExtractor:
+def get_max_upload_size() -> int:
     """
-    音声抽出器のインスタンスを提供します。
+    アップロードを許可する最大バイト数を提供します。
 
     Returns:
-        IAudioExtractor: 音声抽出器のインスタンス。
+        int: アップロードを許可する最大バイト数。
+    """
+    return settings.MAX_UPLOAD_SIZE
+
+# メディア解析器（解析結果のキャッシュをリクエスト間で共有するため、プロセス内で1つのインスタンスを使用）
+media_prober = FFprobeMediaProber(settings.PROBE_CACHE_SIZE)
+def get_media_prober() -> IMediaProber:
+    """
+    メディア解析器のインスタンスを提供します。
+
+    Returns:
+        IMediaProber: メディア解析器のインスタンス。
+    """
+    return media_prober
+
+# ffmpegのジョブスケジューラー（同時実行数をプロセス全体で制御するため、プロセス内で1つのインスタンスを使用）
+ffmpeg_scheduler = FFmpegJobScheduler(
+    max_concurrent_jobs=settings.FFMPEG_MAX_CONCURRENT_JOBS or None,
+    threads_per_job=settings.FFMPEG_THREADS_PER_JOB or None,
+    max_queued_jobs=settings.FFMPEG_MAX_QUEUED_JOBS,
+    retry_after=settings.FFMPEG_RETRY_AFTER,
+)
+def get_ffmpeg_scheduler() -> FFmpegJobScheduler:
+    """
+    ffmpegのジョブスケジューラーのインスタンスを提供します。
+
+    Returns:
+        FFmpegJobScheduler: ffmpegのジョブスケジューラーのインスタンス。
     """
-    return FFmpegAudioExtractor()
+    return ffmpeg_scheduler
 
 def get_archiver() -> IArchiver:
     """
-    アーカイバのインスタンスを提供します。
+    既定の形式（無圧縮のZIP）のアーカイバのインスタンスを提供します。
 
     Returns:
         IArchiver: アーカイバのインスタンス。
     """
-    return ZipArchiver()
+    return ZipArchiver(zipfile.ZIP_STORED)
+
+def get_archivers() -> dict[ArchiveFormat, IArchiver]:
+    """
+    既定以外の形式のアーカイバのインスタンスを提供します。
+
+    Returns:
+        dict[ArchiveFormat, IArchiver]: アーカイブ形式とアーカイバのインスタンスの対応。
+    """
+    return {
+        ArchiveFormat.ZIP_DEFLATED: ZipArchiver(zipfile.ZIP_DEFLATED),
+        ArchiveFormat.TAR: TarArchiver(),
+    }
+
+# ディレクトリやデータベースを作成するインスタンスは、インポート時ではなく最初に使用する時点で作成する
+# （テストでは依存関係を一時ディレクトリのインスタンスに差し替えるため、既定の保存先は作成されない）
+
+# 一時作業領域（容量上限と使用中の作業ディレクトリをプロセス内で管理するため、1つのインスタンスを使用）
+scratch_space: LocalScratchSpace | None = None
+def get_scratch_space() -> IScratchSpace:
+    """
+    一時作業領域のインスタンスを提供します。
+
+    Returns:
+        IScratchSpace: 一時作業領域のインスタンス。
+    """
+    global scratch_space
+    if scratch_space is None:
+        scratch_space = LocalScratchSpace(
+            settings.SCRATCH_DIR,
+            max_bytes=settings.SCRATCH_MAX_BYTES,
+            retry_after=settings.SCRATCH_RETRY_AFTER,
+            orphan_max_age_seconds=settings.SCRATCH_ORPHAN_MAX_AGE_SECONDS,
+        )
+    return scratch_space
+
+def get_audio_extractor(
+    prober: IMediaProber = Depends(get_media_prober),
+    scheduler: FFmpegJobScheduler = Depends(get_ffmpeg_scheduler),
+    scratch: IScratchSpace = Depends(get_scratch_space)
+) -> IAudioExtractor:
+    """
+    音声抽出器のインスタンスを提供します。
+
+    Args:
+        prober (IMediaProber): メディア解析器の依存関係。
+        scheduler (FFmpegJobScheduler): ffmpegのジョブスケジューラーの依存関係。
+        scratch (IScratchSpace): 抽出した音声を書き込む一時作業領域の依存関係。
+
+    Returns:
+        IAudioExtractor: 音声抽出器のインスタンス。
+    """
+    return FFmpegAudioExtractor(
+        settings.EXTRACTION_MODE,
+        prober,
+        scheduler,
+        segment_min_duration=settings.SEGMENT_PARALLEL_MIN_DURATION,
+        max_segments=settings.SEGMENT_PARALLEL_MAX_SEGMENTS or None,
+        scratch_space=scratch,
+    )
+
+def get_extraction_deadline() -> ExtractionDeadline:
+    """
+    音声抽出の制限時間の設定を提供します。
+
+    Returns:
+        ExtractionDeadline: 音声抽出の制限時間の設定。
+    """
+    return ExtractionDeadline(
+        settings.EXTRACTION_DEADLINE_BASE_SECONDS, settings.EXTRACTION_DEADLINE_PER_MEDIA_SECOND
+    )
+
+# 抽出結果キャッシュ（容量とLRUの順序をプロセス内で管理するため、1つのインスタンスを使用）
+result_cache: DiskResultCache | None = None
+def get_result_cache() -> IResultCache | None:
+    """
+    抽出結果キャッシュのインスタンスを提供します。
+
+    Returns:
+        IResultCache | None: 抽出結果キャッシュのインスタンス。キャッシュが無効な場合はNone。
+    """
+    global result_cache
+    if result_cache is None and settings.RESULT_CACHE_MAX_BYTES > 0:
+        result_cache = DiskResultCache(settings.RESULT_CACHE_DIR, settings.RESULT_CACHE_MAX_BYTES)
+    return result_cache
+
+# 参照の解決器（URLの参照をffmpegへ中継するサーバーをプロセス内で共有するため、1つのインスタンスを使用）
+source_resolver: AllowListSourceResolver | None = None
+def get_source_resolver() -> ISourceResolver | None:
+    """
+    参照で指定されたビデオファイルの解決器のインスタンスを提供します。
+
+    Returns:
+        ISourceResolver | None: 解決器のインスタンス。参照を許可する場所が設定されていない場合はNone。
+    """
+    global source_resolver
+    if not settings.REFERENCE_MOUNT_ROOTS and not settings.REFERENCE_URL_PREFIXES:
+        return None
+    if source_resolver is None:
+        source_resolver = AllowListSourceResolver(settings.REFERENCE_MOUNT_ROOTS, settings.REFERENCE_URL_PREFIXES)
+        atexit.register(source_resolver.close)
+    return source_resolver
+
+def get_upload_sniff_size() -> int:
+    """
+    アップロードの受信中にコンテナ形式と音声トラックの有無の判定に使用する先頭部分のバイト数を提供します。
+
+    Returns:
+        int: 先頭部分のバイト数。0の場合は判定しません。
+    """
+    return settings.UPLOAD_SNIFF_SIZE
 
 def get_audio_extractor_service(
     extractor: IAudioExtractor = Depends(get_audio_extractor),
-    archiver: IArchiver = Depends(get_archiver)
+    archiver: IArchiver = Depends(get_archiver),
+    prober: IMediaProber = Depends(get_media_prober),
+    scratch: IScratchSpace = Depends(get_scratch_space),
+    result_cache: IResultCache | None = Depends(get_result_cache),
+    archivers: dict[ArchiveFormat, IArchiver] = Depends(get_archivers),
+    source_resolver: ISourceResolver | None = Depends(get_source_resolver),
+    deadline: ExtractionDeadline = Depends(get_extraction_deadline),
+    sniff_head_size: int = Depends(get_upload_sniff_size)
 ) -> AudioExtractorService:
     """
     AudioExtractorServiceのインスタンスを提供します。
@@ -98,8 +323,139 @@ def get_audio_extractor_service(
     Args:
         extractor (IAudioExtractor): 音声抽出器の依存関係。
         archiver (IArchiver): アーカイバの依存関係。
+        prober (IMediaProber): メディア解析器の依存関係。
+        scratch (IScratchSpace): 一時作業領域の依存関係。
+        result_cache (IResultCache | None): 抽出結果キャッシュの依存関係。
+        archivers (dict[ArchiveFormat, IArchiver]): 既定以外の形式のアーカイバの依存関係。
+        source_resolver (ISourceResolver | None): 参照で指定されたビデオファイルの解決器の依存関係。
+        deadline (ExtractionDeadline): 音声抽出の制限時間の設定の依存関係。
+        sniff_head_size (int): アップロードの判定に使用する先頭部分のバイト数の依存関係。
 
     Returns:
         AudioExtractorService: AudioExtractorServiceのインスタンス。
     """
-    return AudioExtractorService(extractor, archiver)
+    pipe_head_size = settings.PIPE_HEAD_SIZE if settings.INGEST_MODE == "pipe" else None
+    return AudioExtractorService(
+        extractor, archiver, prober, scratch, result_cache, pipe_head_size, archivers, source_resolver, deadline,
+        sniff_head_size or None
+    )
+
+# 一括抽出の同時実行数の上限（複数の一括抽出リクエストで共有するため、プロセス内で1つのインスタンスを使用）
+batch_slots = asyncio.Semaphore(settings.BATCH_MAX_CONCURRENCY or os.cpu_count() or 1)
+def get_batch_slots() -> asyncio.Semaphore:
+    """
+    一括抽出で同時に抽出するファイル数を制限するセマフォを提供します。
+
+    Returns:
+        asyncio.Semaphore: 一括抽出の同時実行数を制限するセマフォ。
+    """
+    return batch_slots
+
+# 非同期ジョブの保存先
+job_store: SqliteJobStore | None = None
+def get_job_store() -> IJobStore:
+    """
+    非同期ジョブの保存先のインスタンスを提供します。
+
+    Returns:
+        IJobStore: 非同期ジョブの保存先のインスタンス。
+    """
+    global job_store
+    if job_store is None:
+        job_store = SqliteJobStore(settings.JOB_DIR / "jobs.sqlite3", settings.JOB_DIR / "results")
+    return job_store
+
+# 非同期ジョブサービス（実行中のジョブと同時実行数をプロセス内で管理するため、1つのインスタンスを使用）
+extraction_job_service: ExtractionJobService | None = None
+def get_extraction_job_service() -> ExtractionJobService:
+    """
+    ExtractionJobServiceのインスタンスを提供します。
+
+    Returns:
+        ExtractionJobService: ExtractionJobServiceのインスタンス。
+    """
+    global extraction_job_service
+    if extraction_job_service is None:
+        extraction_job_service = ExtractionJobService(
+            get_job_store(),
+            ttl_seconds=settings.JOB_TTL_SECONDS,
+            max_workers=settings.JOB_MAX_WORKERS or os.cpu_count() or 1,
+        )
+    return extraction_job_service
+
+# 再開可能なアップロードのセッションの保存先
+upload_session_store: SqliteUploadSessionStore | None = None
+def get_upload_session_store() -> IUploadSessionStore:
+    """
+    再開可能なアップロードのセッションの保存先のインスタンスを提供します。
+
+    Returns:
+        IUploadSessionStore: セッションの保存先のインスタンス。
+    """
+    global upload_session_store
+    if upload_session_store is None:
+        upload_session_store = SqliteUploadSessionStore(settings.UPLOAD_DIR / "uploads.sqlite3")
+    return upload_session_store
+
+# 再開可能なアップロードのサービス（書き込み中のセッションをプロセス内で管理するため、1つのインスタンスを使用）
+upload_session_service: UploadSessionService | None = None
+def get_upload_session_service() -> UploadSessionService:
+    """
+    UploadSessionServiceのインスタンスを提供します。
+
+    Returns:
+        UploadSessionService: UploadSessionServiceのインスタンス。
+    """
+    global upload_session_service
+    if upload_session_service is None:
+        upload_session_service = UploadSessionService(
+            get_upload_session_store(),
+            get_scratch_space(),
+            ttl_seconds=settings.UPLOAD_SESSION_TTL_SECONDS,
+            max_upload_size=settings.MAX_UPLOAD_SIZE,
+        )
+    return upload_session_service
+
+def _scratch_disk_usage() -> dict[tuple[str, ...], float]:
+    """
+    一時作業領域のボリュームの使用量と空き容量を取得します。
+
+    一時作業領域がまだ作成されていない場合は、作成先のディレクトリを含むボリュームの値を返します。
+
+    Returns:
+        dict[tuple[str, ...], float]: 種別（used、free）とバイト数の対応。
+    """
+    path = scratch_space.root if scratch_space is not None else Path(settings.SCRATCH_DIR).absolute()
+    while not path.exists() and path != path.parent:
+        path = path.parent
+    usage = shutil.disk_usage(path)
+    return {("used",): usage.used, ("free",): usage.free}
+
+# リクエスト処理中に更新する必要のない値は、/metricsの取得時に求める
+metrics_registry.register(Gauge(
+    "ffmpeg_processes", "ffmpeg processes currently running or waiting for a slot.",
+    lambda: {("running",): ffmpeg_scheduler.running_jobs, ("queued",): ffmpeg_scheduler.queued_jobs},
+    ("state",),
+))
+metrics_registry.register(Gauge(
+    "scratch_disk_bytes", "Disk usage of the volume holding temporary upload and extraction files.",
+    _scratch_disk_usage, ("kind",),
+))
+metrics_registry.register(Gauge(
+    "scratch_workspace_bytes", "Bytes charged to scratch workspaces of in-flight requests, and the quota (0 if unlimited).",
+    lambda: {("used",): scratch_space.stats().used_bytes, ("limit",): scratch_space.stats().max_bytes}
+    if scratch_space is not None else {},
+    ("kind",),
+))
+metrics_registry.register(Gauge(
+    "result_cache_bytes", "Bytes stored in the extraction result cache.",
+    lambda: result_cache.stats().size_bytes if result_cache is not None else 0,
+))
+def get_metrics_registry() -> MetricsRegistry:
+    """
+    メトリクスの登録先のインスタンスを提供します。
+
+    Returns:
+        MetricsRegistry: メトリクスの登録先のインスタンス。
+    """
+    return metrics_registry
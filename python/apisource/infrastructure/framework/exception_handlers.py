@@ -1,8 +1,19 @@
 from fastapi import Request
 from fastapi.responses import JSONResponse
 
-from domain.interfaces.audio_extractor_interface import AudioExtractionFailedException
-from api.v1.endpoints.validation_exceptions import InvalidFileTypeException
+from domain.interfaces.audio_extractor_interface import (
+    AudioExtractionFailedException, ExtractionDeadlineExceededException, ExtractorBusyException,
+    NoAudioStreamException, NoMatchingAudioTrackException, UnsupportedContainerException
+)
+from domain.interfaces.job_store_interface import JobNotFoundException, JobNotFinishedException
+from domain.interfaces.media_prober_interface import MediaProbeFailedException
+from domain.interfaces.scratch_space_interface import ScratchSpaceExhaustedException
+from domain.interfaces.source_resolver_interface import SourceNotAllowedException, SourceNotFoundException
+from domain.interfaces.upload_session_store_interface import (
+    UploadChecksumMismatchException, UploadIncompleteException, UploadOffsetMismatchException,
+    UploadSessionNotFoundException
+)
+from api.v1.endpoints.validation_exceptions import InvalidFileTypeException, FileTooLargeException
 from infrastructure.framework.di import get_error_logger
 
 async def audio_extraction_failed_exception_handler(request: Request, exc: AudioExtractionFailedException):
@@ -23,6 +34,86 @@ async def audio_extraction_failed_exception_handler(request: Request, exc: Audio
     message = _("error.audio_extraction_failed")
     return JSONResponse(status_code=500, content={"message": message})
 
+async def extractor_busy_exception_handler(request: Request, exc: ExtractorBusyException):
+    """
+    ExtractorBusyExceptionを処理する例外ハンドラー。
+
+    変換処理の待ちが上限に達している場合に、再試行までの秒数をRetry-Afterヘッダーに含めた503レスポンスを返します。
+
+    Args:
+        request (Request): 受信したHTTPリクエスト。
+        exc (ExtractorBusyException): 発生した例外。
+
+    Returns:
+        JSONResponse: エラーメッセージを含むHTTPレスポンス。
+    """
+    get_error_logger().error(f"ExtractorBusyException: {exc}")
+    _ = request.state.translations.gettext
+    message = _("error.server_busy")
+    return JSONResponse(
+        status_code=503,
+        content={"message": message},
+        headers={"Retry-After": str(exc.retry_after)}
+    )
+
+async def extraction_deadline_exceeded_exception_handler(request: Request, exc: ExtractionDeadlineExceededException):
+    """
+    ExtractionDeadlineExceededExceptionを処理する例外ハンドラー。
+
+    音声抽出が制限時間内に終わらなかった場合に適切なエラーメッセージを含む504レスポンスを返します。
+
+    Args:
+        request (Request): 受信したHTTPリクエスト。
+        exc (ExtractionDeadlineExceededException): 発生した例外。
+
+    Returns:
+        JSONResponse: エラーメッセージを含むHTTPレスポンス。
+    """
+    get_error_logger().error(f"ExtractionDeadlineExceededException: {exc}")
+    _ = request.state.translations.gettext
+    message = _("error.extraction_deadline_exceeded")
+    return JSONResponse(status_code=504, content={"message": message})
+
+async def scratch_space_exhausted_exception_handler(request: Request, exc: ScratchSpaceExhaustedException):
+    """
+    ScratchSpaceExhaustedExceptionを処理する例外ハンドラー。
+
+    一時作業領域の容量上限に達している場合に、再試行までの秒数をRetry-Afterヘッダーに含めた507レスポンスを返します。
+
+    Args:
+        request (Request): 受信したHTTPリクエスト。
+        exc (ScratchSpaceExhaustedException): 発生した例外。
+
+    Returns:
+        JSONResponse: エラーメッセージを含むHTTPレスポンス。
+    """
+    get_error_logger().error(f"ScratchSpaceExhaustedException: {exc}")
+    _ = request.state.translations.gettext
+    message = _("error.scratch_space_exhausted")
+    return JSONResponse(
+        status_code=507,
+        content={"message": message},
+        headers={"Retry-After": str(exc.retry_after)}
+    )
+
+async def media_probe_failed_exception_handler(request: Request, exc: MediaProbeFailedException):
+    """
+    MediaProbeFailedExceptionを処理する例外ハンドラー。
+
+    アップロードされたファイルをメディアとして解析できなかった場合に適切なエラーメッセージを含むJSONレスポンスを返します。
+
+    Args:
+        request (Request): 受信したHTTPリクエスト。
+        exc (MediaProbeFailedException): 発生した例外。
+
+    Returns:
+        JSONResponse: エラーメッセージを含むHTTPレスポンス。
+    """
+    get_error_logger().error(f"MediaProbeFailedException: {exc}", exc_info=True)
+    _ = request.state.translations.gettext
+    message = _("error.media_probe_failed")
+    return JSONResponse(status_code=400, content={"message": message})
+
 async def invalid_file_type_exception_handler(request: Request, exc: InvalidFileTypeException):
     """
     InvalidFileTypeExceptionを処理する例外ハンドラー。
@@ -41,6 +132,222 @@ async def invalid_file_type_exception_handler(request: Request, exc: InvalidFile
     message = _("error.invalid_file_type")
     return JSONResponse(status_code=400, content={"message": message})
 
+async def unsupported_container_exception_handler(request: Request, exc: UnsupportedContainerException):
+    """
+    UnsupportedContainerExceptionを処理する例外ハンドラー。
+
+    アップロードされたファイルが対応するコンテナ形式でない場合に適切なエラーメッセージを含むJSONレスポンスを返します。
+
+    Args:
+        request (Request): 受信したHTTPリクエスト。
+        exc (UnsupportedContainerException): 発生した例外。
+
+    Returns:
+        JSONResponse: エラーメッセージを含むHTTPレスポンス。
+    """
+    get_error_logger().error(f"UnsupportedContainerException: {exc}")
+    _ = request.state.translations.gettext
+    message = _("error.unsupported_container")
+    return JSONResponse(status_code=400, content={"message": message})
+
+async def no_audio_stream_exception_handler(request: Request, exc: NoAudioStreamException):
+    """
+    NoAudioStreamExceptionを処理する例外ハンドラー。
+
+    アップロードされたファイルに音声トラックが含まれていない場合に適切なエラーメッセージを含むJSONレスポンスを返します。
+
+    Args:
+        request (Request): 受信したHTTPリクエスト。
+        exc (NoAudioStreamException): 発生した例外。
+
+    Returns:
+        JSONResponse: エラーメッセージを含むHTTPレスポンス。
+    """
+    get_error_logger().error(f"NoAudioStreamException: {exc}")
+    _ = request.state.translations.gettext
+    message = _("error.no_audio_stream")
+    return JSONResponse(status_code=400, content={"message": message})
+
+async def no_matching_audio_track_exception_handler(request: Request, exc: NoMatchingAudioTrackException):
+    """
+    NoMatchingAudioTrackExceptionを処理する例外ハンドラー。
+
+    抽出する音声トラックの指定に一致するトラックがない場合に適切なエラーメッセージを含むJSONレスポンスを返します。
+
+    Args:
+        request (Request): 受信したHTTPリクエスト。
+        exc (NoMatchingAudioTrackException): 発生した例外。
+
+    Returns:
+        JSONResponse: エラーメッセージを含むHTTPレスポンス。
+    """
+    get_error_logger().error(f"NoMatchingAudioTrackException: {exc}")
+    _ = request.state.translations.gettext
+    message = _("error.no_matching_audio_track")
+    return JSONResponse(status_code=400, content={"message": message})
+
+async def file_too_large_exception_handler(request: Request, exc: FileTooLargeException):
+    """
+    FileTooLargeExceptionを処理する例外ハンドラー。
+
+    アップロードされたファイルが最大サイズを超えた場合に適切なエラーメッセージを含むJSONレスポンスを返します。
+
+    Args:
+        request (Request): 受信したHTTPリクエスト。
+        exc (FileTooLargeException): 発生した例外。
+
+    Returns:
+        JSONResponse: エラーメッセージを含むHTTPレスポンス。
+    """
+    get_error_logger().error(f"FileTooLargeException: {exc}", exc_info=True)
+    _ = request.state.translations.gettext
+    message = _("error.file_too_large")
+    return JSONResponse(status_code=413, content={"message": message})
+
+async def job_not_found_exception_handler(request: Request, exc: JobNotFoundException):
+    """
+    JobNotFoundExceptionを処理する例外ハンドラー。
+
+    指定されたジョブが存在しないか、有効期限が切れている場合に適切なエラーメッセージを含むJSONレスポンスを返します。
+
+    Args:
+        request (Request): 受信したHTTPリクエスト。
+        exc (JobNotFoundException): 発生した例外。
+
+    Returns:
+        JSONResponse: エラーメッセージを含むHTTPレスポンス。
+    """
+    get_error_logger().error(f"JobNotFoundException: {exc}")
+    _ = request.state.translations.gettext
+    message = _("error.job_not_found")
+    return JSONResponse(status_code=404, content={"message": message})
+
+async def job_not_finished_exception_handler(request: Request, exc: JobNotFinishedException):
+    """
+    JobNotFinishedExceptionを処理する例外ハンドラー。
+
+    終了していないジョブの結果が要求された場合に適切なエラーメッセージを含むJSONレスポンスを返します。
+
+    Args:
+        request (Request): 受信したHTTPリクエスト。
+        exc (JobNotFinishedException): 発生した例外。
+
+    Returns:
+        JSONResponse: エラーメッセージを含むHTTPレスポンス。
+    """
+    get_error_logger().error(f"JobNotFinishedException: {exc}")
+    _ = request.state.translations.gettext
+    message = _("error.job_not_finished")
+    return JSONResponse(status_code=409, content={"message": message})
+
+async def upload_session_not_found_exception_handler(request: Request, exc: UploadSessionNotFoundException):
+    """
+    UploadSessionNotFoundExceptionを処理する例外ハンドラー。
+
+    指定されたアップロードのセッションが存在しないか、有効期限が切れている場合に適切なエラーメッセージを含むJSONレスポンスを返します。
+
+    Args:
+        request (Request): 受信したHTTPリクエスト。
+        exc (UploadSessionNotFoundException): 発生した例外。
+
+    Returns:
+        JSONResponse: エラーメッセージを含むHTTPレスポンス。
+    """
+    get_error_logger().error(f"UploadSessionNotFoundException: {exc}")
+    _ = request.state.translations.gettext
+    message = _("error.upload_session_not_found")
+    return JSONResponse(status_code=404, content={"message": message})
+
+async def upload_offset_mismatch_exception_handler(request: Request, exc: UploadOffsetMismatchException):
+    """
+    UploadOffsetMismatchExceptionを処理する例外ハンドラー。
+
+    チャンクの送信位置が受信済みのバイト数と一致しない場合に適切なエラーメッセージを含むJSONレスポンスを返します。
+
+    Args:
+        request (Request): 受信したHTTPリクエスト。
+        exc (UploadOffsetMismatchException): 発生した例外。
+
+    Returns:
+        JSONResponse: エラーメッセージを含むHTTPレスポンス。
+    """
+    get_error_logger().error(f"UploadOffsetMismatchException: {exc}")
+    _ = request.state.translations.gettext
+    message = _("error.upload_offset_mismatch")
+    return JSONResponse(status_code=409, content={"message": message})
+
+async def upload_incomplete_exception_handler(request: Request, exc: UploadIncompleteException):
+    """
+    UploadIncompleteExceptionを処理する例外ハンドラー。
+
+    受信が完了していないセッションで音声抽出が要求された場合に適切なエラーメッセージを含むJSONレスポンスを返します。
+
+    Args:
+        request (Request): 受信したHTTPリクエスト。
+        exc (UploadIncompleteException): 発生した例外。
+
+    Returns:
+        JSONResponse: エラーメッセージを含むHTTPレスポンス。
+    """
+    get_error_logger().error(f"UploadIncompleteException: {exc}")
+    _ = request.state.translations.gettext
+    message = _("error.upload_incomplete")
+    return JSONResponse(status_code=409, content={"message": message})
+
+async def upload_checksum_mismatch_exception_handler(request: Request, exc: UploadChecksumMismatchException):
+    """
+    UploadChecksumMismatchExceptionを処理する例外ハンドラー。
+
+    受信したデータのハッシュ値が一致しない場合に、tusプロトコルと同じ460ステータスコードでエラーメッセージを含むJSONレスポンスを返します。
+
+    Args:
+        request (Request): 受信したHTTPリクエスト。
+        exc (UploadChecksumMismatchException): 発生した例外。
+
+    Returns:
+        JSONResponse: エラーメッセージを含むHTTPレスポンス。
+    """
+    get_error_logger().error(f"UploadChecksumMismatchException: {exc}")
+    _ = request.state.translations.gettext
+    message = _("error.upload_checksum_mismatch")
+    return JSONResponse(status_code=460, content={"message": message})
+
+async def source_not_allowed_exception_handler(request: Request, exc: SourceNotAllowedException):
+    """
+    SourceNotAllowedExceptionを処理する例外ハンドラー。
+
+    参照を許可されていない場所のファイルが指定された場合に適切なエラーメッセージを含むJSONレスポンスを返します。
+
+    Args:
+        request (Request): 受信したHTTPリクエスト。
+        exc (SourceNotAllowedException): 発生した例外。
+
+    Returns:
+        JSONResponse: エラーメッセージを含むHTTPレスポンス。
+    """
+    get_error_logger().error(f"SourceNotAllowedException: {exc}")
+    _ = request.state.translations.gettext
+    message = _("error.source_not_allowed")
+    return JSONResponse(status_code=403, content={"message": message})
+
+async def source_not_found_exception_handler(request: Request, exc: SourceNotFoundException):
+    """
+    SourceNotFoundExceptionを処理する例外ハンドラー。
+
+    参照されたファイルが存在しないか、取得できない場合に適切なエラーメッセージを含むJSONレスポンスを返します。
+
+    Args:
+        request (Request): 受信したHTTPリクエスト。
+        exc (SourceNotFoundException): 発生した例外。
+
+    Returns:
+        JSONResponse: エラーメッセージを含むHTTPレスポンス。
+    """
+    get_error_logger().error(f"SourceNotFoundException: {exc}")
+    _ = request.state.translations.gettext
+    message = _("error.source_not_found")
+    return JSONResponse(status_code=404, content={"message": message})
+
 async def generic_exception_handler(request: Request, exc: Exception):
     """
     未定義の例外を処理する汎用例外ハンドラー。
@@ -63,6 +370,22 @@ def get_exception_handlers():
     """
     return [
         (AudioExtractionFailedException, audio_extraction_failed_exception_handler),
+        (ExtractorBusyException, extractor_busy_exception_handler),
+        (ExtractionDeadlineExceededException, extraction_deadline_exceeded_exception_handler),
+        (ScratchSpaceExhaustedException, scratch_space_exhausted_exception_handler),
+        (MediaProbeFailedException, media_probe_failed_exception_handler),
         (InvalidFileTypeException, invalid_file_type_exception_handler),
+        (UnsupportedContainerException, unsupported_container_exception_handler),
+        (NoAudioStreamException, no_audio_stream_exception_handler),
+        (NoMatchingAudioTrackException, no_matching_audio_track_exception_handler),
+        (FileTooLargeException, file_too_large_exception_handler),
+        (JobNotFoundException, job_not_found_exception_handler),
+        (JobNotFinishedException, job_not_finished_exception_handler),
+        (UploadSessionNotFoundException, upload_session_not_found_exception_handler),
+        (UploadOffsetMismatchException, upload_offset_mismatch_exception_handler),
+        (UploadIncompleteException, upload_incomplete_exception_handler),
+        (UploadChecksumMismatchException, upload_checksum_mismatch_exception_handler),
+        (SourceNotAllowedException, source_not_allowed_exception_handler),
+        (SourceNotFoundException, source_not_found_exception_handler),
         (Exception, generic_exception_handler),
     ]
\ No newline at end of file
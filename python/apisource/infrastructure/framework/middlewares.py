@@ -1,19 +1,27 @@
+import asyncio
 import time
-from fastapi import Request
-from babel.support import Translations
+from fastapi import Request, Response
 import os
 
+from domain.models.request_metrics import RequestMetrics, start_request_metrics
 from infrastructure.framework.di import get_access_logger
+from infrastructure.framework.translations import TranslationRegistry
+from infrastructure.metrics import EMITTED_BYTES, INGESTED_BYTES, REQUEST_DURATION, REQUEST_STAGE_DURATION
+from service.audio_extractor_service import ClosingStream
 from fastapi.middleware.cors import CORSMiddleware
 
 LOCALE_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '../../translations'))
 DEFAULT_LANGUAGE = 'en'
 
+# 翻訳カタログ（起動時にすべての言語を読み込み、リクエスト間で共有する）
+translation_registry = TranslationRegistry(LOCALE_DIR, DEFAULT_LANGUAGE)
+
 async def add_translation_middleware(request: Request, call_next):
     """
     翻訳ミドルウェア。
 
     リクエストヘッダーの"Accept-Language"に基づいて翻訳を設定します。
+    言語の解決はエラーメッセージの翻訳が必要になった時点で行われ、結果はヘッダー値ごとにメモ化されます。
 
     Args:
         request (Request): HTTPリクエストオブジェクト。
@@ -23,8 +31,7 @@ async def add_translation_middleware(request: Request, call_next):
         Response: 処理されたHTTPレスポンス。
     """
     lang = request.headers.get("Accept-Language", DEFAULT_LANGUAGE)
-    translations = Translations.load(LOCALE_DIR, [lang])
-    request.state.translations = translations
+    request.state.translations = translation_registry.for_header(lang)
     response = await call_next(request)
     return response
 
@@ -32,7 +39,10 @@ async def log_requests_middleware(request: Request, call_next):
     """
     リクエストログ記録ミドルウェア。
 
-    各リクエストの処理時間とステータスコードをログに記録します。
+    各リクエストの処理時間とステータスコードに加え、受信・解析・変換・アーカイブの各段階の所要時間、
+    入力サイズ、音声トラック数、レスポンスのバイト数をログとメトリクスに記録します。
+    ストリーミングレスポンスの送信が終わるまで計測するため、ログはレスポンスボディの送信完了時に出力されます。
+    レスポンスを返す前に例外が発生した場合や、ボディの送信が始まらなかった場合もログは一度だけ出力されます。
 
     Args:
         request (Request): HTTPリクエストオブジェクト。
@@ -41,14 +51,175 @@ async def log_requests_middleware(request: Request, call_next):
     Returns:
         Response: 処理されたHTTPレスポンス。
     """
-    start_time = time.time()
-    response = await call_next(request)
-    process_time = time.time() - start_time
+    metrics = start_request_metrics()
+    start_time = time.perf_counter()
+    # レスポンスを返す前に例外が発生した場合は、例外ハンドラーの外側で発生したサーバーエラーとして記録する
+    status_code = 500
+    # ボディのストリームにログの出力を引き継いだ場合はTrue（二重に出力しないため）
+    streaming = False
+
+    async def log():
+        process_time = time.perf_counter() - start_time
+        _log_access(request, status_code, process_time, metrics)
+        _observe_request(request, status_code, process_time, metrics)
+
+    try:
+        response = await call_next(request)
+        status_code = response.status_code
+        body_iterator = response.body_iterator
+
+        async def counted_body():
+            async for chunk in body_iterator:
+                metrics.response_bytes += len(chunk)
+                yield chunk
+
+        response.body_iterator = ClosingStream(counted_body(), log)
+        streaming = True
+        return LoggedResponse(response)
+    finally:
+        if not streaming:
+            await log()
+
+class LoggedResponse:
+    """
+    アクセスログを出力するストリームをボディに持つレスポンスを送信するASGIアプリケーション。
+
+    ボディのストリームは送信を終えた時点だけでなく、送信の途中で中断された場合や送信が始まらなかった場合にも閉じるため、
+    ストリームに結び付けたアクセスログは常に出力されます。
+    """
+
+    def __init__(self, response: Response):
+        """
+        LoggedResponseを初期化します。
+
+        Args:
+            response (Response): ボディをClosingStreamに置き換えたレスポンス。
+        """
+        self.response = response
+
+    async def __call__(self, scope, receive, send):
+        try:
+            await self.response(scope, receive, send)
+        finally:
+            await self.response.body_iterator.aclose()
+
+def _log_access(request: Request, status_code: int, process_time: float, metrics: RequestMetrics):
+    """
+    1リクエスト分のアクセスログを出力します。
+
+    Args:
+        request (Request): HTTPリクエストオブジェクト。
+        status_code (int): レスポンスのステータスコード。
+        process_time (float): レスポンスの送信完了までの処理時間（秒）。
+        metrics (RequestMetrics): 処理の内訳。
+    """
+    details = [f"input={metrics.input_bytes}B"]
+    if metrics.track_count is not None:
+        details.append(f"tracks={metrics.track_count}")
+    details += [f"{name}={seconds:.2f}s" for name, seconds in metrics.stages.items()]
+    details.append(f"response={metrics.response_bytes}B")
 
     get_access_logger().info(
-        f"{request.method} {request.url.path} - {response.status_code} - {process_time:.2f}s"
+        f"{request.method} {request.url.path} - {status_code} - {process_time:.2f}s - {' '.join(details)}",
+        extra={"fields": {
+            "method": request.method,
+            "path": request.url.path,
+            "status": status_code,
+            "duration": round(process_time, 6),
+            "input_bytes": metrics.input_bytes,
+            "track_count": metrics.track_count,
+            "stages": {name: round(seconds, 6) for name, seconds in metrics.stages.items()},
+            "response_bytes": metrics.response_bytes,
+        }}
     )
-    return response
+
+def _observe_request(request: Request, status_code: int, process_time: float, metrics: RequestMetrics):
+    """
+    1リクエスト分の処理時間と転送量をメトリクスに記録します。
+
+    エンドポイントはパスパラメーターを含まないルートのパス（例: /api/v1/jobs/{job_id}）で集計します。
+
+    Args:
+        request (Request): HTTPリクエストオブジェクト。
+        status_code (int): レスポンスのステータスコード。
+        process_time (float): レスポンスの送信完了までの処理時間（秒）。
+        metrics (RequestMetrics): 処理の内訳。
+    """
+    route = request.scope.get("route")
+    endpoint = route.path if route is not None else "unmatched"
+    REQUEST_DURATION.observe(process_time, method=request.method, endpoint=endpoint, status=str(status_code))
+    for name, seconds in metrics.stages.items():
+        # トラックごとの段階（transcode[1]など）は段階の種類ごとに集計する
+        REQUEST_STAGE_DURATION.observe(seconds, endpoint=endpoint, stage=name.split("[")[0])
+    if metrics.input_bytes:
+        INGESTED_BYTES.inc(metrics.input_bytes, endpoint=endpoint)
+    EMITTED_BYTES.inc(metrics.response_bytes, endpoint=endpoint)
+
+class CancelOnDisconnectMiddleware:
+    """
+    クライアントが切断した時点でリクエストの処理を取り消すASGIミドルウェア。
+
+    Starletteはレスポンスボディの送信中にしか切断を検知しないため、最初のトラックの抽出を待っている間に
+    クライアントが切断しても、結果の使われないffmpegが最後まで実行されてしまいます。
+    このミドルウェアはリクエストボディの受信が終わった時点から切断の通知を待ち受け、レスポンスの送信が
+    終わる前に切断された場合はリクエストの処理を取り消します。取り消しはffmpegの終了と作業ディレクトリの削除まで伝播します。
+    """
+
+    def __init__(self, app):
+        """
+        CancelOnDisconnectMiddlewareを初期化します。
+
+        Args:
+            app: 内側のASGIアプリケーション。
+        """
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        disconnected = asyncio.Event()
+        response_complete = False
+        watcher: asyncio.Task | None = None
+
+        async def watch_disconnect():
+            # ボディの受信後に届くメッセージは切断の通知のみ
+            while (await receive())["type"] != "http.disconnect":
+                pass
+            disconnected.set()
+            if not response_complete:
+                app_task.cancel()
+
+        async def receive_wrapper():
+            nonlocal watcher
+            if watcher is not None:
+                # ボディの受信後は、待ち受けているタスクが受け取った切断の通知を共有する
+                await disconnected.wait()
+                return {"type": "http.disconnect"}
+            message = await receive()
+            if message["type"] == "http.disconnect":
+                disconnected.set()
+            elif not message.get("more_body", False):
+                watcher = asyncio.create_task(watch_disconnect())
+            return message
+
+        async def send_wrapper(message):
+            nonlocal response_complete
+            if message["type"] == "http.response.body" and not message.get("more_body", False):
+                response_complete = True
+            await send(message)
+
+        app_task = asyncio.ensure_future(self.app(scope, receive_wrapper, send_wrapper))
+        try:
+            await app_task
+        except asyncio.CancelledError:
+            # 切断による取り消しは送信先がないため正常に終了し、サーバーからの取り消しはそのまま伝播させる
+            if not disconnected.is_set() or asyncio.current_task().cancelling():
+                raise
+        finally:
+            if watcher is not None:
+                watcher.cancel()
 
 def setup_middlewares(app):
     """
@@ -69,3 +240,6 @@ def setup_middlewares(app):
     # 関数型ミドルウェア
     app.middleware("http")(add_translation_middleware)
     app.middleware("http")(log_requests_middleware)
+
+    # 切断時の取り消しが内側のすべてのミドルウェアとエンドポイントに及ぶよう、最も外側に登録する
+    app.add_middleware(CancelOnDisconnectMiddleware)
@@ -0,0 +1,215 @@
+from collections.abc import AsyncIterator
+from dataclasses import dataclass, field
+
+from fastapi import Request
+from fastapi.exceptions import RequestValidationError
+import python_multipart
+from python_multipart.multipart import parse_options_header
+
+from api.v1.endpoints.validation_exceptions import FileTooLargeException
+
+# multipart/form-dataのボディを自前で逐次解析するエンドポイント用に、OpenAPIのリクエスト定義を明示する
+UPLOAD_REQUEST_BODY = {
+    "requestBody": {
+        "required": True,
+        "content": {
+            "multipart/form-data": {
+                "schema": {
+                    "type": "object",
+                    "properties": {"file": {"type": "string", "format": "binary"}},
+                    "required": ["file"],
+                }
+            }
+        },
+    }
+}
+
+@dataclass
+class _PartHeaders:
+    """
+    multipartの1パート分のヘッダー情報。
+    """
+    field_name: str = ""
+    filename: str | None = None
+    content_type: str = ""
+    headers: dict[bytes, bytes] = field(default_factory=dict)
+
+class UploadPart:
+    """
+    multipartリクエスト中のファイルパート。
+
+    パートの本文はメモリに保持せず、受信したチャンク単位で読み出します。
+
+    Attributes:
+        field_name (str): フォームのフィールド名。
+        filename (str): クライアントが送信したファイル名。
+        content_type (str): クライアントが送信したContent-Type。
+    """
+
+    def __init__(self, reader: "MultipartStreamReader", headers: _PartHeaders):
+        self._reader = reader
+        self.field_name = headers.field_name
+        self.filename = headers.filename or ""
+        self.content_type = headers.content_type
+
+    def __aiter__(self) -> AsyncIterator[bytes]:
+        return self._reader._iter_part_data()
+
+class MultipartStreamReader:
+    """
+    multipart/form-dataのリクエストボディを逐次解析するクラス。
+
+    FastAPIのUploadFileのようにボディ全体を受信してから処理するのではなく、
+    受信したチャンクをそのまま呼び出し側へ渡すため、リクエストあたりのメモリ使用量が一定に保たれます。
+    """
+
+    def __init__(self, request: Request, max_size: int):
+        """
+        MultipartStreamReaderを初期化します。
+
+        Args:
+            request (Request): 解析対象のHTTPリクエスト。
+            max_size (int): 受信を許可するボディの最大バイト数。
+
+        Raises:
+            RequestValidationError: multipart/form-data形式のリクエストでない場合。
+            FileTooLargeException: Content-Lengthが上限を超えている場合。
+        """
+        content_length = request.headers.get("Content-Length")
+        if content_length and content_length.isdigit() and int(content_length) > max_size:
+            raise FileTooLargeException()
+
+        content_type, params = parse_options_header(request.headers.get("Content-Type", ""))
+        if content_type != b"multipart/form-data" or b"boundary" not in params:
+            raise _missing_file_error("file")
+
+        self._request = request
+        self._max_size = max_size
+        self._received = 0
+        self._events: list[tuple[str, object]] = []
+        self._current = _PartHeaders()
+        self._header_name = b""
+        self._header_value = b""
+        self._finished = False
+        self._parser = python_multipart.MultipartParser(params[b"boundary"], {
+            "on_part_begin": self._on_part_begin,
+            "on_part_data": self._on_part_data,
+            "on_part_end": self._on_part_end,
+            "on_header_field": self._on_header_field,
+            "on_header_value": self._on_header_value,
+            "on_header_end": self._on_header_end,
+            "on_headers_finished": self._on_headers_finished,
+        })
+        self._stream = request.stream()
+
+    def _on_part_begin(self):
+        self._current = _PartHeaders()
+
+    def _on_part_data(self, data: bytes, start: int, end: int):
+        self._events.append(("data", data[start:end]))
+
+    def _on_part_end(self):
+        self._events.append(("end", None))
+
+    def _on_header_field(self, data: bytes, start: int, end: int):
+        self._header_name += data[start:end]
+
+    def _on_header_value(self, data: bytes, start: int, end: int):
+        self._header_value += data[start:end]
+
+    def _on_header_end(self):
+        self._current.headers[self._header_name.lower()] = self._header_value
+        self._header_name = b""
+        self._header_value = b""
+
+    def _on_headers_finished(self):
+        _, options = parse_options_header(self._current.headers.get(b"content-disposition", b""))
+        self._current.field_name = options.get(b"name", b"").decode("utf-8", "replace")
+        if b"filename" in options:
+            self._current.filename = options[b"filename"].decode("utf-8", "replace")
+        self._current.content_type = self._current.headers.get(b"content-type", b"").decode("latin-1")
+        self._events.append(("headers", self._current))
+
+    async def _next_event(self) -> tuple[str, object] | None:
+        """
+        パーサーから次のイベントを取り出します。必要に応じてリクエストボディを追加で受信します。
+
+        Returns:
+            tuple[str, object] | None: イベント種別と値の組。ボディの終端に達した場合はNone。
+        """
+        while not self._events:
+            if self._finished:
+                return None
+            chunk = await anext(self._stream, b"")
+            if not chunk:
+                self._finished = True
+                self._parser.finalize()
+                continue
+            self._received += len(chunk)
+            if self._received > self._max_size:
+                raise FileTooLargeException()
+            self._parser.write(chunk)
+        return self._events.pop(0)
+
+    async def _iter_part_data(self) -> AsyncIterator[bytes]:
+        """
+        現在のパートの本文をチャンク単位で返します。
+        """
+        while (event := await self._next_event()) is not None:
+            kind, value = event
+            if kind == "end":
+                return
+            if kind == "data" and value:
+                yield value
+
+    async def next_file(self) -> UploadPart | None:
+        """
+        次のファイルパートまで読み進めます。
+
+        ファイル以外のフィールドの本文は読み捨てます。
+
+        Returns:
+            UploadPart | None: 次のファイルパート。ファイルパートが残っていない場合はNone。
+        """
+        while (event := await self._next_event()) is not None:
+            kind, value = event
+            if kind == "headers" and value.filename is not None:
+                return UploadPart(self, value)
+        return None
+
+    async def get_file(self, field_name: str) -> UploadPart:
+        """
+        指定されたフィールド名のファイルパートまで読み進めます。
+
+        Args:
+            field_name (str): ファイルパートのフィールド名。
+
+        Returns:
+            UploadPart: 見つかったファイルパート。
+
+        Raises:
+            RequestValidationError: 指定されたファイルパートが含まれていない場合。
+        """
+        while (part := await self.next_file()) is not None:
+            if part.field_name == field_name:
+                return part
+        raise _missing_file_error(field_name)
+
+def _missing_file_error(field_name: str) -> RequestValidationError:
+    """
+    ファイルパートが存在しない場合の検証エラーを生成します。
+
+    FastAPIのFile(...)引数が欠落した場合と同じ形式のエラーを返します。
+
+    Args:
+        field_name (str): 欠落しているフィールド名。
+
+    Returns:
+        RequestValidationError: 検証エラー。
+    """
+    return RequestValidationError([{
+        "type": "missing",
+        "loc": ("body", field_name),
+        "msg": "Field required",
+        "input": None,
+    }])
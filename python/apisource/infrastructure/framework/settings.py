@@ -0,0 +1,119 @@
+"""
+アプリケーション設定。
+
+環境変数から各種設定値を読み込みます。環境変数が未設定の場合は既定値を使用します。
+"""
+
+import os
+import tempfile
+from pathlib import Path
+
+def _get_int(name: str, default: int) -> int:
+    """
+    環境変数を整数として読み込みます。
+
+    Args:
+        name (str): 環境変数名。
+        default (int): 環境変数が未設定の場合の既定値。
+
+    Returns:
+        int: 読み込んだ整数値。
+    """
+    value = os.environ.get(name)
+    return int(value) if value else default
+
+# ログの出力形式（text: インデント付きのテキスト、json: 1行1レコードのJSON）
+LOG_FORMAT = os.environ.get("LOG_FORMAT", "text")
+
+# アップロードを許可する最大バイト数（既定値: 10GiB）
+MAX_UPLOAD_SIZE = _get_int("MAX_UPLOAD_SIZE", 10 * 1024 ** 3)
+
+# 音声抽出モード（single_pass: 1回のffmpeg実行で全トラックを抽出、per_track: トラックごとにffmpegを起動）
+EXTRACTION_MODE = os.environ.get("EXTRACTION_MODE", "single_pass")
+
+# 1つの音声トラックのみをAAC（.aac、.mka）またはMP3に再エンコードする場合に、区間に分割して並列に変換する
+# 抽出範囲の最短の秒数（既定値: 0、0の場合は分割しない。有効にする場合は30分（1800）程度を目安とする）
+SEGMENT_PARALLEL_MIN_DURATION = _get_int("SEGMENT_PARALLEL_MIN_DURATION", 0)
+
+# 区間並列変換で分割する区間の最大数（0の場合はffmpegの同時実行数）
+SEGMENT_PARALLEL_MAX_SEGMENTS = _get_int("SEGMENT_PARALLEL_MAX_SEGMENTS", 0)
+
+# アップロードの受信方法（scratch_file: ファイル全体を一時ファイルに受信してから抽出、
+# pipe: ストリーミング可能な形式のファイルは受信しながらffmpegの標準入力へ渡して抽出）
+INGEST_MODE = os.environ.get("INGEST_MODE", "scratch_file")
+
+# pipeモードで形式の判定とトラック構成の解析に使用する先頭部分のバイト数（既定値: 4MiB）
+PIPE_HEAD_SIZE = _get_int("PIPE_HEAD_SIZE", 4 * 1024 ** 2)
+
+# アップロードの受信中にコンテナ形式の判定と音声トラックの有無の解析に使用する先頭部分のバイト数
+# （既定値: 1MiB、0の場合は判定せずにファイル全体を受信する）
+UPLOAD_SNIFF_SIZE = _get_int("UPLOAD_SNIFF_SIZE", 1024 ** 2)
+
+# メディア解析結果をキャッシュする最大件数
+PROBE_CACHE_SIZE = _get_int("PROBE_CACHE_SIZE", 256)
+
+# ffmpegを同時に実行する最大数（0の場合はCPUコア数）
+FFMPEG_MAX_CONCURRENT_JOBS = _get_int("FFMPEG_MAX_CONCURRENT_JOBS", 0)
+
+# 各ffmpegに割り当てるスレッド数（0の場合はCPUコア数を同時実行数で割った値）
+FFMPEG_THREADS_PER_JOB = _get_int("FFMPEG_THREADS_PER_JOB", 0)
+
+# 実行待ちにできるffmpegのジョブの最大数
+FFMPEG_MAX_QUEUED_JOBS = _get_int("FFMPEG_MAX_QUEUED_JOBS", 64)
+
+# 実行待ちが上限に達した際にRetry-Afterヘッダーで提示する秒数
+FFMPEG_RETRY_AFTER = _get_int("FFMPEG_RETRY_AFTER", 5)
+
+# 受信したファイルや抽出した音声を書き込む一時作業領域のディレクトリ（tmpfsのマウントポイントも指定可能）
+SCRATCH_DIR = Path(os.environ.get("SCRATCH_DIR", Path(tempfile.gettempdir()) / "audio-extractor"))
+
+# 一時作業領域に書き込めるバイト数の合計の上限（0の場合は制限しない）
+SCRATCH_MAX_BYTES = _get_int("SCRATCH_MAX_BYTES", 0)
+
+# 一時作業領域の容量上限に達した際にRetry-Afterヘッダーで提示する秒数
+SCRATCH_RETRY_AFTER = _get_int("SCRATCH_RETRY_AFTER", 30)
+
+# 削除されずに残った作業ディレクトリを清掃する間隔（秒）
+SCRATCH_JANITOR_INTERVAL_SECONDS = _get_int("SCRATCH_JANITOR_INTERVAL_SECONDS", 5 * 60)
+
+# 作成したプロセスが実行中であっても、残されたものとみなして削除するまでの作業ディレクトリの未更新の秒数（既定値: 24時間）
+SCRATCH_ORPHAN_MAX_AGE_SECONDS = _get_int("SCRATCH_ORPHAN_MAX_AGE_SECONDS", 24 * 60 * 60)
+
+# 音声抽出の制限時間のうち、抽出する範囲の長さによらない秒数
+# （制限時間 = EXTRACTION_DEADLINE_BASE_SECONDS + EXTRACTION_DEADLINE_PER_MEDIA_SECOND × 抽出する範囲の秒数、両方0の場合は制限しない）
+EXTRACTION_DEADLINE_BASE_SECONDS = _get_int("EXTRACTION_DEADLINE_BASE_SECONDS", 5 * 60)
+
+# 音声抽出の制限時間のうち、抽出する範囲の長さ1秒あたりに加算する秒数
+EXTRACTION_DEADLINE_PER_MEDIA_SECOND = float(os.environ.get("EXTRACTION_DEADLINE_PER_MEDIA_SECOND") or 1.0)
+
+# 抽出結果キャッシュの保存先ディレクトリ
+RESULT_CACHE_DIR = Path(os.environ.get("RESULT_CACHE_DIR", Path(os.getcwd()) / "cache"))
+
+# 抽出結果キャッシュの容量上限（既定値: 5GiB、0の場合はキャッシュしない）
+RESULT_CACHE_MAX_BYTES = _get_int("RESULT_CACHE_MAX_BYTES", 5 * 1024 ** 3)
+
+# 一括抽出で同時に抽出するファイル数の上限（全リクエスト共通、0の場合はCPUコア数）
+BATCH_MAX_CONCURRENCY = _get_int("BATCH_MAX_CONCURRENCY", 0)
+
+# 非同期ジョブの状態と結果アーカイブの保存先ディレクトリ
+JOB_DIR = Path(os.environ.get("JOB_DIR", Path(os.getcwd()) / "jobs"))
+
+# 非同期ジョブの終了後に結果を保持する秒数（既定値: 24時間）
+JOB_TTL_SECONDS = _get_int("JOB_TTL_SECONDS", 24 * 60 * 60)
+
+# 非同期ジョブを同時に実行する最大数（0の場合はCPUコア数）
+JOB_MAX_WORKERS = _get_int("JOB_MAX_WORKERS", 0)
+
+# 再開可能なアップロードのセッションの状態の保存先ディレクトリ（受信済みのファイルデータは一時作業領域に保存する）
+UPLOAD_DIR = Path(os.environ.get("UPLOAD_DIR", Path(os.getcwd()) / "uploads"))
+
+# 最後にチャンクを受信してから、放置されたアップロードのセッションを保持する秒数（既定値: 24時間）
+UPLOAD_SESSION_TTL_SECONDS = _get_int("UPLOAD_SESSION_TTL_SECONDS", 24 * 60 * 60)
+
+# 参照による音声抽出でファイルを直接読み込むことを許可するマウントのルートディレクトリ
+# （os.pathsepで区切って複数指定、未設定の場合はファイルの参照を受け付けない）
+REFERENCE_MOUNT_ROOTS = [Path(root) for root in os.environ.get("REFERENCE_MOUNT_ROOTS", "").split(os.pathsep) if root]
+
+# 参照による音声抽出でffmpegが中継サーバー経由で読み込むことを許可するHTTP(S)のURLのプレフィックス
+# （カンマで区切って複数指定、未設定の場合はURLの参照を受け付けない）
+REFERENCE_URL_PREFIXES = [prefix.strip() for prefix in os.environ.get("REFERENCE_URL_PREFIXES", "").split(",") if prefix.strip()]
@@ -0,0 +1,161 @@
+from functools import lru_cache
+from pathlib import Path
+
+from babel.support import NullTranslations, Translations
+
+# 言語の解決結果をメモ化するAccept-Languageヘッダー値の最大件数
+RESOLVED_LANGUAGE_CACHE_SIZE = 256
+
+def parse_accept_language(header: str) -> list[str]:
+    """
+    Accept-Languageヘッダーを解析し、品質値（q値）の高い順に言語タグを返します。
+
+    q値が0の言語タグと、書式が不正なq値を持つ言語タグは除外します。q値が等しい場合はヘッダー内の順序を保ちます。
+
+    Args:
+        header (str): Accept-Languageヘッダーの値（例: "ja,en-US;q=0.9"）。
+
+    Returns:
+        list[str]: 言語タグのリスト。
+    """
+    weighted = []
+    for item in header.split(","):
+        tag, _, params = item.strip().partition(";")
+        tag = tag.strip()
+        if not tag:
+            continue
+        quality = 1.0
+        for param in params.split(";"):
+            name, _, value = param.strip().partition("=")
+            if name.strip().lower() == "q":
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        if quality > 0:
+            weighted.append((quality, tag))
+    weighted.sort(key=lambda pair: pair[0], reverse=True)
+    return [tag for _, tag in weighted]
+
+class TranslationRegistry:
+    """
+    翻訳カタログを保持し、Accept-Languageヘッダーから使用する言語を決定するクラス。
+
+    翻訳ディレクトリ内のすべてのカタログを初期化時に読み込むため、リクエストごとのファイル読み込みや.moファイルの解析が発生しません。
+    """
+
+    def __init__(self, locale_dir: str | Path, default_language: str):
+        """
+        TranslationRegistryを初期化し、翻訳ディレクトリ内のすべてのカタログを読み込みます。
+
+        Args:
+            locale_dir (str | Path): 言語ごとのサブディレクトリを含む翻訳ディレクトリ。
+            default_language (str): 対応する言語が見つからない場合に使用する言語。
+        """
+        self.default_language = default_language
+        self._catalogs: dict[str, NullTranslations] = {}
+        for mo_file in sorted(Path(locale_dir).glob("*/LC_MESSAGES/messages.mo")):
+            language = mo_file.parent.parent.name
+            self._catalogs[language.lower()] = Translations.load(locale_dir, [language])
+        self.resolve = lru_cache(maxsize=RESOLVED_LANGUAGE_CACHE_SIZE)(self.__resolve)
+
+    @property
+    def languages(self) -> list[str]:
+        """
+        読み込まれたカタログの言語のリスト。
+        """
+        return list(self._catalogs)
+
+    def __resolve(self, header: str) -> str:
+        """
+        Accept-Languageヘッダーから使用する言語を決定します。
+
+        各言語タグについて完全一致（例: "en_US"）、次に主言語タグ（例: "en"）の順にカタログを探します。
+        結果はヘッダー値ごとにメモ化されます。
+
+        Args:
+            header (str): Accept-Languageヘッダーの値。
+
+        Returns:
+            str: 使用する言語。
+        """
+        for tag in parse_accept_language(header):
+            if tag == "*":
+                return self.default_language
+            normalized = tag.replace("-", "_").lower()
+            for candidate in (normalized, normalized.split("_")[0]):
+                if candidate in self._catalogs:
+                    return candidate
+        return self.default_language
+
+    def get(self, language: str) -> NullTranslations:
+        """
+        言語のカタログを取得します。
+
+        Args:
+            language (str): 言語。
+
+        Returns:
+            NullTranslations: カタログ。カタログが存在しない場合は翻訳を行わないカタログ。
+        """
+        return self._catalogs.get(language.lower()) or NullTranslations()
+
+    def for_header(self, header: str) -> "LazyTranslations":
+        """
+        Accept-Languageヘッダーに対応するカタログを、最初に使用されるまで解決を遅らせて返します。
+
+        Args:
+            header (str): Accept-Languageヘッダーの値。
+
+        Returns:
+            LazyTranslations: カタログの遅延参照。
+        """
+        return LazyTranslations(self, header)
+
+class LazyTranslations:
+    """
+    Accept-Languageヘッダーに対応するカタログの遅延参照。
+
+    翻訳が必要になるのはエラーレスポンスを返す場合に限られるため、
+    言語の解決は gettext などが最初に呼び出された時点で行います。
+    """
+
+    def __init__(self, registry: TranslationRegistry, header: str):
+        self._registry = registry
+        self._header = header
+        self._catalog: NullTranslations | None = None
+
+    @property
+    def catalog(self) -> NullTranslations:
+        """
+        解決済みのカタログ。
+        """
+        if self._catalog is None:
+            self._catalog = self._registry.get(self._registry.resolve(self._header))
+        return self._catalog
+
+    def gettext(self, message: str) -> str:
+        """
+        メッセージを翻訳します。
+
+        Args:
+            message (str): メッセージID。
+
+        Returns:
+            str: 翻訳されたメッセージ。
+        """
+        return self.catalog.gettext(message)
+
+    def ngettext(self, singular: str, plural: str, n: int) -> str:
+        """
+        数に応じた複数形を考慮してメッセージを翻訳します。
+
+        Args:
+            singular (str): 単数形のメッセージID。
+            plural (str): 複数形のメッセージID。
+            n (int): 数。
+
+        Returns:
+            str: 翻訳されたメッセージ。
+        """
+        return self.catalog.ngettext(singular, plural, n)
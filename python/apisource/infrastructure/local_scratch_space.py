@@ -0,0 +1,235 @@
+import asyncio
+import os
+import shutil
+import threading
+import time
+import uuid
+from pathlib import Path
+
+from domain.interfaces.scratch_space_interface import IScratchSpace, ScratchSpaceExhaustedException, ScratchStats
+
+def _process_alive(pid: int) -> bool:
+    """
+    指定されたプロセスIDのプロセスが実行中かどうかを判定します。
+
+    Args:
+        pid (int): プロセスID。
+
+    Returns:
+        bool: 実行中の場合はTrue。
+    """
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+class LocalScratchSpace(IScratchSpace):
+    """
+    ローカルのディレクトリを一時作業領域として使用するクラス。
+
+    ルートディレクトリにtmpfsを指定すると、受信したファイルや抽出した音声をディスクに書き込まずに処理できます。
+    作業ディレクトリの名前には作成したプロセスのIDを含め、異常終了したプロセスが残した作業ディレクトリを
+    purge_orphansで判別して削除します。複数のワーカープロセスで同じルートディレクトリを共有できますが、
+    容量上限はプロセスごとに管理されます。
+    """
+
+    def __init__(self, root: Path, max_bytes: int = 0, retry_after: int = 30, orphan_max_age_seconds: int = 24 * 60 * 60):
+        """
+        LocalScratchSpaceを初期化します。
+
+        Args:
+            root (Path): 作業ディレクトリを作成するルートディレクトリ。
+            max_bytes (int): 作業ディレクトリに書き込めるバイト数の合計の上限（0の場合は制限なし）。
+            retry_after (int): 容量上限に達した際にクライアントへ提示する再試行までの秒数。
+            orphan_max_age_seconds (int): 実行中の他のプロセスの作業ディレクトリであっても、
+                この秒数を超えて更新されていないものは残されたものとみなして削除します。
+        """
+        self.root = Path(root).absolute()
+        self.root.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes
+        self.retry_after = retry_after
+        self.orphan_max_age_seconds = orphan_max_age_seconds
+        # 使用中の作業ディレクトリ名と計上済みのバイト数（清掃はワーカースレッドで行うためロックで保護する）
+        self._workspaces: dict[str, int] = {}
+        self._used_bytes = 0
+        self._lock = threading.Lock()
+
+    def check_capacity(self):
+        """
+        新たなリクエストを受け付けられる空き容量があるかどうかを確認します。
+
+        Raises:
+            ScratchSpaceExhaustedException: 使用量が容量上限に達している場合。
+        """
+        if self.max_bytes and self._used_bytes >= self.max_bytes:
+            raise ScratchSpaceExhaustedException(self.retry_after)
+
+    def create_workspace(self) -> Path:
+        """
+        作業ディレクトリを作成します。
+
+        Returns:
+            Path: 作成した作業ディレクトリのパス。
+        """
+        name = f"{os.getpid()}-{uuid.uuid4().hex}"
+        # 清掃で削除されないよう、ディレクトリを作成する前に使用中として登録する
+        with self._lock:
+            self._workspaces[name] = 0
+        workspace = self.root / name
+        workspace.mkdir(parents=True)
+        return workspace
+
+    def charge(self, path: Path, size: int):
+        """
+        作業ディレクトリに書き込むバイト数を使用量に計上します。
+
+        作業領域外のパスが指定された場合は計上しません。
+
+        Args:
+            path (Path): 作業ディレクトリ、またはその中のファイルのパス。
+            size (int): 書き込むバイト数。
+
+        Raises:
+            ScratchSpaceExhaustedException: 計上すると容量上限を超える場合。
+        """
+        name = self.__workspace_name(path)
+        with self._lock:
+            if name not in self._workspaces:
+                return
+            if self.max_bytes and self._used_bytes + size > self.max_bytes:
+                raise ScratchSpaceExhaustedException(self.retry_after)
+            self._workspaces[name] += size
+            self._used_bytes += size
+
+    def release(self, path: Path, size: int):
+        """
+        作業ディレクトリから削除したファイルのバイト数を、使用量から差し引きます。
+
+        作業領域外のパスが指定された場合は何もしません。
+
+        Args:
+            path (Path): 作業ディレクトリ、またはその中のファイルのパス。
+            size (int): 削除したバイト数。
+        """
+        name = self.__workspace_name(path)
+        with self._lock:
+            if name not in self._workspaces:
+                return
+            size = min(size, self._workspaces[name])
+            self._workspaces[name] -= size
+            self._used_bytes -= size
+
+    def adopt(self, path: Path) -> Path:
+        """
+        前回のプロセスが作成した作業ディレクトリを、このプロセスが使用中の作業ディレクトリとして引き継ぎます。
+
+        作業ディレクトリの名前をこのプロセスのIDを含む名前に変更するため、他のワーカープロセスの清掃でも削除されません。
+        既存のファイルは容量上限を超える場合でも使用量に計上します。
+
+        Args:
+            path (Path): 作業ディレクトリ、またはその中のファイルのパス。
+
+        Returns:
+            Path: 引き継いだ後の、指定されたパスに対応するパス。
+
+        Raises:
+            FileNotFoundError: 作業ディレクトリが既に削除されている場合。
+            ValueError: 作業領域外のパスが指定された場合。
+        """
+        name = self.__workspace_name(path)
+        if name is None:
+            raise ValueError(f"Not in the scratch space: {path}")
+        with self._lock:
+            if name in self._workspaces:
+                return Path(path)
+        relative = Path(path).absolute().relative_to(self.root / name)
+        workspace = self.create_workspace()
+        try:
+            os.replace(self.root / name, workspace)
+        except OSError:
+            self.discard(workspace)
+            raise
+        size = sum(file.stat().st_size for file in workspace.rglob("*") if file.is_file())
+        with self._lock:
+            self._workspaces[workspace.name] += size
+            self._used_bytes += size
+        return workspace / relative
+
+    def discard(self, path: Path):
+        """
+        作業ディレクトリを削除し、その使用量を解放します。
+
+        Args:
+            path (Path): 作業ディレクトリ、またはその中のファイルのパス。作業領域外の場合はそのファイルのみを削除します。
+        """
+        name = self.__workspace_name(path)
+        if name is None:
+            Path(path).unlink(missing_ok=True)
+            return
+        shutil.rmtree(self.root / name, ignore_errors=True)
+        with self._lock:
+            self._used_bytes -= self._workspaces.pop(name, 0)
+
+    def __workspace_name(self, path: Path) -> str | None:
+        """
+        パスを含む作業ディレクトリの名前を返します。作業領域外のパスの場合はNoneを返します。
+        """
+        try:
+            parts = Path(path).absolute().relative_to(self.root).parts
+        except ValueError:
+            return None
+        return parts[0] if parts else None
+
+    def purge_orphans(self) -> int:
+        """
+        削除されずに残った作業ディレクトリを削除します。
+
+        このプロセスが作成して使用中として登録されていないもの、作成したプロセスが終了しているもの、
+        および最終更新から一定時間を超えたものを削除します。
+
+        Returns:
+            int: 削除した作業ディレクトリの数。
+        """
+        purged = 0
+        now = time.time()
+        for entry in self.root.iterdir():
+            pid, separator, _ = entry.name.partition("-")
+            if not separator or not pid.isdigit():
+                continue
+            with self._lock:
+                if entry.name in self._workspaces:
+                    continue
+            try:
+                stale = now - entry.stat().st_mtime > self.orphan_max_age_seconds
+            except FileNotFoundError:
+                continue
+            if int(pid) == os.getpid() or not _process_alive(int(pid)) or stale:
+                shutil.rmtree(entry, ignore_errors=True)
+                purged += 1
+        return purged
+
+    async def run_janitor(self, interval_seconds: float):
+        """
+        purge_orphansを一定の間隔で繰り返し実行します。タスクがキャンセルされるまで終了しません。
+
+        起動直後に1回実行するため、前回のプロセスが異常終了して残した作業ディレクトリは起動時に削除されます。
+
+        Args:
+            interval_seconds (float): 実行の間隔（秒）。
+        """
+        while True:
+            await asyncio.to_thread(self.purge_orphans)
+            await asyncio.sleep(interval_seconds)
+
+    def stats(self) -> ScratchStats:
+        """
+        一時作業領域の使用状況を取得します。
+
+        Returns:
+            ScratchStats: 使用状況。
+        """
+        with self._lock:
+            return ScratchStats(len(self._workspaces), self._used_bytes, self.max_bytes)
@@ -0,0 +1,245 @@
+"""
+Prometheusのテキスト形式で出力するメトリクス。
+
+リクエスト処理中の記録は数値の加算のみで完了し、出力形式への変換は/metricsの取得時にのみ行います。
+"""
+
+import bisect
+import math
+import threading
+from abc import ABC, abstractmethod
+from collections.abc import Callable
+
+# レイテンシ用のヒストグラムのバケット（秒）
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120, 300, 600, 1800, 3600)
+# ffmpegのCPU時間用のヒストグラムのバケット（秒）
+CPU_SECONDS_BUCKETS = (0.1, 0.5, 1, 2.5, 5, 10, 30, 60, 120, 300, 600, 1800, 3600)
+# ffmpegの最大常駐メモリ用のヒストグラムのバケット（バイト）
+RSS_BYTES_BUCKETS = tuple(2 ** exponent * 1024 ** 2 for exponent in range(3, 14))
+
+def _escape(value: str) -> str:
+    """
+    ラベルの値に含まれるバックスラッシュ、二重引用符、改行をエスケープします。
+    """
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+def _format_labels(label_names: tuple[str, ...], label_values: tuple[str, ...], extra: str = "") -> str:
+    """
+    ラベルをPrometheusのテキスト形式に変換します。
+
+    Args:
+        label_names (tuple[str, ...]): ラベル名。
+        label_values (tuple[str, ...]): ラベルの値。
+        extra (str): 末尾に追加する整形済みのラベル（ヒストグラムのleなど）。
+
+    Returns:
+        str: "{name="value",...}"形式の文字列。ラベルがない場合は空文字列。
+    """
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(label_names, label_values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+def _format_value(value: float) -> str:
+    """
+    数値をPrometheusのテキスト形式に変換します。
+    """
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    return repr(float(value))
+
+class _Metric(ABC):
+    """
+    メトリクスの基底クラス。
+
+    Attributes:
+        name (str): メトリクス名。
+        help (str): メトリクスの説明。
+        label_names (tuple[str, ...]): ラベル名。
+    """
+    type_name = ""
+
+    def __init__(self, name: str, help: str, label_names: tuple[str, ...] = ()):
+        self.name = name
+        self.help = help
+        self.label_names = label_names
+        self._lock = threading.Lock()
+
+    def _key(self, labels: dict[str, str]) -> tuple[str, ...]:
+        return tuple(str(labels.get(name, "")) for name in self.label_names)
+
+    @abstractmethod
+    def samples(self) -> list[str]:
+        """
+        メトリクスの値をPrometheusのテキスト形式の行として返します。
+        """
+        pass
+
+    def render(self) -> str:
+        """
+        HELPとTYPEを含むメトリクス全体をPrometheusのテキスト形式で返します。
+        """
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.type_name}", *self.samples()]
+        return "\n".join(lines)
+
+class Counter(_Metric):
+    """
+    単調増加するカウンター。
+    """
+    type_name = "counter"
+
+    def __init__(self, name: str, help: str, label_names: tuple[str, ...] = ()):
+        super().__init__(name, help, label_names)
+        self._values: dict[tuple[str, ...], float] = {}
+
+    def inc(self, amount: float = 1, **labels: str):
+        """
+        カウンターを加算します。
+
+        Args:
+            amount (float): 加算する値。
+            **labels (str): ラベルの値。
+        """
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def samples(self) -> list[str]:
+        with self._lock:
+            values = list(self._values.items())
+        return [f"{self.name}{_format_labels(self.label_names, key)} {_format_value(value)}" for key, value in values]
+
+class Gauge(_Metric):
+    """
+    取得時に関数を呼び出して値を求めるゲージ。
+
+    キューの長さやディスク使用量など、リクエスト処理中に更新する必要のない値に使用します。
+    """
+    type_name = "gauge"
+
+    def __init__(
+        self,
+        name: str,
+        help: str,
+        collect: Callable[[], float | dict[tuple[str, ...], float]],
+        label_names: tuple[str, ...] = (),
+    ):
+        """
+        Gaugeを初期化します。
+
+        Args:
+            name (str): メトリクス名。
+            help (str): メトリクスの説明。
+            collect (Callable): 値を返す関数。ラベルがある場合はラベルの値の組と値の対応を返します。
+            label_names (tuple[str, ...]): ラベル名。
+        """
+        super().__init__(name, help, label_names)
+        self._collect = collect
+
+    def samples(self) -> list[str]:
+        values = self._collect()
+        if not isinstance(values, dict):
+            values = {(): values}
+        return [f"{self.name}{_format_labels(self.label_names, key)} {_format_value(value)}" for key, value in values.items()]
+
+class Histogram(_Metric):
+    """
+    観測値の分布を累積バケットで集計するヒストグラム。
+    """
+    type_name = "histogram"
+
+    def __init__(self, name: str, help: str, buckets: tuple[float, ...], label_names: tuple[str, ...] = ()):
+        super().__init__(name, help, label_names)
+        self.buckets = tuple(sorted(buckets)) + (math.inf,)
+        # ラベルの値の組ごとの、バケットごとの件数（非累積）、合計、件数
+        self._series: dict[tuple[str, ...], tuple[list[int], list[float]]] = {}
+
+    def observe(self, value: float, **labels: str):
+        """
+        値を観測します。
+
+        Args:
+            value (float): 観測値。
+            **labels (str): ラベルの値。
+        """
+        key = self._key(labels)
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                series = self._series[key] = ([0] * len(self.buckets), [0.0])
+            series[0][index] += 1
+            series[1][0] += value
+
+    def samples(self) -> list[str]:
+        with self._lock:
+            series = [(key, list(counts), total[0]) for key, (counts, total) in self._series.items()]
+        lines = []
+        for key, counts, total in series:
+            cumulative = 0
+            for bound, count in zip(self.buckets, counts):
+                cumulative += count
+                le = f'le="{_format_value(bound)}"'
+                lines.append(f"{self.name}_bucket{_format_labels(self.label_names, key, le)} {cumulative}")
+            lines.append(f"{self.name}_sum{_format_labels(self.label_names, key)} {_format_value(total)}")
+            lines.append(f"{self.name}_count{_format_labels(self.label_names, key)} {cumulative}")
+        return lines
+
+class MetricsRegistry:
+    """
+    メトリクスを登録し、まとめてPrometheusのテキスト形式で出力するクラス。
+    """
+
+    def __init__(self):
+        self._metrics: dict[str, _Metric] = {}
+
+    def register(self, metric: _Metric) -> _Metric:
+        """
+        メトリクスを登録します。同じ名前のメトリクスが登録済みの場合は置き換えます。
+
+        Args:
+            metric (_Metric): 登録するメトリクス。
+
+        Returns:
+            _Metric: 登録したメトリクス。
+        """
+        self._metrics[metric.name] = metric
+        return metric
+
+    def render(self) -> str:
+        """
+        登録されたすべてのメトリクスをPrometheusのテキスト形式で返します。
+
+        Returns:
+            str: Prometheusのテキスト形式のメトリクス。
+        """
+        return "\n".join(metric.render() for metric in self._metrics.values()) + "\n"
+
+# アプリケーション全体で共有するメトリクスの登録先
+registry = MetricsRegistry()
+
+REQUEST_DURATION = registry.register(Histogram(
+    "http_request_duration_seconds", "HTTP request latency until the response body is fully sent.",
+    LATENCY_BUCKETS, ("method", "endpoint", "status"),
+))
+REQUEST_STAGE_DURATION = registry.register(Histogram(
+    "http_request_stage_duration_seconds", "Time spent in each processing stage of a request.",
+    LATENCY_BUCKETS, ("endpoint", "stage"),
+))
+INGESTED_BYTES = registry.register(Counter(
+    "ingested_bytes_total", "Bytes of uploaded media received.", ("endpoint",),
+))
+EMITTED_BYTES = registry.register(Counter(
+    "emitted_bytes_total", "Bytes of response bodies sent.", ("endpoint",),
+))
+FFMPEG_CPU_SECONDS = registry.register(Histogram(
+    "ffmpeg_job_cpu_seconds", "User plus system CPU time consumed by each ffmpeg process.",
+    CPU_SECONDS_BUCKETS,
+))
+FFMPEG_PEAK_RSS_BYTES = registry.register(Histogram(
+    "ffmpeg_job_peak_rss_bytes", "Peak resident set size of each ffmpeg process.",
+    RSS_BYTES_BUCKETS,
+))
+FFMPEG_EXITS = registry.register(Counter(
+    "ffmpeg_jobs_total", "Finished ffmpeg processes by outcome.", ("outcome",),
+))
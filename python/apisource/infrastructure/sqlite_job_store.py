@@ -0,0 +1,125 @@
+import sqlite3
+from pathlib import Path
+
+from domain.interfaces.job_store_interface import IJobStore
+from domain.models.job import Job, JobStatus
+
+class SqliteJobStore(IJobStore):
+    """
+    SQLiteにジョブの状態を、ファイルシステムに結果アーカイブを保存するクラス。
+
+    外部サービスを必要とせず、単一のプロセスからローカルに利用することを想定しています。
+
+    IJobStoreインターフェースを実装します。
+    """
+
+    def __init__(self, db_path: Path, results_dir: Path):
+        """
+        SqliteJobStoreを初期化し、必要なテーブルとディレクトリを作成します。
+
+        Args:
+            db_path (Path): SQLiteデータベースファイルのパス。
+            results_dir (Path): 結果アーカイブを保存するディレクトリ。
+        """
+        Path(db_path).parent.mkdir(parents=True, exist_ok=True)
+        self.results_dir = Path(results_dir)
+        self.results_dir.mkdir(parents=True, exist_ok=True)
+        self._connection = sqlite3.connect(db_path, check_same_thread=False, isolation_level=None)
+        self._connection.row_factory = sqlite3.Row
+        self._connection.execute(
+            """
+            CREATE TABLE IF NOT EXISTS jobs (
+                id TEXT PRIMARY KEY,
+                status TEXT NOT NULL,
+                file_name TEXT NOT NULL,
+                created_at REAL NOT NULL,
+                updated_at REAL NOT NULL,
+                expires_at REAL,
+                archive_name TEXT,
+                error TEXT
+            )
+            """
+        )
+        self._connection.execute("CREATE INDEX IF NOT EXISTS jobs_expires_at ON jobs (expires_at)")
+
+    def __to_job(self, row: sqlite3.Row) -> Job:
+        return Job(**{**dict(row), "status": JobStatus(row["status"])})
+
+    def save(self, job: Job):
+        """
+        ジョブを保存します。同じIDのジョブが存在する場合は上書きします。
+
+        Args:
+            job (Job): 保存するジョブ。
+        """
+        self._connection.execute(
+            """
+            INSERT OR REPLACE INTO jobs
+                (id, status, file_name, created_at, updated_at, expires_at, archive_name, error)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+            """,
+            (
+                job.id, job.status.value, job.file_name, job.created_at, job.updated_at,
+                job.expires_at, job.archive_name, job.error,
+            ),
+        )
+
+    def get(self, job_id: str) -> Job | None:
+        """
+        ジョブを取得します。
+
+        Args:
+            job_id (str): ジョブID。
+
+        Returns:
+            Job | None: ジョブ。存在しない場合はNone。
+        """
+        row = self._connection.execute("SELECT * FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        return self.__to_job(row) if row is not None else None
+
+    def list_expired(self, now: float) -> list[Job]:
+        """
+        有効期限を過ぎたジョブを取得します。
+
+        Args:
+            now (float): 現在時刻（UNIX時間）。
+
+        Returns:
+            list[Job]: 有効期限を過ぎたジョブのリスト。
+        """
+        rows = self._connection.execute("SELECT * FROM jobs WHERE expires_at <= ?", (now,)).fetchall()
+        return [self.__to_job(row) for row in rows]
+
+    def list_unfinished(self) -> list[Job]:
+        """
+        終了していない（待機中または実行中の）ジョブを取得します。
+
+        Returns:
+            list[Job]: 終了していないジョブのリスト。
+        """
+        rows = self._connection.execute(
+            "SELECT * FROM jobs WHERE status IN (?, ?)", (JobStatus.QUEUED.value, JobStatus.RUNNING.value)
+        ).fetchall()
+        return [self.__to_job(row) for row in rows]
+
+    def delete(self, job_id: str):
+        """
+        ジョブとその結果アーカイブを削除します。
+
+        Args:
+            job_id (str): ジョブID。
+        """
+        self.result_path(job_id).unlink(missing_ok=True)
+        self._connection.execute("DELETE FROM jobs WHERE id = ?", (job_id,))
+
+    def result_path(self, job_id: str) -> Path:
+        """
+        ジョブの結果アーカイブの保存先パスを取得します。
+
+        Args:
+            job_id (str): ジョブID。
+
+        Returns:
+            Path: 結果アーカイブの保存先パス。
+        """
+        return self.results_dir / job_id
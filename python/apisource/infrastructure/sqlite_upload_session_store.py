@@ -0,0 +1,148 @@
+import sqlite3
+from pathlib import Path
+
+from domain.interfaces.upload_session_store_interface import IUploadSessionStore
+from domain.models.upload_session import UploadSession
+
+# セッションの属性の列（受信済みのファイルデータの保存先パスは、APIで返すセッションに含めないため別に扱う）
+SESSION_COLUMNS = (
+    "id", "file_name", "content_type", "length", "offset", "created_at", "updated_at", "expires_at", "checksum"
+)
+
+class SqliteUploadSessionStore(IUploadSessionStore):
+    """
+    SQLiteにアップロードのセッションの状態と、受信済みのファイルデータの保存先パスを保存するクラス。
+
+    外部サービスを必要とせず、単一のプロセスからローカルに利用することを想定しています。
+
+    IUploadSessionStoreインターフェースを実装します。
+    """
+
+    def __init__(self, db_path: Path):
+        """
+        SqliteUploadSessionStoreを初期化し、必要なテーブルを作成します。
+
+        Args:
+            db_path (Path): SQLiteデータベースファイルのパス。
+        """
+        Path(db_path).parent.mkdir(parents=True, exist_ok=True)
+        self._connection = sqlite3.connect(db_path, check_same_thread=False, isolation_level=None)
+        self._connection.row_factory = sqlite3.Row
+        self._connection.execute(
+            """
+            CREATE TABLE IF NOT EXISTS upload_sessions (
+                id TEXT PRIMARY KEY,
+                file_name TEXT NOT NULL,
+                content_type TEXT NOT NULL,
+                length INTEGER NOT NULL,
+                offset INTEGER NOT NULL,
+                created_at REAL NOT NULL,
+                updated_at REAL NOT NULL,
+                expires_at REAL NOT NULL,
+                checksum TEXT,
+                data_path TEXT
+            )
+            """
+        )
+        # 保存先パスの列がない以前のデータベースには列を追加する（以前のセッションは保存先が不明なものとして扱う）
+        columns = {row["name"] for row in self._connection.execute("PRAGMA table_info(upload_sessions)")}
+        if "data_path" not in columns:
+            self._connection.execute("ALTER TABLE upload_sessions ADD COLUMN data_path TEXT")
+        self._connection.execute(
+            "CREATE INDEX IF NOT EXISTS upload_sessions_expires_at ON upload_sessions (expires_at)"
+        )
+
+    def save(self, session: UploadSession):
+        """
+        セッションを保存します。同じIDのセッションが存在する場合は、保存先パスを残して上書きします。
+
+        Args:
+            session (UploadSession): 保存するセッション。
+        """
+        self._connection.execute(
+            f"""
+            INSERT INTO upload_sessions ({", ".join(SESSION_COLUMNS)})
+            VALUES ({", ".join("?" for _ in SESSION_COLUMNS)})
+            ON CONFLICT (id) DO UPDATE SET
+                {", ".join(f"{column} = excluded.{column}" for column in SESSION_COLUMNS[1:])}
+            """,
+            tuple(getattr(session, column) for column in SESSION_COLUMNS),
+        )
+
+    def get(self, session_id: str) -> UploadSession | None:
+        """
+        セッションを取得します。
+
+        Args:
+            session_id (str): セッションID。
+
+        Returns:
+            UploadSession | None: セッション。存在しない場合はNone。
+        """
+        row = self._connection.execute("SELECT * FROM upload_sessions WHERE id = ?", (session_id,)).fetchone()
+        return self.__to_session(row) if row is not None else None
+
+    def list_all(self) -> list[UploadSession]:
+        """
+        すべてのセッションを取得します。
+
+        Returns:
+            list[UploadSession]: セッションのリスト。
+        """
+        rows = self._connection.execute("SELECT * FROM upload_sessions").fetchall()
+        return [self.__to_session(row) for row in rows]
+
+    def list_expired(self, now: float) -> list[UploadSession]:
+        """
+        有効期限を過ぎたセッションを取得します。
+
+        Args:
+            now (float): 現在時刻（UNIX時間）。
+
+        Returns:
+            list[UploadSession]: 有効期限を過ぎたセッションのリスト。
+        """
+        rows = self._connection.execute("SELECT * FROM upload_sessions WHERE expires_at <= ?", (now,)).fetchall()
+        return [self.__to_session(row) for row in rows]
+
+    def delete(self, session_id: str):
+        """
+        セッションを削除します。受信済みのファイルデータは削除しません。
+
+        Args:
+            session_id (str): セッションID。
+        """
+        self._connection.execute("DELETE FROM upload_sessions WHERE id = ?", (session_id,))
+
+    def data_path(self, session_id: str) -> Path | None:
+        """
+        セッションの受信済みのファイルデータの保存先パスを取得します。
+
+        Args:
+            session_id (str): セッションID。
+
+        Returns:
+            Path | None: ファイルデータの保存先パス。セッションが存在しないか、保存先が記録されていない場合はNone。
+        """
+        row = self._connection.execute(
+            "SELECT data_path FROM upload_sessions WHERE id = ?", (session_id,)
+        ).fetchone()
+        return Path(row["data_path"]) if row is not None and row["data_path"] is not None else None
+
+    def set_data_path(self, session_id: str, data_path: Path):
+        """
+        セッションの受信済みのファイルデータの保存先パスを記録します。
+
+        Args:
+            session_id (str): セッションID。
+            data_path (Path): ファイルデータの保存先パス。
+        """
+        self._connection.execute(
+            "UPDATE upload_sessions SET data_path = ? WHERE id = ?", (str(data_path), session_id)
+        )
+
+    def __to_session(self, row: sqlite3.Row) -> UploadSession:
+        """
+        テーブルの行をセッションに変換します。
+        """
+        return UploadSession(**{column: row[column] for column in SESSION_COLUMNS})
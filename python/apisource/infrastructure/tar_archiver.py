@@ -0,0 +1,61 @@
+import asyncio
+import tarfile
+import time
+from collections.abc import AsyncIterable, AsyncIterator
+from pathlib import Path
+
+from domain.interfaces.archiver_interface import IArchiver
+from domain.models.request_metrics import current_request_metrics
+
+# ファイルを読み出す際のチャンクサイズ
+STREAM_CHUNK_SIZE = 1024 * 1024
+
+class TarArchiver(IArchiver):
+    """
+    無圧縮のtar形式でファイルをアーカイブするクラス。
+
+    tarはエントリのヘッダーにサイズを前置するだけの形式で、CRCの計算や圧縮を行わないため、
+    ZIPより少ないCPU時間でアーカイブを生成できます。
+
+    IArchiverインターフェースを実装します。
+    """
+
+    @property
+    def file_extension(self) -> str:
+        return ".tar"
+
+    async def stream_archive(self, files: AsyncIterable[Path], root: Path | None = None) -> AsyncIterator[bytes]:
+        """
+        ファイルを受け取った順にtarアーカイブへ追加し、生成されたデータをチャンク単位で返します。
+
+        エントリのヘッダーはファイルのサイズから事前に生成できるため、ファイルの内容はバッファリングせずにそのまま送出します。
+        ファイルの読み込みはイベントループを塞がないよう別スレッドで実行します。
+
+        Args:
+            files (AsyncIterable[Path]): アーカイブするファイルを順に返す非同期イテラブル。
+            root (Path | None): エントリ名の基準となるディレクトリ。Noneの場合はファイル名をエントリ名とします。
+
+        Returns:
+            AsyncIterator[bytes]: tarデータのチャンクを返す非同期イテレータ。
+        """
+        metrics = current_request_metrics()
+        async for file in files:
+            started_at = time.perf_counter()
+            stat = file.stat()
+            name = file.relative_to(root).as_posix() if root is not None else file.name
+            tar_info = tarfile.TarInfo(name)
+            tar_info.size = stat.st_size
+            tar_info.mtime = int(stat.st_mtime)
+            tar_info.mode = 0o644
+            header = tar_info.tobuf(format=tarfile.PAX_FORMAT)
+            metrics.add_stage("archive", time.perf_counter() - started_at)
+            yield header
+
+            with open(file, 'rb') as src:
+                while chunk := await asyncio.to_thread(src.read, STREAM_CHUNK_SIZE):
+                    yield chunk
+            # エントリの末尾をブロック境界までゼロで埋める
+            if remainder := tar_info.size % tarfile.BLOCKSIZE:
+                yield tarfile.NUL * (tarfile.BLOCKSIZE - remainder)
+        # アーカイブの終端を示す2つのゼロブロック
+        yield tarfile.NUL * (tarfile.BLOCKSIZE * 2)
@@ -1,7 +1,63 @@
+import asyncio
+import io
+import time
 import zipfile
+from collections.abc import AsyncIterable, AsyncIterator
 from pathlib import Path
 
 from domain.interfaces.archiver_interface import IArchiver
+from domain.models.request_metrics import current_request_metrics
+
+# ストリーミング時にファイルから一度に読み込むバイト数
+STREAM_CHUNK_SIZE = 1024 * 1024
+
+class _ChunkBuffer(io.RawIOBase):
+    """
+    ZipFileの書き込み先として使用する、シーク不可能なバッファ。
+
+    書き込まれたデータはdrainで取り出すまで保持されます。
+    シーク不可能なため、ZipFileは各エントリのサイズとCRCをデータ記述子としてエントリの後ろに書き込みます。
+    """
+
+    def __init__(self):
+        super().__init__()
+        self._chunks: list[bytes] = []
+        self._position = 0
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data) -> int:
+        self._chunks.append(bytes(data))
+        self._position += len(data)
+        return len(data)
+
+    def tell(self) -> int:
+        return self._position
+
+    def drain(self) -> bytes:
+        """
+        これまでに書き込まれたデータを取り出し、バッファを空にします。
+
+        Returns:
+            bytes: 取り出したデータ。
+        """
+        data = b"".join(self._chunks)
+        self._chunks.clear()
+        return data
+
+def _entry_name(file: Path, root: Path | None) -> str:
+    """
+    アーカイブ内のエントリ名を決定します。
+
+    Args:
+        file (Path): アーカイブするファイル。
+        root (Path | None): エントリ名の基準となるディレクトリ。Noneの場合はファイル名をエントリ名とします。
+
+    Returns:
+        str: "/"区切りのエントリ名。
+    """
+    return file.relative_to(root).as_posix() if root is not None else file.name
 
 class ZipArchiver(IArchiver):
     """
@@ -10,20 +66,49 @@ class ZipArchiver(IArchiver):
     IArchiverインターフェースを実装します。
     """
 
-    def create_archive(self, files: list[Path], archive_path: str) -> bytes:
+    def __init__(self, compression: int = zipfile.ZIP_STORED):
+        """
+        ZipArchiverを初期化します。
+
+        抽出した音声の多くは圧縮済みのコーデックで、再圧縮してもほとんど小さくならないため、既定では無圧縮で格納します。
+
+        Args:
+            compression (int): エントリの圧縮方式（zipfile.ZIP_STOREDまたはzipfile.ZIP_DEFLATED）。
         """
-        ファイルをZIPアーカイブにまとめます。
+        self.compression = compression
+
+    @property
+    def file_extension(self) -> str:
+        return ".zip"
+
+    async def stream_archive(self, files: AsyncIterable[Path], root: Path | None = None) -> AsyncIterator[bytes]:
+        """
+        ファイルを受け取った順にZIPアーカイブへ追加し、生成されたデータをチャンク単位で返します。
+
+        圧縮処理はイベントループを塞がないよう別スレッドで実行します。
+        圧縮にかかった時間（送信待ちの時間を除く）は、処理段階archiveの所要時間として記録します。
 
         Args:
-            files (list[Path]): アーカイブするファイルのリスト。
-            archive_path (str): アーカイブファイルの保存先パス。
+            files (AsyncIterable[Path]): アーカイブするファイルを順に返す非同期イテラブル。
+            root (Path | None): エントリ名の基準となるディレクトリ。Noneの場合はファイル名をエントリ名とします。
 
         Returns:
-            bytes: アーカイブされたデータのバイト列。
+            AsyncIterator[bytes]: ZIPデータのチャンクを返す非同期イテレータ。
         """
-        with zipfile.ZipFile(archive_path, 'w', zipfile.ZIP_DEFLATED) as zipf:
-            for file in files:
-                zipf.write(file, file.name)
-
-        with open(archive_path, 'rb') as f:
-            return f.read()
+        buffer = _ChunkBuffer()
+        metrics = current_request_metrics()
+        with zipfile.ZipFile(buffer, 'w', self.compression) as zipf:
+            async for file in files:
+                zip_info = zipfile.ZipInfo.from_file(file, _entry_name(file, root))
+                zip_info.compress_type = self.compression
+                with open(file, 'rb') as src, zipf.open(zip_info, 'w') as dest:
+                    while chunk := await asyncio.to_thread(src.read, STREAM_CHUNK_SIZE):
+                        started_at = time.perf_counter()
+                        await asyncio.to_thread(dest.write, chunk)
+                        metrics.add_stage("archive", time.perf_counter() - started_at)
+                        if data := buffer.drain():
+                            yield data
+                if data := buffer.drain():
+                    yield data
+        if data := buffer.drain():
+            yield data
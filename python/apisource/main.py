@@ -5,14 +5,39 @@ Audio Extractor APIのエントリーポイント。
 ミドルウェア、例外ハンドラー、ルーターを登録します。
 """
 
+import asyncio
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
-from api.v1.endpoints import extract_audio
+from api.v1.endpoints import batch, cache, extract_audio, jobs, metrics, probe, uploads
+from infrastructure.framework import settings
+from infrastructure.framework.di import get_scratch_space, get_upload_session_service
 from infrastructure.framework.exception_handlers import get_exception_handlers
 from infrastructure.framework.middlewares import setup_middlewares
 
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """
+    アプリケーションの起動時に一時作業領域の清掃を開始し、終了時に停止します。
+
+    前回のプロセスから再開可能なアップロードの受信済みのデータを引き継げるよう、清掃の開始前にアップロードのサービスを作成します。
+
+    Args:
+        app (FastAPI): FastAPIアプリケーションインスタンス。
+    """
+    # 依存関係が差し替えられている場合（テストなど）は、差し替え後の一時作業領域を清掃する
+    app.dependency_overrides.get(get_upload_session_service, get_upload_session_service)()
+    scratch_space = app.dependency_overrides.get(get_scratch_space, get_scratch_space)()
+    janitor = asyncio.create_task(scratch_space.run_janitor(settings.SCRATCH_JANITOR_INTERVAL_SECONDS))
+    try:
+        yield
+    finally:
+        janitor.cancel()
+
 app = FastAPI(
     title="Audio Extractor API",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan
 )
 
 # ミドルウェアの登録
@@ -24,3 +49,11 @@ for exception, handler in get_exception_handlers():
 
 # ルーターの登録
 app.include_router(extract_audio.router, prefix="/api/v1")
+app.include_router(batch.router, prefix="/api/v1")
+app.include_router(probe.router, prefix="/api/v1")
+app.include_router(cache.router, prefix="/api/v1")
+app.include_router(jobs.router, prefix="/api/v1")
+app.include_router(uploads.router, prefix="/api/v1")
+
+# Prometheusが参照する慣例のパスで公開するため、バージョンのプレフィックスを付けない
+app.include_router(metrics.router)
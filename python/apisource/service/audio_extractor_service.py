@@ -1,10 +1,107 @@
-import tempfile
+import asyncio
+import dataclasses
+import hashlib
+import json
+from collections.abc import AsyncIterable, AsyncIterator, Awaitable, Callable
 from pathlib import Path
-import os
 import shutil
 
 from domain.interfaces.archiver_interface import IArchiver
-from domain.interfaces.audio_extractor_interface import IAudioExtractor
+from domain.interfaces.audio_extractor_interface import (
+    IAudioExtractor, AudioExtractionFailedException, ExtractionDeadlineExceededException, NoAudioStreamException,
+    UnsupportedContainerException
+)
+from domain.interfaces.media_prober_interface import IMediaProber, MediaProbeFailedException
+from domain.interfaces.result_cache_interface import IResultCache
+from domain.interfaces.scratch_space_interface import IScratchSpace
+from domain.interfaces.source_resolver_interface import ISourceResolver, SourceNotAllowedException
+from domain.models.batch_source import BatchSource
+from domain.models.extraction_deadline import ExtractionDeadline
+from domain.models.extraction_options import ArchiveFormat, ExtractionOptions
+from domain.models.media_info import MediaInfo
+from domain.models.request_metrics import current_request_metrics, measure_stage
+from domain.models.track_analysis import analysis_path_for
+
+# キャッシュ済みアーカイブを読み出す際のチャンクサイズ
+STREAM_CHUNK_SIZE = 1024 * 1024
+
+# アップロードのコンテナ形式をマジックナンバーで判定する際に、最初に読み込む先頭部分のバイト数
+# （MPEG-TSの4パケット分の同期バイトを含む長さ）
+SNIFF_MAGIC_SIZE = 1024
+
+# 一括抽出のアーカイブの末尾に追加する、ファイルごとの結果の一覧のファイル名
+BATCH_MANIFEST_NAME = "manifest.json"
+
+# 波形とラウドネスの解析を指定した場合に、アーカイブの末尾に追加するトラックごとの解析結果の一覧のファイル名
+ANALYSIS_MANIFEST_NAME = "analysis.json"
+
+# レスポンスのファイル名の拡張子とメディアタイプの対応
+MEDIA_TYPES = {
+    ".zip": "application/zip",
+    ".tar": "application/x-tar",
+    ".aac": "audio/aac",
+    ".m4a": "audio/mp4",
+    ".mp3": "audio/mpeg",
+    ".ogg": "audio/ogg",
+    ".opus": "audio/ogg",
+    ".flac": "audio/flac",
+    ".mka": "audio/x-matroska",
+}
+
+def media_type_for(file_name: str) -> str:
+    """
+    レスポンスのファイル名からメディアタイプを決定します。
+
+    Args:
+        file_name (str): アーカイブまたは音声ファイルのファイル名。
+
+    Returns:
+        str: メディアタイプ。未知の拡張子の場合は"application/octet-stream"。
+    """
+    return MEDIA_TYPES.get(Path(file_name).suffix.lower(), "application/octet-stream")
+
+class ClosingStream:
+    """
+    データのチャンクを返す非同期イテレータに、ストリーム終了時の後片付けを結び付けたストリーム。
+
+    後片付けは最後まで読み出した時点、読み出し中に例外が発生した時点、またはacloseを呼び出した時点で一度だけ実行されます。
+    非同期ジェネレータのfinallyと異なり、一度も読み出されずに閉じられた場合も実行されるため、
+    レスポンスの送信が始まらなかった場合も一時ファイルが残りません。
+    """
+
+    def __init__(self, chunks: AsyncIterator[bytes], cleanup: Callable[[], Awaitable[None]]):
+        """
+        ClosingStreamを初期化します。
+
+        Args:
+            chunks (AsyncIterator[bytes]): データのチャンクを返す非同期イテレータ。
+            cleanup (Callable[[], Awaitable[None]]): ストリーム終了時に一時ファイルなどを削除する非同期関数。
+        """
+        self.__chunks = chunks
+        self.__cleanup = cleanup
+        self.__closed = False
+
+    def __aiter__(self) -> "ClosingStream":
+        return self
+
+    async def __anext__(self) -> bytes:
+        try:
+            return await anext(self.__chunks)
+        except BaseException:
+            await self.aclose()
+            raise
+
+    async def aclose(self):
+        """
+        ストリームを閉じ、後片付けを実行します。既に閉じている場合は何もしません。
+        """
+        if self.__closed:
+            return
+        self.__closed = True
+        try:
+            await self.__chunks.aclose()
+        finally:
+            await self.__cleanup()
 
 class AudioExtractorService:
     """
@@ -13,54 +110,810 @@ class AudioExtractorService:
     ビデオファイルから音声を抽出し、アーカイブを作成する機能を提供します。
     """
 
-    def __init__(self, extractor: IAudioExtractor, archiver: IArchiver):
+    def __init__(
+        self,
+        extractor: IAudioExtractor,
+        archiver: IArchiver,
+        prober: IMediaProber,
+        scratch_space: IScratchSpace,
+        result_cache: IResultCache | None = None,
+        pipe_head_size: int | None = None,
+        archivers: dict[ArchiveFormat, IArchiver] | None = None,
+        source_resolver: ISourceResolver | None = None,
+        deadline: ExtractionDeadline | None = None,
+        sniff_head_size: int | None = None,
+    ):
         """
         AudioExtractorServiceを初期化します。
 
         Args:
             extractor (IAudioExtractor): 音声を抽出するためのインターフェース。
-            archiver (IArchiver): ファイルをアーカイブするためのインターフェース。
+            archiver (IArchiver): 既定の形式でファイルをアーカイブするためのインターフェース。
+            prober (IMediaProber): メディアファイルを解析するためのインターフェース。
+            scratch_space (IScratchSpace): 受信したファイルや抽出した音声を書き込む一時作業領域。
+            result_cache (IResultCache | None): 抽出結果を保存するキャッシュ。Noneの場合はキャッシュしません。
+            pipe_head_size (int | None): 受信しながら抽出できる形式かどうかの判定と解析に使用する先頭部分のバイト数。
+                Noneの場合は常にファイル全体を受信してから抽出します。
+            archivers (dict[ArchiveFormat, IArchiver] | None): 既定以外の形式のアーカイバ。
+                オプションで指定された形式のアーカイバがない場合は既定のアーカイバを使用します。
+            source_resolver (ISourceResolver | None): 参照で指定されたビデオファイルの解決器。
+                Noneの場合は参照による音声抽出を受け付けません。
+            deadline (ExtractionDeadline | None): 音声抽出の制限時間の設定。Noneの場合は制限しません。
+            sniff_head_size (int | None): 受信中のファイルのコンテナ形式と音声トラックの有無の判定に使用する先頭部分のバイト数。
+                Noneの場合は判定せずにファイル全体を受信します。
         """
         self.extractor = extractor
         self.archiver = archiver
+        self.prober = prober
+        self.scratch_space = scratch_space
+        self.result_cache = result_cache
+        self.pipe_head_size = pipe_head_size
+        self.archivers = archivers or {}
+        self.source_resolver = source_resolver
+        self.deadline = deadline or ExtractionDeadline()
+        self.sniff_head_size = sniff_head_size
+
+    async def ingest(self, file_name: str, chunks: AsyncIterable[bytes]) -> tuple[str, str]:
+        """
+        受信したファイルデータをチャンク単位で一時作業領域へ書き込み、同時に内容のハッシュ値を計算します。
+
+        ファイルの削除は呼び出し側の責任です。extract_ingestedに渡した場合は、返されたストリームを閉じた時点で削除されます。
+        それ以外の場合はdiscardで削除します。
+
+        Args:
+            file_name (str): ファイル名。
+            chunks (AsyncIterable[bytes]): ファイルのバイトデータを順に返す非同期イテラブル。
+
+        Returns:
+            tuple[str, str]: 受信したファイルのパスと、ファイル内容のSHA-256ハッシュ値。
+
+        Raises:
+            ScratchSpaceExhaustedException: 一時作業領域の容量上限に達している場合、または受信中に上限を超えた場合。
+        """
+        self.scratch_space.check_capacity()
+        digest = hashlib.sha256()
+        metrics = current_request_metrics()
+        workspace = self.scratch_space.create_workspace()
+        video_path = workspace / f"source{Path(file_name).suffix}"
+        try:
+            with measure_stage("upload"), open(video_path, 'wb') as video_file:
+                async for chunk in chunks:
+                    self.scratch_space.charge(workspace, len(chunk))
+                    video_file.write(chunk)
+                    digest.update(chunk)
+                    metrics.input_bytes += len(chunk)
+        except BaseException:
+            self.scratch_space.discard(workspace)
+            raise
+        return str(video_path), digest.hexdigest()
+
+    def discard(self, video_path: str):
+        """
+        ingestで受信したファイルを、作業ディレクトリごと削除します。
+
+        Args:
+            video_path (str): ingestが返したファイルのパス。作業領域外のファイルの場合はそのファイルのみを削除します。
+        """
+        self.scratch_space.discard(Path(video_path))
+
+    async def __probe(self, video_path: str, content_hash: str | None = None) -> MediaInfo:
+        """
+        ビデオファイルを解析し、所要時間と音声トラック数を記録します。
+
+        Args:
+            video_path (str): ビデオファイルのパス。
+            content_hash (str | None): ファイル内容のハッシュ値。
+
+        Returns:
+            MediaInfo: メディアファイルのメタデータ。
+
+        Raises:
+            MediaProbeFailedException: 解析に失敗した場合。
+        """
+        with measure_stage("probe"):
+            media_info = await self.prober.probe(video_path, content_hash)
+        current_request_metrics().track_count = len(media_info.audio_streams)
+        return media_info
+
+    async def probe(self, file_name: str, chunks: AsyncIterable[bytes]) -> MediaInfo:
+        """
+        アップロードされたビデオファイルを解析し、音声トラックのメタデータを取得します。
+
+        解析結果はファイル内容のハッシュ値をキーとしてキャッシュされるため、
+        同じファイルに対する後続の解析や音声抽出では再解析が行われません。
+
+        Args:
+            file_name (str): ファイル名。
+            chunks (AsyncIterable[bytes]): ファイルのバイトデータを順に返す非同期イテラブル。
+
+        Returns:
+            MediaInfo: メディアファイルのメタデータ。
+
+        Raises:
+            MediaProbeFailedException: 解析に失敗した場合。
+        """
+        video_path, content_hash = await self.ingest(file_name, chunks)
+        try:
+            return await self.__probe(video_path, content_hash)
+        finally:
+            self.discard(video_path)
+
+    async def extract(self, file_name: str, chunks: AsyncIterable[bytes], options: ExtractionOptions | None = None):
+        """
+        アップロードされたビデオファイルから音声を抽出し、アーカイブを作成します。
 
-    async def extract(self, file_name: str, file_content: bytes):
+        受信したデータはメモリに溜め込まず、チャンク単位で一時ファイルへ書き込みます。
+        一時ファイルは返されたストリームを閉じた時点（最後まで読み出した場合を含む）で削除されます。
+        同じ内容のファイルを同じオプションで抽出済みの場合は、ffmpegを実行せずにキャッシュ済みのアーカイブを返します。
+
+        pipe_head_size が指定されている場合、先頭部分からストリーミング可能な形式と判定できたファイルは
+        一時ファイルを介さずに受信しながら抽出し、アップロードと変換を並行して進めます。
+        この場合、ファイル全体のハッシュ値が事前に分からないため結果キャッシュは使用しません。
+
+        sniff_head_size が指定されている場合、音声を抽出できないことが先頭部分から分かるファイルは
+        残りのデータを受信する前に拒否します（screenを参照）。
+
+        Args:
+            file_name (str): ファイル名。
+            chunks (AsyncIterable[bytes]): ファイルのバイトデータを順に返す非同期イテラブル。
+            options (ExtractionOptions | None): 音声抽出のオプション。
+
+        Returns:
+            tuple: アーカイブデータのチャンクを返すClosingStreamとアーカイブファイル名。
+
+        Raises:
+            UnsupportedContainerException: 対応するコンテナ形式でない場合。
+            NoAudioStreamException: 音声トラックが含まれていない場合。
+        """
+        head_size = max(self.pipe_head_size or 0, self.sniff_head_size or 0)
+        if head_size:
+            if self.sniff_head_size:
+                head, rest, media_info = await self.__screen(file_name, chunks, head_size)
+            else:
+                (head, rest), media_info = await self.__read_head(chunks, head_size), None
+            if self.pipe_head_size and self.extractor.is_streamable(head):
+                return await self.__open_piped_archive_stream(file_name, head, rest, options, media_info)
+            chunks = self.__prepend(head, rest)
+        video_path, content_hash = await self.ingest(file_name, chunks)
+        return await self.extract_ingested(video_path, content_hash, options, base_name=Path(file_name).name)
+
+    async def screen(self, file_name: str, chunks: AsyncIterable[bytes]) -> AsyncIterator[bytes]:
+        """
+        受信中のファイルの先頭部分から、音声を抽出できないファイルを残りのデータの受信前に拒否します。
+
+        sniff_head_size が指定されていない場合は何も判定しません。
+
+        Args:
+            file_name (str): ファイル名。
+            chunks (AsyncIterable[bytes]): ファイルのバイトデータを順に返す非同期イテラブル。
+
+        Returns:
+            AsyncIterator[bytes]: 読み込み済みの先頭部分を含め、ファイル全体のデータを順に返す非同期イテレータ。
+
+        Raises:
+            UnsupportedContainerException: 対応するコンテナ形式でない場合。
+            NoAudioStreamException: 音声トラックが含まれていない場合。
+        """
+        if not self.sniff_head_size:
+            return aiter(chunks)
+        head, rest, _ = await self.__screen(file_name, chunks, self.sniff_head_size)
+        return self.__prepend(head, rest)
+
+    async def __screen(
+        self, file_name: str, chunks: AsyncIterable[bytes], head_size: int
+    ) -> tuple[bytes, AsyncIterator[bytes], MediaInfo | None]:
         """
-        ビデオファイルから音声を抽出し、アーカイブを作成します。
+        ファイルデータの先頭部分を読み込み、コンテナ形式と音声トラックの有無を判定します。
+
+        コンテナ形式は最初のチャンクのマジックナンバーで判定し、対応しない形式の場合はそれ以上読み込みません。
+        続けて先頭部分だけを解析し、音声トラックがないと分かった場合も拒否します。
+        moovボックスが末尾にあるMP4など、先頭部分だけでは解析できない形式はファイル全体の受信後に改めて解析するため、
+        ここでは拒否しません。
 
         Args:
             file_name (str): ファイル名。
-            file_content (bytes): ファイルのバイトデータ。
+            chunks (AsyncIterable[bytes]): ファイルのバイトデータを順に返す非同期イテラブル。
+            head_size (int): 読み込む先頭部分のバイト数の目安。
+
+        Returns:
+            tuple[bytes, AsyncIterator[bytes], MediaInfo | None]: 先頭部分のバイトデータ、残りのデータを返す非同期イテレータ、
+                および先頭部分の解析結果（解析できなかった場合はNone）。
+
+        Raises:
+            UnsupportedContainerException: 対応するコンテナ形式でない場合。
+            NoAudioStreamException: 先頭部分の解析で音声トラックが見つからなかった場合。
+        """
+        head, rest = await self.__read_head(chunks, SNIFF_MAGIC_SIZE)
+        if not self.extractor.is_supported_container(head):
+            raise UnsupportedContainerException(file_name)
+        remaining, rest = await self.__read_head(rest, head_size - len(head))
+        head += remaining
+        try:
+            media_info = await self.__probe_head(file_name, head)
+        except MediaProbeFailedException:
+            return head, rest, None
+        if not media_info.audio_streams:
+            raise NoAudioStreamException(file_name)
+        return head, rest, media_info
+
+    async def __probe_head(self, file_name: str, head: bytes) -> MediaInfo:
+        """
+        ファイルデータの先頭部分だけを作業ディレクトリに書き出して解析します。
+
+        Args:
+            file_name (str): ファイル名。拡張子を解析のヒントとして使用します。
+            head (bytes): 先頭部分のバイトデータ。
+
+        Returns:
+            MediaInfo: 先頭部分から解析したメタデータ。
+
+        Raises:
+            MediaProbeFailedException: 解析に失敗した場合。
+            ScratchSpaceExhaustedException: 一時作業領域の容量上限に達している場合。
+        """
+        self.scratch_space.check_capacity()
+        workspace = self.scratch_space.create_workspace()
+        try:
+            self.scratch_space.charge(workspace, len(head))
+            head_path = workspace / f"head{Path(file_name).suffix}"
+            head_path.write_bytes(head)
+            return await self.__probe(str(head_path))
+        finally:
+            self.scratch_space.discard(workspace)
+
+    async def __read_head(self, chunks: AsyncIterable[bytes], size: int) -> tuple[bytes, AsyncIterator[bytes]]:
+        """
+        ファイルデータの先頭部分を読み込みます。
+
+        Args:
+            chunks (AsyncIterable[bytes]): ファイルのバイトデータを順に返す非同期イテラブル。
+            size (int): 読み込む先頭部分のバイト数の目安。チャンクの境界まで読み込むため、これを超える場合があります。
+
+        Returns:
+            tuple[bytes, AsyncIterator[bytes]]: 先頭部分のバイトデータと、残りのデータを返す非同期イテレータ。
+        """
+        iterator = aiter(chunks)
+        head = bytearray()
+        while len(head) < size and (chunk := await anext(iterator, None)) is not None:
+            head += chunk
+        return bytes(head), iterator
+
+    async def __prepend(self, head: bytes, rest: AsyncIterator[bytes]) -> AsyncIterator[bytes]:
+        """
+        読み込み済みの先頭部分と残りのデータを連結して返します。
+
+        Args:
+            head (bytes): 先頭部分のバイトデータ。
+            rest (AsyncIterator[bytes]): 残りのデータを返す非同期イテレータ。
+
+        Returns:
+            AsyncIterator[bytes]: ファイル全体のデータを順に返す非同期イテレータ。
+        """
+        if head:
+            yield head
+        async for chunk in rest:
+            yield chunk
+
+    async def __open_piped_archive_stream(
+        self,
+        file_name: str,
+        head: bytes,
+        rest: AsyncIterator[bytes],
+        options: ExtractionOptions | None,
+        media_info: MediaInfo | None = None,
+    ):
+        """
+        受信中のファイルデータをffmpegへ渡しながら音声を抽出し、抽出されたトラックを順にアーカイブへ追加するストリームを返します。
+
+        抽出した音声は、一時作業領域の作業ディレクトリに書き込みます。
+
+        Args:
+            file_name (str): ファイル名。
+            head (bytes): 読み込み済みの先頭部分のバイトデータ。
+            rest (AsyncIterator[bytes]): 残りのデータを返す非同期イテレータ。
+            options (ExtractionOptions | None): 音声抽出のオプション。
+            media_info (MediaInfo | None): 先頭部分の解析結果。Noneの場合は先頭部分からトラック構成を解析します。
+
+        Returns:
+            tuple: アーカイブデータのチャンクを返すClosingStreamとアーカイブファイル名。
+
+        Raises:
+            AudioExtractionFailedException: 解析または音声抽出に失敗した場合。
+            ScratchSpaceExhaustedException: 一時作業領域の容量上限に達している場合。
+        """
+        options = options or ExtractionOptions()
+        if media_info is None:
+            try:
+                media_info = await self.__probe_head(file_name, head)
+            except MediaProbeFailedException as e:
+                raise AudioExtractionFailedException() from e
+        self.scratch_space.check_capacity()
+        audio_dir = self.scratch_space.create_workspace()
+
+        def cleanup():
+            self.scratch_space.discard(audio_dir)
+
+        async def input_chunks() -> AsyncIterator[bytes]:
+            # 受信と変換は並行して進むため、uploadの所要時間は変換の待ち時間を含む
+            metrics = current_request_metrics()
+            with measure_stage("upload"):
+                async for chunk in self.__prepend(head, rest):
+                    metrics.input_bytes += len(chunk)
+                    yield chunk
+
+        audio_files = self.__with_deadline(
+            self.extractor.iter_extract_audio_from_stream(input_chunks(), audio_dir, options, media_info),
+            self.deadline.seconds_for(media_info, options),
+        )
+        return await self.__archive_tracks(audio_files, cleanup, options, media_info, Path(file_name).name)
+
+    async def extract_ingested(
+        self,
+        video_path: str,
+        content_hash: str,
+        options: ExtractionOptions | None = None,
+        base_name: str | None = None,
+        remove_source: bool = True,
+    ):
+        """
+        ingestで受信済みのビデオファイルから音声を抽出し、アーカイブを作成します。
+
+        remove_sourceがTrueの場合、ビデオファイルは返されたストリームを閉じた時点（最後まで読み出した場合を含む）、
+        抽出の開始に失敗した時点、またはキャッシュ済みのアーカイブを返す時点で削除されます。
+
+        Args:
+            video_path (str): ingestが返した一時ファイルのパス。
+            content_hash (str): ingestが返したファイル内容のハッシュ値。
+            options (ExtractionOptions | None): 音声抽出のオプション。
+            base_name (str | None): レスポンスのファイル名の接頭辞。Noneの場合は一時ファイルのファイル名。
+            remove_source (bool): ビデオファイルを削除するかどうか。Falseの場合は呼び出し側がdiscardで削除します。
+
+        Returns:
+            tuple: アーカイブデータのチャンクを返すClosingStreamとアーカイブファイル名。
+        """
+        return await self.__extract_cached(
+            video_path, content_hash, options, remove_source=remove_source, base_name=base_name
+        )
+
+    async def extract_reference(self, reference: str, options: ExtractionOptions | None = None):
+        """
+        マウントされたストレージ上のファイル、またはHTTP(S)のURLで参照されたビデオファイルから音声を抽出し、アーカイブを作成します。
+
+        参照先のファイルは一時ファイルへコピーせず、ffmpegが直接読み込みます。
+        開始位置の指定などで必要な範囲だけを読み込むため、HTTPの場合はRangeリクエストでシークします。
+        HTTPのリクエストは解決器の中継サーバーを経由するため、許可されていない場所へのリダイレクトには従いません。
+        参照先のファイルは削除しません。
+        内容の識別子（パス、サイズ、更新時刻、ETagなど）を求められた場合は、それをキーとして結果キャッシュを使用します。
+
+        Args:
+            reference (str): マウントされたストレージ上の絶対パス、またはHTTP(S)のURL。
+            options (ExtractionOptions | None): 音声抽出のオプション。
+
+        Returns:
+            tuple: アーカイブデータのチャンクを返すClosingStreamとアーカイブファイル名。
+
+        Raises:
+            SourceNotAllowedException: 参照による音声抽出が無効な場合、または許可されていない場所が指定された場合。
+            SourceNotFoundException: 指定されたファイルが存在しない場合。
+            ScratchSpaceExhaustedException: 一時作業領域の容量上限に達している場合。
+            AudioExtractionFailedException: 解析または音声抽出に失敗した場合。
+        """
+        if self.source_resolver is None:
+            raise SourceNotAllowedException(reference)
+        source = await self.source_resolver.resolve(reference)
+        self.scratch_space.check_capacity()
+        return await self.__extract_cached(
+            source.location, source.fingerprint, options, remove_source=False, base_name=source.name
+        )
+
+    async def __extract_cached(
+        self,
+        video_path: str,
+        content_hash: str | None,
+        options: ExtractionOptions | None,
+        remove_source: bool,
+        base_name: str | None = None,
+    ):
+        """
+        結果キャッシュを確認し、キャッシュ済みのアーカイブがなければ音声抽出を開始します。
+
+        Args:
+            video_path (str): ビデオファイルのパスまたはURL。
+            content_hash (str | None): ファイル内容の識別子。Noneの場合は結果キャッシュを使用しません。
+            options (ExtractionOptions | None): 音声抽出のオプション。
+            remove_source (bool): ストリーム終了時またはキャッシュ済みのアーカイブを返す時点でビデオファイルを削除するかどうか。
+            base_name (str | None): レスポンスのファイル名の接頭辞。Noneの場合はビデオファイルのファイル名。
+
+        Returns:
+            tuple: アーカイブデータのチャンクを返すClosingStreamとアーカイブファイル名。
+        """
+        options = options or ExtractionOptions()
+        base_name = base_name or Path(video_path).name
+        if self.result_cache is None or content_hash is None:
+            return await self.__open_archive_stream(video_path, content_hash, options, remove_source, base_name)
+
+        cache_key = self.__cache_key(content_hash, options)
+        cached_path = self.result_cache.get(cache_key)
+        if cached_path is not None:
+            if remove_source:
+                self.discard(video_path)
+            # キャッシュのエントリ名はキーにファイル名の接頭辞以降を付けたものであり、抽出した場合と同じファイル名を返す
+            return self.__stream_file(cached_path), f"{base_name}{cached_path.name[len(cache_key):]}"
+
+        archive_stream, archive_file_name = await self.__open_archive_stream(
+            video_path, content_hash, options, remove_source, base_name
+        )
+        suffix = archive_file_name[len(base_name):]
+        return self.__store_while_streaming(cache_key, archive_stream, suffix), archive_file_name
+
+    def __cache_key(self, content_hash: str, options: ExtractionOptions) -> str:
+        """
+        ファイル内容のハッシュ値と抽出オプションから結果キャッシュのキーを導出します。
+
+        Args:
+            content_hash (str): ファイル内容のハッシュ値。
+            options (ExtractionOptions): 音声抽出のオプション。
+
+        Returns:
+            str: キャッシュキー。
+        """
+        options_json = json.dumps(dataclasses.asdict(options), sort_keys=True, default=str)
+        return hashlib.sha256(f"{content_hash}:{options_json}".encode()).hexdigest()
+
+    def __stream_file(self, path: Path) -> ClosingStream:
+        """
+        ファイルをチャンク単位で読み出す非同期イテレータを返します。
+
+        ファイルはこの時点で開くため、読み出し中にキャッシュから削除されても最後まで読み出せます。
+
+        Args:
+            path (Path): 読み出すファイルのパス。
+
+        Returns:
+            ClosingStream: ファイルのチャンクを返すストリーム。閉じた時点でファイルを閉じます。
+        """
+        file = open(path, 'rb')
+
+        async def read_chunks() -> AsyncIterator[bytes]:
+            while chunk := await asyncio.to_thread(file.read, STREAM_CHUNK_SIZE):
+                yield chunk
+
+        async def close():
+            file.close()
+
+        return ClosingStream(read_chunks(), close)
+
+    def __store_while_streaming(
+        self, cache_key: str, archive_stream: ClosingStream, suffix: str
+    ) -> ClosingStream:
+        """
+        アーカイブのストリームを送出しながら、同じデータを結果キャッシュへ書き込みます。
+
+        ストリームが最後まで送出された場合のみキャッシュへ登録し、途中で中断された場合は書き込んだデータを破棄します。
+
+        Args:
+            cache_key (str): キャッシュキー。
+            archive_stream (ClosingStream): アーカイブデータのチャンクを返すストリーム。
+            suffix (str): アーカイブファイル名のうち接頭辞より後の部分。キャッシュから返す際のファイル名に使用します。
+
+        Returns:
+            ClosingStream: アーカイブデータのチャンクを返すストリーム。閉じた時点でarchive_streamも閉じます。
+        """
+        async def store() -> AsyncIterator[bytes]:
+            temp_path = self.result_cache.reserve(cache_key)
+            try:
+                with open(temp_path, 'wb') as cache_file:
+                    async for chunk in archive_stream:
+                        cache_file.write(chunk)
+                        yield chunk
+            except BaseException:
+                await archive_stream.aclose()
+                self.result_cache.discard(temp_path)
+                raise
+            self.result_cache.commit(cache_key, temp_path, suffix)
+
+        return ClosingStream(store(), archive_stream.aclose)
+
+    async def __open_archive_stream(
+        self,
+        video_path: str,
+        content_hash: str | None,
+        options: ExtractionOptions | None,
+        remove_source: bool,
+        base_name: str | None = None,
+    ):
+        """
+        音声抽出を開始し、抽出されたトラックを順にアーカイブへ追加するストリームを返します。
+
+        最初のトラックの抽出が完了するまで待機するため、解析や変換の失敗はレスポンスの送信開始前に例外として通知されます。
+
+        Args:
+            video_path (str): ビデオファイルのパスまたはURL。
+            content_hash (str | None): ファイル内容のハッシュ値。解析結果のキャッシュキーとして使用します。
+            options (ExtractionOptions | None): 音声抽出のオプション。
+            remove_source (bool): ストリーム終了時にビデオファイルを削除するかどうか。
+            base_name (str | None): レスポンスのファイル名の接頭辞。Noneの場合はビデオファイルのファイル名。
 
         Returns:
-            tuple: アーカイブのバイトデータとアーカイブファイル名。
+            tuple: アーカイブデータのチャンクを返すClosingStreamとアーカイブファイル名。
+
+        Raises:
+            AudioExtractionFailedException: 解析または音声抽出に失敗した場合。
+        """
+        options = options or ExtractionOptions()
+        # 音声ファイルを保存する作業ディレクトリを作成（参照先のストレージには書き込まない）
+        audio_dir = self.scratch_space.create_workspace()
+
+        def cleanup():
+            # 受信したファイルと作業ディレクトリを削除
+            if remove_source:
+                self.discard(video_path)
+            self.scratch_space.discard(audio_dir)
+
+        try:
+            media_info = await self.__probe(video_path, content_hash)
+        except MediaProbeFailedException as e:
+            cleanup()
+            raise AudioExtractionFailedException() from e
+        except BaseException:
+            cleanup()
+            raise
+
+        audio_files = self.__with_deadline(
+            self.extractor.iter_extract_audio(video_path, audio_dir, options, media_info),
+            self.deadline.seconds_for(media_info, options),
+        )
+        return await self.__archive_tracks(
+            audio_files, cleanup, options, media_info, base_name or Path(video_path).name
+        )
+
+    async def __archive_tracks(
+        self,
+        audio_files: AsyncIterator[Path],
+        cleanup,
+        options: ExtractionOptions,
+        media_info: MediaInfo,
+        base_name: str,
+    ):
+        """
+        抽出されたトラックを順にアーカイブへ追加するストリームを返します。
+
+        最初のトラックの抽出が完了するまで待機するため、変換の失敗はレスポンスの送信開始前に例外として通知されます。
+        アーカイブ形式がautoで抽出対象の音声トラックが1つだけの場合は、アーカイブせずに音声ファイルをそのまま返します。
+        ただし、波形とラウドネスの解析が指定された場合は、解析結果の一覧をアーカイブの末尾に追加するため常にアーカイブします。
+
+        Args:
+            audio_files (AsyncIterator[Path]): 抽出された音声ファイルのパスを返す非同期イテレータ。
+            cleanup: ストリーム終了時または失敗時に一時ファイルを削除する関数。
+            options (ExtractionOptions): 音声抽出のオプション。
+            media_info (MediaInfo): ビデオファイルのメタデータ。
+            base_name (str): レスポンスのファイル名の接頭辞。
+
+        Returns:
+            tuple: データのチャンクを返すClosingStreamとファイル名。
+        """
+        async def close():
+            try:
+                await audio_files.aclose()
+            finally:
+                cleanup()
+
+        # 音声抽出処理を開始し、最初のトラックが揃うまで待機
+        try:
+            first_audio_file = await anext(audio_files, None)
+        except BaseException:
+            await close()
+            raise
+
+        if (
+            options.archive_format == ArchiveFormat.AUTO
+            and not options.analyze
+            and len(options.select_tracks(media_info.audio_streams)) == 1
+            and first_audio_file is not None
+        ):
+            # アーカイブせずに音声ファイルをそのまま送出
+            audio_stream = self.__stream_file(first_audio_file)
+
+            async def close_single_track():
+                try:
+                    await audio_stream.aclose()
+                finally:
+                    await close()
+
+            return ClosingStream(audio_stream, close_single_track), f"{base_name}_{Path(first_audio_file).name}"
+
+        archiver = self.archiver_for(options)
+
+        async def extracted_files() -> AsyncIterator[Path]:
+            if first_audio_file is None:
+                return
+            yield first_audio_file
+            extracted = [Path(first_audio_file)]
+            async for audio_file in audio_files:
+                extracted.append(Path(audio_file))
+                yield audio_file
+            if options.analyze:
+                yield self.__write_analysis_manifest(extracted, extracted[0].parent)
+
+        # 抽出が完了したトラックから順にアーカイブへ追加して送出
+        archive_stream = ClosingStream(archiver.stream_archive(extracted_files()), close)
+        return archive_stream, f"{base_name}_audio{archiver.file_extension}"
+
+    def __write_analysis_manifest(self, audio_files: list[Path], directory: Path) -> Path:
         """
-        # 一時ファイルを作成し、受け取ったファイルデータを書き込む
-        with tempfile.NamedTemporaryFile(delete=False, suffix=Path(file_name).suffix) as tmp_file:
-            tmp_file.write(file_content)
-            tmp_file.close()
+        音声抽出器が書き出したトラックごとの解析結果を、1つのJSONファイルにまとめます。
 
-            # 音声ファイルを保存するディレクトリを作成
-            audio_dir = Path(tmp_file.name + "_audio")
-            audio_dir.mkdir(parents=True, exist_ok=True)
+        Args:
+            audio_files (list[Path]): 抽出された音声ファイルのパスのリスト。
+            directory (Path): 解析結果の一覧を保存するディレクトリ。
 
-            # 音声抽出処理を実行
-            audio_files = await self.extractor.extract_all_audio(tmp_file.name, audio_dir)
+        Returns:
+            Path: 解析結果の一覧のJSONファイルのパス。
+        """
+        tracks = []
+        for audio_file in audio_files:
+            analysis_path = analysis_path_for(audio_file)
+            if analysis_path.exists():
+                tracks.append({"file": audio_file.name, **json.loads(analysis_path.read_text(encoding="utf-8"))})
+        tracks.sort(key=lambda track: track["track_index"])
+        manifest_path = directory / ANALYSIS_MANIFEST_NAME
+        manifest_path.write_text(json.dumps({"tracks": tracks}, ensure_ascii=False), encoding="utf-8")
+        return manifest_path
+
+    def __with_deadline(self, audio_files: AsyncIterator[Path], seconds: float | None) -> AsyncIterator[Path]:
+        """
+        抽出された音声ファイルのパスを返す非同期イテレータに制限時間を設けます。
 
-            # 抽出した音声ファイルをZIPアーカイブに圧縮
-            archive_path = tmp_file.name + "_audio.zip"
-            archive_bytes = self.archiver.create_archive(audio_files, archive_path)
+        制限時間を過ぎた時点で抽出を取り消すため、実行中のffmpegは終了させられます。
 
-            # アーカイブファイル名を削除前に取得
-            archive_file_name = Path(archive_path).name
+        Args:
+            audio_files (AsyncIterator[Path]): 抽出された音声ファイルのパスを返す非同期イテレータ。
+            seconds (float | None): 最初のトラックを待ち始めてから全トラックの抽出が終わるまでの制限時間（秒）。
+                Noneの場合は制限しません。
+
+        Returns:
+            AsyncIterator[Path]: 抽出された音声ファイルのパスを返す非同期イテレータ。
+                制限時間を過ぎた場合はExtractionDeadlineExceededExceptionを送出します。
+        """
+        if seconds is None:
+            return audio_files
 
-            # 一時ファイルとディレクトリを削除
-            if os.path.exists(tmp_file.name):
-                os.remove(tmp_file.name)
-            if os.path.exists(audio_dir):
-                shutil.rmtree(audio_dir)
-            if os.path.exists(archive_path):
-                os.remove(archive_path)
+        async def limited() -> AsyncIterator[Path]:
+            deadline = asyncio.get_running_loop().time() + seconds
+            try:
+                while True:
+                    try:
+                        async with asyncio.timeout_at(deadline):
+                            audio_file = await anext(audio_files, None)
+                    except TimeoutError as e:
+                        raise ExtractionDeadlineExceededException(f"Extraction exceeded {seconds:.0f} seconds") from e
+                    if audio_file is None:
+                        return
+                    yield audio_file
+            finally:
+                await audio_files.aclose()
+
+        return limited()
+
+    def archiver_for(self, options: ExtractionOptions) -> IArchiver:
+        """
+        オプションで指定された形式のアーカイバを取得します。
+
+        Args:
+            options (ExtractionOptions): 音声抽出のオプション。
+
+        Returns:
+            IArchiver: 指定された形式のアーカイバ。該当するアーカイバがない場合は既定のアーカイバ。
+        """
+        return self.archivers.get(options.archive_format, self.archiver)
+
+    async def extract_batch(
+        self,
+        sources: AsyncIterable[BatchSource],
+        options: ExtractionOptions | None,
+        slots: asyncio.Semaphore,
+    ):
+        """
+        複数のビデオファイルから音声を抽出し、ファイルごとのディレクトリに分けた1つのアーカイブを作成します。
+
+        ファイルを受信するたびに抽出を開始するため、後続のファイルの受信と先行するファイルの抽出が並行して進みます。
+        同時に抽出するファイル数はslotsで制限します。
+        抽出に失敗したファイルがあっても一括抽出全体は失敗させず、ファイルごとの結果をアーカイブ末尾の
+        manifest.jsonに記録します。アーカイブは抽出が完了したファイルから順に生成しながら送出します。
+        波形とラウドネスの解析が指定された場合は、ファイルごとのディレクトリにanalysis.jsonを追加します。
+
+        Args:
+            sources (AsyncIterable[BatchSource]): 受信済みのファイルを順に返す非同期イテラブル。
+            options (ExtractionOptions | None): 全ファイル共通の音声抽出のオプション。
+            slots (asyncio.Semaphore): 同時に抽出するファイル数を制限するセマフォ。
+
+        Returns:
+            tuple: アーカイブデータのチャンクを返すClosingStreamとアーカイブファイル名。
+        """
+        options = options or ExtractionOptions()
+        batch_dir = self.scratch_space.create_workspace()
+        tasks: list[asyncio.Task] = []
+        video_paths: list[str] = []
+
+        def cleanup():
+            # 開始前に取り消されたタスクの分も含め、受信済みのファイルを削除する
+            for task in tasks:
+                task.cancel()
+            for video_path in video_paths:
+                self.discard(video_path)
+            self.scratch_space.discard(batch_dir)
+
+        try:
+            async for source in sources:
+                if source.video_path is not None:
+                    video_paths.append(source.video_path)
+                entry_dir = batch_dir / f"{len(tasks) + 1:03d}_{Path(source.file_name).stem or 'file'}"
+                tasks.append(asyncio.ensure_future(self.__extract_batch_item(source, entry_dir, options, slots)))
+        except BaseException:
+            cleanup()
+            raise
+
+        async def batch_files() -> AsyncIterator[Path]:
+            results = []
+            for next_done in asyncio.as_completed(tasks):
+                result, audio_files = await next_done
+                results.append(result)
+                for audio_file in audio_files:
+                    yield audio_file
+            # 結果の一覧は受信した順に並べる
+            results.sort(key=lambda result: int(result["directory"].split("_")[0]))
+            manifest_path = batch_dir / BATCH_MANIFEST_NAME
+            manifest_path.write_text(json.dumps({"files": results}, ensure_ascii=False, indent=2), encoding="utf-8")
+            yield manifest_path
+
+        archiver = self.archiver_for(options)
+
+        async def close():
+            cleanup()
+
+        archive_stream = ClosingStream(archiver.stream_archive(batch_files(), batch_dir), close)
+        return archive_stream, f"{batch_dir.name}_batch{archiver.file_extension}"
+
+    async def __extract_batch_item(
+        self,
+        source: BatchSource,
+        entry_dir: Path,
+        options: ExtractionOptions,
+        slots: asyncio.Semaphore,
+    ) -> tuple[dict, list[Path]]:
+        """
+        一括抽出の1ファイルから音声を抽出し、ファイルごとのディレクトリに保存します。
+
+        Args:
+            source (BatchSource): 受信済みのファイル。
+            entry_dir (Path): 抽出した音声を保存するディレクトリ。
+            options (ExtractionOptions): 音声抽出のオプション。
+            slots (asyncio.Semaphore): 同時に抽出するファイル数を制限するセマフォ。
+
+        Returns:
+            tuple[dict, list[Path]]: manifest.jsonに記録するファイルの結果と、抽出された音声ファイルのパスのリスト。
+        """
+        result = {"file_name": source.file_name, "directory": entry_dir.name}
+        if source.error is not None:
+            return {**result, "status": "failed", "error": source.error}, []
 
-            # 圧縮データとファイル名を返却
-            return archive_bytes, archive_file_name
+        entry_dir.mkdir(parents=True, exist_ok=True)
+        try:
+            async with slots:
+                media_info = await self.__probe(source.video_path, source.content_hash)
+                audio_files = [
+                    audio_file async for audio_file in self.__with_deadline(
+                        self.extractor.iter_extract_audio(source.video_path, entry_dir, options, media_info),
+                        self.deadline.seconds_for(media_info, options),
+                    )
+                ]
+        except Exception as e:
+            shutil.rmtree(entry_dir, ignore_errors=True)
+            return {**result, "status": "failed", "error": type(e).__name__}, []
+        finally:
+            self.discard(source.video_path)
+        audio_files = [Path(audio_file) for audio_file in audio_files]
+        tracks = [audio_file.name for audio_file in audio_files]
+        if options.analyze and audio_files:
+            audio_files.append(self.__write_analysis_manifest(audio_files, entry_dir))
+        return {**result, "status": "succeeded", "tracks": tracks}, audio_files
@@ -0,0 +1,292 @@
+import asyncio
+import dataclasses
+import time
+import uuid
+from collections.abc import AsyncIterable, AsyncIterator
+from contextlib import aclosing
+from pathlib import Path
+
+from domain.interfaces.audio_extractor_interface import ExtractorBusyException
+from domain.interfaces.job_store_interface import IJobStore, JobNotFoundException, JobNotFinishedException
+from domain.models.extraction_options import ExtractionOptions
+from domain.models.extraction_progress import ExtractionProgress, start_extraction_progress
+from domain.models.job import Job, JobStatus
+from service.audio_extractor_service import AudioExtractorService
+
+class ExtractionJobService:
+    """
+    音声抽出ジョブサービスクラス。
+
+    アップロードされたファイルの音声抽出をバックグラウンドで実行し、
+    HTTP接続を保持したまま変換の完了を待たずに済むよう、ジョブの投入・状態確認・結果の取得を提供します。
+    """
+
+    def __init__(self, store: IJobStore, ttl_seconds: int, max_workers: int):
+        """
+        ExtractionJobServiceを初期化します。
+
+        前回のプロセス終了時に終了していなかったジョブは、入力ファイルが失われているため失敗として記録します。
+
+        Args:
+            store (IJobStore): ジョブの保存先。
+            ttl_seconds (int): ジョブの終了後に結果を保持する秒数。
+            max_workers (int): 同時に実行するジョブの最大数。
+        """
+        self.store = store
+        self.ttl_seconds = ttl_seconds
+        self._workers = asyncio.Semaphore(max_workers)
+        # 実行中のタスクがガベージコレクションされないよう参照を保持する
+        self._tasks: set[asyncio.Task] = set()
+        # 実行中のジョブの進捗
+        self._progress: dict[str, ExtractionProgress] = {}
+        for job in self.store.list_unfinished():
+            self.__finish(job, JobStatus.FAILED, error="interrupted")
+
+    async def submit(
+        self,
+        service: AudioExtractorService,
+        file_name: str,
+        chunks: AsyncIterable[bytes],
+        options: ExtractionOptions | None = None,
+    ) -> Job:
+        """
+        アップロードされたファイルを受信し、音声抽出ジョブを投入します。
+
+        ファイルの受信はリクエスト内で行い、音声抽出は受信完了後にバックグラウンドで実行します。
+
+        Args:
+            service (AudioExtractorService): 音声抽出に使用するサービス。
+            file_name (str): ファイル名。
+            chunks (AsyncIterable[bytes]): ファイルのバイトデータを順に返す非同期イテラブル。
+            options (ExtractionOptions | None): 音声抽出のオプション。
+
+        Returns:
+            Job: 投入されたジョブ。
+        """
+        self.purge_expired()
+        video_path, content_hash = await service.ingest(file_name, chunks)
+        return self.submit_ingested(service, file_name, video_path, content_hash, options)
+
+    def submit_ingested(
+        self,
+        service: AudioExtractorService,
+        file_name: str,
+        video_path: str,
+        content_hash: str,
+        options: ExtractionOptions | None = None,
+    ) -> Job:
+        """
+        受信済みのファイルの音声抽出ジョブを投入します。
+
+        再開可能なアップロードで受信が完了したファイルなど、リクエストとは別に受信したファイルに使用します。
+        ファイルはジョブの終了時に削除されます。
+
+        Args:
+            service (AudioExtractorService): 音声抽出に使用するサービス。
+            file_name (str): ファイル名。
+            video_path (str): 受信済みのビデオファイルのパス。
+            content_hash (str): ファイル内容のハッシュ値。
+            options (ExtractionOptions | None): 音声抽出のオプション。
+
+        Returns:
+            Job: 投入されたジョブ。
+        """
+        self.purge_expired()
+        now = time.time()
+        job = Job(
+            id=uuid.uuid4().hex,
+            status=JobStatus.QUEUED,
+            file_name=file_name,
+            created_at=now,
+            updated_at=now,
+        )
+        self.store.save(job)
+
+        task = asyncio.create_task(self.__run(job, service, video_path, content_hash, options))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+        return job
+
+    async def __run(
+        self,
+        job: Job,
+        service: AudioExtractorService,
+        video_path: str,
+        content_hash: str,
+        options: ExtractionOptions | None,
+    ):
+        """
+        ジョブの音声抽出を実行し、結果アーカイブを保存します。
+
+        変換の待ち行列が満杯の場合は失敗とせず、ジョブを待機中に戻して提示された秒数の後に再試行します。
+        入力ファイルはジョブの終了時に削除されます。
+
+        Args:
+            job (Job): 実行するジョブ。
+            service (AudioExtractorService): 音声抽出に使用するサービス。
+            video_path (str): 受信済みのビデオファイルのパス。
+            content_hash (str): ファイル内容のハッシュ値。
+            options (ExtractionOptions | None): 音声抽出のオプション。
+        """
+        result_path = self.store.result_path(job.id)
+        # このタスク内で実行されるffmpegの進捗を、ジョブの進捗として記録する
+        self._progress[job.id] = start_extraction_progress()
+        try:
+            while True:
+                try:
+                    archive_name = await self.__extract(job, service, video_path, content_hash, options, result_path)
+                    break
+                except ExtractorBusyException as e:
+                    # 変換の待ち行列が空くまで、入力ファイルを残したまま待機中に戻して再試行する
+                    result_path.unlink(missing_ok=True)
+                    job = dataclasses.replace(job, status=JobStatus.QUEUED, updated_at=time.time())
+                    self.store.save(job)
+                    await asyncio.sleep(e.retry_after)
+        except BaseException as e:
+            result_path.unlink(missing_ok=True)
+            self.__finish(job, JobStatus.FAILED, error=type(e).__name__)
+            if not isinstance(e, Exception):
+                raise
+            return
+        finally:
+            service.discard(video_path)
+            self._progress.pop(job.id, None)
+        self.__finish(job, JobStatus.SUCCEEDED, archive_name=archive_name)
+
+    async def __extract(
+        self,
+        job: Job,
+        service: AudioExtractorService,
+        video_path: str,
+        content_hash: str,
+        options: ExtractionOptions | None,
+        result_path: Path,
+    ) -> str:
+        """
+        ジョブの実行枠を確保して音声抽出を1回実行し、結果アーカイブを書き込みます。
+
+        入力ファイルは再試行できるよう削除しません。
+        数GBになる結果アーカイブの書き込みでイベントループを止めないよう、書き込みは別スレッドで行います。
+
+        Args:
+            job (Job): 実行するジョブ。
+            service (AudioExtractorService): 音声抽出に使用するサービス。
+            video_path (str): 受信済みのビデオファイルのパス。
+            content_hash (str): ファイル内容のハッシュ値。
+            options (ExtractionOptions | None): 音声抽出のオプション。
+            result_path (Path): 結果アーカイブの保存先。
+
+        Returns:
+            str: 結果アーカイブのファイル名。
+
+        Raises:
+            ExtractorBusyException: 実行待ちの変換処理が上限に達している場合。
+        """
+        async with self._workers:
+            self.store.save(dataclasses.replace(job, status=JobStatus.RUNNING, updated_at=time.time()))
+            archive_stream, archive_name = await service.extract_ingested(
+                video_path, content_hash, options, base_name=Path(job.file_name).name, remove_source=False
+            )
+            async with aclosing(archive_stream):
+                with open(result_path, 'wb') as result_file:
+                    async for chunk in archive_stream:
+                        await asyncio.to_thread(result_file.write, chunk)
+        return archive_name
+
+    def __finish(self, job: Job, status: JobStatus, **fields):
+        """
+        ジョブを終了状態として保存し、結果の有効期限を設定します。
+
+        Args:
+            job (Job): 終了したジョブ。
+            status (JobStatus): 終了状態。
+            **fields: 併せて更新するジョブの属性。
+        """
+        now = time.time()
+        self.store.save(dataclasses.replace(
+            job, status=status, updated_at=now, expires_at=now + self.ttl_seconds, **fields
+        ))
+
+    def get(self, job_id: str) -> Job:
+        """
+        ジョブを取得します。
+
+        Args:
+            job_id (str): ジョブID。
+
+        Returns:
+            Job: ジョブ。
+
+        Raises:
+            JobNotFoundException: ジョブが存在しないか、有効期限が切れている場合。
+        """
+        self.purge_expired()
+        job = self.store.get(job_id)
+        if job is None:
+            raise JobNotFoundException(job_id)
+        return job
+
+    def get_result(self, job_id: str) -> tuple[Job, str]:
+        """
+        成功したジョブの結果アーカイブを取得します。
+
+        Args:
+            job_id (str): ジョブID。
+
+        Returns:
+            tuple[Job, str]: ジョブと、結果アーカイブのパス。
+
+        Raises:
+            JobNotFoundException: ジョブが存在しないか、有効期限が切れているか、失敗している場合。
+            JobNotFinishedException: ジョブが終了していない場合。
+        """
+        job = self.get(job_id)
+        if job.status in (JobStatus.QUEUED, JobStatus.RUNNING):
+            raise JobNotFinishedException(job_id)
+        if job.status != JobStatus.SUCCEEDED:
+            raise JobNotFoundException(job_id)
+        return job, str(self.store.result_path(job_id))
+
+    async def watch(self, job_id: str, interval_seconds: float) -> AsyncIterator[tuple[str, dict]]:
+        """
+        ジョブの状態と進捗を、ジョブが終了するまで通知します。
+
+        状態は変化した時点で、進捗は一定の間隔で確認して変化があった場合のみ通知します。
+        進捗はffmpegの出力を読み込むスレッドで記録されたものを参照するだけのため、変換の処理には影響しません。
+
+        Args:
+            job_id (str): ジョブID。
+            interval_seconds (float): 状態と進捗を確認する間隔（秒）。
+
+        Returns:
+            AsyncIterator[tuple[str, dict]]: イベント名（"status"または"progress"）とその内容を返す非同期イテレータ。
+
+        Raises:
+            JobNotFoundException: ジョブが存在しないか、有効期限が切れている場合。
+        """
+        job = self.get(job_id)
+        status = None
+        version = None
+        while True:
+            if job.status != status:
+                status = job.status
+                yield "status", dataclasses.asdict(job)
+            if job.status not in (JobStatus.QUEUED, JobStatus.RUNNING):
+                return
+            progress = self._progress.get(job_id)
+            if progress is not None:
+                current_version, tracks = progress.snapshot()
+                if current_version != version:
+                    version = current_version
+                    yield "progress", {"tracks": [
+                        {**dataclasses.asdict(track), "eta_seconds": track.eta_seconds} for track in tracks
+                    ]}
+            await asyncio.sleep(interval_seconds)
+            job = self.get(job_id)
+
+    def purge_expired(self):
+        """
+        有効期限を過ぎたジョブとその結果アーカイブを削除します。
+        """
+        for job in self.store.list_expired(time.time()):
+            self.store.delete(job.id)
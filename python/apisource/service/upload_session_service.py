@@ -0,0 +1,328 @@
+import asyncio
+import base64
+import dataclasses
+import hashlib
+import os
+import time
+import uuid
+from collections.abc import AsyncIterable
+from pathlib import Path
+
+from api.v1.endpoints.validation_exceptions import FileTooLargeException
+from domain.interfaces.scratch_space_interface import IScratchSpace
+from domain.interfaces.upload_session_store_interface import (
+    IUploadSessionStore, UploadChecksumMismatchException, UploadIncompleteException, UploadOffsetMismatchException,
+    UploadSessionNotFoundException
+)
+from domain.models.request_metrics import current_request_metrics, measure_stage
+from domain.models.upload_session import UploadSession
+
+# 受信完了後にファイル全体のハッシュ値を計算する際のチャンクサイズ
+HASH_CHUNK_SIZE = 1024 * 1024
+
+class UploadSessionService:
+    """
+    再開可能なアップロードのサービスクラス。
+
+    大きなファイルを複数のリクエストに分けて受信し、通信が途切れた場合でも受信済みの位置から送信を再開できるようにします。
+    受信したチャンクはセッションごとの一時作業領域の作業ディレクトリのファイルへ直接追記し、容量上限の使用量に計上します。
+    受信が完了したファイルは、作業ディレクトリごとAudioExtractorServiceへ引き渡します。
+    """
+
+    def __init__(self, store: IUploadSessionStore, scratch_space: IScratchSpace, ttl_seconds: int, max_upload_size: int):
+        """
+        UploadSessionServiceを初期化します。
+
+        前回のプロセスが受信したセッションの作業ディレクトリは、清掃で削除されないようこのプロセスに引き継ぎます。
+        作業ディレクトリが失われたセッションは削除します。
+
+        Args:
+            store (IUploadSessionStore): セッションの保存先。
+            scratch_space (IScratchSpace): 受信したファイルデータを書き込む一時作業領域。
+            ttl_seconds (int): 最後にチャンクを受信してからセッションを保持する秒数。
+            max_upload_size (int): アップロードを許可する最大バイト数。
+        """
+        self.store = store
+        self.scratch_space = scratch_space
+        self.ttl_seconds = ttl_seconds
+        self.max_upload_size = max_upload_size
+        # 書き込み中のセッションID（同じセッションへの並行した書き込みを拒否するため）
+        self._active: set[str] = set()
+        # セッションごとの受信済みのバイト数と、そこまでのハッシュ計算の途中状態
+        # プロセス内で受信が完結した場合に、受信完了後のファイルの再読み込みを省くために使用する
+        self._digests: dict[str, tuple[int, "hashlib._Hash"]] = {}
+        for session in self.store.list_all():
+            self.__adopt(session)
+
+    def __adopt(self, session: UploadSession):
+        """
+        前回のプロセスが受信したセッションの作業ディレクトリを引き継ぎます。引き継げない場合はセッションを削除します。
+        """
+        data_path = self.store.data_path(session.id)
+        try:
+            if data_path is None:
+                raise FileNotFoundError(session.id)
+            self.store.set_data_path(session.id, self.scratch_space.adopt(data_path))
+        except (FileNotFoundError, ValueError):
+            self.store.delete(session.id)
+
+    def create(self, file_name: str, content_type: str, length: int, checksum: str | None = None) -> UploadSession:
+        """
+        アップロードのセッションを作成します。
+
+        Args:
+            file_name (str): アップロードするファイル名。
+            content_type (str): アップロードするファイルのメディアタイプ。
+            length (int): ファイル全体のバイト数。
+            checksum (str | None): ファイル全体のSHA-256ハッシュ値（16進数）。
+
+        Returns:
+            UploadSession: 作成されたセッション。
+
+        Raises:
+            FileTooLargeException: ファイルが最大サイズを超える場合。
+            ScratchSpaceExhaustedException: 一時作業領域の容量上限に達している場合。
+        """
+        self.purge_expired()
+        if length > self.max_upload_size:
+            raise FileTooLargeException()
+        self.scratch_space.check_capacity()
+
+        now = time.time()
+        session = UploadSession(
+            id=uuid.uuid4().hex,
+            file_name=file_name,
+            content_type=content_type,
+            length=length,
+            offset=0,
+            created_at=now,
+            updated_at=now,
+            expires_at=now + self.ttl_seconds,
+            checksum=checksum.lower() if checksum else None,
+        )
+        data_path = self.scratch_space.create_workspace() / f"source{Path(file_name).suffix}"
+        data_path.touch()
+        self.store.save(session)
+        self.store.set_data_path(session.id, data_path)
+        self._digests[session.id] = (0, hashlib.sha256())
+        return session
+
+    def get(self, session_id: str) -> UploadSession:
+        """
+        セッションを取得します。
+
+        Args:
+            session_id (str): セッションID。
+
+        Returns:
+            UploadSession: セッション。
+
+        Raises:
+            UploadSessionNotFoundException: セッションが存在しないか、有効期限が切れている場合。
+        """
+        self.purge_expired()
+        session = self.store.get(session_id)
+        if session is None:
+            raise UploadSessionNotFoundException(session_id)
+        return session
+
+    async def append(
+        self,
+        session_id: str,
+        offset: int,
+        chunks: AsyncIterable[bytes],
+        checksum: str | None = None,
+    ) -> UploadSession:
+        """
+        受信したチャンクをセッションのファイルへ追記します。
+
+        チャンクのハッシュ値が指定されていない場合、通信が途中で途切れても受信できた分は保持され、
+        クライアントはセッションの受信済みのバイト数から送信を再開できます。
+        ハッシュ値が指定されている場合は、照合に失敗したチャンクや途中で途切れたチャンクは破棄します。
+
+        Args:
+            session_id (str): セッションID。
+            offset (int): チャンクの先頭のファイル内の位置。受信済みのバイト数と一致する必要があります。
+            chunks (AsyncIterable[bytes]): チャンクのバイトデータを順に返す非同期イテラブル。
+            checksum (str | None): チャンクのハッシュ値（"sha256 <Base64>"形式）。
+
+        Returns:
+            UploadSession: 更新されたセッション。
+
+        Raises:
+            UploadSessionNotFoundException: セッションが存在しないか、有効期限が切れている場合。
+            UploadOffsetMismatchException: 送信位置が受信済みのバイト数と一致しないか、別のリクエストが書き込み中の場合。
+            UploadChecksumMismatchException: チャンクのハッシュ値が一致しない場合。
+            FileTooLargeException: 受信したデータがファイル全体のバイト数を超えた場合。
+            ScratchSpaceExhaustedException: 受信したデータが一時作業領域の容量上限を超えた場合。
+                受信できた分は、チャンクのハッシュ値が指定されていない場合と同様に保持されます。
+        """
+        session = self.get(session_id)
+        if offset != session.offset or session_id in self._active:
+            raise UploadOffsetMismatchException(session_id)
+        expected_digest = self.__parse_checksum(checksum) if checksum else None
+
+        self._active.add(session_id)
+        try:
+            return await self.__write(session, chunks, expected_digest)
+        finally:
+            self._active.discard(session_id)
+
+    async def __write(self, session: UploadSession, chunks: AsyncIterable[bytes], expected_digest: bytes | None):
+        """
+        チャンクを受信済みの位置から書き込み、セッションの受信済みのバイト数を更新します。
+        """
+        metrics = current_request_metrics()
+        chunk_digest = hashlib.sha256()
+        # ファイル全体のハッシュ計算の途中状態は、チャンクを破棄した場合に元の状態を残せるよう複製して更新する
+        file_offset, file_digest = self._digests.get(session.id, (None, None))
+        file_digest = file_digest.copy() if file_offset == session.offset else None
+        data_path = self.store.data_path(session.id)
+        written = 0
+        # このリクエストで一時作業領域の使用量に計上したバイト数（破棄した分は使用量から差し引く）
+        charged = 0
+        completed = False
+        with measure_stage("upload"), open(data_path, 'r+b') as data_file:
+            # 前回のプロセスの異常終了などで受信済みの位置より後ろに残ったデータは破棄する
+            self.scratch_space.release(data_path, data_file.seek(0, os.SEEK_END) - session.offset)
+            data_file.seek(session.offset)
+            data_file.truncate()
+            try:
+                async for chunk in chunks:
+                    if session.offset + written + len(chunk) > session.length:
+                        raise FileTooLargeException()
+                    self.scratch_space.charge(data_path, len(chunk))
+                    charged += len(chunk)
+                    data_file.write(chunk)
+                    written += len(chunk)
+                    metrics.input_bytes += len(chunk)
+                    chunk_digest.update(chunk)
+                    if file_digest is not None:
+                        file_digest.update(chunk)
+                if expected_digest is not None and chunk_digest.digest() != expected_digest:
+                    raise UploadChecksumMismatchException(session.id)
+                completed = True
+            finally:
+                if not completed:
+                    # ハッシュ値を照合できないデータは残さず、それ以外は途切れる前に書き込めた分を保持する
+                    if expected_digest is not None:
+                        written = 0
+                    data_file.truncate(session.offset + written)
+                    self.scratch_space.release(data_path, charged - written)
+                now = time.time()
+                session = dataclasses.replace(
+                    session, offset=session.offset + written, updated_at=now, expires_at=now + self.ttl_seconds
+                )
+                self.store.save(session)
+                if file_digest is not None and (completed or expected_digest is None):
+                    self._digests[session.id] = (session.offset, file_digest)
+        # 他のワーカープロセスの清掃で放置された作業ディレクトリとみなされないよう、更新時刻を更新する
+        os.utime(data_path.parent)
+        return session
+
+    def __parse_checksum(self, checksum: str) -> bytes:
+        """
+        "sha256 <Base64>"形式のハッシュ値を解析します。
+
+        Args:
+            checksum (str): ハッシュ値。
+
+        Returns:
+            bytes: ハッシュ値のバイト列。
+
+        Raises:
+            UploadChecksumMismatchException: 形式が不正な場合、またはSHA-256以外のアルゴリズムが指定された場合。
+        """
+        algorithm, _, value = checksum.strip().partition(" ")
+        try:
+            if algorithm.lower() != "sha256":
+                raise ValueError(algorithm)
+            return base64.b64decode(value, validate=True)
+        except ValueError as e:
+            raise UploadChecksumMismatchException(checksum) from e
+
+    async def complete(self, session_id: str) -> tuple[str, str]:
+        """
+        受信が完了したセッションのファイルを、AudioExtractorService.extract_ingestedへ渡せる形で引き渡します。
+
+        引き渡したファイルはセッションから切り離されるため、以降はセッションを参照できません。
+        ファイルの削除は呼び出し側の責任です。AudioExtractorService.discardで作業ディレクトリごと削除されます。
+
+        Args:
+            session_id (str): セッションID。
+
+        Returns:
+            tuple[str, str]: ファイルのパスと、ファイル内容のSHA-256ハッシュ値。
+
+        Raises:
+            UploadSessionNotFoundException: セッションが存在しないか、有効期限が切れている場合。
+            UploadOffsetMismatchException: 別のリクエストが書き込み中の場合。
+            UploadIncompleteException: ファイル全体の受信が完了していない場合。
+            UploadChecksumMismatchException: ファイル全体のハッシュ値が作成時に指定されたハッシュ値と一致しない場合。
+        """
+        session = self.get(session_id)
+        if session_id in self._active:
+            raise UploadOffsetMismatchException(session_id)
+        if session.offset != session.length:
+            raise UploadIncompleteException(session_id)
+
+        # 作業ディレクトリごと引き渡すため、ファイルを移動せずにセッションのみを削除する
+        video_path = self.store.data_path(session_id)
+        digest_offset, digest = self._digests.pop(session_id, (None, None))
+        self.store.delete(session_id)
+
+        if digest_offset != session.length:
+            # プロセスの再起動などで途中状態が失われた場合は、ファイル全体を読み直す
+            with measure_stage("upload"):
+                digest = await asyncio.to_thread(self.__hash_file, video_path)
+        content_hash = digest.hexdigest()
+        if session.checksum is not None and content_hash != session.checksum:
+            self.scratch_space.discard(video_path)
+            raise UploadChecksumMismatchException(session_id)
+        return str(video_path), content_hash
+
+    def __hash_file(self, path: Path) -> "hashlib._Hash":
+        """
+        ファイル全体のSHA-256ハッシュ値を計算します。
+        """
+        digest = hashlib.sha256()
+        with open(path, 'rb') as f:
+            while chunk := f.read(HASH_CHUNK_SIZE):
+                digest.update(chunk)
+        return digest
+
+    def delete(self, session_id: str):
+        """
+        セッションを中止し、受信済みのファイルデータを削除します。
+
+        Args:
+            session_id (str): セッションID。
+
+        Raises:
+            UploadSessionNotFoundException: セッションが存在しないか、有効期限が切れている場合。
+            UploadOffsetMismatchException: 別のリクエストが書き込み中の場合。
+        """
+        self.get(session_id)
+        if session_id in self._active:
+            raise UploadOffsetMismatchException(session_id)
+        self.__delete(session_id)
+
+    def purge_expired(self):
+        """
+        有効期限を過ぎた（放置された）セッションとその受信済みのファイルデータを削除します。
+
+        書き込み中のセッションは削除しません。
+        """
+        for session in self.store.list_expired(time.time()):
+            if session.id not in self._active:
+                self.__delete(session.id)
+
+    def __delete(self, session_id: str):
+        """
+        セッションと、受信済みのファイルデータを含む作業ディレクトリを削除します。
+        """
+        data_path = self.store.data_path(session_id)
+        if data_path is not None:
+            self.scratch_space.discard(data_path)
+        self._digests.pop(session_id, None)
+        self.store.delete(session_id)
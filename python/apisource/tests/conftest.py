@@ -0,0 +1,60 @@
+"""
+テスト全体で共有するフィクスチャを定義します。
+"""
+
+import os
+import shutil
+
+import pytest
+
+from infrastructure.framework.di import (
+    get_extraction_job_service, get_result_cache, get_scratch_space, get_upload_session_service
+)
+from infrastructure.local_scratch_space import LocalScratchSpace
+from infrastructure.sqlite_job_store import SqliteJobStore
+from infrastructure.sqlite_upload_session_store import SqliteUploadSessionStore
+from main import app
+from service.extraction_job_service import ExtractionJobService
+from service.upload_session_service import UploadSessionService
+
+@pytest.fixture(autouse=True)
+def isolate_app_state(tmp_path_factory):
+    """
+    一時作業領域、ジョブとアップロードの保存先をテストごとの一時ディレクトリに差し替え、結果キャッシュを無効にします。
+
+    テストが既定の保存先（/tmpや作業ディレクトリ）にファイルを残したり、他のテストの状態を参照したりしないようにします。
+    テスト内で個別に差し替えた依存関係はこれより優先されます。
+    """
+    state_dir = tmp_path_factory.mktemp("app_state")
+    scratch = LocalScratchSpace(state_dir / "scratch")
+    job_service = ExtractionJobService(
+        SqliteJobStore(state_dir / "jobs" / "jobs.sqlite3", state_dir / "jobs" / "results"),
+        ttl_seconds=60,
+        max_workers=1,
+    )
+    upload_service = UploadSessionService(
+        SqliteUploadSessionStore(state_dir / "uploads" / "uploads.sqlite3"),
+        scratch,
+        ttl_seconds=60,
+        max_upload_size=1024 ** 2,
+    )
+    app.dependency_overrides[get_scratch_space] = lambda: scratch
+    app.dependency_overrides[get_extraction_job_service] = lambda: job_service
+    app.dependency_overrides[get_upload_session_service] = lambda: upload_service
+    app.dependency_overrides[get_result_cache] = lambda: None
+    yield
+    app.dependency_overrides.clear()
+
+@pytest.fixture
+def require_ffmpeg():
+    """
+    実際のffmpegを実行するテストで、ffmpegがインストールされていない場合はテストをスキップします。
+
+    環境変数REQUIRE_FFMPEGが設定されている場合（ffmpegをインストールしたDockerのテスト用イメージ）は、
+    スキップせずにテストを失敗させます。
+    """
+    if shutil.which("ffmpeg") is not None:
+        return
+    if os.environ.get("REQUIRE_FFMPEG"):
+        pytest.fail("REQUIRE_FFMPEGが設定されていますが、ffmpegがインストールされていません")
+    pytest.skip("ffmpegがインストールされていません")
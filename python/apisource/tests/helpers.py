@@ -0,0 +1,10 @@
+"""
+テスト全体で共有する補助関数を定義します。
+"""
+
+async def async_iter(items):
+    """
+    リストの要素を順に返す非同期イテレータを生成します。
+    """
+    for item in items:
+        yield item
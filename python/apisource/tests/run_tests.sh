@@ -5,6 +5,8 @@ sh /app/translations/update_translations.sh
 
 # 環境変数の設定
 export PYTHONPATH=/app
+# ffmpegを実行するテストを、ffmpegがない場合にスキップせず失敗させる
+export REQUIRE_FFMPEG=1
 
 # pytestを使用してテストを実行
 echo "pytestでテストを実行中..."
@@ -0,0 +1,226 @@
+"""
+このモジュールは、AllowListSourceResolverのテストケースを含んでいます。
+URLの参照はローカルで起動したHTTPサーバーに対して検証し、中継サーバー経由の読み込みはffmpegと同じGETリクエストで検証します。
+"""
+
+import asyncio
+import functools
+import http.server
+import threading
+import urllib.error
+import urllib.request
+
+import pytest
+
+from domain.interfaces.source_resolver_interface import SourceNotAllowedException, SourceNotFoundException
+from infrastructure.allow_list_source_resolver import AllowListSourceResolver
+
+# リダイレクトを返すパスとリダイレクト先
+REDIRECTS = {
+    "/videos/moved.mp4": "/videos/movie%201.mp4",
+    "/videos/escape.mp4": "/private.mp4",
+}
+
+# HEADには通常どおり応答し、GETのみリダイレクトを返すパスとリダイレクト先（テストごとに設定する）
+GET_REDIRECTS = {}
+
+class RedirectingRequestHandler(http.server.SimpleHTTPRequestHandler):
+    """
+    REDIRECTSに含まれるパスへのリクエストにはリダイレクトを返し、それ以外はファイルを配信するハンドラー。
+
+    受信したリクエストのパスとRangeヘッダーをrequestedに記録します。
+    """
+
+    def __init__(self, *args, requested, **kwargs):
+        self.requested = requested
+        super().__init__(*args, **kwargs)
+
+    def send_head(self):
+        self.requested.append((self.path, self.headers.get("Range")))
+        location = REDIRECTS.get(self.path)
+        if self.command == "GET":
+            location = GET_REDIRECTS.get(self.path, location)
+        if location is not None:
+            self.send_response(302)
+            self.send_header("Location", location)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return None
+        return super().send_head()
+
+    def log_message(self, format, *args):
+        pass
+
+@pytest.fixture
+def serve():
+    """
+    ディレクトリのファイルを配信するHTTPサーバーを起動し、そのURLと受信したリクエストのリストを返す関数を提供します。
+    """
+    servers = []
+
+    def start(directory):
+        requested = []
+        handler = functools.partial(RedirectingRequestHandler, directory=str(directory), requested=requested)
+        server = http.server.ThreadingHTTPServer(("127.0.0.1", 0), handler)
+        thread = threading.Thread(target=server.serve_forever, daemon=True)
+        thread.start()
+        servers.append((server, thread))
+        return f"http://127.0.0.1:{server.server_port}", requested
+
+    yield start
+    for server, thread in servers:
+        server.shutdown()
+        server.server_close()
+        thread.join()
+
+@pytest.fixture
+def http_origin(tmp_path, serve):
+    """
+    一時ディレクトリのファイルを配信するHTTPサーバーを起動し、そのURLと受信したリクエストのリストを返します。
+    """
+    (tmp_path / "videos").mkdir()
+    (tmp_path / "videos" / "movie 1.mp4").write_bytes(b"dummy video content")
+    (tmp_path / "private.mp4").write_bytes(b"private video content")
+    return serve(tmp_path)
+
+@pytest.fixture
+def create_resolver():
+    """
+    AllowListSourceResolverを生成し、テストの終了時に中継サーバーを停止する関数を提供します。
+    """
+    resolvers = []
+
+    def create(mount_roots, url_prefixes):
+        resolver = AllowListSourceResolver(mount_roots, url_prefixes)
+        resolvers.append(resolver)
+        return resolver
+
+    yield create
+    for resolver in resolvers:
+        resolver.close()
+
+def fetch(url, headers=None):
+    """
+    ffmpegと同じようにURLへGETリクエストを送信し、ステータスコードとボディを返します。
+    """
+    try:
+        with urllib.request.urlopen(urllib.request.Request(url, headers=headers or {}), timeout=10) as response:
+            return response.status, response.read()
+    except urllib.error.HTTPError as e:
+        with e:
+            return e.code, e.read()
+
+def test_resolves_url_under_allowed_prefix(http_origin, create_resolver):
+    """
+    許可されたプレフィックス配下のURLが中継サーバー経由の入力として解決され、Rangeヘッダーが参照元へ中継されること、
+    および内容の識別子がレスポンスヘッダーから求められることをテストします。
+    """
+    http_origin, requested = http_origin
+    resolver = create_resolver([], [f"{http_origin}/videos"])
+    source = asyncio.run(resolver.resolve(f"{http_origin}/videos/movie%201.mp4"))
+
+    assert source.location.startswith("http://127.0.0.1:")
+    assert source.location.endswith("/movie%201.mp4")
+    assert source.name == "movie 1.mp4"
+    assert source.fingerprint is not None
+    assert asyncio.run(resolver.resolve(f"{http_origin}/videos/movie%201.mp4")).fingerprint == source.fingerprint
+    assert fetch(source.location) == (200, b"dummy video content")
+    requested.clear()
+    assert fetch(source.location, {"Range": "bytes=6-"}) == (200, b"dummy video content")
+    assert requested == [("/videos/movie%201.mp4", "bytes=6-")]
+
+    # 署名が一致しないパスは中継しない
+    tampered = source.location.replace("/movie%201.mp4", "").rsplit("/", 2)
+    assert fetch(f"{tampered[0]}/{'0' * 64}/{tampered[2]}/movie.mp4")[0] == 404
+
+def test_url_name_drops_control_characters(tmp_path, http_origin, create_resolver):
+    """
+    パーセントエンコードされたASCII以外の文字や引用符、区切り文字を含むURLのファイル名が、
+    制御文字だけを取り除いてレスポンスのファイル名となり、中継サーバー経由でも読み込めることをテストします。
+    """
+    http_origin, _ = http_origin
+    (tmp_path / "videos" / "動画;\"1\"\t.mp4").write_bytes(b"quoted video content")
+    resolver = create_resolver([], [f"{http_origin}/videos"])
+    source = asyncio.run(resolver.resolve(f"{http_origin}/videos/%E5%8B%95%E7%94%BB%3B%221%22%09.mp4"))
+
+    assert source.name == "動画;\"1\".mp4"
+    assert fetch(source.location) == (200, b"quoted video content")
+
+def test_rejects_url_outside_allowed_prefix(http_origin, create_resolver):
+    """
+    許可されたプレフィックス外のURLや、".."でプレフィックス外を指すURLが拒否され、存在しないURLが404として扱われることをテストします。
+    """
+    http_origin, _ = http_origin
+    resolver = create_resolver([], [f"{http_origin}/videos/"])
+
+    for reference in (
+        f"{http_origin}/private.mp4",
+        f"{http_origin}/videos/../private.mp4",
+        f"{http_origin}/videos%2F..%2Fprivate.mp4",
+        f"{http_origin}/videosx/movie.mp4",
+        "http://localhost.invalid/videos/movie.mp4",
+    ):
+        with pytest.raises(SourceNotAllowedException):
+            asyncio.run(resolver.resolve(reference))
+    with pytest.raises(SourceNotFoundException):
+        asyncio.run(resolver.resolve(f"{http_origin}/videos/missing.mp4"))
+
+def test_follows_redirects_only_within_allowed_prefix(http_origin, create_resolver):
+    """
+    許可されたプレフィックス配下へのリダイレクトには従って最終的なURLの内容が入力となり、
+    プレフィックス外へのリダイレクトは拒否されることをテストします。
+    """
+    http_origin, _ = http_origin
+    resolver = create_resolver([], [f"{http_origin}/videos/"])
+
+    source = asyncio.run(resolver.resolve(f"{http_origin}/videos/moved.mp4"))
+    assert source.name == "moved.mp4"
+    assert fetch(source.location) == (200, b"dummy video content")
+
+    with pytest.raises(SourceNotAllowedException):
+        asyncio.run(resolver.resolve(f"{http_origin}/videos/escape.mp4"))
+
+def test_relay_rejects_get_redirected_outside_allowed_prefix(tmp_path, http_origin, serve, create_resolver, monkeypatch):
+    """
+    HEADには許可された場所で応答し、GETのみ許可されていないホストへリダイレクトする参照元の場合に、
+    ffmpegのリクエストがリダイレクト先へ送信されないことをテストします。
+    """
+    http_origin, _ = http_origin
+    (tmp_path / "other").mkdir()
+    (tmp_path / "other" / "secret.mp4").write_bytes(b"secret video content")
+    other_origin, other_requested = serve(tmp_path / "other")
+    (tmp_path / "videos" / "switch.mp4").write_bytes(b"switch video content")
+    monkeypatch.setitem(GET_REDIRECTS, "/videos/switch.mp4", f"{other_origin}/secret.mp4")
+    resolver = create_resolver([], [f"{http_origin}/videos/"])
+
+    source = asyncio.run(resolver.resolve(f"{http_origin}/videos/switch.mp4"))
+    status, body = fetch(source.location)
+
+    assert status == 403
+    assert b"secret" not in body
+    assert other_requested == []
+
+def test_resolves_path_under_mount_root(tmp_path):
+    """
+    マウントのルート配下のファイルが解決され、ルート外を指すパスやシンボリックリンクが拒否されることをテストします。
+    """
+    root = tmp_path / "mnt"
+    root.mkdir()
+    video = root / "movie.mp4"
+    video.write_bytes(b"dummy video content")
+    outside = tmp_path / "outside.mp4"
+    outside.write_bytes(b"outside video content")
+    (root / "link.mp4").symlink_to(outside)
+    resolver = AllowListSourceResolver([root], [])
+
+    source = asyncio.run(resolver.resolve(str(video)))
+    assert (source.location, source.name) == (str(video.resolve()), "movie.mp4")
+
+    video.write_bytes(b"updated video content!")
+    assert asyncio.run(resolver.resolve(str(video))).fingerprint != source.fingerprint
+
+    for reference in (str(outside), str(root / ".." / "outside.mp4"), str(root / "link.mp4"), "movie.mp4"):
+        with pytest.raises(SourceNotAllowedException):
+            asyncio.run(resolver.resolve(reference))
+    with pytest.raises(SourceNotFoundException):
+        asyncio.run(resolver.resolve(str(root / "missing.mp4")))
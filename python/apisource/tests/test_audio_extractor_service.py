@@ -0,0 +1,119 @@
+"""
+このモジュールは、AudioExtractorServiceのアップロードの先頭部分の判定と、一時ファイルの後片付けのテストケースを含んでいます。
+"""
+
+import asyncio
+from unittest.mock import AsyncMock, Mock
+
+import pytest
+
+from domain.interfaces.audio_extractor_interface import NoAudioStreamException, UnsupportedContainerException
+from domain.interfaces.media_prober_interface import MediaProbeFailedException
+from domain.models.media_info import AudioStreamInfo, MediaInfo
+from infrastructure.ffmpeg_audio_extractor import FFmpegAudioExtractor
+from infrastructure.local_scratch_space import LocalScratchSpace
+from domain.models.extraction_options import ArchiveFormat, ExtractionOptions
+from service.audio_extractor_service import AudioExtractorService
+
+MP4_HEAD = bytes([0, 0, 0, 16]) + b"ftypisom" + bytes(4)
+
+def create_service(tmp_path, prober, sniff_head_size=2048):
+    """
+    実際のマジックナンバーの判定と、モックの解析器を使用するAudioExtractorServiceを生成します。
+    """
+    return AudioExtractorService(
+        FFmpegAudioExtractor(), Mock(), prober, LocalScratchSpace(tmp_path / "scratch"),
+        sniff_head_size=sniff_head_size
+    )
+
+def upload(chunks, consumed):
+    """
+    返したチャンクの数をconsumedに記録しながら、チャンクを順に返す非同期イテレータを生成します。
+    """
+    async def iterate():
+        for chunk in chunks:
+            consumed.append(chunk)
+            yield chunk
+    return iterate()
+
+def test_rejects_unsupported_container_after_first_chunk(tmp_path):
+    """
+    対応しないコンテナ形式のファイルが、最初のチャンクだけを受信した時点で解析せずに拒否されることをテストします。
+    """
+    prober = AsyncMock()
+    service = create_service(tmp_path, prober)
+    consumed = []
+
+    with pytest.raises(UnsupportedContainerException):
+        asyncio.run(service.screen("video.mp4", upload([b"%PDF-1.7" + bytes(1024), bytes(1024)], consumed)))
+    assert len(consumed) == 1
+    prober.probe.assert_not_awaited()
+
+def test_rejects_file_without_audio_before_rest_of_body(tmp_path):
+    """
+    先頭部分の解析で音声トラックがないと分かったファイルが、残りのデータを受信する前に拒否されることをテストします。
+    """
+    prober = AsyncMock()
+    prober.probe.return_value = MediaInfo(format_name="mov,mp4,m4a,3gp,3g2,mj2")
+    service = create_service(tmp_path, prober)
+    consumed = []
+
+    with pytest.raises(NoAudioStreamException):
+        asyncio.run(service.screen("video.mp4", upload([MP4_HEAD + bytes(1024), bytes(1024), bytes(1024)], consumed)))
+    assert len(consumed) == 2
+    assert list((tmp_path / "scratch").iterdir()) == []
+
+def test_passes_file_through_when_head_is_inconclusive(tmp_path):
+    """
+    音声トラックが見つかった場合や、先頭部分だけでは解析できなかった場合に、ファイル全体のデータがそのまま返されることをテストします。
+    """
+    chunks = [MP4_HEAD + bytes(1024), bytes(1024), b"rest of the file"]
+
+    async def read_all(service):
+        return b"".join([chunk async for chunk in await service.screen("video.mp4", upload(chunks, []))])
+
+    prober = AsyncMock()
+    prober.probe.side_effect = [
+        MediaInfo(format_name="mov,mp4,m4a,3gp,3g2,mj2", audio_streams=[AudioStreamInfo(index=1, codec_name="aac")]),
+        MediaProbeFailedException(),
+    ]
+    service = create_service(tmp_path, prober)
+
+    assert asyncio.run(read_all(service)) == b"".join(chunks)
+    assert asyncio.run(read_all(service)) == b"".join(chunks)
+    assert prober.probe.await_count == 2
+
+@pytest.mark.parametrize("archive_format", [ArchiveFormat.ZIP, ArchiveFormat.AUTO])
+def test_closing_unread_stream_removes_workspace(tmp_path, archive_format):
+    """
+    返されたストリームを一度も読み出さずに閉じた場合も、作業ディレクトリと受信したファイルが削除されることをテストします。
+    """
+    async def extract(video_path, audio_dir, options, media_info):
+        audio_file = audio_dir / "audio_track_1.aac"
+        audio_file.write_bytes(b"audio")
+        yield audio_file
+
+    async def archive(files):
+        async for audio_file in files:
+            yield audio_file.read_bytes()
+
+    extractor = Mock()
+    extractor.iter_extract_audio = extract
+    archiver = Mock(file_extension=".zip")
+    archiver.stream_archive = archive
+    prober = AsyncMock()
+    prober.probe.return_value = MediaInfo(
+        format_name="mov,mp4,m4a,3gp,3g2,mj2", audio_streams=[AudioStreamInfo(index=1, codec_name="aac")]
+    )
+    scratch = tmp_path / "scratch"
+    service = AudioExtractorService(extractor, archiver, prober, LocalScratchSpace(scratch))
+
+    async def run():
+        stream, _ = await service.extract(
+            "video.mp4", upload([MP4_HEAD], []), ExtractionOptions(archive_format=archive_format)
+        )
+        assert len(list(scratch.iterdir())) == 2
+        await stream.aclose()
+
+    asyncio.run(run())
+    assert list(scratch.iterdir()) == []
@@ -0,0 +1,85 @@
+"""
+このモジュールは、クライアントの切断時にリクエストの処理を取り消すCancelOnDisconnectMiddlewareのテストケースを含んでいます。
+"""
+
+import asyncio
+
+from infrastructure.framework.middlewares import CancelOnDisconnectMiddleware
+
+SCOPE = {"type": "http", "method": "POST", "path": "/api/v1/extract_audio", "headers": []}
+
+def fake_receive(disconnect: asyncio.Event):
+    """
+    ボディを1回で返した後、disconnectが設定されるまで切断の通知を待たせるASGIのreceiveを生成します。
+    """
+    messages = [{"type": "http.request", "body": b"video", "more_body": False}]
+
+    async def receive():
+        if messages:
+            return messages.pop(0)
+        await disconnect.wait()
+        return {"type": "http.disconnect"}
+
+    return receive
+
+def test_cancels_handler_when_client_disconnects():
+    """
+    ボディの受信後、レスポンスの送信前にクライアントが切断した場合に処理が取り消され、
+    後片付けが実行されたうえでミドルウェアが正常に終了することをテストします。
+    """
+    events = []
+
+    async def app(scope, receive, send):
+        await receive()
+        try:
+            # 最初のトラックの抽出を待っている状態を模す
+            await asyncio.sleep(10)
+        except asyncio.CancelledError:
+            events.append("cancelled")
+            raise
+
+    async def run():
+        disconnect = asyncio.Event()
+        asyncio.get_running_loop().call_later(0.05, disconnect.set)
+        sent = []
+
+        async def send(message):
+            sent.append(message)
+
+        await asyncio.wait_for(CancelOnDisconnectMiddleware(app)(SCOPE, fake_receive(disconnect), send), 5)
+        return sent
+
+    assert asyncio.run(run()) == []
+    assert events == ["cancelled"]
+
+def test_completed_response_is_not_cancelled():
+    """
+    レスポンスの送信が終わった後に届いた切断の通知では処理が取り消されず、
+    内側のアプリケーションも切断の通知を受け取れることをテストします。
+    """
+    events = []
+
+    async def app(scope, receive, send):
+        await receive()
+        await send({"type": "http.response.start", "status": 200, "headers": []})
+        await send({"type": "http.response.body", "body": b"zip", "more_body": False})
+        events.append((await receive())["type"])
+        # 送信後の後処理（アクセスログの出力など）が取り消されないことを確認する
+        await asyncio.sleep(0.05)
+        events.append("finished")
+
+    async def run():
+        disconnect = asyncio.Event()
+        sent = []
+
+        async def send(message):
+            sent.append(message)
+            if not message.get("more_body", True):
+                disconnect.set()
+
+        await CancelOnDisconnectMiddleware(app)(SCOPE, fake_receive(disconnect), send)
+        return sent
+
+    sent = asyncio.run(run())
+    assert [message["type"] for message in sent] == ["http.response.start", "http.response.body"]
+    assert events == ["http.disconnect", "finished"]
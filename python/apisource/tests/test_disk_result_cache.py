@@ -0,0 +1,76 @@
+"""
+このモジュールは、DiskResultCacheのテストケースを含んでいます。
+"""
+
+from infrastructure.disk_result_cache import DiskResultCache
+
+def store(cache, key, content):
+    """
+    一時ファイルに内容を書き込み、キャッシュへ登録します。
+    """
+    temp_path = cache.reserve(key)
+    temp_path.write_bytes(content)
+    cache.commit(key, temp_path)
+
+def test_get_returns_committed_entry(tmp_path):
+    """
+    登録したエントリが取得でき、ヒット数とミス数が記録されることをテストします。
+    """
+    cache = DiskResultCache(tmp_path, max_bytes=100)
+    assert cache.get("a") is None
+
+    store(cache, "a", b"archive")
+
+    assert cache.get("a").read_bytes() == b"archive"
+    stats = cache.stats()
+    assert (stats.hits, stats.misses, stats.entries, stats.size_bytes) == (1, 1, 1, 7)
+
+def test_evicts_least_recently_used_entries(tmp_path):
+    """
+    容量上限を超えた場合に、最後に参照された時刻が最も古いエントリから削除されることをテストします。
+    """
+    cache = DiskResultCache(tmp_path, max_bytes=20)
+    store(cache, "a", b"0" * 10)
+    store(cache, "b", b"0" * 10)
+    cache.get("a")
+    store(cache, "c", b"0" * 10)
+
+    assert cache.get("b") is None
+    assert cache.get("a") is not None
+    assert cache.get("c") is not None
+    assert cache.stats().evictions == 1
+    assert cache.stats().size_bytes == 20
+
+def test_discards_entries_larger_than_quota(tmp_path):
+    """
+    容量上限より大きいアーカイブが登録されずに破棄されることをテストします。
+    """
+    cache = DiskResultCache(tmp_path, max_bytes=5)
+    store(cache, "a", b"0" * 10)
+
+    assert cache.get("a") is None
+    assert list((tmp_path / "tmp").iterdir()) == []
+
+def test_restores_entries_after_restart(tmp_path):
+    """
+    プロセスの再起動後も既存のエントリが引き継がれることをテストします。
+    """
+    store(DiskResultCache(tmp_path, max_bytes=100), "a", b"archive")
+
+    cache = DiskResultCache(tmp_path, max_bytes=100)
+
+    assert cache.get("a").read_bytes() == b"archive"
+
+def test_keeps_suffix_of_entries_across_restart(tmp_path):
+    """
+    登録時に指定した接尾辞がエントリのファイル名に付き、再起動後も同じキーで取得できることをテストします。
+    """
+    cache = DiskResultCache(tmp_path, max_bytes=100)
+    for key, suffix in (("a", ".tar"), ("b", "_audio_track_1.aac")):
+        temp_path = cache.reserve(key)
+        temp_path.write_bytes(b"data")
+        cache.commit(key, temp_path, suffix)
+
+    restarted = DiskResultCache(tmp_path, max_bytes=100)
+    assert cache.get("a").name == restarted.get("a").name == "a.tar"
+    assert cache.get("b").name == restarted.get("b").name == "b_audio_track_1.aac"
@@ -0,0 +1,191 @@
+"""
+このモジュールは、ExtractionJobServiceとSqliteJobStoreのテストケースを含んでいます。
+"""
+
+import asyncio
+import dataclasses
+import os
+from pathlib import Path
+from unittest.mock import AsyncMock, Mock
+
+import pytest
+
+from domain.interfaces.audio_extractor_interface import AudioExtractionFailedException, ExtractorBusyException
+from domain.interfaces.job_store_interface import JobNotFinishedException, JobNotFoundException
+from domain.models.extraction_progress import current_extraction_progress
+from domain.models.job import Job, JobStatus
+from infrastructure.sqlite_job_store import SqliteJobStore
+from service.extraction_job_service import ExtractionJobService
+from tests.helpers import async_iter
+
+def create_service(tmp_path, ttl_seconds=60):
+    """
+    一時ディレクトリにジョブを保存するExtractionJobServiceを生成します。
+    """
+    store = SqliteJobStore(tmp_path / "jobs.sqlite3", tmp_path / "results")
+    return ExtractionJobService(store, ttl_seconds=ttl_seconds, max_workers=1)
+
+def create_audio_service(tmp_path, extract_ingested):
+    """
+    受信したファイルを一時ディレクトリに保存し、指定された抽出処理を行うAudioExtractorServiceのモックを生成します。
+    """
+    video_path = tmp_path / "video.mp4"
+    video_path.write_bytes(b"video")
+    audio_service = AsyncMock()
+    audio_service.ingest.return_value = (str(video_path), "hash")
+    audio_service.extract_ingested.side_effect = extract_ingested
+    audio_service.discard = Mock(side_effect=lambda path: os.remove(path) if os.path.exists(path) else None)
+    return audio_service, video_path
+
+async def wait_for_jobs(job_service):
+    """
+    実行中のジョブがすべて終了するまで待機します。
+    """
+    await asyncio.gather(*job_service._tasks)
+
+def test_job_succeeds_and_stores_result(tmp_path):
+    """
+    投入したジョブがバックグラウンドで実行され、結果アーカイブが保存されることをテストします。
+    """
+    job_service = create_service(tmp_path)
+
+    async def extract_ingested(video_path, content_hash, options, base_name=None, remove_source=True):
+        assert not remove_source
+        return async_iter([b"zip ", b"content"]), f"{base_name}_audio.zip"
+
+    audio_service, video_path = create_audio_service(tmp_path, extract_ingested)
+
+    async def run():
+        job = await job_service.submit(audio_service, "video.mp4", async_iter([b"video"]))
+        assert job.status == JobStatus.QUEUED
+        with pytest.raises(JobNotFinishedException):
+            job_service.get_result(job.id)
+        await wait_for_jobs(job_service)
+        return job
+
+    job = asyncio.run(run())
+
+    finished, result_path = job_service.get_result(job.id)
+    assert finished.status == JobStatus.SUCCEEDED
+    assert finished.archive_name == "video.mp4_audio.zip"
+    assert finished.expires_at == pytest.approx(finished.updated_at + 60)
+    assert Path(result_path).read_bytes() == b"zip content"
+    assert not video_path.exists()
+
+def test_busy_job_waits_and_retries_with_input(tmp_path):
+    """
+    変換の待ち行列が満杯で受け付けられなかったジョブが失敗とならず、待機中に戻されて
+    入力ファイルを残したまま再試行されることをテストします。
+    """
+    job_service = create_service(tmp_path)
+    save = job_service.store.save
+    statuses = []
+    job_service.store.save = lambda job: (statuses.append(job.status), save(job))
+
+    async def extract_ingested(video_path, content_hash, options, base_name=None, remove_source=True):
+        assert Path(video_path).exists()
+        if audio_service.extract_ingested.await_count == 1:
+            raise ExtractorBusyException(0)
+        return async_iter([b"zip"]), f"{base_name}_audio.zip"
+
+    audio_service, video_path = create_audio_service(tmp_path, extract_ingested)
+
+    async def run():
+        job = await job_service.submit(audio_service, "video.mp4", async_iter([b"video"]))
+        await wait_for_jobs(job_service)
+        return job
+
+    job = asyncio.run(run())
+
+    finished, result_path = job_service.get_result(job.id)
+    assert statuses == [
+        JobStatus.QUEUED, JobStatus.RUNNING, JobStatus.QUEUED, JobStatus.RUNNING, JobStatus.SUCCEEDED
+    ]
+    assert Path(result_path).read_bytes() == b"zip"
+    assert not video_path.exists()
+
+def test_job_failure_is_recorded_and_input_removed(tmp_path):
+    """
+    音声抽出に失敗したジョブが失敗として記録され、入力ファイルが削除されることをテストします。
+    """
+    job_service = create_service(tmp_path)
+
+    async def extract_ingested(video_path, content_hash, options, base_name=None, remove_source=True):
+        raise AudioExtractionFailedException()
+
+    audio_service, video_path = create_audio_service(tmp_path, extract_ingested)
+
+    async def run():
+        job = await job_service.submit(audio_service, "video.mp4", async_iter([b"video"]))
+        await wait_for_jobs(job_service)
+        return job
+
+    job = asyncio.run(run())
+
+    failed = job_service.get(job.id)
+    assert failed.status == JobStatus.FAILED
+    assert failed.error == "AudioExtractionFailedException"
+    assert not video_path.exists()
+    with pytest.raises(JobNotFoundException):
+        job_service.get_result(job.id)
+
+def test_watch_reports_progress_until_job_finishes(tmp_path):
+    """
+    ジョブの実行中に記録された進捗と状態の変化が、ジョブの終了まで通知されることをテストします。
+    """
+    job_service = create_service(tmp_path)
+
+    async def extract_ingested(video_path, content_hash, options, base_name=None, remove_source=True):
+        progress = current_extraction_progress()
+        progress.start_tracks({1: 10.0})
+        progress.update([1], 4.0, 2.0)
+        await asyncio.sleep(0.05)
+        progress.finish([1])
+        return async_iter([b"zip"]), "video_audio.zip"
+
+    audio_service, _ = create_audio_service(tmp_path, extract_ingested)
+
+    async def run():
+        job = await job_service.submit(audio_service, "video.mp4", async_iter([b"video"]))
+        return [event async for event in job_service.watch(job.id, 0.01)]
+
+    events = asyncio.run(run())
+
+    statuses = [data["status"] for event, data in events if event == "status"]
+    assert statuses[0] == JobStatus.QUEUED
+    assert statuses[-1] == JobStatus.SUCCEEDED
+    progress = [data["tracks"][0] for event, data in events if event == "progress"]
+    assert progress[0]["processed_seconds"] == 4.0
+    assert progress[0]["speed"] == 2.0
+    assert progress[0]["eta_seconds"] == 3.0
+    assert job_service._progress == {}
+
+def test_expired_jobs_are_purged(tmp_path):
+    """
+    有効期限を過ぎたジョブとその結果アーカイブが削除されることをテストします。
+    """
+    job_service = create_service(tmp_path)
+    job = Job(
+        id="expired", status=JobStatus.SUCCEEDED, file_name="video.mp4",
+        created_at=0, updated_at=0, expires_at=1, archive_name="video_audio.zip",
+    )
+    job_service.store.save(job)
+    job_service.store.result_path(job.id).write_bytes(b"zip")
+
+    with pytest.raises(JobNotFoundException):
+        job_service.get(job.id)
+    assert not job_service.store.result_path(job.id).exists()
+
+def test_unfinished_jobs_fail_on_restart(tmp_path):
+    """
+    プロセスの再起動時に、終了していなかったジョブが失敗として記録されることをテストします。
+    """
+    store = SqliteJobStore(tmp_path / "jobs.sqlite3", tmp_path / "results")
+    job = Job(id="running", status=JobStatus.RUNNING, file_name="video.mp4", created_at=0, updated_at=0)
+    store.save(job)
+    store.save(dataclasses.replace(job, id="queued", status=JobStatus.QUEUED))
+
+    job_service = create_service(tmp_path)
+
+    assert job_service.get("running").status == JobStatus.FAILED
+    assert job_service.get("queued").error == "interrupted"
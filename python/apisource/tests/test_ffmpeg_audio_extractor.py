@@ -0,0 +1,729 @@
+"""
+このモジュールは、FFmpegAudioExtractorのテストケースを含んでいます。
+ffmpegの実行はモック化し、組み立てられたコマンドラインを検証します。
+区間並列変換で連結した音声のサンプル数のみ、実際のffmpegで検証します。
+"""
+
+import asyncio
+import io
+import json
+import re
+import signal
+import subprocess
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from unittest.mock import Mock, patch
+
+import ffmpeg
+import pytest
+
+from domain.interfaces.audio_extractor_interface import NoAudioStreamException, NoMatchingAudioTrackException
+from domain.interfaces.scratch_space_interface import ScratchSpaceExhaustedException
+from domain.models.extraction_options import ExtractionOptions, OutputFormat
+from domain.models.extraction_progress import ExtractionProgress, start_extraction_progress
+from domain.models.media_info import AudioStreamInfo, MediaInfo
+from domain.models.track_analysis import analysis_path_for
+from infrastructure.ffmpeg_audio_extractor import FFmpegAudioExtractor, SINGLE_PASS_MODE, PER_TRACK_MODE
+from infrastructure.ffmpeg_scheduler import FFmpegJobScheduler
+from infrastructure.local_scratch_space import LocalScratchSpace
+from infrastructure.metrics import FFMPEG_CPU_SECONDS, FFMPEG_PEAK_RSS_BYTES
+
+# os.wait4で回収したffmpegのリソース使用量の代わりに返す値
+FAKE_RUSAGE = Mock(ru_utime=1.5, ru_stime=0.5, ru_maxrss=64 * 1024)
+
+# 区間並列変換の基準を求めるffmpegが書き出す、48kHzのAC-3の先頭の2フレーム。
+# Matroskaのミリ秒単位のタイムスタンプのため、先頭のフレームはフレームの位置から2サンプルずれている
+FAKE_ANCHOR_FRAMES = (
+    "#tb 0: 1/48000\n#media_type 0: audio\n#codec_id 0: pcm_s16le\n#sample_rate 0: 48000\n"
+    "0,        -50,        -50,     1536,     6144, 0x00000000\n"
+    "0,       1488,       1488,     1536,     6144, 0x00000000\n"
+)
+
+def fake_process():
+    """
+    正常終了するffmpegのプロセスのモックを生成します。
+    """
+    process = Mock(returncode=0)
+    process.stdout.read.return_value = b""
+    process.stderr.read.return_value = b""
+    return process
+
+def run_extractor(extractor, tmp_path, track_indices, codecs=None, options=None, languages=None):
+    """
+    ffmpegの実行をモック化して音声抽出を行い、実行されたコマンドラインのリストを返します。
+    """
+    commands = []
+
+    def fake_run_async(stream_spec, **kwargs):
+        commands.append(stream_spec.compile())
+        return fake_process()
+
+    codecs = codecs or ["aac"] * len(track_indices)
+    languages = languages or [None] * len(track_indices)
+    media_info = MediaInfo(format_name="matroska,webm", duration=60.0, audio_streams=[
+        AudioStreamInfo(index=index, codec_name=codec, language=language)
+        for index, codec, language in zip(track_indices, codecs, languages)
+    ])
+    with patch.object(ffmpeg.nodes.OutputStream, "run_async", fake_run_async), \
+            patch("os.wait4", return_value=(0, 0, FAKE_RUSAGE)):
+        audio_files = asyncio.run(extractor.extract_all_audio("input.mkv", tmp_path, options, media_info))
+    return audio_files, commands
+
+def test_single_pass_mode_runs_ffmpeg_once(tmp_path):
+    """
+    single_passモードで全トラックが1回のffmpeg実行で抽出されることをテストします。
+    """
+    audio_files, commands = run_extractor(FFmpegAudioExtractor(SINGLE_PASS_MODE), tmp_path, [1, 2, 3])
+
+    assert len(commands) == 1
+    assert commands[0].count("-map") == 3
+    assert [f"0:{index}" for index in (1, 2, 3)] == [
+        commands[0][i + 1] for i, arg in enumerate(commands[0]) if arg == "-map"
+    ]
+    assert [audio_file.name for audio_file in audio_files] == [
+        "audio_track_1.aac", "audio_track_2.aac", "audio_track_3.aac"
+    ]
+
+def test_per_track_mode_runs_ffmpeg_per_track(tmp_path):
+    """
+    per_trackモードでトラックごとにffmpegが実行されることをテストします。
+    """
+    audio_files, commands = run_extractor(FFmpegAudioExtractor(PER_TRACK_MODE), tmp_path, [1, 2])
+
+    assert len(commands) == 2
+    assert len(audio_files) == 2
+
+def output_codecs(command):
+    """
+    ffmpegのコマンドラインから出力ファイルごとの-acodecの値を取り出します。
+    """
+    return [command[i + 1] for i, arg in enumerate(command) if arg == "-acodec"]
+
+def test_passthrough_copies_only_compatible_tracks(tmp_path):
+    """
+    出力形式に格納できるコーデックのトラックのみストリームコピーされることをテストします。
+
+    このテストでは、AACとAC-3のトラックをAAC形式で抽出した際に、
+    AACのトラックはコピーされ、AC-3のトラックのみAACに再エンコードされることを検証します。
+    """
+    _, commands = run_extractor(
+        FFmpegAudioExtractor(SINGLE_PASS_MODE), tmp_path, [1, 2], codecs=["aac", "ac3"],
+        options=ExtractionOptions(output_format=OutputFormat.AAC)
+    )
+
+    assert output_codecs(commands[0]) == ["copy", "aac"]
+
+def test_passthrough_disabled_transcodes_all_tracks(tmp_path):
+    """
+    passthroughを無効にした場合にすべてのトラックが再エンコードされることをテストします。
+    """
+    _, commands = run_extractor(
+        FFmpegAudioExtractor(SINGLE_PASS_MODE), tmp_path, [1, 2], codecs=["aac", "ac3"],
+        options=ExtractionOptions(output_format=OutputFormat.AAC, passthrough=False)
+    )
+
+    assert output_codecs(commands[0]) == ["aac", "aac"]
+
+def test_auto_format_keeps_source_codecs(tmp_path):
+    """
+    出力形式autoでトラックごとに元のコーデックを格納できる形式が選択されることをテストします。
+    """
+    audio_files, commands = run_extractor(
+        FFmpegAudioExtractor(SINGLE_PASS_MODE), tmp_path, [1, 2, 3], codecs=["aac", "opus", "ac3"],
+        options=ExtractionOptions(output_format=OutputFormat.AUTO)
+    )
+
+    assert output_codecs(commands[0]) == ["copy", "copy", "copy"]
+    assert [audio_file.name for audio_file in audio_files] == [
+        "audio_track_1.aac", "audio_track_2.ogg", "audio_track_3.mka"
+    ]
+
+def test_scheduler_assigns_threads_per_job(tmp_path):
+    """
+    スケジューラーが指定された場合に、ジョブごとのスレッド数がffmpegに渡されることをテストします。
+    """
+    scheduler = FFmpegJobScheduler(max_concurrent_jobs=2, threads_per_job=3)
+    _, commands = run_extractor(FFmpegAudioExtractor(PER_TRACK_MODE, scheduler=scheduler), tmp_path, [1, 2])
+
+    for command in commands:
+        assert command[command.index("-threads") + 1] == "3"
+    assert scheduler.running_jobs == 0
+
+def test_selects_tracks_by_index_and_language(tmp_path):
+    """
+    インデックスまたは言語タグで指定された音声トラックのみが抽出されることをテストします。
+    """
+    audio_files, commands = run_extractor(
+        FFmpegAudioExtractor(SINGLE_PASS_MODE), tmp_path, [1, 2, 3, 4], languages=["jpn", "eng", "fra", "eng-US"],
+        options=ExtractionOptions(tracks=(3,), languages=("ENG",))
+    )
+
+    assert [audio_file.name for audio_file in audio_files] == [
+        "audio_track_2.aac", "audio_track_3.aac", "audio_track_4.aac"
+    ]
+    assert commands[0].count("-map") == 3
+
+def test_empty_track_selection_is_rejected_without_running_ffmpeg(tmp_path):
+    """
+    音声トラックがない場合や、指定に一致する音声トラックがない場合に、ffmpegを実行せずに例外が発生することをテストします。
+    """
+    extractor = FFmpegAudioExtractor(SINGLE_PASS_MODE)
+    with pytest.raises(NoMatchingAudioTrackException):
+        run_extractor(
+            extractor, tmp_path, [1, 2], languages=["jpn", "eng"],
+            options=ExtractionOptions(tracks=(5,), languages=("fra",))
+        )
+    with pytest.raises(NoAudioStreamException):
+        run_extractor(extractor, tmp_path, [])
+    assert list(tmp_path.iterdir()) == []
+
+def test_time_range_uses_input_seeking(tmp_path):
+    """
+    抽出する範囲が、ffmpegの入力側の-ssと-tとして指定されることをテストします。
+
+    このテストでは、範囲外のデータを読み飛ばせるよう、-ssと-tが-iより前に指定されることを検証します。
+    """
+    _, commands = run_extractor(
+        FFmpegAudioExtractor(PER_TRACK_MODE), tmp_path, [1, 2],
+        options=ExtractionOptions(start=90.0, end=120.0)
+    )
+
+    for command in commands:
+        assert command[command.index("-ss") + 1] == "90.0"
+        assert command[command.index("-t") + 1] == "30.0"
+        assert command.index("-ss") < command.index("-i")
+        assert command.index("-t") < command.index("-i")
+
+def run_long_track(extractor, tmp_path, codec, options=None):
+    """
+    3時間の音声トラックを1つ持つ動画について、ffmpegの実行をモック化して音声抽出を行います。
+
+    Returns:
+        tuple: 抽出された音声ファイルのリスト、実行されたコマンドラインのリスト、連結に渡された区間のリスト。
+    """
+    commands = []
+    concat_lists = []
+
+    def fake_run_async(stream_spec, **kwargs):
+        command = stream_spec.compile()
+        commands.append(command)
+        if "concat" in command:
+            concat_lists.append(Path(command[command.index("-i") + 1]).read_text(encoding="utf-8"))
+        if "framecrc" in command:
+            anchor_path, = (arg for arg in command if arg.endswith(".framecrc"))
+            Path(anchor_path).write_text(FAKE_ANCHOR_FRAMES, encoding="utf-8")
+        return fake_process()
+
+    media_info = MediaInfo(format_name="matroska,webm", duration=3 * 60 * 60.0, audio_streams=[
+        AudioStreamInfo(index=1, codec_name=codec, sample_rate=48000)
+    ])
+    with patch.object(ffmpeg.nodes.OutputStream, "run_async", fake_run_async), \
+            patch("os.wait4", return_value=(0, 0, FAKE_RUSAGE)):
+        audio_files = asyncio.run(extractor.extract_all_audio("input.mkv", tmp_path, options, media_info))
+    return audio_files, commands, concat_lists
+
+def test_long_track_is_transcoded_in_parallel_segments(tmp_path):
+    """
+    再エンコードする1つのトラックの長さが閾値以上の場合に、区間ごとに変換してから連結されることをテストします。
+
+    このテストでは、区間の境界がAACのフレーム長（1024サンプル）の整数倍に揃えられ、各区間が前後に4フレームずつ
+    重ねて変換されること、2番目以降の区間は開始位置の1秒手前まで入力側でシークし、フレームの位置に揃えた先頭のサンプルの
+    タイムスタンプを基準にサンプル単位で切り出すこと、重ねた部分とエンコーダーの遅延による先頭のパケットを破棄すること、
+    および区間のファイルが残したパケットの長さでストリームコピーにより1つの出力に連結されて削除されることを検証します。
+    """
+    scheduler = FFmpegJobScheduler(max_concurrent_jobs=4, threads_per_job=1)
+    extractor = FFmpegAudioExtractor(SINGLE_PASS_MODE, scheduler=scheduler, segment_min_duration=30 * 60)
+    audio_files, commands, concat_lists = run_long_track(
+        extractor, tmp_path, "ac3", ExtractionOptions(output_format=OutputFormat.AAC)
+    )
+
+    anchor_command, segment_commands, concat_command = commands[0], commands[1:-1], commands[-1]
+    assert anchor_command[anchor_command.index("-f") + 1] == "framecrc"
+    assert anchor_command[anchor_command.index("-frames:a") + 1] == "2"
+    assert "-copyts" in anchor_command
+    assert len(segment_commands) == 4
+    seeks = [command[command.index("-ss") + 1] if "-ss" in command else None for command in segment_commands]
+    trims = [
+        re.search(r"atrim=([^\[]*)", command[command.index("-filter_complex") + 1]).group(1)
+        for command in segment_commands
+    ]
+    drops = [command[command.index("-bsf:a") + 1] for command in segment_commands]
+    # 区間の長さは2700秒をフレーム長（1024/48000秒）の整数倍に切り上げた126563フレーム（2700.010667秒）、
+    # 重ねる長さは4フレーム（4096サンプル）。先頭のサンプルのタイムスタンプはフレームの位置に揃えた-48
+    assert seeks == [None, "2698.924333", "5398.935", "8098.945667"]
+    assert all(
+        command.index("-ss") < command.index("-i") and "-noaccurate_seek" in command
+        for command in segment_commands[1:]
+    )
+    assert all("-copyts" in command and "-t" not in command for command in segment_commands)
+    assert trims == [
+        "end_pts=129604560:start_pts=-48",
+        "end_pts=259205072:start_pts=129596368",
+        "end_pts=388805584:start_pts=259196880",
+        "start_pts=388797392",
+    ]
+    assert all(
+        command[command.index("-filter_complex") + 1].startswith("[0:1]asetpts=1488+round((STARTPTS-1488)/1536)*1536+N")
+        and command[command.index("-filter_complex") + 1].endswith("asetpts=PTS-STARTPTS[s2]")
+        for command in segment_commands
+    )
+    assert drops == [
+        "noise=drop=gte(n\\,126564)",
+        "noise=drop=lt(n\\,5)+gte(n\\,126568)",
+        "noise=drop=lt(n\\,5)+gte(n\\,126568)",
+        "noise=drop=lt(n\\,5)",
+    ]
+    assert all(output_codecs(command) == ["aac"] for command in segment_commands)
+
+    assert concat_command[concat_command.index("-f") + 1] == "concat"
+    assert output_codecs(concat_command) == ["copy"]
+    assert concat_command[-1] == str(tmp_path / "audio_track_1.aac")
+    assert concat_lists == [
+        "file 'segment_0000.aac'\ninpoint 0\nduration 2700.032000\n"
+        "file 'segment_0001.aac'\ninpoint 0\nduration 2700.010667\n"
+        "file 'segment_0002.aac'\ninpoint 0\nduration 2700.010667\n"
+        "file 'segment_0003.aac'\ninpoint 0\n"
+    ]
+    assert [audio_file.name for audio_file in audio_files] == ["audio_track_1.aac"]
+    assert list(tmp_path.iterdir()) == []
+    assert scheduler.running_jobs == 0
+
+def test_segmenting_is_skipped_for_stream_copy_and_short_ranges(tmp_path):
+    """
+    ストリームコピーする場合、区間を連結するとサンプル数が変わる出力形式の場合、元のコーデックのフレームの
+    サンプル数が一定でない場合、および抽出する範囲が閾値より短い場合は区間に分割しないことをテストします。
+    """
+    extractor = FFmpegAudioExtractor(SINGLE_PASS_MODE, segment_min_duration=30 * 60, max_segments=4)
+
+    _, commands, _ = run_long_track(extractor, tmp_path, "aac", ExtractionOptions(output_format=OutputFormat.AAC))
+    assert len(commands) == 1
+
+    for output_format in (OutputFormat.M4A, OutputFormat.FLAC, OutputFormat.OPUS):
+        _, commands, _ = run_long_track(extractor, tmp_path, "ac3", ExtractionOptions(output_format=output_format))
+        assert len(commands) == 1
+
+    for codec in ("opus", "vorbis", "pcm_s16le"):
+        _, commands, _ = run_long_track(extractor, tmp_path, codec, ExtractionOptions(output_format=OutputFormat.AAC))
+        assert len(commands) == 1
+
+    _, commands, _ = run_long_track(
+        extractor, tmp_path, "ac3", ExtractionOptions(output_format=OutputFormat.AAC, start=600.0, end=1800.0)
+    )
+    assert len(commands) == 1
+
+    _, commands, _ = run_long_track(
+        FFmpegAudioExtractor(SINGLE_PASS_MODE, max_segments=4), tmp_path, "ac3",
+        ExtractionOptions(output_format=OutputFormat.AAC)
+    )
+    assert len(commands) == 1
+
+def run_long_track_writing_outputs(extractor, output_dir, size):
+    """
+    3時間の音声トラックを1つ持つ動画について、ffmpegの実行をモック化し、各ffmpegの出力ファイルを指定されたバイト数で
+    書き出しながら区間並列変換を行います。
+    """
+    def fake_run_async(stream_spec, **kwargs):
+        command = stream_spec.compile()
+        if "framecrc" in command:
+            anchor_path, = (arg for arg in command if arg.endswith(".framecrc"))
+            Path(anchor_path).write_text(FAKE_ANCHOR_FRAMES, encoding="utf-8")
+        else:
+            *_, output_path = (arg for arg in command if arg.endswith(".aac"))
+            Path(output_path).write_bytes(b"\0" * size)
+        return fake_process()
+
+    media_info = MediaInfo(format_name="matroska,webm", duration=3 * 60 * 60.0, audio_streams=[
+        AudioStreamInfo(index=1, codec_name="ac3", sample_rate=48000)
+    ])
+    options = ExtractionOptions(output_format=OutputFormat.AAC)
+    with patch.object(ffmpeg.nodes.OutputStream, "run_async", fake_run_async), \
+            patch("os.wait4", return_value=(0, 0, FAKE_RUSAGE)):
+        return asyncio.run(extractor.extract_all_audio("input.mkv", output_dir, options, media_info))
+
+def test_outputs_and_segments_are_charged_to_scratch_space(tmp_path):
+    """
+    抽出した音声と区間並列変換の中間ファイルが一時作業領域の使用量に計上され、削除した中間ファイルの分は
+    使用量から差し引かれること、および容量上限を超えた場合は一時作業領域の例外として通知されることをテストします。
+    """
+    scratch = LocalScratchSpace(tmp_path)
+    extractor = FFmpegAudioExtractor(
+        SINGLE_PASS_MODE, segment_min_duration=30 * 60, max_segments=4, scratch_space=scratch
+    )
+    workspace = scratch.create_workspace()
+
+    audio_files = run_long_track_writing_outputs(extractor, workspace, 100)
+    assert [audio_file.name for audio_file in audio_files] == ["audio_track_1.aac"]
+    assert scratch.stats().used_bytes == 100
+
+    scratch.discard(workspace)
+    scratch.max_bytes = 250
+    workspace = scratch.create_workspace()
+    with pytest.raises(ScratchSpaceExhaustedException):
+        run_long_track_writing_outputs(extractor, workspace, 100)
+    assert list(workspace.iterdir()) == []
+    assert scratch.stats().used_bytes == 0
+
+def decoded_samples(path: Path) -> int:
+    """
+    実際のffmpegで音声ファイルをデコードし、1チャンネルあたりのサンプル数を返します。
+    """
+    pcm = subprocess.run(
+        ["ffmpeg", "-v", "error", "-i", str(path), "-f", "s16le", "-ac", "1", "-"], capture_output=True, check=True
+    ).stdout
+    return len(pcm) // 2
+
+@pytest.mark.usefixtures("require_ffmpeg")
+@pytest.mark.parametrize("output_format, sample_rate, start, end", [
+    (OutputFormat.AAC, 48000, None, None),
+    (OutputFormat.MKA, 44100, None, None),
+    (OutputFormat.MP3, 44100, None, None),
+    (OutputFormat.MP3, 48000, 5.5, 64.25),
+])
+def test_segmented_output_has_same_samples_as_unsplit_encode(tmp_path, output_format, sample_rate, start, end):
+    """
+    実際のffmpegで、区間ごとに変換して連結した音声のサンプル数が、分割せずに変換した音声と一致することをテストします。
+
+    このテストでは、区間の最短の長さを20秒とし、70秒のAC-3の音声を区間に分割して、エンコーダーの遅延や区間の端のパケットによって連結した音声の
+    長さが変わらないことを、抽出する範囲の指定の有無と、Matroskaのタイムスタンプがサンプル単位に揃わない
+    サンプリング周波数それぞれについて検証します。
+    """
+    video_path = tmp_path / "input.mkv"
+    subprocess.run([
+        "ffmpeg", "-v", "error", "-f", "lavfi", "-i", f"anoisesrc=duration=70:color=pink:sample_rate={sample_rate}",
+        "-c:a", "ac3", str(video_path)
+    ], check=True)
+    media_info = MediaInfo(format_name="matroska,webm", duration=70.0, audio_streams=[
+        AudioStreamInfo(index=0, codec_name="ac3", sample_rate=sample_rate)
+    ])
+    options = ExtractionOptions(output_format=output_format, start=start, end=end, passthrough=False)
+    commands = []
+    original_run_async = ffmpeg.nodes.OutputStream.run_async
+
+    def recording_run_async(stream_spec, **kwargs):
+        commands.append(stream_spec.compile())
+        return original_run_async(stream_spec, **kwargs)
+
+    unsplit_dir = tmp_path / "unsplit"
+    segmented_dir = tmp_path / "segmented"
+    unsplit_dir.mkdir()
+    segmented_dir.mkdir()
+    with patch.object(ffmpeg.nodes.OutputStream, "run_async", recording_run_async), \
+            patch("infrastructure.ffmpeg_segment_planner.MIN_SEGMENT_SECONDS", 20):
+        unsplit, = asyncio.run(FFmpegAudioExtractor(SINGLE_PASS_MODE).extract_all_audio(
+            str(video_path), unsplit_dir, options, media_info
+        ))
+        segmented, = asyncio.run(FFmpegAudioExtractor(
+            SINGLE_PASS_MODE, segment_min_duration=40, max_segments=3
+        ).extract_all_audio(str(video_path), segmented_dir, options, media_info))
+
+    # 分割しない変換に1回、区間ごとの変換に2回以上、連結に1回ffmpegが実行される
+    assert len(commands) >= 4
+    assert "concat" in commands[-1]
+    assert decoded_samples(segmented) == decoded_samples(unsplit)
+
+def test_analysis_runs_in_same_ffmpeg_as_extraction(tmp_path):
+    """
+    波形とラウドネスの解析が抽出と同じffmpegの実行で行われ、トラックごとの解析結果が書き出されることをテストします。
+
+    このテストでは、ametadataフィルターが書き出すメタデータを模したファイルから、
+    フレームごとのピークと、ピークのみを含む最後のフレームより前に出力されたラウドネスが求められることを検証します。
+    """
+    commands = []
+
+    def fake_run_async(stream_spec, **kwargs):
+        command = stream_spec.compile()
+        commands.append(command)
+        filter_graph = command[command.index("-filter_complex") + 1]
+        for metadata_path in re.findall(r"ametadata=file=([^:]+):mode=print", filter_graph):
+            Path(metadata_path).write_text(
+                "frame:0    pts:0       pts_time:0\n"
+                "lavfi.r128.I=-70.000\n"
+                "lavfi.astats.Overall.Peak_level=-inf\n"
+                "frame:1    pts:4800    pts_time:0.1\n"
+                "lavfi.r128.I=-23.046\n"
+                "lavfi.r128.LRA=4.500\n"
+                "lavfi.r128.true_peaks_ch0=0.501\n"
+                "lavfi.r128.true_peaks_ch1=0.891\n"
+                "lavfi.astats.Overall.Peak_level=-6.020600\n"
+                "frame:2    pts:9600    pts_time:0.2\n"
+                "lavfi.astats.Overall.Peak_level=-12.041200\n"
+            )
+        return fake_process()
+
+    media_info = MediaInfo(format_name="matroska,webm", audio_streams=[
+        AudioStreamInfo(index=1, codec_name="aac"), AudioStreamInfo(index=2, codec_name="aac")
+    ])
+    with patch.object(ffmpeg.nodes.OutputStream, "run_async", fake_run_async), \
+            patch("os.wait4", return_value=(0, 0, FAKE_RUSAGE)):
+        audio_files = asyncio.run(FFmpegAudioExtractor(SINGLE_PASS_MODE).extract_all_audio(
+            "input.mkv", tmp_path, ExtractionOptions(analyze=True), media_info
+        ))
+
+    assert len(commands) == 1
+    assert commands[0].count("null") == 2
+    assert "ebur128=metadata=1:peak=true" in commands[0][commands[0].index("-filter_complex") + 1]
+    for track_index, audio_file in zip((1, 2), audio_files):
+        analysis = json.loads(analysis_path_for(audio_file).read_text())
+        assert analysis == {
+            "track_index": track_index,
+            "integrated_loudness": -23.05,
+            "loudness_range": 4.5,
+            "true_peak": -1.0,
+            "peaks_per_second": 10,
+            "peaks": [0.0, 0.5, 0.25],
+        }
+    assert sorted(path.name for path in tmp_path.iterdir()) == ["audio_track_1.analysis.json", "audio_track_2.analysis.json"]
+
+def test_progress_is_read_from_ffmpeg_output(tmp_path):
+    """
+    進捗の記録が開始されている場合に、ffmpegの-progressの報告がトラックごとの進捗として記録されることをテストします。
+
+    このテストでは、1回のffmpeg実行で抽出する全トラックに同じ変換済みの長さが記録され、
+    変換済みの長さが抽出する範囲の長さを基準とすることを検証します。
+    """
+    commands = []
+    reports = []
+    original_update = ExtractionProgress.update
+
+    def recording_update(progress, *args):
+        original_update(progress, *args)
+        reports.append(progress.snapshot()[1])
+
+    def fake_run_async(stream_spec, **kwargs):
+        commands.append(stream_spec.compile())
+        process = fake_process()
+        process.stdout = io.BytesIO(
+            b"out_time_us=N/A\nspeed=N/A\nprogress=continue\n"
+            b"out_time_us=15000000\nspeed=3.00x\nprogress=continue\n"
+        )
+        return process
+
+    media_info = MediaInfo(format_name="matroska,webm", duration=60.0, audio_streams=[
+        AudioStreamInfo(index=1, codec_name="aac"), AudioStreamInfo(index=2, codec_name="aac", duration=50.0)
+    ])
+
+    async def run():
+        start_extraction_progress()
+        await FFmpegAudioExtractor(SINGLE_PASS_MODE).extract_all_audio(
+            "input.mkv", tmp_path, ExtractionOptions(start=10.0), media_info
+        )
+
+    with patch.object(ffmpeg.nodes.OutputStream, "run_async", fake_run_async), \
+            patch("os.wait4", return_value=(0, 0, FAKE_RUSAGE)), \
+            patch.object(ExtractionProgress, "update", recording_update):
+        asyncio.run(run())
+
+    assert commands[0][commands[0].index("-progress") + 1] == "pipe:1"
+    assert [(track.processed_seconds, track.speed) for track in reports[-1]] == [(15.0, 3.0), (15.0, 3.0)]
+    assert [track.duration for track in reports[-1]] == [50.0, 40.0]
+    assert [track.eta_seconds for track in reports[-1]] == [35.0 / 3, 25.0 / 3]
+
+def test_progress_is_not_requested_without_tracking(tmp_path):
+    """
+    進捗の記録が開始されていない場合は、ffmpegに-progressを指定しないことをテストします。
+    """
+    _, commands = run_extractor(FFmpegAudioExtractor(SINGLE_PASS_MODE), tmp_path, [1])
+
+    assert "-progress" not in commands[0]
+
+def test_is_streamable_detects_container_layout():
+    """
+    先頭部分から、受信しながら読み込める形式かどうかが判定されることをテストします。
+
+    このテストでは、MPEG-TS、Matroska、moovが先頭側にあるMP4をストリーミング可能と判定し、
+    moovが末尾にあるMP4や未知の形式はストリーミング不可と判定することを検証します。
+    """
+    def box(box_type, payload=b""):
+        return (8 + len(payload)).to_bytes(4, "big") + box_type + payload
+
+    extractor = FFmpegAudioExtractor()
+    ts_packet = bytes([0x47]) + bytes(187)
+    ftyp = box(b"ftyp", b"isom" + bytes(4))
+
+    assert extractor.is_streamable(ts_packet * 4)
+    assert extractor.is_streamable(b"\x1a\x45\xdf\xa3" + bytes(32))
+    assert extractor.is_streamable(ftyp + box(b"moov", bytes(16)) + box(b"moof") + box(b"mdat"))
+    assert not extractor.is_streamable(ftyp + box(b"mdat", bytes(16)) + box(b"moov"))
+    assert not extractor.is_streamable(bytes([0x47]) + bytes(200))
+    assert not extractor.is_streamable(b"RIFF" + bytes(32))
+
+def test_is_supported_container_detects_magic_numbers():
+    """
+    先頭部分のマジックナンバーから、対応するコンテナ形式かどうかが判定されることをテストします。
+
+    このテストでは、moovが末尾にあるMP4を含む主要なコンテナ形式を対応する形式と判定し、
+    空のファイル、テキスト、画像、同期バイトが続かないデータは対応しない形式と判定することを検証します。
+    """
+    extractor = FFmpegAudioExtractor()
+    ts_packet = bytes([0x47]) + bytes(187)
+
+    assert extractor.is_supported_container(bytes([0, 0, 0, 24]) + b"ftypisom" + bytes(12) + b"\x00\x00\x00\x08mdat")
+    assert extractor.is_supported_container(bytes([0, 0, 0, 8]) + b"wide" + bytes(8) + b"mdat")
+    assert extractor.is_supported_container(b"\x1a\x45\xdf\xa3" + bytes(32))
+    assert extractor.is_supported_container(ts_packet * 4)
+    assert extractor.is_supported_container((bytes(4) + ts_packet) * 4)
+    assert extractor.is_supported_container(b"RIFF" + bytes(4) + b"AVI LIST")
+    assert extractor.is_supported_container(b"\x00\x00\x01\xba" + bytes(32))
+    assert extractor.is_supported_container(b"FLV\x01\x05" + bytes(16))
+    assert not extractor.is_supported_container(b"")
+    assert not extractor.is_supported_container(b"dummy video content")
+    assert not extractor.is_supported_container(b"\x89PNG\r\n\x1a\n" + bytes(32))
+    assert not extractor.is_supported_container(b"RIFF" + bytes(4) + b"WAVEfmt ")
+    assert not extractor.is_supported_container(bytes([0x47]) + bytes(400))
+
+def test_extract_from_stream_feeds_ffmpeg_stdin(tmp_path):
+    """
+    受信中のデータがffmpegの標準入力へ順に書き込まれ、全トラックが1回の実行で抽出されることをテストします。
+    """
+    commands = []
+    written = []
+
+    def fake_run_async(stream_spec, **kwargs):
+        commands.append((stream_spec.compile(), kwargs))
+        process = fake_process()
+        process.stdin.write.side_effect = written.append
+        return process
+
+    async def chunks():
+        for chunk in (b"first ", b"second"):
+            yield chunk
+
+    media_info = MediaInfo(format_name="mpegts", audio_streams=[
+        AudioStreamInfo(index=1, codec_name="aac"), AudioStreamInfo(index=2, codec_name="aac")
+    ])
+
+    async def collect():
+        return [
+            audio_file async for audio_file in
+            FFmpegAudioExtractor(PER_TRACK_MODE).iter_extract_audio_from_stream(chunks(), tmp_path, None, media_info)
+        ]
+
+    with patch.object(ffmpeg.nodes.OutputStream, "run_async", fake_run_async), \
+            patch("os.wait4", return_value=(0, 0, FAKE_RUSAGE)):
+        audio_files = asyncio.run(collect())
+
+    assert len(commands) == 1
+    command, kwargs = commands[0]
+    assert command[command.index("-i") + 1] == "pipe:0"
+    assert kwargs["pipe_stdin"] is True
+    assert written == [b"first ", b"second"]
+    assert [audio_file.name for audio_file in audio_files] == ["audio_track_1.aac", "audio_track_2.aac"]
+
+def test_concurrent_piped_extractions_do_not_exhaust_default_executor(tmp_path):
+    """
+    既定のスレッドプールのスレッド数を超える数のffmpegへ同時に標準入力を書き込んでも、処理が停止しないことをテストします。
+
+    このテストでは、標準入力が閉じられるまで出力を読み終わらないffmpegを、既定のスレッドプールのスレッド数（3）を
+    超える4つ同時に実行し、入出力が既定のスレッドプールを使用せずにすべて完了することを検証します。
+    """
+    pool_size = 3
+    jobs = pool_size + 1
+    drained = []
+
+    def fake_run_async(stream_spec, **kwargs):
+        process = fake_process()
+        stdin_closed = threading.Event()
+
+        def read_until_stdin_closed():
+            # 標準入力が閉じられないまま待ち続けた場合はFalseが記録される
+            drained.append(stdin_closed.wait(5))
+            return b""
+
+        process.stdin.close.side_effect = stdin_closed.set
+        process.stdout.read.side_effect = read_until_stdin_closed
+        process.stderr.read.side_effect = read_until_stdin_closed
+        return process
+
+    async def chunks():
+        for chunk in (b"first ", b"second"):
+            await asyncio.sleep(0)
+            yield chunk
+
+    media_info = MediaInfo(format_name="mpegts", audio_streams=[AudioStreamInfo(index=1, codec_name="aac")])
+
+    async def extract(output_dir):
+        output_dir.mkdir()
+        extractor = FFmpegAudioExtractor(SINGLE_PASS_MODE)
+        return [
+            audio_file async for audio_file in
+            extractor.iter_extract_audio_from_stream(chunks(), output_dir, None, media_info)
+        ]
+
+    async def run_concurrently():
+        asyncio.get_running_loop().set_default_executor(ThreadPoolExecutor(pool_size))
+        return await asyncio.gather(*(extract(tmp_path / str(job)) for job in range(jobs)))
+
+    with patch.object(ffmpeg.nodes.OutputStream, "run_async", fake_run_async), \
+            patch("os.wait4", return_value=(0, 0, FAKE_RUSAGE)):
+        results = asyncio.run(run_concurrently())
+
+    assert [len(audio_files) for audio_files in results] == [1] * jobs
+    assert drained == [True] * jobs * 2
+
+def test_cancellation_kills_running_ffmpeg(tmp_path):
+    """
+    抽出を待っている間にキャンセルされた場合（クライアントの切断や制限時間の超過）に、
+    実行中のffmpegが強制終了されて回収され、キャンセルが呼び出し側へ伝播することをテストします。
+    """
+    killed = threading.Event()
+    started = []
+    signals = []
+
+    def fake_run_async(stream_spec, **kwargs):
+        process = Mock(returncode=None, pid=4321)
+        # 強制終了されるまで出力を読み終わらない、実行中のffmpegを模す
+        process.stdout.read.side_effect = lambda: killed.wait(5) and b""
+        process.stderr.read.return_value = b""
+        started.append(process)
+        return process
+
+    def fake_kill(pid, sig):
+        signals.append((pid, sig))
+        killed.set()
+
+    media_info = MediaInfo(format_name="matroska,webm", duration=60.0, audio_streams=[
+        AudioStreamInfo(index=1, codec_name="aac"), AudioStreamInfo(index=2, codec_name="aac")
+    ])
+
+    async def cancel_while_extracting():
+        extractor = FFmpegAudioExtractor(PER_TRACK_MODE)
+        task = asyncio.ensure_future(extractor.extract_all_audio("input.mkv", tmp_path, None, media_info))
+        while len(started) < 2:
+            await asyncio.sleep(0.01)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+
+    with patch.object(ffmpeg.nodes.OutputStream, "run_async", fake_run_async), \
+            patch("os.kill", fake_kill), \
+            patch("os.wait4", return_value=(4321, signal.SIGKILL, FAKE_RUSAGE)) as wait4:
+        asyncio.run(cancel_while_extracting())
+
+    assert signals == [(4321, signal.SIGKILL), (4321, signal.SIGKILL)]
+    assert wait4.call_count == 2
+    assert all(process.returncode == -signal.SIGKILL for process in started)
+
+def sample_value(metric, sample_name):
+    """
+    メトリクスの出力から指定された名前のサンプルの値を取り出します。存在しない場合は0を返します。
+    """
+    for line in metric.samples():
+        name, value = line.rsplit(" ", 1)
+        if name == sample_name:
+            return float(value)
+    return 0.0
+
+def test_ffmpeg_resource_usage_is_recorded(tmp_path):
+    """
+    os.wait4で回収したffmpegのCPU時間と最大常駐メモリがメトリクスに記録されることをテストします。
+    """
+    count_before = sample_value(FFMPEG_CPU_SECONDS, "ffmpeg_job_cpu_seconds_count")
+    cpu_before = sample_value(FFMPEG_CPU_SECONDS, "ffmpeg_job_cpu_seconds_sum")
+    rss_before = sample_value(FFMPEG_PEAK_RSS_BYTES, "ffmpeg_job_peak_rss_bytes_count")
+
+    run_extractor(FFmpegAudioExtractor(PER_TRACK_MODE), tmp_path, [1, 2])
+
+    assert sample_value(FFMPEG_CPU_SECONDS, "ffmpeg_job_cpu_seconds_count") == count_before + 2
+    assert sample_value(FFMPEG_CPU_SECONDS, "ffmpeg_job_cpu_seconds_sum") == cpu_before + 4.0
+    assert sample_value(FFMPEG_PEAK_RSS_BYTES, "ffmpeg_job_peak_rss_bytes_count") == rss_before + 2
@@ -0,0 +1,100 @@
+"""
+このモジュールは、FFmpegJobSchedulerのテストケースを含んでいます。
+"""
+
+import asyncio
+
+import pytest
+
+from domain.interfaces.audio_extractor_interface import ExtractorBusyException
+from infrastructure.ffmpeg_scheduler import FFmpegJobScheduler
+
+def test_limits_concurrent_jobs():
+    """
+    同時に実行されるジョブ数が上限を超えないことをテストします。
+    """
+    scheduler = FFmpegJobScheduler(max_concurrent_jobs=2, threads_per_job=1)
+    peak = 0
+
+    async def job():
+        nonlocal peak
+        async with scheduler.slot("request"):
+            peak = max(peak, scheduler.running_jobs)
+            await asyncio.sleep(0.01)
+
+    async def run():
+        await asyncio.gather(*[job() for _ in range(6)])
+
+    asyncio.run(run())
+
+    assert peak == 2
+    assert scheduler.running_jobs == 0
+
+def test_queued_jobs_are_served_fairly_across_owners():
+    """
+    待機中のジョブが依頼元を巡回して実行されることをテストします。
+
+    このテストでは、依頼元Aが先に3つのジョブを待機させた後に依頼元Bが1つのジョブを待機させた場合でも、
+    Bのジョブが依頼元Aの残りのジョブより先に実行されることを検証します。
+    """
+    scheduler = FFmpegJobScheduler(max_concurrent_jobs=1, threads_per_job=1)
+    order = []
+
+    async def job(owner, name):
+        async with scheduler.slot(owner):
+            order.append(name)
+            await asyncio.sleep(0)
+
+    async def run():
+        await scheduler.acquire("blocker")
+        tasks = [asyncio.create_task(job("a", f"a{index}")) for index in range(3)]
+        await asyncio.sleep(0)
+        tasks.append(asyncio.create_task(job("b", "b0")))
+        await asyncio.sleep(0)
+        scheduler.release()
+        await asyncio.gather(*tasks)
+
+    asyncio.run(run())
+
+    assert order == ["a0", "b0", "a1", "a2"]
+
+def test_rejects_jobs_when_queue_is_full():
+    """
+    待機できるジョブの上限に達した場合にExtractorBusyExceptionが送出されることをテストします。
+    """
+    scheduler = FFmpegJobScheduler(max_concurrent_jobs=1, threads_per_job=1, max_queued_jobs=1, retry_after=7)
+
+    async def run():
+        await scheduler.acquire("a")
+        waiter = asyncio.create_task(scheduler.acquire("b"))
+        await asyncio.sleep(0)
+        with pytest.raises(ExtractorBusyException) as exc_info:
+            await scheduler.acquire("c")
+        with pytest.raises(ExtractorBusyException):
+            scheduler.check_capacity(1)
+        waiter.cancel()
+        await asyncio.gather(waiter, return_exceptions=True)
+        return exc_info.value
+
+    exc = asyncio.run(run())
+
+    assert exc.retry_after == 7
+    assert scheduler.queued_jobs == 0
+
+def test_cancelled_waiter_does_not_leak_slot():
+    """
+    待機中にキャンセルされたジョブが実行枠を消費しないことをテストします。
+    """
+    scheduler = FFmpegJobScheduler(max_concurrent_jobs=1, threads_per_job=1)
+
+    async def run():
+        await scheduler.acquire("a")
+        waiter = asyncio.create_task(scheduler.acquire("b"))
+        await asyncio.sleep(0)
+        scheduler.release()
+        waiter.cancel()
+        await asyncio.gather(waiter, return_exceptions=True)
+
+    asyncio.run(run())
+
+    assert scheduler.running_jobs == 0
@@ -0,0 +1,163 @@
+"""
+このモジュールは、区間並列変換の区間の分割とffmpegの引数の計算のテストケースを含んでいます。
+ffmpegを実行せずに、区間の境界、シーク位置、タイムスタンプの補正、破棄するパケットを検証します。
+"""
+
+import re
+from pathlib import Path
+
+import pytest
+
+from domain.models.extraction_options import ExtractionOptions
+from domain.models.media_info import AudioStreamInfo
+from infrastructure.ffmpeg_segment_planner import (
+    AAC_SEGMENT_CODEC, SEGMENT_CODECS, SEGMENT_OVERLAP_FRAMES, Segment, SegmentAnchor, concat_list,
+    drop_packets_filter, parse_anchor, plan_segments, plan_track_segments, segment_input_args, snap_expression
+)
+
+MP3_SEGMENT_CODEC = SEGMENT_CODECS[("libmp3lame", ".mp3")]
+
+# 48kHzのAC-3の先頭の2フレーム。Matroskaのミリ秒単位のタイムスタンプのため、先頭のフレームはフレームの位置から2サンプルずれている
+ANCHOR_FRAMES = (
+    "#tb 0: 1/48000\n#media_type 0: audio\n#codec_id 0: pcm_s16le\n#sample_rate 0: 48000\n"
+    "0,        -50,        -50,     1536,     6144, 0x00000000\n"
+    "0,       1488,       1488,     1536,     6144, 0x00000000\n"
+)
+
+def test_plan_segments_overlaps_frame_aligned_boundaries():
+    """
+    区間の境界がエンコーダーのフレーム長の整数倍に揃い、隣の区間と重ねて変換する部分と
+    エンコーダーの遅延によるパケットが破棄されることをテストします。
+    """
+    segments = plan_segments(0, None, 130, 2, AAC_SEGMENT_CODEC, 48000)
+
+    assert segments == [
+        Segment(0, (3047 + SEGMENT_OVERLAP_FRAMES) * 1024, 0, 3048, 3048 * 1024 / 48000),
+        Segment((3047 - SEGMENT_OVERLAP_FRAMES) * 1024, None, SEGMENT_OVERLAP_FRAMES + 1, None, None),
+    ]
+
+@pytest.mark.parametrize("codec, sample_rate, range_start, range_end, duration, count", [
+    (AAC_SEGMENT_CODEC, 48000, 0, None, 10800, 4),
+    (AAC_SEGMENT_CODEC, 44100, 0, None, 70, 3),
+    (MP3_SEGMENT_CODEC, 44100, 242550, None, 3600, 8),
+    (MP3_SEGMENT_CODEC, 48000, 264000, 3084000, 58.75, 2),
+])
+def test_plan_segments_kept_packets_cover_range_without_gaps(codec, sample_rate, range_start, range_end, duration, count):
+    """
+    各区間で残すパケットが、直前までの区間で残したパケットの続きのサンプルから始まり、
+    区間の変換が隣の区間と重ねる部分を含みつつ抽出する範囲を超えないことをテストします。
+    """
+    segments = plan_segments(range_start, range_end, duration, count, codec, sample_rate)
+    overlap = SEGMENT_OVERLAP_FRAMES * codec.frame_size
+
+    assert len(segments) == count
+    assert segments[0].start_sample == range_start and segments[0].skip_packets == 0
+    assert segments[-1].end_sample == range_end and segments[-1].packets is None
+    kept_packets = 0
+    for index, segment in enumerate(segments):
+        if index:
+            # 重ねた部分の後から、それまでに残したパケット（エンコーダーの遅延の分を除く）の続きの音声を残す
+            assert segment.skip_packets == SEGMENT_OVERLAP_FRAMES + codec.delay_packets
+            assert segment.start_sample + overlap == range_start + (kept_packets - codec.delay_packets) * codec.frame_size
+        if segment.packets is not None:
+            assert segment.duration == pytest.approx(segment.packets * codec.frame_size / sample_rate)
+            next_start = segments[index + 1].start_sample
+            expected_end = next_start + 2 * overlap
+            assert segment.end_sample == (expected_end if range_end is None else min(expected_end, range_end))
+            kept_packets += segment.packets
+
+def test_plan_track_segments_splits_supported_long_track():
+    """
+    区間並列変換できるトラックと出力形式の組み合わせで、抽出する範囲がサンプル単位で区間に分割されることをテストします。
+    """
+    track = AudioStreamInfo(index=1, codec_name="ac3", sample_rate=48000, duration=600.0)
+    options = ExtractionOptions(start=5.5, end=305.5)
+
+    codec, segments = plan_track_segments(
+        track, Path("audio_track_1.mp3"), {"acodec": "libmp3lame"}, options, None, 120, 8
+    )
+
+    assert codec == MP3_SEGMENT_CODEC
+    assert len(segments) == 5
+    assert segments[0].start_sample == 264000
+    assert segments[-1].end_sample == 14664000
+
+@pytest.mark.parametrize("track, output_name, output_args, options", [
+    # ストリームコピー
+    (AudioStreamInfo(index=1, codec_name="aac", sample_rate=48000), "a.aac", {"acodec": "copy"}, ExtractionOptions()),
+    # 連結すると遅延の情報が失われる出力形式
+    (AudioStreamInfo(index=1, codec_name="ac3", sample_rate=48000), "a.m4a", {"acodec": "aac"}, ExtractionOptions()),
+    # フレーム単位でシークできない元のコーデック
+    (AudioStreamInfo(index=1, codec_name="flac", sample_rate=48000), "a.aac", {"acodec": "aac"}, ExtractionOptions()),
+    # 1152サンプルのフレームにならないサンプリング周波数
+    (AudioStreamInfo(index=1, codec_name="ac3", sample_rate=22050), "a.mp3", {"acodec": "libmp3lame"}, ExtractionOptions()),
+    # 抽出する範囲が短い
+    (AudioStreamInfo(index=1, codec_name="ac3", sample_rate=48000), "a.aac", {"acodec": "aac"}, ExtractionOptions(end=90)),
+])
+def test_plan_track_segments_skips_unsupported_tracks(track, output_name, output_args, options):
+    """
+    連結したサンプル数を保証できない組み合わせや短い範囲では、区間に分割しないことをテストします。
+    """
+    assert plan_track_segments(track, Path(output_name), output_args, options, 3600.0, 60, 8) is None
+
+def test_parse_anchor_aligns_first_frame_to_frame_grid(tmp_path):
+    """
+    先頭のフレームのタイムスタンプが、2番目のフレームから求めたフレームの位置に揃えられることをテストします。
+    """
+    anchor_path = tmp_path / "anchor.framecrc"
+    anchor_path.write_text(ANCHOR_FRAMES, encoding="utf-8")
+
+    assert parse_anchor(anchor_path) == SegmentAnchor(48000, -48, 1536)
+
+def evaluate_snap(expression: str, start_pts: int, n: int) -> int:
+    """
+    asetptsの式を、STARTPTSとNを与えて評価します。
+    """
+    return eval(expression.replace("STARTPTS", str(start_pts)).replace("N", str(n)), {"round": round})
+
+def test_snap_expression_rounds_seek_timestamps_to_frames():
+    """
+    シークした位置のミリ秒単位に丸められたタイムスタンプが、最も近いフレームの位置に揃えられ、
+    以降のサンプルがそこから連続して数えられることをテストします。
+    """
+    anchor = SegmentAnchor(48000, -48, 1536)
+    expression = snap_expression(anchor)
+    frame_pts = -48 + 1536 * 313
+
+    assert re.fullmatch(r"1488\+round\(\(STARTPTS-1488\)/1536\)\*1536\+N", expression)
+    for error in (-40, -1, 0, 1, 40):
+        assert evaluate_snap(expression, frame_pts + error, 0) == frame_pts
+        assert evaluate_snap(expression, frame_pts + error, 1000) == frame_pts + 1000
+
+def test_segment_input_args_seeks_before_segment_and_trims_exact_samples():
+    """
+    区間の開始位置の手前まで入力側でシークし、切り出す範囲が基準のタイムスタンプからのサンプル位置となることをテストします。
+    """
+    anchor = SegmentAnchor(48000, -48, 1536)
+
+    input_args, trim_args = segment_input_args(Segment(480000, 960000, 5, 100, 1.0), anchor)
+    assert input_args == {"ss": 8.999, "noaccurate_seek": None}
+    assert trim_args == {"start_pts": 479952, "end_pts": 959952}
+
+    # 先頭の区間はシークせず、最後の区間は終端まで切り出す
+    assert segment_input_args(Segment(0, 960000, 0, 100, 1.0), anchor) == ({}, {"start_pts": -48, "end_pts": 959952})
+    assert segment_input_args(Segment(480000, None, 5, None, None), anchor)[1] == {"start_pts": 479952}
+
+def test_drop_packets_filter_keeps_only_concatenated_packets():
+    """
+    区間の先頭の重ねた部分と、次の区間と重ねた末尾のパケットが破棄されることをテストします。
+    """
+    assert drop_packets_filter(Segment(0, 100, 0, 3048, 1.0)) == "noise=drop=gte(n\\,3048)"
+    assert drop_packets_filter(Segment(0, 100, 5, 3047, 1.0)) == "noise=drop=lt(n\\,5)+gte(n\\,3052)"
+    assert drop_packets_filter(Segment(0, None, 5, None, None)) == "noise=drop=lt(n\\,5)"
+
+def test_concat_list_uses_kept_packet_durations():
+    """
+    連結する位置が残したパケットの長さで指定され、最後の区間は終端まで連結されることをテストします。
+    """
+    segments = [Segment(0, 100, 0, 3048, 65.024), Segment(50, None, 5, None, None)]
+
+    assert concat_list(["segment_0000.aac", "segment_0001.aac"], segments) == (
+        "file 'segment_0000.aac'\ninpoint 0\nduration 65.024000\n"
+        "file 'segment_0001.aac'\ninpoint 0\n"
+    )
@@ -0,0 +1,84 @@
+"""
+このモジュールは、FFprobeMediaProberのテストケースを含んでいます。
+ffprobeの実行はモック化し、出力の変換とキャッシュの動作を検証します。
+"""
+
+import asyncio
+from unittest.mock import AsyncMock, Mock, patch
+
+import pytest
+
+from infrastructure.ffprobe_media_prober import FFprobeMediaProber
+
+FFPROBE_OUTPUT = {
+    "streams": [
+        {
+            "index": 1, "codec_name": "aac", "codec_type": "audio", "channels": 2,
+            "sample_rate": "48000", "bit_rate": "192000", "tags": {"language": "jpn"}
+        },
+        {
+            "index": 2, "codec_name": "opus", "codec_type": "audio", "channels": 6,
+            "sample_rate": "48000", "duration": "59.5"
+        },
+    ],
+    "format": {"format_name": "matroska,webm", "duration": "60.000000"},
+}
+
+def test_probe_parses_stream_metadata():
+    """
+    ffprobeの出力が音声ストリームのメタデータに変換されることをテストします。
+    """
+    prober = FFprobeMediaProber()
+    with patch.object(prober, "_FFprobeMediaProber__run_ffprobe", AsyncMock(return_value=FFPROBE_OUTPUT)):
+        media_info = asyncio.run(prober.probe("input.mkv"))
+
+    assert media_info.format_name == "matroska,webm"
+    assert media_info.duration == 60.0
+    first, second = media_info.audio_streams
+    assert (first.codec_name, first.channels, first.sample_rate, first.bit_rate) == ("aac", 2, 48000, 192000)
+    assert first.language == "jpn"
+    assert first.duration == 60.0
+    assert (second.codec_name, second.duration, second.language, second.bit_rate) == ("opus", 59.5, None, None)
+
+def test_probe_results_are_cached_by_content_hash():
+    """
+    同じハッシュ値のファイルに対してffprobeが再実行されないことをテストします。
+    """
+    prober = FFprobeMediaProber(cache_size=1)
+    run_ffprobe = AsyncMock(return_value=FFPROBE_OUTPUT)
+    with patch.object(prober, "_FFprobeMediaProber__run_ffprobe", run_ffprobe):
+        first = asyncio.run(prober.probe("a.mkv", "hash-a"))
+        second = asyncio.run(prober.probe("copy-of-a.mkv", "hash-a"))
+        asyncio.run(prober.probe("b.mkv", "hash-b"))
+        asyncio.run(prober.probe("a.mkv", "hash-a"))
+
+    assert first is second
+    # cache_size=1のため、hash-bの解析でhash-aは追い出される
+    assert run_ffprobe.await_count == 3
+
+def test_cancellation_kills_running_ffprobe():
+    """
+    解析中にキャンセルされた場合に、ffprobeが強制終了されて回収され、キャンセルが呼び出し側へ伝播することをテストします。
+    """
+    started = asyncio.Event()
+
+    async def hang():
+        started.set()
+        await asyncio.Event().wait()
+
+    process = Mock(returncode=None)
+    process.communicate = hang
+    process.wait = AsyncMock(return_value=-9)
+
+    async def cancel_while_probing():
+        task = asyncio.ensure_future(FFprobeMediaProber().probe("input.mkv"))
+        await started.wait()
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+
+    with patch("asyncio.create_subprocess_exec", AsyncMock(return_value=process)):
+        asyncio.run(cancel_while_probing())
+
+    process.kill.assert_called_once_with()
+    process.wait.assert_awaited_once()
@@ -0,0 +1,95 @@
+"""
+このモジュールは、LocalScratchSpaceのテストケースを含んでいます。
+"""
+
+import os
+import subprocess
+import sys
+
+import pytest
+
+from domain.interfaces.scratch_space_interface import ScratchSpaceExhaustedException
+from infrastructure.local_scratch_space import LocalScratchSpace
+
+def test_charges_and_releases_quota(tmp_path):
+    """
+    作業ディレクトリへの書き込みが容量上限を超える場合に拒否され、作業ディレクトリの削除で使用量が解放されることをテストします。
+    """
+    scratch = LocalScratchSpace(tmp_path, max_bytes=100, retry_after=7)
+    workspace = scratch.create_workspace()
+    scratch.charge(workspace / "source.mp4", 60)
+
+    with pytest.raises(ScratchSpaceExhaustedException) as exc_info:
+        scratch.charge(workspace, 41)
+    assert exc_info.value.retry_after == 7
+    scratch.charge(workspace, 40)
+    with pytest.raises(ScratchSpaceExhaustedException):
+        scratch.check_capacity()
+    assert (scratch.stats().workspaces, scratch.stats().used_bytes) == (1, 100)
+
+    scratch.discard(workspace / "source.mp4")
+    assert not workspace.exists()
+    assert (scratch.stats().workspaces, scratch.stats().used_bytes) == (0, 0)
+    scratch.check_capacity()
+
+def test_discard_outside_root_removes_only_the_file(tmp_path):
+    """
+    作業領域外のファイルが指定された場合に、そのファイルのみが削除されることをテストします。
+    """
+    scratch = LocalScratchSpace(tmp_path / "scratch")
+    outside = tmp_path / "upload.mp4"
+    outside.write_bytes(b"video")
+
+    scratch.discard(outside)
+    assert not outside.exists()
+    assert (tmp_path / "scratch").exists()
+
+def test_purges_orphaned_workspaces(tmp_path):
+    """
+    終了したプロセスや自プロセスが削除せずに残した作業ディレクトリが削除され、
+    使用中の作業ディレクトリと実行中の他のプロセスの作業ディレクトリは残ることをテストします。
+    """
+    scratch = LocalScratchSpace(tmp_path)
+    in_use = scratch.create_workspace()
+    leaked = tmp_path / f"{os.getpid()}-leaked"
+    leaked.mkdir()
+    finished = subprocess.run([sys.executable, "-c", "import os; print(os.getpid())"], capture_output=True, text=True)
+    crashed = tmp_path / f"{finished.stdout.strip()}-crashed"
+    (crashed / "audio").mkdir(parents=True)
+    other_worker = tmp_path / f"{os.getppid()}-running"
+    other_worker.mkdir()
+    unrelated = tmp_path / "unrelated"
+    unrelated.mkdir()
+
+    assert scratch.purge_orphans() == 2
+    assert in_use.exists() and other_worker.exists() and unrelated.exists()
+    assert not leaked.exists() and not crashed.exists()
+
+    os.utime(other_worker, (0, 0))
+    assert scratch.purge_orphans() == 1
+    assert not other_worker.exists()
+
+def test_adopts_workspace_of_previous_process(tmp_path):
+    """
+    前回のプロセスの作業ディレクトリが名前を変えて引き継がれ、既存のファイルが使用量に計上されること、
+    削除したファイルの分を使用量から差し引けること、および削除済みの作業ディレクトリは引き継げないことをテストします。
+    """
+    previous = LocalScratchSpace(tmp_path)
+    workspace = previous.create_workspace()
+    (workspace / "source.mp4").write_bytes(b"0" * 60)
+
+    scratch = LocalScratchSpace(tmp_path, max_bytes=50)
+    adopted = scratch.adopt(workspace / "source.mp4")
+    assert adopted.name == "source.mp4" and adopted.read_bytes() == b"0" * 60
+    assert adopted.parent != workspace and not workspace.exists()
+    assert (scratch.stats().workspaces, scratch.stats().used_bytes) == (1, 60)
+    assert scratch.adopt(adopted) == adopted
+    assert scratch.purge_orphans() == 0
+
+    scratch.release(adopted, 20)
+    assert scratch.stats().used_bytes == 40
+    scratch.check_capacity()
+
+    with pytest.raises(FileNotFoundError):
+        scratch.adopt(workspace / "source.mp4")
+    assert scratch.stats().workspaces == 1
@@ -3,15 +3,71 @@
 FastAPIのTestClientを使用してリクエストをシミュレートし、レスポンスを検証します。
 """
 
+import asyncio
+import hashlib
+import io
+import json
+import zipfile
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
 from fastapi.testclient import TestClient
-from unittest.mock import AsyncMock, Mock
+from starlette.requests import ClientDisconnect
+from unittest.mock import AsyncMock, Mock, patch
 from main import app
-from infrastructure.framework.di import get_audio_extractor, get_archiver
+from api.v1.endpoints.attachment import AttachmentResponse
+from domain.interfaces.audio_extractor_interface import ExtractorBusyException
+from domain.interfaces.media_prober_interface import MediaProbeFailedException
+from domain.models.extraction_deadline import ExtractionDeadline
+from domain.models.media_info import AudioStreamInfo, MediaInfo
+from domain.models.track_analysis import analysis_path_for
+from infrastructure.allow_list_source_resolver import AllowListSourceResolver
+from infrastructure.disk_result_cache import DiskResultCache
+from infrastructure.ffmpeg_audio_extractor import FFmpegAudioExtractor
+from infrastructure.local_scratch_space import LocalScratchSpace
+from infrastructure.framework import settings
+from infrastructure.framework.di import (
+    get_audio_extractor, get_archiver, get_extraction_deadline, get_extraction_job_service, get_max_upload_size,
+    get_media_prober, get_result_cache, get_scratch_space, get_source_resolver, get_upload_session_service,
+    get_upload_sniff_size
+)
+from infrastructure.sqlite_job_store import SqliteJobStore
+from infrastructure.sqlite_upload_session_store import SqliteUploadSessionStore
+from service.audio_extractor_service import ClosingStream
+from service.extraction_job_service import ExtractionJobService
+from service.upload_session_service import UploadSessionService
+from tests.helpers import async_iter
 
 client = TestClient(app)
 
+@pytest.fixture(autouse=True)
+def disable_upload_sniffing():
+    """
+    モックの解析結果を返すテストのデータが拒否されないよう、既定ではアップロードの先頭部分の判定を無効にします。
+    """
+    app.dependency_overrides[get_upload_sniff_size] = lambda: 0
+
+@pytest.fixture
+def mocks():
+    """
+    音声抽出器、アーカイバ、メディア解析器をモックに差し替えます。
+
+    メディア解析器は既定でMP4の解析結果を返し、アーカイバは既定の形式のアーカイバの処理をそのまま呼び出します。
+    テストごとに必要な戻り値や振る舞いを設定するか、モックを置き換えてください。
+    """
+    mocks = SimpleNamespace(
+        extractor=Mock(),
+        archiver=Mock(wraps=get_archiver(), file_extension=".zip"),
+        prober=AsyncMock(),
+    )
+    mocks.prober.probe.return_value = MediaInfo(format_name="mov,mp4,m4a,3gp,3g2,mj2")
+    app.dependency_overrides[get_audio_extractor] = lambda: mocks.extractor
+    app.dependency_overrides[get_archiver] = lambda: mocks.archiver
+    app.dependency_overrides[get_media_prober] = lambda: mocks.prober
+    return mocks
 
-def test_extract_audio_valid_file():
+def test_extract_audio_valid_file(mocks):
     """
     有効な動画ファイルを使用してextract_audioエンドポイントをテストします。
 
@@ -21,29 +77,18 @@ def test_extract_audio_valid_file():
     また、依存関係であるAudioExtractorとArchiverをモック化して、
     テストが外部依存に影響されないようにしています。
     """
-    # 依存関係をモック化
-    mock_extractor = AsyncMock()
-    mock_extractor.extract_all_audio.return_value = ["audio1.mp3", "audio2.mp3"]
+    mocks.extractor.iter_extract_audio = Mock(return_value=async_iter(["audio1.mp3", "audio2.mp3"]))
+    mocks.archiver.stream_archive = Mock(return_value=async_iter([b"dummy ", b"zip content"]))
 
-    mock_archiver = Mock()
-    mock_archiver.create_archive.return_value = b"dummy zip content"
-
-    # 依存関係をオーバーライド
-    app.dependency_overrides[get_audio_extractor] = lambda: mock_extractor
-    app.dependency_overrides[get_archiver] = lambda: mock_archiver
-
-    try:
-        response = client.post(
-            "/api/v1/extract_audio",
-            files={"file": ("valid_video.mp4", b"dummy video content", "video/mp4")}
-        )
+    response = client.post(
+        "/api/v1/extract_audio",
+        files={"file": ("valid_video.mp4", b"dummy video content", "video/mp4")}
+    )
 
-        assert response.status_code == 200
-        assert response.headers["Content-Disposition"].startswith("attachment; filename=")
-        assert response.headers["Content-Type"] == "application/zip"
-    finally:
-        # テスト後にオーバーライドをリセット
-        app.dependency_overrides.clear()
+    assert response.status_code == 200
+    assert response.headers["Content-Disposition"].startswith("attachment; filename=")
+    assert response.headers["Content-Type"] == "application/zip"
+    assert response.content == b"dummy zip content"
 
 def test_root_endpoint():
     """
@@ -68,17 +113,659 @@ def test_extract_audio_invalid_file_type():
     assert response.status_code == 400
     assert response.json()["message"] == "Invalid file type: the uploaded file must be a video."
 
-def test_extract_audio_empty_file():
+def test_extract_audio_empty_file(mocks):
     """
     空のファイルでextract_audioエンドポイントをテスト。
 
     このテストは、空の動画ファイルを/api/v1/extract_audioエンドポイントにアップロードした際に、
-    500ステータスコードと適切なエラーメッセージが返されることを検証します。
+    ffmpegを実行せずに400ステータスコードと適切なエラーメッセージが返されることを検証します。
     """
+    mocks.extractor = Mock(wraps=FFmpegAudioExtractor())
+    app.dependency_overrides[get_upload_sniff_size] = lambda: 1024 ** 2
+
     response = client.post(
         "/api/v1/extract_audio",
         files={"file": ("empty.mp4", b"", "video/mp4")}
     )
 
-    assert response.status_code == 500
-    assert response.json()["message"] == "Audio extraction failed"
+    assert response.status_code == 400
+    assert response.json()["message"] == "The uploaded file is not in a supported video container format."
+    mocks.extractor.iter_extract_audio.assert_not_called()
+
+def test_extract_audio_rejects_file_without_audio_from_head(tmp_path, mocks):
+    """
+    先頭部分の解析で音声トラックがないと分かったファイルをアップロードした場合のextract_audioエンドポイントをテスト。
+
+    このテストでは、ファイル全体を受信・解析せずに400ステータスコードと適切なエラーメッセージが返され、
+    解析に使用した先頭部分も削除されることを検証します。
+    """
+    probed = []
+
+    async def probe(video_path, content_hash=None):
+        probed.append((video_path, Path(video_path).read_bytes()))
+        return MediaInfo(format_name="mov,mp4,m4a,3gp,3g2,mj2")
+
+    mocks.extractor = Mock(wraps=FFmpegAudioExtractor())
+    mocks.prober.probe = probe
+    app.dependency_overrides[get_scratch_space] = lambda: LocalScratchSpace(tmp_path)
+    app.dependency_overrides[get_upload_sniff_size] = lambda: 1024 ** 2
+
+    head = bytes([0, 0, 0, 16]) + b"ftypisom" + bytes(4)
+    response = client.post(
+        "/api/v1/extract_audio",
+        files={"file": ("silent.mp4", head, "video/mp4")}
+    )
+
+    assert response.status_code == 400
+    assert response.json()["message"] == "The uploaded file does not contain any audio tracks."
+    assert len(probed) == 1
+    assert probed[0][0].endswith("head.mp4")
+    assert probed[0][1] == head
+    mocks.extractor.iter_extract_audio.assert_not_called()
+    assert list(tmp_path.iterdir()) == []
+
+def test_extract_audio_file_too_large(mocks):
+    """
+    最大サイズを超えるファイルでextract_audioエンドポイントをテスト。
+
+    このテストは、許可された最大サイズを超える動画ファイルをアップロードした際に、
+    音声抽出を行わずに413ステータスコードと適切なエラーメッセージが返されることを検証します。
+    """
+    app.dependency_overrides[get_max_upload_size] = lambda: 1024
+
+    response = client.post(
+        "/api/v1/extract_audio",
+        files={"file": ("large.mp4", b"0" * 2048, "video/mp4")}
+    )
+
+    assert response.status_code == 413
+    assert response.json()["message"] == "The uploaded file exceeds the maximum allowed size."
+    mocks.extractor.iter_extract_audio.assert_not_called()
+
+def test_extract_audio_missing_file():
+    """
+    fileフィールドを含まないリクエストでextract_audioエンドポイントをテスト。
+
+    このテストは、ファイルが添付されていない場合に422ステータスコードが返されることを検証します。
+    """
+    response = client.post("/api/v1/extract_audio", data={"other": "value"})
+    assert response.status_code == 422
+
+def test_extract_audio_invalid_output_format():
+    """
+    未対応の出力形式を指定してextract_audioエンドポイントをテスト。
+
+    このテストは、未対応の出力形式がクエリパラメータで指定された場合に422ステータスコードが返されることを検証します。
+    """
+    response = client.post(
+        "/api/v1/extract_audio?output_format=wma",
+        files={"file": ("valid_video.mp4", b"dummy video content", "video/mp4")}
+    )
+    assert response.status_code == 422
+
+def test_extract_audio_track_and_range_options(mocks):
+    """
+    抽出する音声トラックと範囲のクエリパラメータをテスト。
+
+    このテストは、指定された値が音声抽出のオプションとして音声抽出器に渡されること、
+    および終了位置が開始位置以前の場合に422ステータスコードが返されることを検証します。
+    """
+    mocks.extractor.iter_extract_audio = Mock(return_value=async_iter([]))
+
+    response = client.post(
+        "/api/v1/extract_audio?track=1&track=3&language=jpn&start=10&end=40",
+        files={"file": ("valid_video.mp4", b"dummy video content", "video/mp4")}
+    )
+    assert response.status_code == 200
+    options = mocks.extractor.iter_extract_audio.call_args.args[2]
+    assert (options.tracks, options.languages, options.start, options.end) == ((1, 3), ("jpn",), 10.0, 40.0)
+
+    response = client.post(
+        "/api/v1/extract_audio?start=40&end=10",
+        files={"file": ("valid_video.mp4", b"dummy video content", "video/mp4")}
+    )
+    assert response.status_code == 422
+
+def test_extract_audio_rejects_selection_without_matching_tracks(tmp_path, mocks):
+    """
+    指定したトラック番号と言語に一致する音声トラックがない場合のextract_audioエンドポイントをテスト。
+
+    このテストは、空のアーカイブを返さずに400ステータスコードと適切なエラーメッセージが返され、
+    ffmpegを実行せずに一時ファイルが削除されることを検証します。
+    """
+    mocks.prober.probe.return_value = MediaInfo(
+        format_name="mov,mp4,m4a,3gp,3g2,mj2",
+        audio_streams=[AudioStreamInfo(index=1, codec_name="aac", language="jpn")]
+    )
+    app.dependency_overrides[get_audio_extractor] = lambda: FFmpegAudioExtractor()
+    app.dependency_overrides[get_scratch_space] = lambda: LocalScratchSpace(tmp_path)
+
+    with patch("ffmpeg.nodes.OutputStream.run_async") as run_async:
+        response = client.post(
+            "/api/v1/extract_audio?track=2&language=eng",
+            files={"file": ("valid_video.mp4", b"dummy video content", "video/mp4")}
+        )
+
+    assert response.status_code == 400
+    assert response.json()["message"] == "No audio track matches the specified track numbers or languages."
+    run_async.assert_not_called()
+    assert list(tmp_path.iterdir()) == []
+
+def test_extract_audio_auto_format_returns_single_track_as_is(tmp_path, mocks):
+    """
+    アーカイブ形式にautoを指定し、音声トラックが1つだけの場合に音声ファイルがそのまま返されることをテストします。
+
+    このテストでは、アーカイバが呼び出されず、レスポンスのファイル名とContent-Typeが音声ファイルのものになることを検証します。
+    """
+    audio_file = tmp_path / "audio_track_0.m4a"
+    audio_file.write_bytes(b"raw audio")
+    mocks.extractor.iter_extract_audio = Mock(return_value=async_iter([audio_file]))
+    mocks.prober.probe.return_value = MediaInfo(
+        format_name="mov,mp4,m4a,3gp,3g2,mj2",
+        audio_streams=[AudioStreamInfo(index=1, codec_name="aac")]
+    )
+
+    response = client.post(
+        "/api/v1/extract_audio?archive_format=auto",
+        files={"file": ("valid_video.mp4", b"dummy video content", "video/mp4")}
+    )
+
+    assert response.status_code == 200
+    assert response.headers["Content-Disposition"].endswith("_audio_track_0.m4a")
+    assert response.headers["Content-Type"] == "audio/mp4"
+    assert response.content == b"raw audio"
+    mocks.archiver.stream_archive.assert_not_called()
+
+def test_extract_audio_with_analysis_adds_manifest(mocks):
+    """
+    波形とラウドネスの解析を指定した場合のextract_audioエンドポイントをテスト。
+
+    このテストでは、archive_formatがautoで音声トラックが1つだけでもアーカイブにまとめられ、
+    音声抽出器が書き出したトラックごとの解析結果がanalysis.jsonとして末尾に追加されることを検証します。
+    """
+    received_options = []
+
+    async def iter_extract_audio(video_path, output_dir, options, media_info):
+        received_options.append(options)
+        audio_file = output_dir / "audio_track_1.aac"
+        audio_file.write_bytes(b"audio")
+        analysis_path_for(audio_file).write_text(json.dumps({
+            "track_index": 1, "integrated_loudness": -23.0, "loudness_range": 5.0, "true_peak": -1.0,
+            "peaks_per_second": 10, "peaks": [0.1, 0.5],
+        }))
+        yield audio_file
+
+    mocks.extractor.iter_extract_audio = iter_extract_audio
+    mocks.prober.probe.return_value = MediaInfo(
+        format_name="mov,mp4,m4a,3gp,3g2,mj2", audio_streams=[AudioStreamInfo(index=1, codec_name="aac")]
+    )
+
+    response = client.post(
+        "/api/v1/extract_audio?archive_format=auto&analyze=true",
+        files={"file": ("valid_video.mp4", b"dummy video content", "video/mp4")}
+    )
+
+    assert response.status_code == 200
+    assert response.headers["Content-Type"] == "application/zip"
+    assert received_options[0].analyze
+    with zipfile.ZipFile(io.BytesIO(response.content)) as zipf:
+        assert zipf.namelist() == ["audio_track_1.aac", "analysis.json"]
+        manifest = json.loads(zipf.read("analysis.json"))
+    assert manifest["tracks"][0]["file"] == "audio_track_1.aac"
+    assert manifest["tracks"][0]["integrated_loudness"] == -23.0
+    assert manifest["tracks"][0]["peaks"] == [0.1, 0.5]
+
+def test_extract_audio_batch_reports_errors_per_file(mocks):
+    """
+    一括抽出エンドポイントで、ファイルごとのディレクトリに分けたアーカイブと結果の一覧が返されることをテスト。
+
+    このテストでは、動画形式でないファイルや解析に失敗したファイルが含まれていても全体は成功し、
+    それらのファイルがmanifest.jsonに失敗として記録されることを検証します。
+    """
+    async def iter_extract_audio(video_path, output_dir, options, media_info):
+        audio_file = output_dir / "audio_track_1.aac"
+        audio_file.write_bytes(b"audio of " + Path(video_path).read_bytes())
+        yield audio_file
+
+    async def probe(video_path, content_hash=None):
+        if Path(video_path).read_bytes() == b"broken":
+            raise MediaProbeFailedException()
+        return MediaInfo(format_name="mov,mp4,m4a,3gp,3g2,mj2", audio_streams=[AudioStreamInfo(index=1, codec_name="aac")])
+
+    mocks.extractor.iter_extract_audio = iter_extract_audio
+    mocks.prober.probe = probe
+
+    response = client.post("/api/v1/extract_audio/batch", files=[
+        ("files", ("first.mp4", b"first", "video/mp4")),
+        ("files", ("notes.txt", b"text", "text/plain")),
+        ("files", ("broken.mp4", b"broken", "video/mp4")),
+        ("files", ("second.mkv", b"second", "video/x-matroska")),
+    ])
+
+    assert response.status_code == 200
+    assert response.headers["Content-Type"] == "application/zip"
+    with zipfile.ZipFile(io.BytesIO(response.content)) as zipf:
+        assert zipf.read("001_first/audio_track_1.aac") == b"audio of first"
+        assert zipf.read("004_second/audio_track_1.aac") == b"audio of second"
+        manifest = json.loads(zipf.read("manifest.json"))
+    assert [(item["directory"], item["status"]) for item in manifest["files"]] == [
+        ("001_first", "succeeded"), ("002_notes", "failed"), ("003_broken", "failed"), ("004_second", "succeeded")
+    ]
+    assert manifest["files"][1]["error"] == "InvalidFileTypeException"
+
+def test_extract_audio_batch_requires_files():
+    """
+    ファイルを1つも指定せずに一括抽出エンドポイントを呼び出した場合に422ステータスコードが返されることをテスト。
+    """
+    assert client.post("/api/v1/extract_audio/batch").status_code == 422
+
+def test_extract_audio_by_reference_reads_source_in_place(tmp_path, mocks):
+    """
+    許可されたマウント上のファイルを参照で指定した場合に、コピーせずにそのパスから抽出され、
+    参照先のファイルが削除されないことをテスト。
+
+    また、許可されていない場所の参照が403、参照による抽出が無効な場合も403となることを検証します。
+    """
+    video = tmp_path / "movie.mp4"
+    video.write_bytes(b"dummy video content")
+    mocks.extractor.iter_extract_audio = Mock(return_value=async_iter(["audio1.aac", "audio2.aac"]))
+    mocks.archiver.stream_archive = Mock(return_value=async_iter([b"reference ", b"zip content"]))
+    app.dependency_overrides[get_source_resolver] = lambda: AllowListSourceResolver([tmp_path], [])
+
+    response = client.post("/api/v1/extract_audio/reference", params={"source": str(video), "start": 5})
+    assert response.status_code == 200
+    assert response.content == b"reference zip content"
+    assert response.headers["Content-Disposition"] == (
+        "attachment; filename=\"movie.mp4_audio.zip\"; filename*=UTF-8''movie.mp4_audio.zip"
+    )
+    video_path, _, options, _ = mocks.extractor.iter_extract_audio.call_args.args
+    assert (video_path, options.start) == (str(video.resolve()), 5)
+    assert video.exists()
+
+    response = client.post("/api/v1/extract_audio/reference", params={"source": "/etc/hostname"})
+    assert response.status_code == 403
+    assert response.json()["message"] == "The specified source is not in an allowed location."
+
+    app.dependency_overrides[get_source_resolver] = lambda: None
+    response = client.post("/api/v1/extract_audio/reference", params={"source": str(video)})
+    assert response.status_code == 403
+
+def test_extract_audio_by_reference_encodes_source_name(tmp_path, mocks):
+    """
+    ASCII以外の文字や引用符、区切り文字を含むファイル名の参照から抽出した場合に、
+    ファイル名がエンコードされてContent-Dispositionに含まれることをテスト。
+    """
+    video = tmp_path / "動画; \"1\".mp4"
+    video.write_bytes(b"dummy video content")
+    mocks.extractor.iter_extract_audio = Mock(return_value=async_iter(["audio1.aac"]))
+    mocks.archiver.stream_archive = Mock(return_value=async_iter([b"zip content"]))
+    app.dependency_overrides[get_source_resolver] = lambda: AllowListSourceResolver([tmp_path], [])
+
+    response = client.post("/api/v1/extract_audio/reference", params={"source": str(video)})
+    assert response.status_code == 200
+    assert response.headers["Content-Disposition"] == (
+        "attachment; filename=\"___ _1_.mp4_audio.zip\"; "
+        "filename*=UTF-8''%E5%8B%95%E7%94%BB%3B%20%221%22.mp4_audio.zip"
+    )
+    assert response.content == b"zip content"
+
+def test_probe_valid_file(mocks):
+    """
+    有効な動画ファイルを使用してprobeエンドポイントをテストします。
+
+    このテストでは、メディア解析器をモック化し、音声トラックのメタデータがJSONとして返されること、
+    およびファイル内容のハッシュ値がキャッシュキーとして渡されることを検証します。
+    """
+    mocks.prober.probe.return_value = MediaInfo(
+        format_name="matroska,webm",
+        duration=120.5,
+        audio_streams=[AudioStreamInfo(
+            index=1, codec_name="aac", channels=2, sample_rate=48000,
+            duration=120.5, language="jpn", bit_rate=192000
+        )]
+    )
+
+    response = client.post(
+        "/api/v1/probe",
+        files={"file": ("valid_video.mkv", b"dummy video content", "video/x-matroska")}
+    )
+
+    assert response.status_code == 200
+    assert response.json()["audio_streams"] == [{
+        "index": 1, "codec_name": "aac", "channels": 2, "sample_rate": 48000,
+        "duration": 120.5, "language": "jpn", "bit_rate": 192000
+    }]
+    _, content_hash = mocks.prober.probe.call_args.args
+    assert content_hash == hashlib.sha256(b"dummy video content").hexdigest()
+
+def test_probe_unreadable_file(mocks):
+    """
+    メディアとして読み取れないファイルでprobeエンドポイントをテスト。
+
+    このテストは、解析に失敗した場合に400ステータスコードと適切なエラーメッセージが返されることを検証します。
+    """
+    mocks.prober.probe.side_effect = MediaProbeFailedException("Invalid data found when processing input")
+
+    response = client.post(
+        "/api/v1/probe",
+        files={"file": ("broken.mp4", b"not a video", "video/mp4")}
+    )
+
+    assert response.status_code == 400
+    assert response.json()["message"] == "The uploaded file could not be read as a media file."
+
+def test_extract_audio_server_busy(mocks):
+    """
+    変換処理の待ちが上限に達している状態でextract_audioエンドポイントをテスト。
+
+    このテストは、音声抽出器が受け付けを拒否した場合に、
+    503ステータスコードとRetry-Afterヘッダーが返されることを検証します。
+    """
+    async def busy_extractor(*args):
+        raise ExtractorBusyException(retry_after=10)
+        yield
+
+    mocks.extractor.iter_extract_audio = busy_extractor
+
+    response = client.post(
+        "/api/v1/extract_audio",
+        files={"file": ("valid_video.mp4", b"dummy video content", "video/mp4")}
+    )
+
+    assert response.status_code == 503
+    assert response.headers["Retry-After"] == "10"
+    assert response.json()["message"] == "The server is busy. Please try again later."
+
+def test_extract_audio_deadline_kills_extraction(tmp_path, mocks):
+    """
+    音声抽出が制限時間内に終わらない場合に抽出が取り消されて504ステータスコードが返され、
+    受信したファイルと作業ディレクトリが削除されることをテスト。
+    """
+    events = []
+
+    async def slow_extraction(*args):
+        try:
+            await asyncio.sleep(10)
+        except asyncio.CancelledError:
+            events.append("cancelled")
+            raise
+        yield "audio1.aac"
+
+    mocks.extractor.iter_extract_audio = Mock(side_effect=slow_extraction)
+    mocks.prober.probe.return_value = MediaInfo(format_name="mov,mp4,m4a,3gp,3g2,mj2", duration=60.0)
+    app.dependency_overrides[get_scratch_space] = lambda: LocalScratchSpace(tmp_path)
+    app.dependency_overrides[get_extraction_deadline] = lambda: ExtractionDeadline(base_seconds=0.05)
+
+    response = client.post(
+        "/api/v1/extract_audio",
+        files={"file": ("valid_video.mp4", b"dummy video content", "video/mp4")}
+    )
+
+    assert response.status_code == 504
+    assert response.json()["message"] == "Audio extraction did not finish within the time limit."
+    assert events == ["cancelled"]
+    assert list(tmp_path.iterdir()) == []
+
+def test_extract_audio_scratch_space_exhausted(tmp_path):
+    """
+    受信したファイルが一時作業領域の容量上限を超えた場合に507ステータスコードとRetry-Afterヘッダーが返され、
+    受信途中のファイルが削除されることをテスト。
+    """
+    scratch = LocalScratchSpace(tmp_path, max_bytes=8, retry_after=12)
+    app.dependency_overrides[get_scratch_space] = lambda: scratch
+
+    response = client.post(
+        "/api/v1/extract_audio",
+        files={"file": ("valid_video.mp4", b"dummy video content", "video/mp4")}
+    )
+
+    assert response.status_code == 507
+    assert response.headers["Retry-After"] == "12"
+    assert response.json()["message"] == "The server is out of working space. Please try again later."
+    assert list(tmp_path.iterdir()) == []
+    assert scratch.stats().used_bytes == 0
+
+def test_extract_audio_returns_cached_result(tmp_path, mocks):
+    """
+    同じファイルを同じオプションで再度アップロードした場合のextract_audioエンドポイントをテスト。
+
+    このテストでは、2回目のリクエストでは音声抽出もメディア解析も行われずに
+    1回目と同じアーカイブが同じファイル名で返されること、およびキャッシュの統計情報に反映されることを検証します。
+    """
+    mocks.extractor.iter_extract_audio = Mock(side_effect=lambda *args: async_iter(["audio1.aac"]))
+    mocks.archiver.stream_archive = Mock(side_effect=lambda files: async_iter([b"cached ", b"zip content"]))
+    result_cache = DiskResultCache(tmp_path, max_bytes=1024 * 1024)
+    app.dependency_overrides[get_result_cache] = lambda: result_cache
+
+    files = {"file": ("valid_video.mp4", b"same video content", "video/mp4")}
+    first = client.post("/api/v1/extract_audio", files=files)
+    second = client.post("/api/v1/extract_audio", files=files)
+    other_options = client.post("/api/v1/extract_audio?output_format=m4a", files=files)
+
+    assert first.status_code == second.status_code == other_options.status_code == 200
+    assert second.content == first.content == b"cached zip content"
+    assert first.headers["Content-Disposition"] == second.headers["Content-Disposition"] == (
+        "attachment; filename=\"valid_video.mp4_audio.zip\"; filename*=UTF-8''valid_video.mp4_audio.zip"
+    )
+    assert mocks.extractor.iter_extract_audio.call_count == 2
+    assert mocks.prober.probe.await_count == 2
+
+    stats = client.get("/api/v1/cache/stats").json()
+    assert (stats["hits"], stats["misses"], stats["entries"]) == (1, 2, 2)
+
+@pytest.mark.parametrize("file_name, expected", [
+    ("動画.mp4", "attachment; filename=\"__.mp4_audio.zip\"; filename*=UTF-8''%E5%8B%95%E7%94%BB.mp4_audio.zip"),
+    ("a; b.mp4", "attachment; filename=\"a_ b.mp4_audio.zip\"; filename*=UTF-8''a%3B%20b.mp4_audio.zip"),
+])
+def test_extract_audio_encodes_file_name_in_content_disposition(file_name, expected, mocks):
+    """
+    ASCII以外の文字や引用符、区切り文字を含むファイル名をアップロードした場合のextract_audioエンドポイントをテスト。
+
+    このテストでは、ファイル名がそのままヘッダーに含まれず、安全なASCII文字に置き換えたfilenameと
+    UTF-8でパーセントエンコードしたfilename*が返されることを検証します。
+    """
+    mocks.extractor.iter_extract_audio = Mock(return_value=async_iter(["audio1.aac"]))
+    mocks.archiver.stream_archive = Mock(return_value=async_iter([b"zip content"]))
+
+    response = client.post(
+        "/api/v1/extract_audio",
+        files={"file": (file_name, b"dummy video content", "video/mp4")}
+    )
+
+    assert response.status_code == 200
+    assert response.headers["Content-Disposition"] == expected
+    assert response.content == b"zip content"
+
+def test_attachment_response_closes_stream_when_not_sent():
+    """
+    レスポンスの送信が始まる前にクライアントが切断した場合も、ボディのストリームが閉じられることをテスト。
+
+    このテストでは、ボディを一度も読み出さずに送信が失敗した場合に、ストリームの後片付けが1回だけ実行されることを検証します。
+    """
+    closed = []
+
+    async def cleanup():
+        closed.append(True)
+
+    async def receive():
+        return {"type": "http.disconnect"}
+
+    async def send(message):
+        raise OSError("connection reset")
+
+    response = AttachmentResponse(ClosingStream(async_iter([b"zip content"]), cleanup), "video.mp4_audio.zip")
+    with pytest.raises(ClientDisconnect):
+        asyncio.run(response({"type": "http", "asgi": {"spec_version": "2.4"}}, receive, send))
+    assert closed == [True]
+
+def test_job_api_returns_result_after_completion(tmp_path, mocks):
+    """
+    ジョブAPIで音声抽出ジョブを投入し、状態の確認と結果の取得ができることをテスト。
+
+    このテストでは、投入時に202ステータスコードとジョブIDが返されること、
+    ジョブの完了後に状態がsucceededとなり、ASCII以外の文字を含むファイル名でも結果アーカイブを取得できることを検証します。
+    """
+    mocks.extractor.iter_extract_audio = Mock(return_value=async_iter(["audio1.aac"]))
+    mocks.archiver.stream_archive = Mock(return_value=async_iter([b"job ", b"zip content"]))
+    job_service = ExtractionJobService(
+        SqliteJobStore(tmp_path / "jobs.sqlite3", tmp_path / "results"), ttl_seconds=60, max_workers=1
+    )
+    app.dependency_overrides[get_extraction_job_service] = lambda: job_service
+
+    # バックグラウンドのジョブがリクエスト間で同じイベントループ上で実行されるよう、クライアントを開いたままにする
+    with TestClient(app) as job_client:
+        response = job_client.post(
+            "/api/v1/jobs",
+            files={"file": ("動画.mp4", b"dummy video content", "video/mp4")}
+        )
+        assert response.status_code == 202
+        job_id = response.json()["id"]
+
+        for _ in range(100):
+            status = job_client.get(f"/api/v1/jobs/{job_id}").json()["status"]
+            if status not in ("queued", "running"):
+                break
+            job_client.portal.call(asyncio.sleep, 0.01)
+        assert status == "succeeded"
+
+        result = job_client.get(f"/api/v1/jobs/{job_id}/result")
+        assert result.status_code == 200
+        assert result.headers["Content-Type"] == "application/zip"
+        assert result.headers["Content-Disposition"] == (
+            "attachment; filename=\"__.mp4_audio.zip\"; filename*=UTF-8''%E5%8B%95%E7%94%BB.mp4_audio.zip"
+        )
+        assert result.content == b"job zip content"
+
+        events = job_client.get(f"/api/v1/jobs/{job_id}/events")
+        assert events.headers["Content-Type"].startswith("text/event-stream")
+        assert events.text.startswith("event: status\ndata: ")
+        assert json.loads(events.text.split("data: ", 1)[1])["status"] == "succeeded"
+
+def test_job_api_unknown_job():
+    """
+    存在しないジョブIDを指定した場合のジョブAPIをテスト。
+    """
+    assert client.get("/api/v1/jobs/unknown").status_code == 404
+    assert client.get("/api/v1/jobs/unknown/result").status_code == 404
+    assert client.get("/api/v1/jobs/unknown/events").status_code == 404
+
+def test_resumable_upload_api_extracts_audio(tmp_path, mocks):
+    """
+    再開可能なアップロードAPIでファイルを分割して送信し、受信完了後に音声を抽出できることをテスト。
+
+    このテストでは、受信済みのバイト数と異なる位置からの送信が409で拒否されること、
+    セッションの状態から再開位置を取得できること、受信完了後の抽出でアーカイブが返されることを検証します。
+    """
+    content = b"dummy video content"
+    mocks.extractor.iter_extract_audio = Mock(return_value=async_iter(["audio1.aac"]))
+    mocks.archiver.stream_archive = Mock(return_value=async_iter([b"zip content"]))
+    scratch = LocalScratchSpace(tmp_path / "scratch")
+    upload_service = UploadSessionService(
+        SqliteUploadSessionStore(tmp_path / "uploads.sqlite3"), scratch, ttl_seconds=60, max_upload_size=1024
+    )
+    app.dependency_overrides[get_scratch_space] = lambda: scratch
+    app.dependency_overrides[get_upload_session_service] = lambda: upload_service
+
+    response = client.post(
+        "/api/v1/uploads",
+        params={"file_name": "動画.mp4", "content_type": "video/mp4"},
+        headers={"Upload-Length": str(len(content))}
+    )
+    assert response.status_code == 201
+    session_id = response.json()["id"]
+    assert response.headers["Location"] == f"/api/v1/uploads/{session_id}"
+
+    response = client.patch(f"/api/v1/uploads/{session_id}", content=content[:5], headers={"Upload-Offset": "0"})
+    assert response.status_code == 200
+    assert response.headers["Upload-Offset"] == "5"
+    assert client.post(f"/api/v1/uploads/{session_id}/extract").status_code == 409
+    assert client.patch(
+        f"/api/v1/uploads/{session_id}", content=content[5:], headers={"Upload-Offset": "0"}
+    ).status_code == 409
+
+    offset = client.get(f"/api/v1/uploads/{session_id}").json()["offset"]
+    client.patch(f"/api/v1/uploads/{session_id}", content=content[offset:], headers={"Upload-Offset": str(offset)})
+
+    response = client.post(f"/api/v1/uploads/{session_id}/extract")
+    assert response.status_code == 200
+    assert response.headers["Content-Type"] == "application/zip"
+    assert response.headers["Content-Disposition"] == (
+        "attachment; filename=\"__.mp4_audio.zip\"; filename*=UTF-8''%E5%8B%95%E7%94%BB.mp4_audio.zip"
+    )
+    assert response.content == b"zip content"
+    assert client.get(f"/api/v1/uploads/{session_id}").status_code == 404
+    assert list((tmp_path / "scratch").iterdir()) == []
+    assert scratch.stats().used_bytes == 0
+
+def test_resumable_upload_api_screens_first_chunk(mocks):
+    """
+    再開可能なアップロードで、ファイルの先頭を含むチャンクが/extract_audioと同様に判定されることをテスト。
+
+    このテストでは、対応しないコンテナ形式のチャンクと、先頭部分の解析で音声トラックがないと分かったチャンクが
+    400ステータスコードで拒否され、書き込まれずに受信済みのバイト数が0のままとなることを検証します。
+    """
+    mocks.extractor = Mock(wraps=FFmpegAudioExtractor())
+    app.dependency_overrides[get_upload_sniff_size] = lambda: 1024 ** 2
+    head = bytes([0, 0, 0, 16]) + b"ftypisom" + bytes(4)
+    session_id = client.post(
+        "/api/v1/uploads",
+        params={"file_name": "silent.mp4", "content_type": "video/mp4"},
+        headers={"Upload-Length": "1024"}
+    ).json()["id"]
+
+    response = client.patch(f"/api/v1/uploads/{session_id}", content=b"plain text", headers={"Upload-Offset": "0"})
+    assert response.status_code == 400
+    assert response.json()["message"] == "The uploaded file is not in a supported video container format."
+
+    response = client.patch(f"/api/v1/uploads/{session_id}", content=head, headers={"Upload-Offset": "0"})
+    assert response.status_code == 400
+    assert response.json()["message"] == "The uploaded file does not contain any audio tracks."
+    assert mocks.prober.probe.await_args.args[0].endswith("head.mp4")
+    assert client.get(f"/api/v1/uploads/{session_id}").json()["offset"] == 0
+
+def test_resumable_upload_api_rejects_oversized_file():
+    """
+    最大サイズを超えるファイルのアップロードのセッションが作成されないことをテスト。
+    """
+    app.dependency_overrides[get_upload_session_service] = lambda: UploadSessionService(
+        Mock(**{"list_all.return_value": [], "list_expired.return_value": []}), Mock(),
+        ttl_seconds=60, max_upload_size=10
+    )
+    response = client.post(
+        "/api/v1/uploads",
+        params={"file_name": "valid_video.mp4", "content_type": "video/mp4"},
+        headers={"Upload-Length": "11"}
+    )
+    assert response.status_code == 413
+
+def test_extract_audio_pipes_streamable_upload(monkeypatch, mocks):
+    """
+    pipeモードでストリーミング可能なファイルをアップロードした場合のextract_audioエンドポイントをテスト。
+
+    このテストでは、一時ファイルを介さずにアップロードされたデータがそのまま音声抽出器へ渡され、
+    トラック構成の解析には先頭部分のみが使用されることを検証します。
+    """
+    received = []
+
+    async def iter_extract_audio_from_stream(chunks, output_dir, options, media_info):
+        async for chunk in chunks:
+            received.append(chunk)
+        yield "audio1.aac"
+
+    mocks.extractor.is_streamable = Mock(return_value=True)
+    mocks.extractor.iter_extract_audio_from_stream = Mock(side_effect=iter_extract_audio_from_stream)
+    mocks.archiver.stream_archive = Mock(return_value=async_iter([b"piped zip content"]))
+    mocks.prober.probe.return_value = MediaInfo(format_name="mpegts")
+    monkeypatch.setattr(settings, "INGEST_MODE", "pipe")
+    monkeypatch.setattr(settings, "PIPE_HEAD_SIZE", 4)
+
+    response = client.post(
+        "/api/v1/extract_audio",
+        files={"file": ("stream.ts", b"dummy transport stream", "video/mp2t")}
+    )
+
+    assert response.status_code == 200
+    assert response.content == b"piped zip content"
+    assert b"".join(received) == b"dummy transport stream"
+    mocks.extractor.iter_extract_audio.assert_not_called()
+    assert mocks.prober.probe.await_args.args[0].endswith(".ts")
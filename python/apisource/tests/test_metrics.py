@@ -0,0 +1,52 @@
+"""
+このモジュールは、メトリクスの集計とPrometheus形式での出力のテストケースを含んでいます。
+"""
+
+from fastapi.testclient import TestClient
+
+from infrastructure.metrics import Counter, Histogram, MetricsRegistry
+from main import app
+
+def test_histogram_renders_cumulative_buckets():
+    """
+    ヒストグラムが累積バケット、合計、件数をPrometheusのテキスト形式で出力することをテストします。
+    """
+    registry = MetricsRegistry()
+    histogram = registry.register(Histogram("latency_seconds", "Latency.", (0.1, 1), ("endpoint",)))
+    histogram.observe(0.05, endpoint="/a")
+    histogram.observe(0.5, endpoint="/a")
+    histogram.observe(5, endpoint="/a")
+
+    lines = registry.render().splitlines()
+
+    assert lines[:2] == ["# HELP latency_seconds Latency.", "# TYPE latency_seconds histogram"]
+    assert 'latency_seconds_bucket{endpoint="/a",le="0.1"} 1' in lines
+    assert 'latency_seconds_bucket{endpoint="/a",le="1.0"} 2' in lines
+    assert 'latency_seconds_bucket{endpoint="/a",le="+Inf"} 3' in lines
+    assert 'latency_seconds_sum{endpoint="/a"} 5.55' in lines
+    assert 'latency_seconds_count{endpoint="/a"} 3' in lines
+
+def test_counter_escapes_label_values():
+    """
+    ラベルの値に含まれる二重引用符と改行がエスケープされることをテストします。
+    """
+    counter = Counter("events_total", "Events.", ("name",))
+    counter.inc(2, name='a"b\nc')
+
+    assert counter.samples() == ['events_total{name="a\\"b\\nc"} 2.0']
+
+def test_metrics_endpoint_reports_requests_and_ffmpeg_state():
+    """
+    /metricsエンドポイントが、処理済みのリクエストのレイテンシとffmpegの実行状況を返すことをテストします。
+    """
+    client = TestClient(app)
+    client.get("/api/v1/cache/stats")
+
+    response = client.get("/metrics")
+
+    assert response.status_code == 200
+    assert response.headers["Content-Type"].startswith("text/plain; version=0.0.4")
+    body = response.text
+    assert 'http_request_duration_seconds_count{method="GET",endpoint="/api/v1/cache/stats",status="200"}' in body
+    assert 'ffmpeg_processes{state="running"}' in body
+    assert 'scratch_disk_bytes{kind="free"}' in body
@@ -0,0 +1,133 @@
+"""
+このモジュールは、アクセスログの構造化出力と処理段階ごとの計測のテストケースを含んでいます。
+"""
+
+import asyncio
+import json
+import logging
+from unittest.mock import AsyncMock, Mock
+
+import pytest
+from fastapi import Request
+from fastapi.responses import StreamingResponse
+from fastapi.testclient import TestClient
+from starlette.requests import ClientDisconnect
+
+from domain.models.media_info import AudioStreamInfo, MediaInfo
+from infrastructure.framework.di import (
+    JsonLinesFormatter, get_access_logger, get_archiver, get_audio_extractor, get_media_prober, get_result_cache
+)
+from infrastructure.framework.middlewares import log_requests_middleware
+from main import app
+from tests.helpers import async_iter
+
+# ASGI 2.4以降ではStreamingResponseが切断を待ち受けないため、receiveを渡さずに送信できる
+SCOPE = {
+    "type": "http", "asgi": {"spec_version": "2.4"}, "method": "GET", "path": "/api/v1/health", "headers": [],
+    "query_string": b"",
+}
+
+class RecordCollector(logging.Handler):
+    """
+    出力されたログレコードを保持するハンドラー。
+    """
+    def __init__(self):
+        super().__init__()
+        self.records = []
+
+    def emit(self, record):
+        self.records.append(record)
+
+def test_json_lines_formatter_expands_fields():
+    """
+    JSON形式のフォーマッターが、extraで渡された項目をトップレベルに展開した1行のJSONを出力することをテストします。
+    """
+    record = logging.LogRecord("access", logging.INFO, __file__, 1, "GET / - 200", None, None)
+    record.fields = {"status": 200, "stages": {"upload": 0.5}}
+
+    line = JsonLinesFormatter().format(record)
+
+    assert "\n" not in line
+    entry = json.loads(line)
+    assert entry["message"] == "GET / - 200"
+    assert entry["status"] == 200
+    assert entry["stages"] == {"upload": 0.5}
+
+def test_access_log_records_stage_breakdown():
+    """
+    アクセスログに、処理段階ごとの所要時間、入力サイズ、トラック数、レスポンスのバイト数が記録されることをテストします。
+    """
+    mock_extractor = Mock()
+    mock_extractor.iter_extract_audio = Mock(return_value=async_iter(["audio1.aac"]))
+    mock_archiver = Mock()
+    mock_archiver.stream_archive = Mock(return_value=async_iter([b"dummy ", b"zip content"]))
+    mock_prober = AsyncMock()
+    mock_prober.probe.return_value = MediaInfo(format_name="matroska,webm", audio_streams=[
+        AudioStreamInfo(index=1, codec_name="aac"), AudioStreamInfo(index=2, codec_name="aac")
+    ])
+    app.dependency_overrides[get_audio_extractor] = lambda: mock_extractor
+    app.dependency_overrides[get_archiver] = lambda: mock_archiver
+    app.dependency_overrides[get_media_prober] = lambda: mock_prober
+    app.dependency_overrides[get_result_cache] = lambda: None
+    collector = RecordCollector()
+    get_access_logger().addHandler(collector)
+
+    try:
+        response = TestClient(app).post(
+            "/api/v1/extract_audio",
+            files={"file": ("valid_video.mkv", b"dummy video content", "video/x-matroska")}
+        )
+    finally:
+        get_access_logger().removeHandler(collector)
+        app.dependency_overrides.clear()
+
+    assert response.status_code == 200
+    fields = collector.records[-1].fields
+    assert fields["path"] == "/api/v1/extract_audio"
+    assert fields["input_bytes"] == len(b"dummy video content")
+    assert fields["track_count"] == 2
+    assert {"upload", "probe"} <= fields["stages"].keys()
+    assert fields["response_bytes"] == len(b"dummy zip content")
+
+def test_access_log_is_written_once_when_body_is_never_sent():
+    """
+    レスポンスボディの送信が始まる前に送信に失敗した場合も、アクセスログが一度だけ出力されることをテストします。
+    """
+    async def call_next(request):
+        return StreamingResponse(async_iter([b"never sent"]))
+
+    async def send(message):
+        raise OSError("connection reset")
+
+    async def run():
+        response = await log_requests_middleware(Request(SCOPE), call_next)
+        with pytest.raises(ClientDisconnect):
+            await response(SCOPE, None, send)
+
+    collector = RecordCollector()
+    get_access_logger().addHandler(collector)
+    try:
+        asyncio.run(run())
+    finally:
+        get_access_logger().removeHandler(collector)
+
+    assert len(collector.records) == 1
+    assert collector.records[0].fields["status"] == 200
+    assert collector.records[0].fields["response_bytes"] == 0
+
+def test_access_log_is_written_when_endpoint_raises():
+    """
+    レスポンスを返す前に例外が発生した場合も、サーバーエラーとしてアクセスログが出力されることをテストします。
+    """
+    async def call_next(request):
+        raise RuntimeError("unhandled")
+
+    collector = RecordCollector()
+    get_access_logger().addHandler(collector)
+    try:
+        with pytest.raises(RuntimeError):
+            asyncio.run(log_requests_middleware(Request(SCOPE), call_next))
+    finally:
+        get_access_logger().removeHandler(collector)
+
+    assert [record.fields["status"] for record in collector.records] == [500]
@@ -0,0 +1,37 @@
+"""
+このモジュールは、TarArchiverのテストケースを含んでいます。
+"""
+
+import asyncio
+import io
+import tarfile
+
+from infrastructure.tar_archiver import TarArchiver
+from tests.helpers import async_iter
+
+async def collect(stream):
+    """
+    非同期イテレータが返すチャンクをすべて連結します。
+    """
+    return b"".join([chunk async for chunk in stream])
+
+def test_stream_archive_creates_valid_tar(tmp_path):
+    """
+    stream_archiveが生成するストリームが有効なtarアーカイブであることをテストします。
+
+    このテストでは、ブロック境界に揃わないサイズを含む複数のファイルをストリーミングでアーカイブし、
+    連結したデータをtarとして展開した際に元の内容と一致することを検証します。
+    """
+    files = []
+    for index, content in enumerate([b"first track" * 1000, b"x" * tarfile.BLOCKSIZE]):
+        path = tmp_path / f"audio_track_{index}.aac"
+        path.write_bytes(content)
+        files.append(path)
+
+    data = asyncio.run(collect(TarArchiver().stream_archive(async_iter(files))))
+
+    assert len(data) % tarfile.BLOCKSIZE == 0
+    with tarfile.open(fileobj=io.BytesIO(data)) as tar:
+        assert tar.getnames() == ["audio_track_0.aac", "audio_track_1.aac"]
+        assert tar.extractfile("audio_track_0.aac").read() == files[0].read_bytes()
+        assert tar.extractfile("audio_track_1.aac").read() == files[1].read_bytes()
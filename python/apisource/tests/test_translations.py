@@ -0,0 +1,36 @@
+"""
+このモジュールは、翻訳カタログの読み込みとAccept-Languageヘッダーによる言語の決定のテストケースを含んでいます。
+"""
+
+from infrastructure.framework.middlewares import LOCALE_DIR
+from infrastructure.framework.translations import TranslationRegistry, parse_accept_language
+
+def test_parse_accept_language_orders_by_quality():
+    """
+    言語タグがq値の高い順に並べられ、q値が0の言語タグが除外されることをテストします。
+    """
+    assert parse_accept_language("en-US;q=0.8, ja, fr;q=0, de;q=0.8") == ["ja", "en-US", "de"]
+    assert parse_accept_language("") == []
+
+def test_resolve_negotiates_language():
+    """
+    Accept-Languageヘッダーから、読み込まれたカタログのうち最も優先度の高い言語が選ばれることをテストします。
+    """
+    registry = TranslationRegistry(LOCALE_DIR, "en")
+
+    assert registry.resolve("ja,en-US;q=0.9") == "ja"
+    assert registry.resolve("fr-FR, ja-JP;q=0.5") == "ja"
+    assert registry.resolve("en-US,ja;q=0.9") == "en"
+    assert registry.resolve("fr, de") == "en"
+
+def test_lazy_translations_resolve_on_first_use():
+    """
+    言語の解決が翻訳の初回呼び出しまで遅延され、同じヘッダー値では再利用されることをテストします。
+    """
+    registry = TranslationRegistry(LOCALE_DIR, "en")
+    translations = registry.for_header("ja,en;q=0.5")
+    assert registry.resolve.cache_info().currsize == 0
+
+    assert translations.gettext("error.file_too_large") == registry.get("ja").gettext("error.file_too_large")
+    registry.for_header("ja,en;q=0.5").gettext("error.file_too_large")
+    assert registry.resolve.cache_info().hits == 1
@@ -0,0 +1,158 @@
+"""
+このモジュールは、UploadSessionServiceとSqliteUploadSessionStoreのテストケースを含んでいます。
+"""
+
+import asyncio
+import base64
+import hashlib
+from pathlib import Path
+
+import pytest
+
+from domain.interfaces.scratch_space_interface import ScratchSpaceExhaustedException
+from domain.interfaces.upload_session_store_interface import (
+    UploadChecksumMismatchException, UploadIncompleteException, UploadOffsetMismatchException,
+    UploadSessionNotFoundException
+)
+from infrastructure.local_scratch_space import LocalScratchSpace
+from infrastructure.sqlite_upload_session_store import SqliteUploadSessionStore
+from service.upload_session_service import UploadSessionService
+from tests.helpers import async_iter
+
+CONTENT = b"0123456789" * 100
+
+async def interrupted(items):
+    """
+    リストの要素を返した後、通信の切断を模して例外を発生させる非同期イテレータを生成します。
+    """
+    for item in items:
+        yield item
+    raise ConnectionResetError()
+
+def create_service(tmp_path, ttl_seconds=60, max_upload_size=10 * 1024, max_bytes=0):
+    """
+    一時ディレクトリにセッションと受信したファイルデータを保存するUploadSessionServiceを生成します。
+
+    プロセスの再起動を模せるよう、呼び出すたびに一時作業領域のインスタンスも新たに生成します。
+    """
+    store = SqliteUploadSessionStore(tmp_path / "uploads.sqlite3")
+    scratch = LocalScratchSpace(tmp_path / "scratch", max_bytes=max_bytes, retry_after=3)
+    return UploadSessionService(store, scratch, ttl_seconds=ttl_seconds, max_upload_size=max_upload_size)
+
+def sha256_header(data: bytes) -> str:
+    """
+    Upload-Checksumヘッダー形式のハッシュ値を生成します。
+    """
+    return "sha256 " + base64.b64encode(hashlib.sha256(data).digest()).decode()
+
+def test_resumes_after_interrupted_chunk(tmp_path):
+    """
+    チャンクの送信が途中で途切れた場合に受信できた分が保持され、その位置から再開して完了できることをテストします。
+    """
+    service = create_service(tmp_path)
+    session = service.create("video.mp4", "video/mp4", len(CONTENT))
+
+    with pytest.raises(ConnectionResetError):
+        asyncio.run(service.append(session.id, 0, interrupted([CONTENT[:300]])))
+    assert service.get(session.id).offset == 300
+
+    session = asyncio.run(service.append(session.id, 300, async_iter([CONTENT[300:]])))
+    assert session.offset == len(CONTENT)
+
+    video_path, content_hash = asyncio.run(service.complete(session.id))
+    with open(video_path, 'rb') as f:
+        assert f.read() == CONTENT
+    assert video_path.endswith(".mp4")
+    assert content_hash == hashlib.sha256(CONTENT).hexdigest()
+    with pytest.raises(UploadSessionNotFoundException):
+        service.get(session.id)
+    # 受信したファイルは一時作業領域の作業ディレクトリごと引き渡される
+    assert service.scratch_space.stats().used_bytes == len(CONTENT)
+    service.scratch_space.discard(Path(video_path))
+    assert list((tmp_path / "scratch").iterdir()) == []
+
+def test_discards_chunk_with_mismatched_checksum(tmp_path):
+    """
+    ハッシュ値が一致しないチャンクが破棄され、受信済みのバイト数が変わらないことをテストします。
+    """
+    service = create_service(tmp_path)
+    session = service.create("video.mp4", "video/mp4", len(CONTENT))
+    asyncio.run(service.append(session.id, 0, async_iter([CONTENT[:500]]), sha256_header(CONTENT[:500])))
+
+    with pytest.raises(UploadChecksumMismatchException):
+        asyncio.run(service.append(session.id, 500, async_iter([b"x" * 500]), sha256_header(CONTENT[500:])))
+    assert service.get(session.id).offset == 500
+    assert service.scratch_space.stats().used_bytes == 500
+
+    asyncio.run(service.append(session.id, 500, async_iter([CONTENT[500:]]), sha256_header(CONTENT[500:])))
+    _, content_hash = asyncio.run(service.complete(session.id))
+    assert content_hash == hashlib.sha256(CONTENT).hexdigest()
+
+def test_rejects_mismatched_offset_and_incomplete_upload(tmp_path):
+    """
+    受信済みのバイト数と異なる位置からの送信と、受信が完了していないセッションの引き渡しが拒否されることをテストします。
+    """
+    service = create_service(tmp_path)
+    session = service.create("video.mp4", "video/mp4", len(CONTENT))
+    asyncio.run(service.append(session.id, 0, async_iter([CONTENT[:100]])))
+
+    with pytest.raises(UploadOffsetMismatchException):
+        asyncio.run(service.append(session.id, 0, async_iter([CONTENT[:100]])))
+    with pytest.raises(UploadIncompleteException):
+        asyncio.run(service.complete(session.id))
+
+def test_verifies_whole_file_checksum_after_restart(tmp_path):
+    """
+    プロセスの再起動でハッシュ計算の途中状態が失われても、受信完了時にファイル全体のハッシュ値を照合できることをテストします。
+    """
+    service = create_service(tmp_path)
+    session = service.create("video.mp4", "video/mp4", len(CONTENT), hashlib.sha256(CONTENT).hexdigest())
+    asyncio.run(service.append(session.id, 0, async_iter([CONTENT[:400]])))
+
+    # 前回のプロセスの作業ディレクトリは引き継がれ、受信済みのデータが使用量に計上される
+    restarted = create_service(tmp_path)
+    assert restarted.scratch_space.stats().used_bytes == 400
+    assert restarted.scratch_space.purge_orphans() == 0
+    asyncio.run(restarted.append(session.id, 400, async_iter([CONTENT[400:]])))
+    video_path, content_hash = asyncio.run(restarted.complete(session.id))
+    assert content_hash == hashlib.sha256(CONTENT).hexdigest()
+    restarted.scratch_space.discard(Path(video_path))
+
+    session = restarted.create("video.mp4", "video/mp4", len(CONTENT), hashlib.sha256(b"other").hexdigest())
+    asyncio.run(restarted.append(session.id, 0, async_iter([CONTENT])))
+    with pytest.raises(UploadChecksumMismatchException):
+        asyncio.run(restarted.complete(session.id))
+    assert list((tmp_path / "scratch").iterdir()) == []
+    assert restarted.scratch_space.stats().used_bytes == 0
+
+def test_purges_abandoned_sessions(tmp_path):
+    """
+    有効期限を過ぎた（放置された）セッションが、受信済みのファイルデータとともに削除されることをテストします。
+    """
+    service = create_service(tmp_path, ttl_seconds=0)
+    session = service.create("video.mp4", "video/mp4", len(CONTENT))
+
+    with pytest.raises(UploadSessionNotFoundException):
+        service.get(session.id)
+    assert list((tmp_path / "scratch").iterdir()) == []
+
+def test_upload_data_is_charged_to_scratch_quota(tmp_path):
+    """
+    受信したチャンクが一時作業領域の容量上限に計上され、上限を超えた場合は受信できた分を保持して拒否されること、
+    および上限に達している間は新たなセッションを作成できないことをテストします。
+    """
+    service = create_service(tmp_path, max_bytes=600)
+    session = service.create("video.mp4", "video/mp4", len(CONTENT))
+
+    with pytest.raises(ScratchSpaceExhaustedException) as exc_info:
+        asyncio.run(service.append(session.id, 0, async_iter([CONTENT[:400], CONTENT[400:800]])))
+    assert exc_info.value.retry_after == 3
+    assert service.get(session.id).offset == 400
+    assert service.scratch_space.stats().used_bytes == 400
+
+    asyncio.run(service.append(session.id, 400, async_iter([CONTENT[400:600]])))
+    with pytest.raises(ScratchSpaceExhaustedException):
+        service.create("other.mp4", "video/mp4", len(CONTENT))
+
+    service.delete(session.id)
+    assert service.scratch_space.stats().used_bytes == 0
@@ -0,0 +1,75 @@
+"""
+このモジュールは、ZipArchiverのテストケースを含んでいます。
+"""
+
+import asyncio
+import io
+import zipfile
+
+from infrastructure.zip_archiver import ZipArchiver
+from tests.helpers import async_iter
+
+async def collect(stream):
+    """
+    非同期イテレータが返すチャンクをすべて連結します。
+    """
+    return b"".join([chunk async for chunk in stream])
+
+def test_stream_archive_creates_valid_zip(tmp_path):
+    """
+    stream_archiveが生成するストリームが有効なZIPアーカイブであることをテストします。
+
+    このテストでは、複数のファイルをストリーミングでアーカイブし、
+    連結したデータをZIPとして展開した際に元の内容と一致することを検証します。
+    """
+    files = []
+    for index, content in enumerate([b"first track" * 1000, b"second track" * 1000]):
+        path = tmp_path / f"audio_track_{index}.aac"
+        path.write_bytes(content)
+        files.append(path)
+
+    data = asyncio.run(collect(ZipArchiver().stream_archive(async_iter(files))))
+
+    with zipfile.ZipFile(io.BytesIO(data)) as zipf:
+        assert zipf.namelist() == ["audio_track_0.aac", "audio_track_1.aac"]
+        assert zipf.read("audio_track_0.aac") == files[0].read_bytes()
+        assert zipf.read("audio_track_1.aac") == files[1].read_bytes()
+
+def test_stream_archive_yields_before_all_files_are_ready(tmp_path):
+    """
+    stream_archiveが後続のファイルを待たずにデータを出力することをテストします。
+
+    このテストでは、1つ目のファイルを渡した後に2つ目のファイルがまだ揃っていない状態でも、
+    1つ目のファイルのデータがストリームから出力されることを検証します。
+    """
+    first = tmp_path / "audio_track_0.aac"
+    first.write_bytes(b"first track")
+    second_ready = asyncio.Event()
+
+    async def files():
+        yield first
+        await second_ready.wait()
+
+    async def run():
+        stream = ZipArchiver().stream_archive(files())
+        first_chunk = await asyncio.wait_for(anext(stream), timeout=1)
+        second_ready.set()
+        rest = await collect(stream)
+        return first_chunk + rest
+
+    data = asyncio.run(run())
+
+    with zipfile.ZipFile(io.BytesIO(data)) as zipf:
+        assert zipf.read("audio_track_0.aac") == b"first track"
+
+def test_stream_archive_stores_entries_without_compression(tmp_path):
+    """
+    既定のZipArchiverが圧縮済みの音声を再圧縮せず、無圧縮でエントリを格納することをテストします。
+    """
+    path = tmp_path / "audio_track_0.aac"
+    path.write_bytes(b"track" * 1000)
+
+    data = asyncio.run(collect(ZipArchiver().stream_archive(async_iter([path]))))
+
+    with zipfile.ZipFile(io.BytesIO(data)) as zipf:
+        assert zipf.getinfo("audio_track_0.aac").compress_type == zipfile.ZIP_STORED